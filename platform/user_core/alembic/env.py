@@ -19,11 +19,8 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 import os
-from models.user_profile import Base
-from models.behavior_event import Base
-from models.notification_preference import Base
-from models.change_feed import Base
-from models.buddy_matching import Base
+# Importing the package registers every model on the shared Base
+from models import Base
 
 # Get the database URL from the environment variable
 db_url = os.environ.get('DB_URL') or os.environ.get('USER_CORE_DB_URL') or 'sqlite:///./user_core.db'
@@ -0,0 +1,34 @@
+"""baseline schema
+
+Creates every table of the current models that does not exist yet. This
+takes the place of the initial migration that start.sh used to
+autogenerate on a fresh database; on an existing database it only adds
+missing tables and leaves existing ones untouched.
+
+Revision ID: 0001_baseline_schema
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from models import Base
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline_schema'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    Base.metadata.create_all(bind=op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
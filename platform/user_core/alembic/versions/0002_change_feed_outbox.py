@@ -0,0 +1,57 @@
+"""change_feed outbox delivery columns
+
+Adds the outbox delivery state to an existing change_feed table. Rows
+written before the outbox existed were already pushed to subscribers
+synchronously, so they are marked `delivered`; backfilling them as
+`pending` would make the dispatcher re-send the whole history. Tables
+created by the baseline revision already have the columns and are left
+as they are.
+
+Revision ID: 0002_change_feed_outbox
+Revises: 0001_baseline_schema
+Create Date: 2026-10-19 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_change_feed_outbox'
+down_revision: Union[str, Sequence[str], None] = '0001_baseline_schema'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('change_feed')}
+    if 'delivery_status' in columns:
+        return
+
+    with op.batch_alter_table('change_feed') as batch:
+        batch.add_column(sa.Column('delivery_status', sa.String(20), server_default='pending', nullable=False))
+        batch.add_column(sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+        batch.add_column(sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column('delivered_at', sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column('last_error', sa.String(500), nullable=True))
+        batch.create_index('idx_change_feed_outbox', ['delivery_status', 'published_at'])
+
+    op.execute(
+        "UPDATE change_feed SET delivery_status = 'delivered', attempts = 0, "
+        "delivered_at = published_at"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('change_feed') as batch:
+        batch.drop_index('idx_change_feed_outbox')
+        batch.drop_column('last_error')
+        batch.drop_column('delivered_at')
+        batch.drop_column('next_attempt_at')
+        batch.drop_column('attempts')
+        batch.drop_column('delivery_status')
@@ -0,0 +1,87 @@
+"""user_profiles search_text and trigram index
+
+Adds the normalized `search_text` column used by admin search to an
+existing user_profiles table and fills it for every user, the same way
+`scripts/refresh_admin_stats.py --backfill-search` does. On PostgreSQL the
+column gets a pg_trgm GIN index so `LIKE '%...%'` searches use it; other
+dialects get a plain index, as `create_all` would create. Tables created by
+the baseline revision already have the column and are left as they are.
+
+Revision ID: 0003_user_search_text
+Revises: 0002_change_feed_outbox
+Create Date: 2026-10-19 00:00:02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from models.user_profile import build_search_text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_user_search_text'
+down_revision: Union[str, Sequence[str], None] = '0002_change_feed_outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BACKFILL_CHUNK_SIZE = 1000
+
+user_profiles = sa.table(
+    'user_profiles',
+    sa.column('user_id'),
+    sa.column('email', sa.String),
+    sa.column('display_name', sa.String),
+    sa.column('search_text', sa.String),
+)
+
+
+def _backfill_search_text(bind) -> None:
+    while True:
+        rows = bind.execute(
+            sa.select(user_profiles.c.user_id, user_profiles.c.email, user_profiles.c.display_name)
+            .where(user_profiles.c.search_text.is_(None))
+            .limit(_BACKFILL_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            user_profiles.update()
+            .where(user_profiles.c.user_id == sa.bindparam('b_user_id'))
+            .values(search_text=sa.bindparam('b_search_text')),
+            [
+                {'b_user_id': row.user_id, 'b_search_text': build_search_text(row.email, row.display_name)}
+                for row in rows
+            ],
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column['name'] for column in inspector.get_columns('user_profiles')}
+    if 'search_text' in columns:
+        return
+
+    with op.batch_alter_table('user_profiles') as batch:
+        batch.add_column(sa.Column('search_text', sa.String(400), nullable=True))
+
+    _backfill_search_text(bind)
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'idx_users_search_text_trgm', 'user_profiles', ['search_text'],
+            postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'},
+        )
+    else:
+        op.create_index('idx_users_search_text_trgm', 'user_profiles', ['search_text'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_users_search_text_trgm', table_name='user_profiles')
+    with op.batch_alter_table('user_profiles') as batch:
+        batch.drop_column('search_text')
@@ -9,16 +9,16 @@ Provides admin-only endpoints for:
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_
 from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional, Dict
-from datetime import datetime, UTC, timedelta
+from datetime import datetime, UTC
 import uuid
 
 from services import db
 from models.user_profile import UserProfile
 from models.enums import UserStatus
 from services.auth_dependencies import get_current_admin_user
+from services import admin_stats_service, auth_cache, read_replicas
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -41,6 +41,7 @@ class UserListResponse(BaseModel):
     """用戶列表回應"""
     users: List[UserListItem]
     total: int
+    total_is_estimate: bool = False
     page: int
     page_size: int
     total_pages: int
@@ -93,6 +94,7 @@ class StatisticsResponse(BaseModel):
     new_users_last_30_days: int
     users_by_experience_level: Dict[str, int]
     users_by_role: Dict[str, int]
+    computed_at: Optional[str] = None
 
 
 # ==================== Endpoints ====================
@@ -117,13 +119,7 @@ async def list_users(
 
     # Apply filters
     if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            or_(
-                UserProfile.email.ilike(search_pattern),
-                UserProfile.display_name.ilike(search_pattern)
-            )
-        )
+        query = admin_stats_service.apply_search(query, search)
 
     if status_filter:
         try:
@@ -139,8 +135,8 @@ async def list_users(
         # Filter by role using JSON contains
         query = query.filter(UserProfile.roles.contains([role_filter]))
 
-    # Get total count
-    total = query.count()
+    # Get total count (exact up to a cap, estimated beyond it)
+    total, total_is_estimate = admin_stats_service.count_users(db_session, query)
 
     # Apply pagination
     offset = (page - 1) * page_size
@@ -166,6 +162,7 @@ async def list_users(
     return UserListResponse(
         users=user_items,
         total=total,
+        total_is_estimate=total_is_estimate,
         page=page,
         page_size=page_size,
         total_pages=total_pages
@@ -319,6 +316,7 @@ async def update_user_status(
     user.updated_at = datetime.now(UTC)
     db_session.commit()
     db_session.refresh(user)
+    auth_cache.invalidate_user(user.user_id)
 
     return {
         "message": f"User status updated to {new_status.value}",
@@ -407,6 +405,7 @@ async def delete_user(
 
     db_session.delete(user)
     db_session.commit()
+    auth_cache.invalidate_user(uid)
 
     return {
         "message": "User deleted successfully",
@@ -416,68 +415,27 @@ async def delete_user(
 
 @router.get("/statistics", response_model=StatisticsResponse)
 async def get_statistics(
+    read_session: Session = Depends(read_replicas.get_read_db),
     db_session: Session = Depends(db.get_db),
     _admin: UserProfile = Depends(get_current_admin_user)
 ):
     """
     獲取統計資訊
 
-    需要管理員權限
+    需要管理員權限（讀取 replica，過期時於主庫重新計算）
     """
-    # Total users
-    total_users = db_session.query(func.count(UserProfile.user_id)).scalar()
-
-    # Active/Inactive users
-    active_users = db_session.query(func.count(UserProfile.user_id)).filter(
-        UserProfile.status == UserStatus.active
-    ).scalar()
-
-    inactive_users = db_session.query(func.count(UserProfile.user_id)).filter(
-        UserProfile.status == UserStatus.inactive
-    ).scalar()
-
-    # New users in last 7 days
-    seven_days_ago = datetime.now(UTC) - timedelta(days=7)
-    new_users_7d = db_session.query(func.count(UserProfile.user_id)).filter(
-        UserProfile.created_at >= seven_days_ago
-    ).scalar()
-
-    # New users in last 30 days
-    thirty_days_ago = datetime.now(UTC) - timedelta(days=30)
-    new_users_30d = db_session.query(func.count(UserProfile.user_id)).filter(
-        UserProfile.created_at >= thirty_days_ago
-    ).scalar()
-
-    # Users by experience level
-    experience_levels = db_session.query(
-        UserProfile.experience_level,
-        func.count(UserProfile.user_id)
-    ).group_by(UserProfile.experience_level).all()
-
-    users_by_experience = {
-        level or "unknown": count
-        for level, count in experience_levels
-    }
-
-    # Users by role (this is simplified - in reality roles is a JSON array)
-    # For now, we'll just count admin vs non-admin
-    admin_count = db_session.query(func.count(UserProfile.user_id)).filter(
-        UserProfile.roles.contains(['admin'])
-    ).scalar() or 0
-
-    user_count = total_users - admin_count
-
-    users_by_role = {
-        "admin": admin_count,
-        "user": user_count
-    }
+    stats = admin_stats_service.get_user_statistics(read_session, write_db=db_session)
 
     return StatisticsResponse(
-        total_users=total_users or 0,
-        active_users=active_users or 0,
-        inactive_users=inactive_users or 0,
-        new_users_last_7_days=new_users_7d or 0,
-        new_users_last_30_days=new_users_30d or 0,
-        users_by_experience_level=users_by_experience,
-        users_by_role=users_by_role
+        total_users=stats.total_users,
+        active_users=stats.active_users,
+        inactive_users=stats.inactive_users,
+        new_users_last_7_days=stats.new_users_last_7_days,
+        new_users_last_30_days=stats.new_users_last_30_days,
+        users_by_experience_level=stats.users_by_experience_level or {},
+        users_by_role={
+            "admin": stats.admin_users,
+            "user": stats.total_users - stats.admin_users
+        },
+        computed_at=stats.computed_at.isoformat() if stats.computed_at else None
     )
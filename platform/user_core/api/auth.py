@@ -6,12 +6,12 @@ Provides:
 - User login (email + password)
 - Token validation
 """
-import time
-from collections import defaultdict
 from typing import Dict, Any
 from fastapi import APIRouter, Header, HTTPException, status, Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr, Field
+import logging
 import uuid
 import os
 
@@ -21,48 +21,45 @@ from services import password_service
 from services.bot_protection import verify_captcha
 from services.auth_service import create_access_token, verify_token
 from config.settings import settings
+from services.rate_limiter import get_rate_limiter
 
-try:
-    import redis
-    _redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
-    _redis_available = True
-except Exception:
-    _redis = None
-    _redis_available = False
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
-_REQUEST_HISTORY = defaultdict(list)
 AUTH_RL_WINDOW = 60  # seconds
 AUTH_RL_MAX = 15
+_rate_limiter = get_rate_limiter("auth", AUTH_RL_MAX, AUTH_RL_WINDOW, settings.redis_url)
 
 
 def _rate_limit(key: str) -> None:
-    """Apply a simple sliding window rate limit."""
-    if _redis_available:
-        now_ms = int(time.time() * 1000)
-        window_ms = AUTH_RL_WINDOW * 1000
-        key_name = f"auth:rl:{key}"
-        try:
-            pipeline = _redis.pipeline()
-            pipeline.zremrangebyscore(key_name, 0, now_ms - window_ms)
-            pipeline.zcard(key_name)
-            pipeline.zadd(key_name, {str(now_ms): now_ms})
-            pipeline.expire(key_name, AUTH_RL_WINDOW)
-            _, count, _, _ = pipeline.execute()
-            if count >= AUTH_RL_MAX:
-                raise HTTPException(status_code=429, detail="Too many requests")
-            return
-        except Exception:
-            pass
-
-    now = time.time()
-    window_start = now - AUTH_RL_WINDOW
-    recent = _REQUEST_HISTORY[key]
-    while recent and recent[0] < window_start:
-        recent.pop(0)
-    if len(recent) >= AUTH_RL_MAX:
-        raise HTTPException(status_code=429, detail="Too many requests")
-    recent.append(now)
+    """Apply the per-client auth rate limit."""
+    _rate_limiter.check(key, detail="Too many requests")
+
+
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Authentication service busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _find_user_by_email(db_session: AsyncSession, email: str):
+    return await db_session.scalar(select(UserProfile).where(UserProfile.email == email))
+
+
+async def _rehash_if_needed(db_session: AsyncSession, user: UserProfile, password: str) -> None:
+    """Upgrade a stored hash to the configured cost after a successful login."""
+    if not password_service.needs_rehash(user.hashed_password):
+        return
+    try:
+        user.hashed_password = await password_service.hash_password_async(password)
+        await db_session.commit()
+    except password_service.PasswordHasherBusy:
+        pass  # Try again on a later login
+    except Exception as exc:
+        logger.warning(f"Password rehash failed for user {user.user_id}: {exc}")
+        await db_session.rollback()
 
 
 # ==================== Schemas ====================
@@ -99,7 +96,7 @@ class AuthResponse(BaseModel):
 async def register(
     request: RegisterRequest,
     http_request: Request,
-    db_session: Session = Depends(db.get_db)
+    db_session: AsyncSession = Depends(db.get_async_db)
 ) -> AuthResponse:
     """
     Register a new user.
@@ -114,9 +111,7 @@ async def register(
     await verify_captcha(request.captcha_token, client_ip=http_request.client.host if http_request.client else None)
 
     # Check if email already exists
-    existing_user = db_session.query(UserProfile).filter(
-        UserProfile.email == request.email
-    ).first()
+    existing_user = await _find_user_by_email(db_session, request.email)
 
     if existing_user:
         raise HTTPException(
@@ -125,7 +120,10 @@ async def register(
         )
 
     # Hash password
-    hashed_password = password_service.hash_password(request.password)
+    try:
+        hashed_password = await password_service.hash_password_async(request.password)
+    except password_service.PasswordHasherBusy:
+        raise _hasher_busy()
 
     # Create new user
     new_user = UserProfile(
@@ -145,8 +143,8 @@ async def register(
     )
 
     db_session.add(new_user)
-    db_session.commit()
-    db_session.refresh(new_user)
+    await db_session.commit()
+    await db_session.refresh(new_user)
 
     access_token = create_access_token(new_user.user_id)
 
@@ -163,7 +161,7 @@ async def register(
 async def login(
     request: LoginRequest,
     http_request: Request,
-    db_session: Session = Depends(db.get_db)
+    db_session: AsyncSession = Depends(db.get_async_db)
 ) -> AuthResponse:
     """
     Login with email and password.
@@ -178,9 +176,7 @@ async def login(
     await verify_captcha(request.captcha_token, client_ip=http_request.client.host if http_request.client else None)
 
     # Find user by email
-    user = db_session.query(UserProfile).filter(
-        UserProfile.email == request.email
-    ).first()
+    user = await _find_user_by_email(db_session, request.email)
 
     if not user:
         raise HTTPException(
@@ -189,12 +185,18 @@ async def login(
         )
 
     # Verify password
-    if not password_service.verify_password(request.password, user.hashed_password):
+    try:
+        valid = await password_service.verify_password_async(request.password, user.hashed_password)
+    except password_service.PasswordHasherBusy:
+        raise _hasher_busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
+    await _rehash_if_needed(db_session, user, request.password)
+
     access_token = create_access_token(user.user_id)
 
     return AuthResponse(
@@ -209,7 +211,7 @@ async def login(
 @router.get("/validate")
 async def validate_token(
     authorization: str = Header(...),
-    db_session: Session = Depends(db.get_db)
+    db_session: AsyncSession = Depends(db.get_async_db)
 ) -> Dict[str, str]:
     """
     Validate a bearer token and return user information.
@@ -236,9 +238,7 @@ async def validate_token(
             detail=str(exc)
         )
 
-    user = db_session.query(UserProfile).filter(
-        UserProfile.user_id == user_id
-    ).first()
+    user = await db_session.get(UserProfile, user_id)
 
     if not user:
         raise HTTPException(
@@ -257,7 +257,7 @@ async def validate_token(
 @router.get("/me")
 async def get_current_user(
     authorization: str = Header(...),
-    db_session: Session = Depends(db.get_db)
+    db_session: AsyncSession = Depends(db.get_async_db)
 ) -> Dict[str, Any]:
     """
     Get current user's profile information.
@@ -276,9 +276,7 @@ async def get_current_user(
     user_id = uuid.UUID(validation["user_id"])
 
     # Get full user profile
-    user = db_session.query(UserProfile).filter(
-        UserProfile.user_id == user_id
-    ).first()
+    user = await db_session.get(UserProfile, user_id)
 
     if not user:
         raise HTTPException(
@@ -5,6 +5,7 @@ from typing import List, Optional
 
 from services import behavior_event_service, db
 from services.workflow_dispatchers import get_casi_workflow_dispatcher
+from services.casi_skill_updater import INCREMENTAL_EVENT_TYPES
 from schemas import behavior_event as behavior_event_schema
 
 router = APIRouter()
@@ -20,9 +21,13 @@ def create_event_for_user(
         
         # 如果是單板教學的練習完成事件，觸發 CASI 分析
         if (event.source_project == "snowboard-teaching" and 
-            event.event_type == "snowboard.practice.completed"):
+            event.event_type in INCREMENTAL_EVENT_TYPES):
             dispatcher = get_casi_workflow_dispatcher()
-            dispatcher.dispatch(user_id=event.user_id, background_tasks=background_tasks)
+            dispatcher.dispatch(
+                user_id=event.user_id,
+                background_tasks=background_tasks,
+                event_id=db_event.event_id,
+            )
         
         return db_event
     except behavior_event_service.BehaviorEventValidationError as exc:
@@ -7,60 +7,29 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Header
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from config.settings import settings
 from domain.calendar.enums import EventType
 from repositories.calendar_repository import CalendarEventRepository
 from services import db
-from services.auth_dependencies import get_current_user
+from services.auth_dependencies import get_current_user_id
 from services.bot_protection import verify_captcha
 from services.calendar_service import CalendarService
-
-try:  # pragma: no cover - optional dependency
-    import redis
-except Exception:  # pragma: no cover - redis import failure
-    redis = None  # type: ignore
+from services.rate_limiter import get_rate_limiter
 
 
 router = APIRouter(prefix="/calendar", tags=["Calendar"])
-_RATE_LIMIT: dict[str, list[dt.datetime]] = {}
 RATE_LIMIT_COUNT = 50
 RATE_LIMIT_WINDOW = dt.timedelta(minutes=1)
-
-if redis and settings.redis_url:
-    try:
-        _RL_CLIENT = redis.Redis.from_url(settings.redis_url, decode_responses=True)
-    except Exception:  # pragma: no cover - redis connection fallback
-        _RL_CLIENT = None
-else:
-    _RL_CLIENT = None
+_rate_limiter = get_rate_limiter(
+    "calendar", RATE_LIMIT_COUNT, RATE_LIMIT_WINDOW.total_seconds(), settings.redis_url
+)
 
 
 def _rate_limit(key: str) -> None:
-    now = dt.datetime.now(dt.timezone.utc)
-    if _RL_CLIENT:
-        window_ms = int(RATE_LIMIT_WINDOW.total_seconds() * 1000)
-        now_ms = int(now.timestamp() * 1000)
-        key_name = f"calendar:rl:{key}"
-        pipeline = _RL_CLIENT.pipeline()
-        pipeline.zremrangebyscore(key_name, 0, now_ms - window_ms)
-        pipeline.zcard(key_name)
-        pipeline.zadd(key_name, {str(now_ms): now_ms})
-        pipeline.expire(key_name, int(RATE_LIMIT_WINDOW.total_seconds()))
-        try:
-            _, count, _, _ = pipeline.execute()
-            if count >= RATE_LIMIT_COUNT:
-                raise HTTPException(status_code=429, detail="Too many calendar operations")
-            return
-        except Exception:
-            pass
-
-    entries = _RATE_LIMIT.setdefault(key, [])
-    entries[:] = [t for t in entries if now - t <= RATE_LIMIT_WINDOW]
-    if len(entries) >= RATE_LIMIT_COUNT:
-        raise HTTPException(status_code=429, detail="Too many calendar operations")
-    entries.append(now)
+    _rate_limiter.check(key, detail="Too many calendar operations")
 
 
 # ==================== Request/Response Models ====================
@@ -150,16 +119,16 @@ def get_calendar_service(db_session: Session = Depends(db.get_db)) -> CalendarSe
 @router.post("/events", response_model=EventResponse, status_code=201)
 def create_event(
     request: EventCreateRequest,
-    current_user = Depends(get_current_user),
+    current_user_id: UUID = Depends(get_current_user_id),
     service: CalendarService = Depends(get_calendar_service),
     captcha_token: str | None = Header(None, alias="X-Captcha-Token"),
 ):
     """Create a new calendar event."""
-    _rate_limit(f"event:{current_user.user_id}")
+    _rate_limit(f"event:{current_user_id}")
     verify_captcha(captcha_token)
     
     event = service.create_event(
-        user_id=UUID(current_user.user_id),
+        user_id=current_user_id,
         event_type=request.type,
         title=request.title,
         start_date=request.start_date,
@@ -201,21 +170,23 @@ def create_event(
 
 
 @router.get("/events", response_model=List[EventResponse])
-def list_events(
-    current_user = Depends(get_current_user),
-    service: CalendarService = Depends(get_calendar_service),
+async def list_events(
+    current_user_id: UUID = Depends(get_current_user_id),
+    db_session: AsyncSession = Depends(db.get_async_db),
     start_date: Optional[dt.datetime] = None,
     end_date: Optional[dt.datetime] = None,
     event_type: Optional[str] = None,
     source_app: Optional[str] = None,
 ):
     """List calendar events for the current user."""
-    events = service.list_events(
-        user_id=UUID(current_user.user_id),
-        start_date=start_date,
-        end_date=end_date,
-        event_type=event_type,
-        source_app=source_app,
+    events = await db_session.run_sync(
+        lambda session: CalendarService(CalendarEventRepository(session)).list_events(
+            user_id=current_user_id,
+            start_date=start_date,
+            end_date=end_date,
+            event_type=event_type,
+            source_app=source_app,
+        )
     )
     
     return [
@@ -246,7 +217,7 @@ def list_events(
 @router.get("/events/{event_id}", response_model=EventResponse)
 def get_event(
     event_id: str,
-    current_user = Depends(get_current_user),
+    current_user_id: UUID = Depends(get_current_user_id),
     service: CalendarService = Depends(get_calendar_service),
 ):
     """Get a specific calendar event."""
@@ -256,7 +227,7 @@ def get_event(
         raise HTTPException(status_code=404, detail="Event not found")
     
     # Verify ownership
-    if str(event.user_id) != current_user.user_id:
+    if str(event.user_id) != str(current_user_id):
         raise HTTPException(status_code=403, detail="Not authorized to access this event")
     
     return EventResponse(
@@ -285,7 +256,7 @@ def get_event(
 def update_event(
     event_id: str,
     request: EventUpdateRequest,
-    current_user = Depends(get_current_user),
+    current_user_id: UUID = Depends(get_current_user_id),
     service: CalendarService = Depends(get_calendar_service),
 ):
     """Update a calendar event."""
@@ -296,7 +267,7 @@ def update_event(
         raise HTTPException(status_code=404, detail="Event not found")
     
     # Verify ownership
-    if str(event.user_id) != current_user.user_id:
+    if str(event.user_id) != str(current_user_id):
         raise HTTPException(status_code=403, detail="Not authorized to update this event")
     
     # Update event
@@ -342,7 +313,7 @@ def update_event(
 @router.delete("/events/{event_id}", status_code=204)
 def delete_event(
     event_id: str,
-    current_user = Depends(get_current_user),
+    current_user_id: UUID = Depends(get_current_user_id),
     service: CalendarService = Depends(get_calendar_service),
 ):
     """Delete a calendar event."""
@@ -353,7 +324,7 @@ def delete_event(
         raise HTTPException(status_code=404, detail="Event not found")
     
     # Verify ownership
-    if str(event.user_id) != current_user.user_id:
+    if str(event.user_id) != str(current_user_id):
         raise HTTPException(status_code=403, detail="Not authorized to delete this event")
     
     # Delete event
@@ -367,7 +338,7 @@ def delete_event(
 def list_events_for_source(
     source_app: str,
     source_id: str,
-    current_user = Depends(get_current_user),
+    current_user_id: UUID = Depends(get_current_user_id),
     service: CalendarService = Depends(get_calendar_service),
 ):
     """List calendar events for a specific source."""
@@ -377,7 +348,7 @@ def list_events_for_source(
     )
     
     # Filter by current user
-    user_events = [e for e in events if str(e.user_id) == current_user.user_id]
+    user_events = [e for e in events if str(e.user_id) == str(current_user_id)]
     
     return [
         EventResponse(
@@ -12,7 +12,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
 
-from services import course_tracking_service, db
+from services import course_tracking_service, db, read_replicas
 from schemas import course_tracking as ct_schemas
 
 router = APIRouter()
@@ -461,7 +461,7 @@ def get_achievement_definitions(
 def get_leaderboard(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
-    db_session: Session = Depends(db.get_db)
+    db_session: Session = Depends(read_replicas.get_read_db)
 ):
     """
     Get the global achievement leaderboard.
@@ -483,7 +483,7 @@ def get_leaderboard(
 )
 def get_user_rank(
     user_id: uuid.UUID,
-    db_session: Session = Depends(db.get_db)
+    db_session: Session = Depends(read_replicas.get_read_db)
 ):
     """
     Get a specific user's rank on the leaderboard.
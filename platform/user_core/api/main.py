@@ -1,46 +1,40 @@
+import importlib
 import logging
 import os
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-
-from services import db, course_tracking_service
-from models import (
-    user_profile, behavior_event, notification_preference,
-    course_tracking, social,
-    trip_planning as trip_planning_models,
-    gear as gear_models
-)
-from api import (
-    user_profiles, behavior_events, notification_preferences, auth, admin,
-    course_tracking as course_tracking_api, share_cards,
-    social as social_api, ski_map, trip_planning, gear, calendar, casi_skills
-)
 
-try:
-    import sentry_sdk
-    from sentry_sdk.integrations.fastapi import FastApiIntegration
-except ImportError:
-    sentry_sdk = None  # Optional dependency; skip if not installed
+from telemetry.startup_profile import profiler
+
+with profiler.step("import fastapi"):
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+
+with profiler.step("import services.db"):
+    from services import db
+    from services.read_replicas import WriteTrackingMiddleware
+
+with profiler.step("import models"):
+    # Registers every table on Base.metadata; schema creation itself is an
+    # explicit step (alembic / scripts/run_migrations.py), not an import side effect.
+    import models  # noqa: F401
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("user_core")
 
-if sentry_sdk and os.getenv("SENTRY_DSN"):
-    sentry_sdk.init(
-        dsn=os.getenv("SENTRY_DSN"),
-        integrations=[FastApiIntegration()],
-        traces_sample_rate=float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.05")),
-    )
-
-# Create all tables (for development only)
-user_profile.Base.metadata.create_all(bind=db.engine)
-behavior_event.Base.metadata.create_all(bind=db.engine)
-notification_preference.Base.metadata.create_all(bind=db.engine)
-course_tracking.Base.metadata.create_all(bind=db.engine)
-social.Base.metadata.create_all(bind=db.engine)
-trip_planning_models.Base.metadata.create_all(bind=db.engine)
-gear_models.Base.metadata.create_all(bind=db.engine)
+if os.getenv("SENTRY_DSN"):
+    try:
+        import sentry_sdk
+        from sentry_sdk.integrations.fastapi import FastApiIntegration
+    except ImportError:
+        sentry_sdk = None  # Optional dependency; skip if not installed
+
+    if sentry_sdk:
+        with profiler.step("init sentry"):
+            sentry_sdk.init(
+                dsn=os.getenv("SENTRY_DSN"),
+                integrations=[FastApiIntegration()],
+                traces_sample_rate=float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.05")),
+            )
 
 app = FastAPI(
     title="SnowTrace User Core Service",
@@ -66,26 +60,39 @@ app.add_middleware(
     max_age=86400,  # 24 hours preflight cache
 )
 
-app.include_router(user_profiles.router, prefix="/users", tags=["User Profiles"])
-app.include_router(behavior_events.router, prefix="/events", tags=["Behavior Events"])
-app.include_router(auth.router, tags=["Authentication"])
-app.include_router(admin.router, tags=["Admin"])
-# A bit of a workaround to nest preferences under a user
-app.include_router(notification_preferences.router, prefix="/users/{user_id}/preferences", tags=["Notification Preferences"])
-app.include_router(course_tracking_api.router, prefix="/users", tags=["Course Tracking"])
-app.include_router(share_cards.router, prefix="/api", tags=["Share Cards"])
-# Social features
-app.include_router(social_api.router, prefix="/social", tags=["Social Features"])
-# Ski map
-app.include_router(ski_map.router, prefix="/ski-map", tags=["Ski Map"])
-# Trip planning
-app.include_router(trip_planning.router, prefix="/trip-planning", tags=["Trip Planning"])
-# Gear operations
-app.include_router(gear.router, prefix="/api", tags=["Gear Operations"])
-# Calendar
-app.include_router(calendar.router)
-# CASI Skills (for Snowbuddy matching)
-app.include_router(casi_skills.router, tags=["CASI Skills"])
+# Pin callers to the primary database for a short window after a write
+app.add_middleware(WriteTrackingMiddleware)
+
+# (module, include_router kwargs) in registration order
+ROUTERS = [
+    ("user_profiles", {"prefix": "/users", "tags": ["User Profiles"]}),
+    ("behavior_events", {"prefix": "/events", "tags": ["Behavior Events"]}),
+    ("auth", {"tags": ["Authentication"]}),
+    ("admin", {"tags": ["Admin"]}),
+    # A bit of a workaround to nest preferences under a user
+    ("notification_preferences", {"prefix": "/users/{user_id}/preferences", "tags": ["Notification Preferences"]}),
+    ("course_tracking", {"prefix": "/users", "tags": ["Course Tracking"]}),
+    ("share_cards", {"prefix": "/api", "tags": ["Share Cards"]}),
+    # Social features
+    ("social", {"prefix": "/social", "tags": ["Social Features"]}),
+    # Ski map
+    ("ski_map", {"prefix": "/ski-map", "tags": ["Ski Map"]}),
+    # Trip planning
+    ("trip_planning", {"prefix": "/trip-planning", "tags": ["Trip Planning"]}),
+    # Gear operations
+    ("gear", {"prefix": "/api", "tags": ["Gear Operations"]}),
+    # Calendar
+    ("calendar", {}),
+    # CASI Skills (for Snowbuddy matching)
+    ("casi_skills", {"tags": ["CASI Skills"]}),
+    # Snowbuddy request-state projections
+    ("snowbuddy", {"prefix": "/snowbuddy", "tags": ["Snowbuddy"]}),
+]
+
+for module_name, router_kwargs in ROUTERS:
+    with profiler.step(f"import api.{module_name}"):
+        module = importlib.import_module(f"api.{module_name}")
+    app.include_router(module.router, **router_kwargs)
 
 
 @app.exception_handler(Exception)
@@ -99,21 +106,29 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
 
 
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
     """Load achievement definitions on startup."""
-    import os
     from pathlib import Path
+    from config.settings import settings
+
+    if settings.auto_create_schema:
+        # Development convenience only; deployments run migrations first
+        with profiler.step("create_all (AUTO_CREATE_SCHEMA)"):
+            models.Base.metadata.create_all(bind=db.engine)
 
     # Find achievement definitions YAML file
     yaml_path = Path(__file__).parent.parent / "data" / "achievement_definitions.yaml"
 
     if yaml_path.exists():
-        db_session = next(db.get_db())
+        from services import achievement_service
+
+        db_session = db.SessionLocal()
         try:
-            count = course_tracking_service.load_achievement_definitions(
-                db=db_session,
-                yaml_path=str(yaml_path)
-            )
+            with profiler.step("load achievement definitions"):
+                count = achievement_service.load_definitions(
+                    db=db_session,
+                    yaml_path=str(yaml_path)
+                )
             print(f"✅ Loaded {count} achievement definitions")
         except Exception as e:
             print(f"⚠️ Failed to load achievement definitions: {e}")
@@ -122,8 +137,51 @@ def startup_event():
     else:
         print(f"⚠️ Achievement definitions file not found at {yaml_path}")
 
+    from services.read_replicas import replica_set
+    replica_set.start(settings.replica_health_check_interval_seconds)
+
+    from services.resort_catalog import catalog
+    catalog.prefetch()
+
+    if settings.changefeed_dispatcher_enabled:
+        from services.change_feed_outbox import start_outbox_worker
+        start_outbox_worker(db.SessionLocal)
+
+    profiler.log_report()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers."""
+    from services.change_feed_outbox import stop_outbox_worker
+    await stop_outbox_worker()
+    await db.dispose_async_engine()
+    from services.read_replicas import replica_set
+    replica_set.stop()
+
 
 @app.get("/health", summary="Health Check")
 def health_check():
     """Provides a simple health check endpoint to verify the service is running."""
     return {"status": "ok"}
+
+
+@app.get("/health/rate-limits", summary="Rate Limiter Stats")
+def rate_limit_stats():
+    """Decision latency and key cardinality for each rate limiter."""
+    from services.rate_limiter import all_stats
+    return {"limiters": all_stats()}
+
+
+@app.get("/health/resort-catalog", summary="Resort Catalog Cache")
+def resort_catalog_stats():
+    """Version, size and freshness of the ski-map resort catalog."""
+    from services.resort_catalog import catalog
+    return catalog.stats()
+
+
+@app.get("/health/db-pool", summary="Database Pool Stats")
+def db_pool_stats():
+    """Connection pool checkout-wait metrics, current usage and replica health."""
+    from services.read_replicas import replica_set
+    return {**db.pool_stats(), "replicas": replica_set.stats()}
@@ -3,8 +3,6 @@ Share Card API endpoints.
 
 Generate beautiful share card images for social media.
 """
-import time
-from collections import defaultdict
 from fastapi import APIRouter, Depends, HTTPException, Response, Request, Header
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -12,66 +10,29 @@ from pydantic import BaseModel, UUID4
 from datetime import date
 import uuid
 import io
+import hashlib
 
 from services import db
-from services.imagen_service import get_imagen_service
 from models.course_tracking import CourseVisit
-from models.user_profile import UserProfile
-from services.auth_dependencies import get_current_user
+from services.auth_dependencies import get_current_user_id
 from config.settings import settings
 from services.bot_protection import verify_captcha
+from services.rate_limiter import get_rate_limiter
 
-try:
-    import redis
-    _redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
-    _redis_available = True
-except Exception:
-    _redis_client = None
-    _redis_available = False
-
-# Simple in-memory rate limiter to prevent abuse of costly image generation endpoints
-_REQUEST_HISTORY = defaultdict(list)
+# Rate limit costly image generation endpoints per user (or IP)
 RATE_LIMIT_WINDOW_SECONDS = 60
 RATE_LIMIT_MAX_REQUESTS = 10
+_rate_limiter = get_rate_limiter(
+    "sharecard", RATE_LIMIT_MAX_REQUESTS, RATE_LIMIT_WINDOW_SECONDS, settings.redis_url
+)
 
 
 def _check_rate_limit(key: str) -> None:
-    """Enforce a sliding-window rate limit by key (user or IP)."""
-    if _redis_available:
-        now_ms = int(time.time() * 1000)
-        window_ms = RATE_LIMIT_WINDOW_SECONDS * 1000
-        key_name = f"sharecard:rl:{key}"
-        try:
-            pipeline = _redis_client.pipeline()
-            pipeline.zremrangebyscore(key_name, 0, now_ms - window_ms)
-            pipeline.zcard(key_name)
-            pipeline.zadd(key_name, {str(now_ms): now_ms})
-            pipeline.expire(key_name, RATE_LIMIT_WINDOW_SECONDS)
-            _, count, _, _ = pipeline.execute()
-            if count >= RATE_LIMIT_MAX_REQUESTS:
-                raise HTTPException(
-                    status_code=429,
-                    detail="Rate limit exceeded for share card generation"
-                )
-            return
-        except Exception:
-            # Fallback to in-memory on Redis errors
-            pass
-
-    now = time.time()
-    window_start = now - RATE_LIMIT_WINDOW_SECONDS
-    recent = _REQUEST_HISTORY[key]
-    while recent and recent[0] < window_start:
-        recent.pop(0)
-    if len(recent) >= RATE_LIMIT_MAX_REQUESTS:
-        raise HTTPException(
-            status_code=429,
-            detail="Rate limit exceeded for share card generation"
-        )
-    recent.append(now)
+    """Enforce the share card rate limit by key (user or IP)."""
+    _rate_limiter.check(key, detail="Rate limit exceeded for share card generation")
 
 
-def _guard_request(request: Request, user: Optional[UserProfile], api_key: Optional[str]) -> None:
+def _guard_request(request: Request, user_id: Optional[uuid.UUID], api_key: Optional[str]) -> None:
     """Apply auth-aware rate limit keyed by user ID, fallback to client IP, and enforce API key if configured."""
     if settings.user_core_api_key:
         if not api_key or api_key != settings.user_core_api_key:
@@ -80,9 +41,29 @@ def _guard_request(request: Request, user: Optional[UserProfile], api_key: Optio
                 detail="Invalid or missing API key"
             )
 
-    key = f"user:{user.user_id}" if user else f"ip:{request.client.host if request.client else 'unknown'}"
+    key = f"user:{user_id}" if user_id else f"ip:{request.client.host if request.client else 'unknown'}"
     _check_rate_limit(key)
 
+
+def get_imagen_service():
+    """Imagen client, imported on first use to keep it off the startup path."""
+    from services.imagen_service import get_imagen_service as _get_imagen_service
+    return _get_imagen_service()
+
+
+def _image_response(http_request: Request, image_bytes: bytes, filename: str) -> Response:
+    """PNG response with a content-derived ETag; honours If-None-Match."""
+    etag = f'"{hashlib.sha256(image_bytes).hexdigest()[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.share_card_cache_max_age_seconds}",
+    }
+    if http_request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f"inline; filename={filename}"
+    return Response(content=image_bytes, media_type="image/png", headers=headers)
+
 router = APIRouter()
 
 
@@ -122,7 +103,7 @@ async def generate_course_completion_card(
     http_request: Request,
     x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
     captcha_token: Optional[str] = Header(None, alias="X-Captcha-Token"),
-    current_user: UserProfile = Depends(get_current_user),
+    current_user_id: uuid.UUID = Depends(get_current_user_id),
     db_session: Session = Depends(db.get_db)
 ):
     """
@@ -130,7 +111,7 @@ async def generate_course_completion_card(
 
     Returns PNG image that can be shared on social media.
     """
-    _guard_request(http_request, current_user, x_api_key)
+    _guard_request(http_request, current_user_id, x_api_key)
     await verify_captcha(captcha_token, client_ip=http_request.client.host if http_request.client else None)
     # Get visit details
     visit = db_session.query(CourseVisit).filter(
@@ -173,13 +154,7 @@ async def generate_course_completion_card(
             user_stats=user_stats
         )
 
-        return Response(
-            content=image_bytes,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"inline; filename=course_completion_{visit.id}.png"
-            }
-        )
+        return _image_response(http_request, image_bytes, f"course_completion_{visit.id}.png")
 
     except Exception:
         raise HTTPException(
@@ -203,7 +178,7 @@ async def generate_achievement_card(
     http_request: Request,
     x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
     captcha_token: Optional[str] = Header(None, alias="X-Captcha-Token"),
-    current_user: UserProfile = Depends(get_current_user),
+    current_user_id: uuid.UUID = Depends(get_current_user_id),
     db_session: Session = Depends(db.get_db)
 ):
     """
@@ -213,7 +188,7 @@ async def generate_achievement_card(
     """
     from models.course_tracking import UserAchievement, AchievementDefinition
 
-    _guard_request(http_request, current_user, x_api_key)
+    _guard_request(http_request, current_user_id, x_api_key)
     await verify_captcha(captcha_token, client_ip=http_request.client.host if http_request.client else None)
 
     # Get achievement details
@@ -242,13 +217,7 @@ async def generate_achievement_card(
             description=ach_def.description_zh
         )
 
-        return Response(
-            content=image_bytes,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"inline; filename=achievement_{user_ach.id}.png"
-            }
-        )
+        return _image_response(http_request, image_bytes, f"achievement_{user_ach.id}.png")
 
     except Exception:
         raise HTTPException(
@@ -272,7 +241,7 @@ async def generate_progress_milestone_card(
     http_request: Request,
     x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
     captcha_token: Optional[str] = Header(None, alias="X-Captcha-Token"),
-    current_user: UserProfile = Depends(get_current_user),
+    current_user_id: uuid.UUID = Depends(get_current_user_id),
     db_session: Session = Depends(db.get_db)
 ):
     """
@@ -280,7 +249,7 @@ async def generate_progress_milestone_card(
 
     Returns PNG image that can be shared on social media.
     """
-    _guard_request(http_request, current_user, x_api_key)
+    _guard_request(http_request, current_user_id, x_api_key)
     await verify_captcha(captcha_token, client_ip=http_request.client.host if http_request.client else None)
 
     # Calculate progress
@@ -323,13 +292,7 @@ async def generate_progress_milestone_card(
             milestone_type=milestone_type
         )
 
-        return Response(
-            content=image_bytes,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"inline; filename=progress_{request.resort_id}.png"
-            }
-        )
+        return _image_response(http_request, image_bytes, f"progress_{request.resort_id}.png")
 
     except Exception:
         raise HTTPException(
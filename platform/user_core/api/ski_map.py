@@ -4,10 +4,10 @@ Ski map API endpoints.
 Visualizes user's ski resort conquests on a map.
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
-from services import db, ski_map_service
+from services import read_replicas, resort_catalog, ski_map_service
 from services.auth_service import get_current_user_id
 from schemas.ski_map import SkiMapData
 
@@ -19,10 +19,10 @@ router = APIRouter()
     response_model=SkiMapData,
     summary="Get user's ski map data"
 )
-def get_ski_map(
+async def get_ski_map(
     user_id: uuid.UUID,
     current_user_id: uuid.UUID = Depends(get_current_user_id),
-    db_session: Session = Depends(db.get_db)
+    db_session: AsyncSession = Depends(read_replicas.get_async_read_db)
 ):
     """
     Get ski map data showing which resorts a user has visited.
@@ -37,23 +37,19 @@ def get_ski_map(
     - SVG region map
     - Progress bars by region
     """
-    map_data = ski_map_service.get_ski_map_data(
-        db=db_session,
-        user_id=user_id
-    )
-
-    return map_data
+    catalog = await resort_catalog.catalog.get()
+    return await ski_map_service.aget_ski_map_data(db_session, user_id, catalog)
 
 
 @router.get(
     "/users/{user_id}/ski-map/regions/{region}",
     summary="Get region detail"
 )
-def get_region_detail(
+async def get_region_detail(
     user_id: uuid.UUID,
     region: str,
     current_user_id: uuid.UUID = Depends(get_current_user_id),
-    db_session: Session = Depends(db.get_db)
+    db_session: AsyncSession = Depends(read_replicas.get_async_read_db)
 ):
     """
     Get detailed information for a specific region.
@@ -62,11 +58,7 @@ def get_region_detail(
     - **region**: Region name (e.g., "北海道", "長野県")
     """
     try:
-        region_detail = ski_map_service.get_region_detail(
-            db=db_session,
-            user_id=user_id,
-            region=region
-        )
-        return region_detail
+        catalog = await resort_catalog.catalog.get()
+        return await ski_map_service.aget_region_detail(db_session, user_id, region, catalog)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -0,0 +1,48 @@
+"""
+Snowbuddy projection API - 單一職責原則
+供 Snowbuddy Service 以主鍵查詢媒合請求與行程申請的目前狀態
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from services import db, snowbuddy_projection_service
+from schemas.snowbuddy import MatchRequestState, TripApplicationState, TripParticipants
+
+
+router = APIRouter()
+
+
+@router.get("/match-requests/{request_id}", response_model=MatchRequestState)
+def get_match_request(
+    request_id: str,
+    db_session: Session = Depends(db.get_db)
+):
+    """獲取媒合請求的目前狀態"""
+    match_request = snowbuddy_projection_service.get_match_request(db_session, request_id)
+    if match_request is None:
+        raise HTTPException(status_code=404, detail="Match request not found")
+    return match_request
+
+
+@router.get("/trip-applications/{request_id}", response_model=TripApplicationState)
+def get_trip_application(
+    request_id: str,
+    db_session: Session = Depends(db.get_db)
+):
+    """獲取行程申請的目前狀態（含申請者）"""
+    application = snowbuddy_projection_service.get_trip_application(db_session, request_id)
+    if application is None:
+        raise HTTPException(status_code=404, detail="Trip application not found")
+    return application
+
+
+@router.get("/trips/{trip_id}/participants", response_model=TripParticipants)
+def get_trip_participants(
+    trip_id: str,
+    db_session: Session = Depends(db.get_db)
+):
+    """獲取行程已接受的參與者"""
+    return {
+        "trip_id": trip_id,
+        "participants": snowbuddy_projection_service.get_trip_participants(db_session, trip_id),
+    }
@@ -7,11 +7,12 @@ Provides REST APIs for:
 - Likes and comments
 """
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import uuid
 
-from services import db, social_service
+from services import db, read_replicas, social_service
 from services.auth_service import get_current_user_id
 from schemas.social import (
     FollowResponse, FollowStats,
@@ -163,17 +164,32 @@ def get_follow_stats(
 
 # ==================== Activity Feed Endpoints ====================
 
+def _load_feed(db_session: Session, load_items, current_user_id: uuid.UUID, **kwargs) -> dict:
+    """Load one feed page and enrich it with user info and is_liked status."""
+    items, next_cursor, has_more = load_items(db=db_session, current_user_id=current_user_id, **kwargs)
+    enriched_items = social_service.enrich_feed_items(
+        db=db_session,
+        items=items,
+        current_user_id=current_user_id
+    )
+    return {
+        "items": enriched_items,
+        "next_cursor": next_cursor,
+        "has_more": has_more
+    }
+
+
 @router.get(
     "/feed",
     response_model=FeedResponse,
     summary="Get activity feed"
 )
-def get_activity_feed(
+async def get_activity_feed(
     feed_type: str = Query("all", regex="^(all|following|popular)$"),
     cursor: Optional[str] = None,
     limit: int = Query(20, ge=1, le=50),
     current_user_id: uuid.UUID = Depends(get_current_user_id),
-    db_session: Session = Depends(db.get_db)
+    db_session: AsyncSession = Depends(read_replicas.get_async_read_db)
 ):
     """
     Get activity feed.
@@ -182,39 +198,27 @@ def get_activity_feed(
     - **cursor**: Pagination cursor (last item's ID from previous page)
     - **limit**: Number of items to return (max 50)
     """
-    items, next_cursor, has_more = social_service.get_feed(
-        db=db_session,
+    return await db_session.run_sync(
+        _load_feed,
+        social_service.get_feed,
         current_user_id=current_user_id,
         feed_type=feed_type,
         cursor=cursor,
         limit=limit
     )
 
-    # Enrich items with user info and is_liked status
-    enriched_items = social_service.enrich_feed_items(
-        db=db_session,
-        items=items,
-        current_user_id=current_user_id
-    )
-
-    return {
-        "items": enriched_items,
-        "next_cursor": next_cursor,
-        "has_more": has_more
-    }
-
 
 @router.get(
     "/users/{user_id}/feed",
     response_model=FeedResponse,
     summary="Get user's activity feed"
 )
-def get_user_activity_feed(
+async def get_user_activity_feed(
     user_id: uuid.UUID,
     cursor: Optional[str] = None,
     limit: int = Query(20, ge=1, le=50),
     current_user_id: uuid.UUID = Depends(get_current_user_id),
-    db_session: Session = Depends(db.get_db)
+    db_session: AsyncSession = Depends(read_replicas.get_async_read_db)
 ):
     """
     Get activity feed for a specific user.
@@ -224,26 +228,15 @@ def get_user_activity_feed(
     - Following: see public and followers-only
     - Others: see only public
     """
-    items, next_cursor, has_more = social_service.get_user_feed(
-        db=db_session,
+    return await db_session.run_sync(
+        _load_feed,
+        social_service.get_user_feed,
         user_id=user_id,
         current_user_id=current_user_id,
         cursor=cursor,
         limit=limit
     )
 
-    enriched_items = social_service.enrich_feed_items(
-        db=db_session,
-        items=items,
-        current_user_id=current_user_id
-    )
-
-    return {
-        "items": enriched_items,
-        "next_cursor": next_cursor,
-        "has_more": has_more
-    }
-
 
 @router.post(
     "/feed",
@@ -8,16 +8,18 @@ Provides REST APIs for:
 - Calendar views
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
 from datetime import date
 
-from services import trip_planning_service, db
+from services import trip_planning_service, db, read_replicas
 from schemas import trip_planning as tp_schemas
 from models.enums import SeasonStatus, TripStatus
 from models.trip_planning import Trip
 from auth_utils import get_current_user_id
+from utils.user_loader import get_user_loader
 
 router = APIRouter()
 
@@ -229,23 +231,28 @@ def create_trips_batch(
     response_model=List[tp_schemas.Trip],
     summary="Get user's trips"
 )
-def get_trips(
+async def get_trips(
     user_id: uuid.UUID = Query(..., description="User ID"),
     season_id: Optional[uuid.UUID] = Query(None, description="Filter by season"),
     status: Optional[TripStatus] = Query(None, description="Filter by status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
-    db_session: Session = Depends(db.get_db)
+    db_session: AsyncSession = Depends(db.get_async_db)
 ):
     """Get all trips for a user."""
-    return trip_planning_service.get_user_trips(
-        db=db_session,
-        user_id=user_id,
-        season_id=season_id,
-        status=status,
-        skip=skip,
-        limit=limit
-    )
+    def load(session: Session) -> List[tp_schemas.Trip]:
+        trips = trip_planning_service.get_user_trips(
+            db=session,
+            user_id=user_id,
+            season_id=season_id,
+            status=status,
+            skip=skip,
+            limit=limit
+        )
+        # Serialize while the session is still usable for attribute loads
+        return [tp_schemas.Trip.model_validate(trip) for trip in trips]
+
+    return await db_session.run_sync(load)
 
 
 @router.get(
@@ -256,7 +263,7 @@ def get_trips(
 def get_public_trips(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
-    db_session: Session = Depends(db.get_db)
+    db_session: Session = Depends(read_replicas.get_read_db)
 ):
     """Get all public trips visible on the Snowbuddy Board."""
     return trip_planning_service.get_public_trips_with_owner_info(
@@ -441,19 +448,17 @@ def get_trip_buddies(
     db_session: Session = Depends(db.get_db)
 ):
     """Get all buddies for a trip with user information."""
-    from models.user_profile import UserProfile
-
     buddies = trip_planning_service.get_trip_buddies(
         db=db_session,
         trip_id=trip_id
     )
 
-    # 填充每個 buddy 的用戶顯示名稱
+    # 一次查詢填充所有 buddy 的用戶顯示名稱
+    users = get_user_loader(db_session).load_many(buddy.user_id for buddy in buddies)
+
     result = []
     for buddy in buddies:
-        user = db_session.query(UserProfile).filter(
-            UserProfile.user_id == buddy.user_id
-        ).first()
+        user = users.get(buddy.user_id)
 
         buddy_info = tp_schemas.BuddyInfo(
             buddy_id=buddy.buddy_id,
@@ -549,35 +554,35 @@ def get_trip_by_share_link(
     response_model=List[tp_schemas.CalendarTrip],
     summary="Get calendar view of trips"
 )
-def get_calendar_trips(
+async def get_calendar_trips(
     user_id: uuid.UUID = Query(..., description="User ID"),
     year: int = Query(..., description="Year"),
     month: Optional[int] = Query(None, ge=1, le=12, description="Month (1-12)"),
-    db_session: Session = Depends(db.get_db)
+    db_session: AsyncSession = Depends(db.get_async_db)
 ):
-    """Get trips for calendar view."""
-    trips = trip_planning_service.get_user_trips(
-        db=db_session,
-        user_id=user_id
+    """Get trips overlapping the given year (or month) for calendar view."""
+    trips = await db_session.run_sync(
+        lambda session: trip_planning_service.get_calendar_trips(
+            db=session,
+            user_id=user_id,
+            year=year,
+            month=month
+        )
     )
 
-    # Filter by year/month
-    calendar_trips = []
-    for trip in trips:
-        if trip.start_date.year == year or trip.end_date.year == year:
-            if month is None or trip.start_date.month == month or trip.end_date.month == month:
-                calendar_trips.append(tp_schemas.CalendarTrip(
-                    trip_id=trip.trip_id,
-                    resort_id=trip.resort_id,
-                    title=trip.title,
-                    start_date=trip.start_date,
-                    end_date=trip.end_date,
-                    trip_status=trip.trip_status,
-                    current_buddies=trip.current_buddies,
-                    max_buddies=trip.max_buddies
-                ))
-
-    return calendar_trips
+    return [
+        tp_schemas.CalendarTrip(
+            trip_id=trip.trip_id,
+            resort_id=trip.resort_id,
+            title=trip.title,
+            start_date=trip.start_date,
+            end_date=trip.end_date,
+            trip_status=trip.trip_status,
+            current_buddies=trip.current_buddies,
+            max_buddies=trip.max_buddies
+        )
+        for trip in trips
+    ]
 
 
 @router.get(
@@ -591,30 +596,12 @@ def get_year_overview(
     db_session: Session = Depends(db.get_db)
 ):
     """Get year overview with trip counts per month."""
-    trips = trip_planning_service.get_user_trips(
+    overview = trip_planning_service.get_year_overview(
         db=db_session,
-        user_id=user_id
-    )
-
-    months_count = {}
-    total_trips = 0
-    completed_trips = 0
-
-    for trip in trips:
-        if trip.start_date.year == year or trip.end_date.year == year:
-            total_trips += 1
-            if trip.trip_status == TripStatus.COMPLETED:
-                completed_trips += 1
-
-            month = trip.start_date.month
-            months_count[month] = months_count.get(month, 0) + 1
-
-    return tp_schemas.YearOverview(
-        year=year,
-        months=months_count,
-        total_trips=total_trips,
-        completed_trips=completed_trips
+        user_id=user_id,
+        year=year
     )
+    return tp_schemas.YearOverview(**overview)
 
 
 # ==================== Shared Calendar ====================
@@ -629,51 +616,11 @@ def get_shared_calendar(
     db_session: Session = Depends(db.get_db)
 ):
     """Get shared calendar including own trips and trips joined as buddy."""
-    from models.trip import Trip, TripBuddy
-    from models.enums import BuddyRequestStatus
-    
-    # 自己的行程
-    my_trips = trip_planning_service.get_user_trips(db=db_session, user_id=user_id)
-    
-    # 已加入的雪伴行程 (accepted)
-    buddy_records = db_session.query(TripBuddy).filter(
-        TripBuddy.user_id == user_id,
-        TripBuddy.status == BuddyRequestStatus.ACCEPTED
-    ).all()
-    
-    buddy_trip_ids = [b.trip_id for b in buddy_records]
-    buddy_trips = []
-    if buddy_trip_ids:
-        buddy_trips = db_session.query(Trip).filter(Trip.trip_id.in_(buddy_trip_ids)).all()
-    
-    # 合併並轉換
-    all_trips = []
-    for t in my_trips:
-        all_trips.append(tp_schemas.SharedTrip(
-            trip_id=t.trip_id,
-            title=t.title,
-            start_date=t.start_date,
-            end_date=t.end_date,
-            resort_id=t.resort_id,
-            trip_status=t.trip_status,
-            is_owner=True,
-        ))
-    
-    for t in buddy_trips:
-        all_trips.append(tp_schemas.SharedTrip(
-            trip_id=t.trip_id,
-            title=t.title,
-            start_date=t.start_date,
-            end_date=t.end_date,
-            resort_id=t.resort_id,
-            trip_status=t.trip_status,
-            is_owner=False,
-        ))
-    
-    # 按日期排序
-    all_trips.sort(key=lambda x: x.start_date)
-    
-    return tp_schemas.SharedCalendarResponse(trips=all_trips)
+    trips = trip_planning_service.get_shared_calendar_trips(
+        db=db_session,
+        user_id=user_id
+    )
+    return tp_schemas.SharedCalendarResponse(trips=trips)
 
 
 # ==================== Trip Application Endpoints ====================
@@ -1,3 +1,8 @@
-# Placeholder for audit logging logic
+import logging
+
+_logger = logging.getLogger("user_core.audit")
+
+
 def log_change(user_id: str, entity: str, change: dict):
-    print(f"AUDIT LOG: User {user_id} changed {entity}: {change}")
+    """Record an audit entry (debug level; the change feed row is the durable record)."""
+    _logger.debug("User %s changed %s: %s", user_id, entity, change)
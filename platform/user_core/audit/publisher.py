@@ -1,35 +1,53 @@
+import logging
 import os
 from typing import Any, Dict, Optional
 
 import httpx
 
+logger = logging.getLogger("user_core.changefeed")
+
 # This would be a list of subscriber URLs, loaded from config
 SUBSCRIBER_URL = os.getenv("USER_CORE_CHANGEFEED_URL")
 
 
+class PublishError(Exception):
+    """Raised when a subscriber did not accept a change event."""
+
+
 def publish_change(
     *,
     entity_type: str,
     entity_id: str,
     change_type: str,
     payload: Dict[str, Any],
+    event_id: Optional[str] = None,
     timeout_seconds: float = 5.0,
+    client: Optional[httpx.Client] = None,
 ) -> None:
-    """Publishes a change event to a configured webhook subscriber."""
+    """
+    Publishes a change event to a configured webhook subscriber.
+
+    Delivery is at-least-once; subscribers should deduplicate on `event_id`.
+
+    Raises:
+        PublishError: The subscriber was unreachable or rejected the event
+    """
     if not SUBSCRIBER_URL:
-        print("WARN: No changefeed subscriber URL configured. Skipping publish.")
         return
 
     event_payload = {
+        "event_id": event_id,
         "entity_type": entity_type,
         "entity_id": entity_id,
         "change_type": change_type,
         "payload": payload,
     }
+    headers = {"Idempotency-Key": event_id} if event_id else None
 
+    http = client or httpx  # A shared client reuses connections across a batch
     try:
-        response = httpx.post(SUBSCRIBER_URL, json=event_payload, timeout=timeout_seconds)
+        response = http.post(SUBSCRIBER_URL, json=event_payload, headers=headers, timeout=timeout_seconds)
         response.raise_for_status()
-        print(f"SUCCESS: Published change for {entity_type}:{entity_id} to {SUBSCRIBER_URL}")
-    except httpx.HTTPError as exc:  # pragma: no cover - network failure is logged
-        print(f"ERROR: Failed to publish changefeed event: {exc}")
+    except httpx.HTTPError as exc:
+        raise PublishError(str(exc)) from exc
+    logger.debug("Published change %s for %s:%s", event_id, entity_type, entity_id)
@@ -14,6 +14,22 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./test.db"
+    # Create missing tables at startup (dev only; deployments run migrations)
+    auto_create_schema: bool = False
+    # Async engine URL; derived from database_url (asyncpg / aiosqlite) when empty
+    database_async_url: str = ""
+    # Connection pool (per engine, per worker process; ignored for SQLite)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 10.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 500  # asyncpg prepared statements; 0 behind pgbouncer
+    # Read replicas (comma-separated URLs) for read-only endpoints
+    database_replica_urls: str = ""
+    replica_max_lag_seconds: float = 5.0
+    replica_health_check_interval_seconds: float = 5.0
+    read_your_writes_seconds: float = 5.0  # Caller reads from primary this long after a write
     
     # CORS
     cors_origins: List[str] = [
@@ -32,6 +48,13 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 30
     jwt_fallback_secret: str = ""
+    auth_token_cache_size: int = 10000
+    auth_user_status_ttl_seconds: int = 30
+
+    # Password hashing
+    password_bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 32
 
     # Bot protection
     turnstile_secret: str = ""
@@ -39,6 +62,13 @@ class Settings(BaseSettings):
     
     # Changefeed
     user_core_changefeed_url: str = ""
+    changefeed_dispatcher_enabled: bool = True  # Run the outbox dispatcher in the API process
+    changefeed_dispatch_interval_seconds: float = 2.0
+    changefeed_batch_size: int = 100
+    changefeed_max_attempts: int = 10
+    changefeed_base_backoff_seconds: float = 1.0
+    changefeed_max_backoff_seconds: float = 300.0
+    changefeed_lease_seconds: float = 900.0  # Claimed batch lease; must exceed batch_size × delivery timeout
     
     # API Key
     user_core_api_key: str = ""
@@ -52,6 +82,21 @@ class Settings(BaseSettings):
     course_recommendation_workflow_api_key: str = ""
     gear_reminder_workflow_url: str = ""
     gear_reminder_workflow_api_key: str = ""
+
+    # Admin console
+    admin_stats_max_age_seconds: int = 300
+    admin_search_count_cap: int = 1000
+
+    # Ski map
+    resort_api_url: str = "http://localhost:8000"
+    ski_map_catalog_ttl_seconds: int = 600
+    ski_map_catalog_retry_seconds: int = 30  # Retry delay after a failed catalog fetch
+    ski_map_visited_ttl_seconds: int = 300
+
+    # Share card cache
+    share_card_cache_dir: str = "./.cache/share_cards"
+    share_card_cache_max_bytes: int = 512 * 1024 * 1024
+    share_card_cache_max_age_seconds: int = 86400
     
     class Config:
         env_file = ".env"
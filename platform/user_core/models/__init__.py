@@ -9,6 +9,10 @@ from .trip_planning import Season, Trip, TripBuddy, TripShare
 from .ski_preference import SkiPreference
 from .gear import GearItem, GearInspection, GearReminder
 from .calendar import CalendarEvent
+from .admin_stats import UserStatsRollup
+from .change_feed import ChangeFeed
+from .buddy_matching import CASISkillProfile, CASISkillAccumulator, MatchSearchCache
+from .snowbuddy import SnowbuddyMatchRequest, SnowbuddyTripApplication
 from .enums import (
     UserStatus, NotificationStatus, LocaleVerificationStatus, NotificationFrequency,
     TripFlexibility, FlightStatus, AccommodationStatus, TripStatus,
@@ -40,6 +44,13 @@ __all__ = [
     'GearInspection',
     'GearReminder',
     'CalendarEvent',
+    'UserStatsRollup',
+    'ChangeFeed',
+    'CASISkillProfile',
+    'CASISkillAccumulator',
+    'MatchSearchCache',
+    'SnowbuddyMatchRequest',
+    'SnowbuddyTripApplication',
     'UserStatus',
     'NotificationStatus',
     'LocaleVerificationStatus',
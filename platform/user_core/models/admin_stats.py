@@ -0,0 +1,28 @@
+"""
+Admin statistics rollup.
+
+A single precomputed row of user counts so the admin dashboard reads one
+small table instead of scanning `user_profiles` on every page load.
+"""
+from sqlalchemy import Column, Integer, DateTime, JSON
+from datetime import datetime, UTC
+
+from .user_profile import Base
+
+
+class UserStatsRollup(Base):
+    """Periodically refreshed user statistics (one row, id=1)."""
+    __tablename__ = 'user_stats_rollup'
+
+    id = Column(Integer, primary_key=True, default=1)
+    total_users = Column(Integer, nullable=False, default=0)
+    active_users = Column(Integer, nullable=False, default=0)
+    inactive_users = Column(Integer, nullable=False, default=0)
+    new_users_last_7_days = Column(Integer, nullable=False, default=0)
+    new_users_last_30_days = Column(Integer, nullable=False, default=0)
+    admin_users = Column(Integer, nullable=False, default=0)
+    users_by_experience_level = Column(JSON, nullable=False, default=dict)
+    computed_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
+
+    def __repr__(self):
+        return f"<UserStatsRollup(total_users={self.total_users}, computed_at={self.computed_at})>"
@@ -2,7 +2,7 @@
 Buddy matching models for CASI skill profiles and match search cache.
 """
 from sqlalchemy import (
-    Column, String, DateTime, JSON, Float, Text,
+    Column, String, DateTime, JSON, Float, Text, Integer,
     CheckConstraint, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
@@ -64,6 +64,35 @@ class CASISkillProfile(Base):
         return f"<CASISkillProfile(user_id={self.user_id})>"
 
 
+class CASISkillAccumulator(Base):
+    """
+    Exponentially decayed per-skill accumulators backing CASISkillProfile.
+    Lets the profile be updated incrementally, one practice event at a time.
+    """
+    __tablename__ = 'casi_skill_accumulators'
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey('user_profiles.user_id'),
+                    primary_key=True)
+
+    # {skill: decayed sum of rating * lesson weight}
+    skill_sums = Column(JSON, nullable=False, default=dict)
+    # {skill: decayed number of observations}
+    skill_counts = Column(JSON, nullable=False, default=dict)
+
+    # Decay reference point: every stored value is expressed relative to this time
+    last_event_at = Column(DateTime, nullable=True)
+    events_applied = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=lambda: datetime.now(UTC),
+                       onupdate=lambda: datetime.now(UTC), nullable=False)
+
+    # Relationships
+    user = relationship("UserProfile", backref="casi_skill_accumulator")
+
+    def __repr__(self):
+        return f"<CASISkillAccumulator(user_id={self.user_id}, events={self.events_applied})>"
+
+
 class MatchSearchCache(Base):
     """
     Caches buddy matching search results to improve performance.
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, JSON, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, String, DateTime, Integer, JSON, Index, Enum as SQLAlchemyEnum
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, UTC
@@ -6,6 +6,12 @@ from datetime import datetime, UTC
 from .user_profile import Base
 
 class ChangeFeed(Base):
+    """
+    Change events, written in the same transaction as the entity change.
+
+    The table doubles as a transactional outbox: rows start as `pending` and
+    the outbox dispatcher delivers them to subscribers asynchronously.
+    """
     __tablename__ = 'change_feed'
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -14,3 +20,14 @@ class ChangeFeed(Base):
     change_type = Column(String, nullable=False)
     payload = Column(JSON)
     published_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
+
+    # Outbox delivery state
+    delivery_status = Column(String(20), default='pending', server_default='pending', nullable=False)  # pending / delivered / failed
+    attempts = Column(Integer, default=0, server_default='0', nullable=False)
+    next_attempt_at = Column(DateTime, nullable=True)
+    delivered_at = Column(DateTime, nullable=True)
+    last_error = Column(String(500), nullable=True)
+
+    __table_args__ = (
+        Index('idx_change_feed_outbox', 'delivery_status', 'published_at'),
+    )
@@ -0,0 +1,57 @@
+"""
+Snowbuddy request-state projections.
+
+Materialized from `snowbuddy.*` behavior events as they are ingested, so the
+current state of a match request or trip application is a primary-key read
+instead of a scan over event payloads.
+"""
+from sqlalchemy import Column, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime, UTC
+
+from .user_profile import Base
+
+
+class SnowbuddyMatchRequest(Base):
+    """Current state of a buddy match request (requester → target)."""
+    __tablename__ = 'snowbuddy_match_requests'
+
+    request_id = Column(String(64), primary_key=True)
+    requester_id = Column(UUID(as_uuid=True), nullable=True)
+    target_user_id = Column(UUID(as_uuid=True), nullable=True)
+    status = Column(String(20), default='pending', nullable=False)  # pending / accepted / declined
+    responded_by = Column(UUID(as_uuid=True), nullable=True)
+
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
+    # occurred_at of the last applied event; older events are ignored on replay
+    updated_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
+
+    __table_args__ = (
+        Index('idx_snowbuddy_match_requester', 'requester_id', 'status'),
+        Index('idx_snowbuddy_match_target', 'target_user_id', 'status'),
+    )
+
+    def __repr__(self):
+        return f"<SnowbuddyMatchRequest(request_id={self.request_id}, status={self.status})>"
+
+
+class SnowbuddyTripApplication(Base):
+    """Current state of an application to join a trip."""
+    __tablename__ = 'snowbuddy_trip_applications'
+
+    request_id = Column(String(64), primary_key=True)
+    trip_id = Column(String(64), nullable=False)
+    applicant_id = Column(UUID(as_uuid=True), nullable=True)
+    status = Column(String(20), default='pending', nullable=False)  # pending / accepted / declined / left
+    responded_by = Column(UUID(as_uuid=True), nullable=True)
+
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
+
+    __table_args__ = (
+        Index('idx_snowbuddy_trip_app_trip_status', 'trip_id', 'status'),
+        Index('idx_snowbuddy_trip_app_trip_applicant', 'trip_id', 'applicant_id'),
+    )
+
+    def __repr__(self):
+        return f"<SnowbuddyTripApplication(request_id={self.request_id}, trip_id={self.trip_id}, status={self.status})>"
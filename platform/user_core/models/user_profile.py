@@ -1,5 +1,6 @@
 from sqlalchemy import (
-    create_engine, Column, Integer, String, DateTime, JSON, Enum as SQLAlchemyEnum, ForeignKey, Index
+    create_engine, Column, Integer, String, DateTime, JSON, Enum as SQLAlchemyEnum, ForeignKey, Index,
+    DDL, event
 )
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -37,17 +38,42 @@ class UserProfile(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
     updated_at = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC), nullable=False)
     status = Column(SQLAlchemyEnum(UserStatus, native_enum=False), default=UserStatus.active, nullable=False)
+    # Lower-cased "email display_name", maintained on write for admin search
+    search_text = Column(String(400), nullable=True)
 
     locale_profiles = relationship("UserLocaleProfile", cascade="all, delete-orphan", back_populates="user")
 
     __table_args__ = (
         Index('idx_users_skill_level', 'skill_level'),
+        Index(
+            'idx_users_search_text_trgm', 'search_text',
+            postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'}
+        ),
     )
 
     def __repr__(self):
         return f"<UserProfile(user_id={self.user_id}, status={self.status})>"
 
 
+def build_search_text(email, display_name) -> str:
+    """Normalized text searched by the admin console."""
+    return " ".join(part.strip().lower() for part in (email, display_name) if part)
+
+
+@event.listens_for(UserProfile, "before_insert")
+@event.listens_for(UserProfile, "before_update")
+def _sync_search_text(mapper, connection, target):
+    target.search_text = build_search_text(target.email, target.display_name)
+
+
+# The trigram index needs pg_trgm; other dialects get a plain index
+event.listen(
+    UserProfile.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class UserLocaleProfile(Base):
     __tablename__ = 'user_locale_profiles'
 
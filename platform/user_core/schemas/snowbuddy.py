@@ -0,0 +1,39 @@
+"""
+Schemas for snowbuddy request-state projections.
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+
+class MatchRequestState(BaseModel):
+    """媒合請求目前狀態"""
+    model_config = {"from_attributes": True}
+
+    request_id: str
+    requester_id: Optional[uuid.UUID] = None
+    target_user_id: Optional[uuid.UUID] = None
+    status: str
+    responded_by: Optional[uuid.UUID] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class TripApplicationState(BaseModel):
+    """行程申請目前狀態"""
+    model_config = {"from_attributes": True}
+
+    request_id: str
+    trip_id: str
+    applicant_id: Optional[uuid.UUID] = None
+    status: str
+    responded_by: Optional[uuid.UUID] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class TripParticipants(BaseModel):
+    """行程已接受的申請者"""
+    trip_id: str
+    participants: List[TripApplicationState]
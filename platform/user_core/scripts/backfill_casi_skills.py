@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+重建 CASI 技能累加器
+
+重播 behavior_events 中的歷史練習事件（分批讀取），
+重建 casi_skill_accumulators 與 casi_skill_profiles。
+加上 --check 時，會在重建後與完整重算結果比對。
+"""
+import argparse
+import sys
+import uuid
+from pathlib import Path
+
+# 添加父目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import db
+from services.casi_skill_updater import CASISkillUpdater, DEFAULT_BACKFILL_CHUNK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill CASI skill accumulators")
+    parser.add_argument("--user-id", type=uuid.UUID, help="只重建單一使用者")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_BACKFILL_CHUNK_SIZE)
+    parser.add_argument("--check", action="store_true", help="重建後執行一致性檢查")
+    args = parser.parse_args()
+
+    session = db.SessionLocal()
+    updater = CASISkillUpdater()
+    try:
+        if args.user_id:
+            updater.backfill_user(session, args.user_id, chunk_size=args.chunk_size)
+            user_ids = [args.user_id]
+        else:
+            count = updater.backfill_all(session, chunk_size=args.chunk_size)
+            print(f"✅ 已重建 {count} 位使用者的 CASI 技能累加器")
+            from models.buddy_matching import CASISkillAccumulator
+            user_ids = [row.user_id for row in session.query(CASISkillAccumulator.user_id)]
+
+        if args.check:
+            failures = 0
+            for user_id in user_ids:
+                report = updater.check_consistency(session, user_id)
+                if not report.consistent:
+                    failures += 1
+                    print(f"❌ {user_id}: 差異 {report.max_abs_diff:.6f}")
+            print(f"🔍 一致性檢查完成：{len(user_ids) - failures}/{len(user_ids)} 通過")
+            if failures:
+                sys.exit(1)
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+重建 Snowbuddy 請求狀態投影
+
+從 behavior_events 重播所有 snowbuddy.* 事件，填入
+snowbuddy_match_requests 與 snowbuddy_trip_applications。
+投影上線前的舊事件需執行一次；重複執行結果相同。
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# 添加父目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import db
+from services.snowbuddy_projection_service import rebuild
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild snowbuddy request-state projections")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    session = db.SessionLocal()
+    try:
+        count = rebuild(session, batch_size=args.batch_size)
+        print(f"✅ 已重播 {count} 筆 snowbuddy 事件")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
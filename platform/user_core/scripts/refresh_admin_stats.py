@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+重新計算管理後台統計 rollup
+
+建議以排程（cron）定期執行，讓 /admin/statistics 只需讀取 user_stats_rollup。
+加上 --backfill-search 時，會先為舊資料補上 search_text。
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# 添加父目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import db
+from services.admin_stats_service import refresh_user_statistics
+from models.user_profile import UserProfile, build_search_text
+
+
+def backfill_search_text(session, chunk_size: int) -> int:
+    """為 search_text 為空的用戶補上正規化搜尋欄位"""
+    updated = 0
+    while True:
+        users = (
+            session.query(UserProfile)
+            .filter(UserProfile.search_text.is_(None))
+            .limit(chunk_size)
+            .all()
+        )
+        if not users:
+            return updated
+        for user in users:
+            user.search_text = build_search_text(user.email, user.display_name)
+        session.commit()
+        updated += len(users)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh admin statistics rollup")
+    parser.add_argument("--backfill-search", action="store_true", help="補上舊資料的 search_text")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    session = db.SessionLocal()
+    try:
+        if args.backfill_search:
+            count = backfill_search_text(session, args.chunk_size)
+            print(f"✅ 已補上 {count} 位用戶的 search_text")
+
+        rollup = refresh_user_statistics(session)
+        print(f"✅ 統計已更新：{rollup.total_users} 位用戶（{rollup.computed_at.isoformat()}）")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
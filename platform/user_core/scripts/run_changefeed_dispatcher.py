@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Change feed outbox 派送程序
+
+以獨立程序派送 change_feed 中尚未送達的事件（API 程序內的派送器可用
+CHANGEFEED_DISPATCHER_ENABLED=false 關閉）。加上 --once 時只清空目前的積壓後結束。
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加父目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services import db
+from services.change_feed_outbox import OutboxDispatcher
+
+
+def drain(dispatcher: OutboxDispatcher) -> int:
+    """派送直到沒有可立即送出的事件，回傳送達數量"""
+    delivered = 0
+    while True:
+        result = dispatcher.dispatch_batch()
+        delivered += result.delivered
+        if result.processed < dispatcher.batch_size:
+            return delivered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dispatch pending change feed events")
+    parser.add_argument("--once", action="store_true", help="清空積壓後結束")
+    parser.add_argument("--batch-size", type=int, default=settings.changefeed_batch_size)
+    parser.add_argument("--interval", type=float, default=settings.changefeed_dispatch_interval_seconds)
+    args = parser.parse_args()
+
+    dispatcher = OutboxDispatcher(db.SessionLocal, batch_size=args.batch_size)
+
+    if args.once:
+        print(f"✅ 已派送 {drain(dispatcher)} 筆事件")
+        return
+
+    print(f"🚚 Change feed 派送中（每 {args.interval}s 檢查一次）")
+    try:
+        while True:
+            drain(dispatcher)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from services import db
-from models import user_profile, behavior_event, notification_preference, course_tracking, social
+import models
 
 
 def run_migrations():
@@ -20,32 +20,13 @@ def run_migrations():
     print("🔧 開始創建數據庫表...")
 
     try:
-        # 創建所有表
-        print("   📊 創建 user_profiles 相關表...")
-        user_profile.Base.metadata.create_all(bind=db.engine)
-
-        print("   📊 創建 behavior_events 表...")
-        behavior_event.Base.metadata.create_all(bind=db.engine)
-
-        print("   📊 創建 notification_preferences 表...")
-        notification_preference.Base.metadata.create_all(bind=db.engine)
-
-        print("   📊 創建 course_tracking 相關表...")
-        course_tracking.Base.metadata.create_all(bind=db.engine)
-
-        print("   📊 創建 social 相關表...")
-        social.Base.metadata.create_all(bind=db.engine)
+        # 所有模型共用同一個 Base，一次建立全部表
+        models.Base.metadata.create_all(bind=db.engine)
 
         print("\n✅ 所有表創建成功！")
         print("\n創建的表包括：")
-        print("   - user_profiles (已更新：添加 display_name, avatar_url, default_post_visibility)")
-        print("   - user_follows (新增)")
-        print("   - activity_feed_items (新增)")
-        print("   - activity_likes (新增)")
-        print("   - activity_comments (新增)")
-        print("   - course_visits")
-        print("   - user_achievements")
-        print("   - 其他現有表...")
+        for table_name in sorted(models.Base.metadata.tables):
+            print(f"   - {table_name}")
 
     except Exception as e:
         print(f"\n❌ 錯誤：{e}")
@@ -9,51 +9,45 @@ from sqlalchemy.orm import Session
 from models.course_tracking import (
     CourseVisit, CourseRecommendation, UserAchievement, AchievementDefinition
 )
+from utils.query_utils import dialect_insert
 
 
 def load_definitions(db: Session, yaml_path: str) -> int:
-    """Load achievement definitions from YAML file."""
+    """Load achievement definitions from YAML file with one bulk upsert."""
     import yaml
-    
+
     with open(yaml_path, 'r', encoding='utf-8') as f:
         definitions = yaml.safe_load(f)
-    
-    count = 0
-    for defn in definitions:
-        existing = db.query(AchievementDefinition).filter(
-            AchievementDefinition.achievement_type == defn['achievement_type']
-        ).first()
-        
-        if existing:
-            existing.name_zh = defn['name_zh']
-            existing.name_en = defn['name_en']
-            existing.description_zh = defn.get('description_zh')
-            existing.description_en = defn.get('description_en')
-            existing.icon = defn['icon']
-            existing.category = defn['category']
-            existing.points = defn['points']
-            existing.requirements = defn['requirements']
-            existing.is_hidden = defn.get('is_hidden', False)
-            existing.display_order = defn.get('display_order', 0)
-        else:
-            new_defn = AchievementDefinition(
-                achievement_type=defn['achievement_type'],
-                name_zh=defn['name_zh'],
-                name_en=defn['name_en'],
-                description_zh=defn.get('description_zh'),
-                description_en=defn.get('description_en'),
-                icon=defn['icon'],
-                category=defn['category'],
-                points=defn['points'],
-                requirements=defn['requirements'],
-                is_hidden=defn.get('is_hidden', False),
-                display_order=defn.get('display_order', 0)
-            )
-            db.add(new_defn)
-        count += 1
-    
+
+    if not definitions:
+        return 0
+
+    rows = [
+        {
+            "achievement_type": defn['achievement_type'],
+            "name_zh": defn['name_zh'],
+            "name_en": defn['name_en'],
+            "description_zh": defn.get('description_zh'),
+            "description_en": defn.get('description_en'),
+            "icon": defn['icon'],
+            "category": defn['category'],
+            "points": defn['points'],
+            "requirements": defn['requirements'],
+            "is_hidden": defn.get('is_hidden', False),
+            "display_order": defn.get('display_order', 0),
+        }
+        for defn in definitions
+    ]
+
+    stmt = dialect_insert(db, AchievementDefinition).values(rows)
+    updatable = [key for key in rows[0] if key != "achievement_type"]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["achievement_type"],
+        set_={key: stmt.excluded[key] for key in updatable},
+    )
+    db.execute(stmt)
     db.commit()
-    return count
+    return len(rows)
 
 
 def check_and_award(db: Session, user_id: uuid.UUID) -> List[UserAchievement]:
@@ -0,0 +1,166 @@
+"""
+Admin statistics and search helpers.
+
+User statistics are computed with one conditional-aggregate query grouped by
+experience level and stored in `user_stats_rollup`; the dashboard reads the
+rollup and only recomputes it once it is older than
+`settings.admin_stats_max_age_seconds` (or when the refresh script runs).
+
+Admin search matches the normalized `search_text` column (trigram-indexed on
+PostgreSQL) and counts matches only up to a cap, falling back to the
+planner's row estimate for very large result sets.
+"""
+from datetime import datetime, UTC, timedelta
+from typing import Dict, Optional, Tuple
+import json
+import logging
+
+from sqlalchemy import String, cast, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from config.settings import settings
+from models.admin_stats import UserStatsRollup
+from models.enums import UserStatus
+from models.user_profile import UserProfile, build_search_text
+
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_ID = 1
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    # DateTime columns are stored without tzinfo
+    return dt.replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def compute_user_statistics(db: Session) -> Dict:
+    """Compute all dashboard counts in a single query."""
+    now = _naive_utc(datetime.now(UTC))
+    seven_days_ago = now - timedelta(days=7)
+    thirty_days_ago = now - timedelta(days=30)
+    is_admin = cast(UserProfile.roles, String).like('%"admin"%')
+
+    rows = db.execute(
+        select(
+            UserProfile.experience_level,
+            func.count().label("total"),
+            func.count().filter(UserProfile.status == UserStatus.active).label("active"),
+            func.count().filter(UserProfile.status == UserStatus.inactive).label("inactive"),
+            func.count().filter(UserProfile.created_at >= seven_days_ago).label("new_7d"),
+            func.count().filter(UserProfile.created_at >= thirty_days_ago).label("new_30d"),
+            func.count().filter(is_admin).label("admins"),
+        ).group_by(UserProfile.experience_level)
+    ).all()
+
+    users_by_experience: Dict[str, int] = {}
+    for row in rows:
+        level = row.experience_level or "unknown"
+        users_by_experience[level] = users_by_experience.get(level, 0) + row.total
+
+    return {
+        "total_users": sum(row.total for row in rows),
+        "active_users": sum(row.active for row in rows),
+        "inactive_users": sum(row.inactive for row in rows),
+        "new_users_last_7_days": sum(row.new_7d for row in rows),
+        "new_users_last_30_days": sum(row.new_30d for row in rows),
+        "admin_users": sum(row.admins for row in rows),
+        "users_by_experience_level": users_by_experience,
+    }
+
+
+def refresh_user_statistics(db: Session) -> UserStatsRollup:
+    """Recompute the statistics rollup and commit it."""
+    stats = compute_user_statistics(db)
+    rollup = db.get(UserStatsRollup, ROLLUP_ID)
+    if rollup is None:
+        rollup = UserStatsRollup(id=ROLLUP_ID)
+        db.add(rollup)
+    for field, value in stats.items():
+        setattr(rollup, field, value)
+    rollup.computed_at = _naive_utc(datetime.now(UTC))
+    db.commit()
+    db.refresh(rollup)
+    return rollup
+
+
+def get_user_statistics(
+    db: Session,
+    max_age_seconds: Optional[int] = None,
+    write_db: Optional[Session] = None,
+) -> UserStatsRollup:
+    """
+    Read the statistics rollup, refreshing it when missing or stale.
+
+    `db` may be a read-replica session; the refresh then runs on `write_db`.
+    """
+    if max_age_seconds is None:
+        max_age_seconds = settings.admin_stats_max_age_seconds
+
+    rollup = db.get(UserStatsRollup, ROLLUP_ID)
+    if rollup is not None:
+        age = _naive_utc(datetime.now(UTC)) - _naive_utc(rollup.computed_at)
+        if age.total_seconds() <= max_age_seconds:
+            return rollup
+    return refresh_user_statistics(write_db or db)
+
+
+def apply_search(query: Query, search: str) -> Query:
+    """Filter users whose email or display name contains `search`."""
+    needle = build_search_text(search, None)
+    escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return query.filter(UserProfile.search_text.like(f"%{escaped}%", escape="\\"))
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` of a statement, compiled with its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _planner_estimate(db: Session, query: Query) -> Optional[int]:
+    """PostgreSQL planner row estimate for a query (None elsewhere)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    # A savepoint keeps a failed EXPLAIN from aborting the caller's transaction
+    with db.begin_nested():
+        plan = db.execute(Explain(query.statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_users(db: Session, query: Query, cap: Optional[int] = None) -> Tuple[int, bool]:
+    """
+    Count rows matched by an admin user query.
+
+    Counts exactly up to `cap`; beyond that returns an estimate.
+
+    Returns:
+        (count, is_estimate)
+    """
+    if cap is None:
+        cap = settings.admin_search_count_cap
+
+    capped = db.query(func.count()).select_from(
+        query.order_by(None).limit(cap + 1).subquery()
+    ).scalar() or 0
+    if capped <= cap:
+        return capped, False
+
+    try:
+        estimate = _planner_estimate(db, query.order_by(None))
+    except Exception as exc:
+        logger.warning(f"Planner estimate failed: {exc}")
+        estimate = None
+    return max(estimate or 0, capped), True
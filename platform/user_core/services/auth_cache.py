@@ -0,0 +1,118 @@
+"""
+In-process caches for the authentication fast path.
+
+- `TokenCache`: bounded LRU of verified token digests → (user_id, exp), so a
+  token's signature is checked once rather than on every request.
+- `UserStatusCache`: short-TTL user_id → status map, so confirming that the
+  caller still exists and is active does not cost a query per request.
+
+Status entries are dropped as soon as a `user_profile` change event is
+published (deactivate/merge/update); the TTL bounds staleness for changes
+made by other worker processes.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+import uuid
+
+from config.settings import settings
+
+
+def token_digest(token: str) -> str:
+    """Cache key for a token; raw tokens are never kept in memory."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """Bounded LRU of verified tokens."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[uuid.UUID, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[uuid.UUID]:
+        """Return the user ID for a previously verified, unexpired token."""
+        key = token_digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user_id, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user_id
+
+    def put(self, token: str, user_id: uuid.UUID, expires_at: float) -> None:
+        if self.maxsize <= 0:
+            return
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (user_id, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class UserStatusCache:
+    """Short-TTL cache of user status (None = user does not exist)."""
+
+    def __init__(self, ttl_seconds: float, maxsize: int):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[uuid.UUID, Tuple[Optional[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: uuid.UUID) -> Tuple[bool, Optional[str]]:
+        """Return (hit, status) for a user."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return False, None
+            user_status, cached_at = entry
+            if time.monotonic() - cached_at > self.ttl_seconds:
+                del self._entries[user_id]
+                return False, None
+            return True, user_status
+
+    def put(self, user_id: uuid.UUID, user_status: Optional[str]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (user_status, time.monotonic())
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(maxsize=settings.auth_token_cache_size)
+user_status_cache = UserStatusCache(
+    ttl_seconds=settings.auth_user_status_ttl_seconds,
+    maxsize=settings.auth_token_cache_size,
+)
+
+
+def invalidate_user(user_id) -> None:
+    """Drop cached status for a user (called when their profile changes)."""
+    if isinstance(user_id, str):
+        try:
+            user_id = uuid.UUID(user_id)
+        except ValueError:
+            return
+    user_status_cache.invalidate(user_id)
@@ -4,14 +4,75 @@ Authentication Dependencies
 """
 from fastapi import Header, HTTPException, status, Depends
 from sqlalchemy.orm import Session
-from typing import Dict
+from typing import Optional
+import uuid
 
 from services.auth_service import verify_token
+from services.auth_cache import user_status_cache
 
 from services import db
+from models.enums import UserStatus
 from models.user_profile import UserProfile
 
 
+def _token_from_header(authorization: str) -> str:
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authorization header format"
+        )
+    return authorization.replace("Bearer ", "")
+
+
+def _load_user_status(user_id: uuid.UUID) -> Optional[str]:
+    """Read only the status column; opens a session just for cache misses."""
+    session = db.SessionLocal()
+    try:
+        return session.query(UserProfile.status).filter(
+            UserProfile.user_id == user_id
+        ).scalar()
+    finally:
+        session.close()
+
+
+def _status_value(user_status) -> Optional[str]:
+    return user_status.value if isinstance(user_status, UserStatus) else user_status
+
+
+def get_current_user_id(authorization: str = Header(...)) -> uuid.UUID:
+    """
+    從 Authorization header 獲取當前用戶 ID（不查詢資料庫）
+
+    Tokens and user status are served from in-process caches; the database is
+    only read when a user's status is not cached.
+
+    Raises:
+        401: 無效的 token、用戶不存在或已停用
+    """
+    token = _token_from_header(authorization)
+
+    try:
+        user_id = verify_token(token)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+
+    hit, user_status = user_status_cache.get(user_id)
+    if not hit:
+        user_status = _status_value(_load_user_status(user_id))
+        user_status_cache.put(user_id, user_status)
+
+    if user_status != UserStatus.active.value:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+
+    return user_id
+
+
 async def get_current_user(
     authorization: str = Header(...),
     db_session: Session = Depends(db.get_db)
@@ -29,13 +90,7 @@ async def get_current_user(
     Raises:
         401: 無效的 token 或用戶不存在
     """
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authorization header format"
-        )
-
-    token = authorization.replace("Bearer ", "")
+    token = _token_from_header(authorization)
 
     try:
         user_id = verify_token(token)
@@ -45,12 +100,13 @@ async def get_current_user(
             UserProfile.user_id == user_id
         ).first()
 
-        if not user:
+        if not user or _status_value(user.status) != UserStatus.active.value:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found"
             )
 
+        user_status_cache.put(user_id, _status_value(user.status))
         return user
 
     except Exception:
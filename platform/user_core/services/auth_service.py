@@ -10,6 +10,7 @@ import os
 from jose import JWTError, jwt
 
 from config.settings import settings
+from services.auth_cache import token_cache
 
 
 class AuthenticationError(Exception):
@@ -34,6 +35,10 @@ def create_access_token(user_id: uuid.UUID, expires_delta: Optional[timedelta] =
 
 def verify_token(token: str) -> uuid.UUID:
     """Verify and decode JWT token with optional fallback secret for rotation."""
+    cached_user_id = token_cache.get(token)
+    if cached_user_id is not None:
+        return cached_user_id
+
     secrets_to_try = [settings.jwt_secret_key]
     if settings.jwt_fallback_secret:
         secrets_to_try.append(settings.jwt_fallback_secret)
@@ -52,7 +57,10 @@ def verify_token(token: str) -> uuid.UUID:
             user_id_str: str = payload.get("sub")
             if not user_id_str:
                 raise AuthenticationError("Invalid token payload")
-            return uuid.UUID(user_id_str)
+            user_id = uuid.UUID(user_id_str)
+            if payload.get("exp"):
+                token_cache.put(token, user_id, float(payload["exp"]))
+            return user_id
         except Exception as exc:
             last_error = exc
             continue
@@ -5,12 +5,11 @@ from time import perf_counter
 import uuid
 from typing import List, Optional, Sequence
 
-from jsonschema import Draft202012Validator, FormatChecker, ValidationError
 from sqlalchemy.orm import Session
 
 from models import behavior_event as behavior_event_model
 from schemas import behavior_event as behavior_event_schema
-from services import event_schema_registry
+from services import event_schema_registry, snowbuddy_projection_service
 from telemetry import metrics
 
 
@@ -40,6 +39,9 @@ def _validate_core_event(event: behavior_event_schema.BehaviorEventCreate):
     if not schema:
         return
 
+    # jsonschema is only needed for events with a registered schema
+    from jsonschema import Draft202012Validator, FormatChecker, ValidationError
+
     validator = Draft202012Validator(schema, format_checker=FormatChecker())
     try:
         validator.validate(event.payload)
@@ -70,6 +72,9 @@ def create_event(
 
     db_event = behavior_event_model.BehaviorEvent(**event_payload)
     db.add(db_event)
+    if snowbuddy_projection_service.handles(db_event.event_type):
+        # Projections commit together with the event
+        snowbuddy_projection_service.apply_event(db, db_event)
     db.commit()
     db.refresh(db_event)
     metrics.record_timing(
@@ -7,7 +7,7 @@ to infer their proficiency in the five CASI core skills.
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from datetime import datetime, timedelta, UTC
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 import uuid
 import logging
 from collections import defaultdict
@@ -17,12 +17,28 @@ from models.buddy_matching import CASISkillProfile
 from models.user_profile import UserProfile
 from schemas.buddy_matching import CASISkillProfile as CASISkillProfileSchema
 from schemas.behavior_event import BehaviorEvent
-from services.user_core_client import UserCoreClient
+
+if TYPE_CHECKING:
+    from services.user_core_client import UserCoreClient
 
 
 logger = logging.getLogger(__name__)
 
 
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes (as stored by the DB) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+def decay_factor(elapsed_seconds: float, half_life_days: Optional[float]) -> float:
+    """Exponential decay weight for an observation `elapsed_seconds` old."""
+    if not half_life_days or elapsed_seconds <= 0:
+        return 1.0
+    return 0.5 ** (elapsed_seconds / (half_life_days * 86400))
+
+
 class CASISkillAnalyzer:
     """CASI 技能分析器
     
@@ -96,7 +112,7 @@ class CASISkillAnalyzer:
         }
     }
     
-    def __init__(self, user_core_client: Optional[UserCoreClient] = None):
+    def __init__(self, user_core_client: Optional["UserCoreClient"] = None):
         """
         Initialize the CASI Skill Analyzer.
         
@@ -104,7 +120,11 @@ class CASISkillAnalyzer:
             user_core_client: Optional UserCoreClient for fetching events.
                             If not provided, will create a new one.
         """
-        self.user_core_client = user_core_client or UserCoreClient()
+        if user_core_client is None:
+            # Deferred: pulls in httpx/tenacity, unused by the incremental updater
+            from services.user_core_client import UserCoreClient
+            user_core_client = UserCoreClient()
+        self.user_core_client = user_core_client
     
     def get_skill_profile(
         self,
@@ -199,12 +219,39 @@ class CASISkillAnalyzer:
         # Compute skill mastery from events
         skill_scores = self._compute_skill_scores_from_events(practice_events)
         
+        profile = self.save_skill_scores(db, user_id, skill_scores, existing_profile)
+        
+        logger.info(f"Updated CASI profile for user {user_id}: {skill_scores}")
+        
+        return CASISkillProfileSchema.model_validate(profile)
+    
+    def save_skill_scores(
+        self,
+        db: Session,
+        user_id: uuid.UUID,
+        skill_scores: Dict[str, float],
+        existing_profile: Optional[CASISkillProfile] = None
+    ) -> CASISkillProfile:
+        """寫入技能分數並同步 user_profiles.skill_level
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            skill_scores: Dict mapping skill name to score
+            existing_profile: Already loaded profile row, if any
+            
+        Returns:
+            Persisted CASISkillProfile row
+        """
         # Ensure all scores are in valid range [0.0, 1.0]
         skill_scores = {
-            skill: max(0.0, min(1.0, score))
-            for skill, score in skill_scores.items()
+            skill: max(0.0, min(1.0, skill_scores.get(skill, 0.0)))
+            for skill in self.CASI_SKILLS
         }
         
+        if existing_profile is None:
+            existing_profile = db.get(CASISkillProfile, user_id)
+        
         # Update or create profile in database
         if existing_profile:
             # Update existing profile
@@ -228,9 +275,6 @@ class CASISkillAnalyzer:
             )
             db.add(profile)
         
-        db.commit()
-        db.refresh(profile)
-        
         # 同步更新 user_profiles.skill_level (1-10)
         # 計算平均技能分數並轉換為 1-10 等級
         avg_skill = sum(skill_scores.values()) / len(skill_scores)
@@ -239,12 +283,12 @@ class CASISkillAnalyzer:
         user_profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
         if user_profile:
             user_profile.skill_level = skill_level_1_10
-            db.commit()
             logger.debug(f"Updated user_profiles.skill_level to {skill_level_1_10} for user {user_id}")
         
-        logger.info(f"Updated CASI profile for user {user_id}: {skill_scores}")
+        db.commit()
+        db.refresh(profile)
         
-        return CASISkillProfileSchema.model_validate(profile)
+        return profile
     
     def calculate_skill_similarity(
         self,
@@ -304,7 +348,8 @@ class CASISkillAnalyzer:
     
     def _compute_skill_scores_from_events(
         self,
-        events: List[BehaviorEvent]
+        events: List[BehaviorEvent],
+        half_life_days: Optional[float] = None
     ) -> Dict[str, float]:
         """從事件計算技能分數
         
@@ -318,34 +363,35 @@ class CASISkillAnalyzer:
         
         Args:
             events: List of practice events
+            half_life_days: If set, older events are down-weighted exponentially
+                            relative to the newest event (same decay as the
+                            incremental updater)
             
         Returns:
             Dict mapping skill name to mastery score (0.0-1.0)
         """
         # Initialize skill accumulators
         skill_weights = defaultdict(float)
-        skill_counts = defaultdict(int)
+        skill_counts = defaultdict(float)
+        
+        reference_time = None
+        if half_life_days and events:
+            reference_time = max(as_utc(event.occurred_at) for event in events)
         
         for event in events:
-            # Extract lesson ID from event payload
-            lesson_id = event.payload.get("lesson_id") or event.payload.get("drill_id")
-            if not lesson_id:
+            contribution = self._extract_skill_contribution(event.payload)
+            if not contribution:
                 continue
             
-            # Extract rating/score if available (0-5 scale typically)
-            rating = event.payload.get("rating", 3.0)  # Default to 3.0 if not provided
-            rating = float(rating)
-            
-            # Normalize rating to 0.0-1.0 scale
-            normalized_rating = min(1.0, max(0.0, rating / 5.0))
-            
-            # Get skill mapping for this lesson
-            skill_mapping = self._get_lesson_skill_mapping(lesson_id)
+            decay = 1.0
+            if reference_time is not None:
+                elapsed = (reference_time - as_utc(event.occurred_at)).total_seconds()
+                decay = decay_factor(elapsed, half_life_days)
             
             # Accumulate weighted scores
-            for skill, weight in skill_mapping.items():
-                skill_weights[skill] += normalized_rating * weight
-                skill_counts[skill] += 1
+            for skill, value in contribution.items():
+                skill_weights[skill] += value * decay
+                skill_counts[skill] += decay
         
         # Compute average scores for each skill
         skill_scores = {}
@@ -360,6 +406,36 @@ class CASISkillAnalyzer:
         
         return skill_scores
     
+    def _extract_skill_contribution(self, payload: Dict) -> Optional[Dict[str, float]]:
+        """單一事件對各技能的貢獻
+        
+        Args:
+            payload: Event payload
+            
+        Returns:
+            Dict mapping skill name to normalized rating * lesson weight,
+            or None if the event carries no lesson/drill ID
+        """
+        # Extract lesson ID from event payload
+        lesson_id = payload.get("lesson_id") or payload.get("drill_id")
+        if not lesson_id:
+            return None
+        
+        # Extract rating/score if available (0-5 scale typically)
+        rating = payload.get("rating", 3.0)  # Default to 3.0 if not provided
+        rating = float(rating)
+        
+        # Normalize rating to 0.0-1.0 scale
+        normalized_rating = min(1.0, max(0.0, rating / 5.0))
+        
+        # Get skill mapping for this lesson
+        skill_mapping = self._get_lesson_skill_mapping(lesson_id)
+        
+        return {
+            skill: normalized_rating * weight
+            for skill, weight in skill_mapping.items()
+        }
+    
     def _get_lesson_skill_mapping(self, lesson_id: str) -> Dict[str, float]:
         """獲取課程的技能映射
         
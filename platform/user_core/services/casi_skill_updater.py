@@ -0,0 +1,369 @@
+"""
+Incremental CASI skill updater.
+
+Folds each practice event into exponentially decayed per-skill accumulators
+(`CASISkillAccumulator`) so the CASI profile stays fresh at O(1) cost per
+event, instead of re-analysing the last 500 events on every refresh.
+
+Decay keeps numerator and denominator on the same time base, so the resulting
+score is a decay-weighted average that does not depend on when it is read and
+is independent of the order events arrive in.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+import logging
+import uuid
+
+from sqlalchemy import select, and_, or_
+from sqlalchemy.orm import Session
+
+from models.behavior_event import BehaviorEvent
+from models.buddy_matching import CASISkillAccumulator
+from schemas.buddy_matching import CASISkillProfile as CASISkillProfileSchema
+from services.casi_skill_analyzer import CASISkillAnalyzer, as_utc, decay_factor
+
+
+logger = logging.getLogger(__name__)
+
+
+# 觸發增量更新的事件類型
+INCREMENTAL_EVENT_TYPES = (
+    "snowboard.practice.completed",
+    "lesson_completed",
+    "practice_session",
+    "drill_completed",
+)
+
+DEFAULT_HALF_LIFE_DAYS = 90.0
+DEFAULT_BACKFILL_CHUNK_SIZE = 500
+
+
+@dataclass
+class SkillAccumulatorState:
+    """In-memory view of a user's decayed skill accumulators."""
+    skill_sums: Dict[str, float] = field(default_factory=dict)
+    skill_counts: Dict[str, float] = field(default_factory=dict)
+    last_event_at: Optional[datetime] = None
+    events_applied: int = 0
+
+    @classmethod
+    def from_row(cls, row: CASISkillAccumulator) -> "SkillAccumulatorState":
+        return cls(
+            skill_sums=dict(row.skill_sums or {}),
+            skill_counts=dict(row.skill_counts or {}),
+            last_event_at=as_utc(row.last_event_at) if row.last_event_at else None,
+            events_applied=row.events_applied or 0,
+        )
+
+    def write_to(self, row: CASISkillAccumulator) -> None:
+        # Reassign (not mutate) JSON columns so SQLAlchemy tracks the change
+        row.skill_sums = dict(self.skill_sums)
+        row.skill_counts = dict(self.skill_counts)
+        row.last_event_at = self.last_event_at
+        row.events_applied = self.events_applied
+
+    def fold(
+        self,
+        contribution: Dict[str, float],
+        occurred_at: datetime,
+        half_life_days: Optional[float],
+    ) -> None:
+        """Fold one event's per-skill contribution into the accumulators."""
+        occurred_at = as_utc(occurred_at)
+
+        if self.last_event_at is None or occurred_at >= self.last_event_at:
+            # Newer event: age the existing state up to this event's time
+            if self.last_event_at is not None:
+                elapsed = (occurred_at - self.last_event_at).total_seconds()
+                age = decay_factor(elapsed, half_life_days)
+                self.skill_sums = {k: v * age for k, v in self.skill_sums.items()}
+                self.skill_counts = {k: v * age for k, v in self.skill_counts.items()}
+            self.last_event_at = occurred_at
+            weight = 1.0
+        else:
+            # Late (out-of-order) event: discount it to the current reference time
+            elapsed = (self.last_event_at - occurred_at).total_seconds()
+            weight = decay_factor(elapsed, half_life_days)
+
+        for skill, value in contribution.items():
+            self.skill_sums[skill] = self.skill_sums.get(skill, 0.0) + value * weight
+            self.skill_counts[skill] = self.skill_counts.get(skill, 0.0) + weight
+
+        self.events_applied += 1
+
+    def scores(self, skills: List[str]) -> Dict[str, float]:
+        """Decay-weighted average per skill (0.0 when the skill has no data)."""
+        return {
+            skill: (
+                self.skill_sums.get(skill, 0.0) / self.skill_counts[skill]
+                if self.skill_counts.get(skill, 0.0) > 0 else 0.0
+            )
+            for skill in skills
+        }
+
+
+@dataclass
+class ConsistencyReport:
+    """Incremental vs. full recomputation comparison for one user."""
+    user_id: uuid.UUID
+    events_checked: int
+    incremental_scores: Dict[str, float]
+    recomputed_scores: Dict[str, float]
+    max_abs_diff: float
+    consistent: bool
+
+
+class CASISkillUpdater:
+    """CASI 技能增量更新器
+
+    Keeps `CASISkillProfile` up to date by folding practice events into
+    `CASISkillAccumulator` rows, with a chunked backfill for historical events
+    and a consistency check against the full recomputation.
+    """
+
+    def __init__(
+        self,
+        analyzer: Optional[CASISkillAnalyzer] = None,
+        half_life_days: Optional[float] = DEFAULT_HALF_LIFE_DAYS,
+    ):
+        """
+        Args:
+            analyzer: Analyzer providing the lesson → skill mapping
+            half_life_days: Decay half-life; None disables decay
+        """
+        self.analyzer = analyzer or CASISkillAnalyzer()
+        self.half_life_days = half_life_days
+
+    def apply_event(
+        self,
+        db: Session,
+        event: BehaviorEvent,
+    ) -> Optional[CASISkillProfileSchema]:
+        """將單一事件增量套用到技能檔案
+
+        Args:
+            db: Database session
+            event: Behavior event (ORM row or schema)
+
+        Returns:
+            Updated CASISkillProfile, or None if the event carries no skill signal
+        """
+        if event.event_type not in INCREMENTAL_EVENT_TYPES:
+            return None
+
+        contribution = self.analyzer._extract_skill_contribution(event.payload)
+        if not contribution:
+            return None
+
+        row = db.get(CASISkillAccumulator, event.user_id)
+        if row is None:
+            # No accumulators yet: start from the user's history so this event
+            # does not replace a profile built from earlier events
+            state = self._replay_history(
+                db, event.user_id, DEFAULT_BACKFILL_CHUNK_SIZE,
+                exclude_event_id=getattr(event, "event_id", None),
+            )
+            row = CASISkillAccumulator(user_id=event.user_id)
+            db.add(row)
+        else:
+            state = SkillAccumulatorState.from_row(row)
+
+        state.fold(contribution, event.occurred_at, self.half_life_days)
+        state.write_to(row)
+
+        profile = self.analyzer.save_skill_scores(
+            db, event.user_id, state.scores(self.analyzer.CASI_SKILLS)
+        )
+        return CASISkillProfileSchema.model_validate(profile)
+
+    def backfill_user(
+        self,
+        db: Session,
+        user_id: uuid.UUID,
+        chunk_size: int = DEFAULT_BACKFILL_CHUNK_SIZE,
+    ) -> CASISkillProfileSchema:
+        """重播歷史事件重建累加器
+
+        Replays all of the user's practice events in `chunk_size` batches,
+        replacing whatever accumulator state exists.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            chunk_size: Number of events loaded per query
+
+        Returns:
+            Rebuilt CASISkillProfile
+        """
+        state = self._replay_history(db, user_id, chunk_size)
+
+        row = db.get(CASISkillAccumulator, user_id)
+        if row is None:
+            row = CASISkillAccumulator(user_id=user_id)
+            db.add(row)
+        state.write_to(row)
+
+        profile = self.analyzer.save_skill_scores(
+            db, user_id, state.scores(self.analyzer.CASI_SKILLS)
+        )
+        logger.info(
+            f"[CASI Backfill] Replayed {state.events_applied} events for user {user_id}"
+        )
+        return CASISkillProfileSchema.model_validate(profile)
+
+    def backfill_all(
+        self,
+        db: Session,
+        chunk_size: int = DEFAULT_BACKFILL_CHUNK_SIZE,
+    ) -> int:
+        """對所有有練習事件的使用者執行 backfill
+
+        Returns:
+            Number of users backfilled
+        """
+        stmt = (
+            select(BehaviorEvent.user_id)
+            .where(BehaviorEvent.event_type.in_(INCREMENTAL_EVENT_TYPES))
+            .distinct()
+        )
+        user_ids = db.execute(stmt).scalars().all()
+
+        for user_id in user_ids:
+            self.backfill_user(db, user_id, chunk_size=chunk_size)
+
+        return len(user_ids)
+
+    def check_consistency(
+        self,
+        db: Session,
+        user_id: uuid.UUID,
+        tolerance: float = 1e-6,
+    ) -> ConsistencyReport:
+        """比對增量累加結果與完整重算結果
+
+        Args:
+            db: Database session
+            user_id: User ID
+            tolerance: Maximum allowed absolute difference per skill
+
+        Returns:
+            ConsistencyReport describing the comparison
+        """
+        events: List[BehaviorEvent] = []
+        for chunk in self._iter_practice_events(db, user_id, DEFAULT_BACKFILL_CHUNK_SIZE):
+            events.extend(chunk)
+
+        recomputed = self.analyzer._compute_skill_scores_from_events(
+            events, half_life_days=self.half_life_days
+        )
+
+        row = db.get(CASISkillAccumulator, user_id)
+        state = SkillAccumulatorState.from_row(row) if row else SkillAccumulatorState()
+        incremental = state.scores(self.analyzer.CASI_SKILLS)
+
+        max_abs_diff = max(
+            abs(incremental[skill] - recomputed[skill])
+            for skill in self.analyzer.CASI_SKILLS
+        )
+        consistent = max_abs_diff <= tolerance
+        if not consistent:
+            logger.warning(
+                f"[CASI Consistency] User {user_id} drifted by {max_abs_diff:.6f}"
+            )
+
+        return ConsistencyReport(
+            user_id=user_id,
+            events_checked=len(events),
+            incremental_scores=incremental,
+            recomputed_scores=recomputed,
+            max_abs_diff=max_abs_diff,
+            consistent=consistent,
+        )
+
+    def _replay_history(
+        self,
+        db: Session,
+        user_id: uuid.UUID,
+        chunk_size: int,
+        exclude_event_id: Optional[uuid.UUID] = None,
+    ) -> SkillAccumulatorState:
+        """Fold all of the user's stored practice events (except `exclude_event_id`) into a fresh state."""
+        state = SkillAccumulatorState()
+        for chunk in self._iter_practice_events(db, user_id, chunk_size):
+            for event in chunk:
+                if exclude_event_id is not None and event.event_id == exclude_event_id:
+                    continue
+                contribution = self.analyzer._extract_skill_contribution(event.payload)
+                if contribution:
+                    state.fold(contribution, event.occurred_at, self.half_life_days)
+        return state
+
+    def _iter_practice_events(
+        self,
+        db: Session,
+        user_id: uuid.UUID,
+        chunk_size: int,
+    ) -> Iterator[List[BehaviorEvent]]:
+        """Keyset-paginate a user's practice events in (occurred_at, event_id) order."""
+        cursor = None
+        while True:
+            stmt = select(BehaviorEvent).where(
+                BehaviorEvent.user_id == user_id,
+                BehaviorEvent.event_type.in_(INCREMENTAL_EVENT_TYPES),
+            )
+            if cursor is not None:
+                last_occurred_at, last_event_id = cursor
+                stmt = stmt.where(
+                    or_(
+                        BehaviorEvent.occurred_at > last_occurred_at,
+                        and_(
+                            BehaviorEvent.occurred_at == last_occurred_at,
+                            BehaviorEvent.event_id > last_event_id,
+                        ),
+                    )
+                )
+            stmt = stmt.order_by(
+                BehaviorEvent.occurred_at.asc(), BehaviorEvent.event_id.asc()
+            ).limit(chunk_size)
+
+            chunk = db.execute(stmt).scalars().all()
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            cursor = (chunk[-1].occurred_at, chunk[-1].event_id)
+
+
+def apply_casi_event_task(event_id: uuid.UUID) -> None:
+    """後台任務：將新事件增量套用到使用者的 CASI 技能檔案
+
+    如果發生錯誤，只紀錄日誌，不影響事件寫入。
+
+    Args:
+        event_id: ID of the stored behavior event
+    """
+    from services.db import get_db
+
+    db_gen = get_db()
+    db = next(db_gen)
+
+    try:
+        event = db.get(BehaviorEvent, event_id)
+        if event is None:
+            logger.warning(f"[CASI Sync] Event {event_id} not found")
+            return
+
+        profile = CASISkillUpdater().apply_event(db, event)
+        if profile:
+            logger.info(f"[CASI Sync] Applied event {event_id} to user {event.user_id}")
+
+    except Exception as e:
+        logger.error(f"[CASI Sync] Failed to apply event {event_id}: {e}")
+        # 靜默失敗，不影響主流程
+    finally:
+        try:
+            db_gen.close()
+        except:
+            pass
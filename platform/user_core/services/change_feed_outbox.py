@@ -0,0 +1,325 @@
+"""
+Change feed outbox dispatcher.
+
+Change events are committed as `pending` rows together with the entity
+change (see change_feed_service.create_change_event). This dispatcher drains
+them in batches outside the request path:
+
+- at-least-once: a row is marked delivered only after the subscriber accepts
+  it, so a crash mid-batch re-sends (subscribers dedupe on event_id)
+- short transactions: a batch is claimed by leasing its rows
+  (`next_attempt_at` moved past the delivery window) in one brief
+  transaction, delivered with no transaction open, and the outcomes are
+  recorded in a second one; rows of a dispatcher that died are picked up
+  again once their lease runs out
+- per-entity ordering: events are visited oldest first, and an event waits
+  while an earlier event of its entity is backing off or leased
+- retries with exponential backoff; after `max_attempts` an event is marked
+  `failed` and no longer blocks its entity
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import uuid
+
+import httpx
+from sqlalchemy import and_, or_, select, text
+from sqlalchemy.orm import Session, aliased
+
+from audit import publisher
+from config.settings import settings
+from models.change_feed import ChangeFeed
+
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DELIVERED = "delivered"
+FAILED = "failed"
+
+# pg_advisory_xact_lock key: only one dispatcher claims a batch at a time, so
+# two workers never lease the same rows
+_OUTBOX_LOCK_KEY = 0x0C4A_F33D
+
+
+def _utcnow() -> datetime:
+    # DateTime columns are stored without tzinfo
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+@dataclass
+class DispatchResult:
+    delivered: int = 0
+    retried: int = 0
+    failed: int = 0
+    blocked: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.delivered + self.retried + self.failed + self.blocked
+
+
+@dataclass
+class ClaimedEvent:
+    """Detached copy of a leased outbox row, delivered outside any transaction."""
+    id: uuid.UUID
+    entity_type: str
+    entity_id: uuid.UUID
+    change_type: str
+    payload: Any
+    attempts: int
+    next_attempt_at: Optional[datetime]  # value before the lease, restored on release
+
+    @classmethod
+    def from_row(cls, row: ChangeFeed) -> "ClaimedEvent":
+        return cls(
+            id=row.id,
+            entity_type=row.entity_type,
+            entity_id=row.entity_id,
+            change_type=row.change_type,
+            payload=row.payload,
+            attempts=row.attempts or 0,
+            next_attempt_at=row.next_attempt_at,
+        )
+
+
+class OutboxDispatcher:
+    """Delivers pending change feed rows in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        base_backoff_seconds: Optional[float] = None,
+        max_backoff_seconds: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.changefeed_batch_size
+        self.max_attempts = max_attempts or settings.changefeed_max_attempts
+        self.base_backoff_seconds = base_backoff_seconds or settings.changefeed_base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds or settings.changefeed_max_backoff_seconds
+        self.lease_seconds = lease_seconds or settings.changefeed_lease_seconds
+
+    def backoff(self, attempts: int) -> timedelta:
+        """Delay before retry number `attempts` (1-based)."""
+        delay = self.base_backoff_seconds * (2 ** (attempts - 1))
+        return timedelta(seconds=min(delay, self.max_backoff_seconds))
+
+    def dispatch_batch(self) -> DispatchResult:
+        """Deliver up to `batch_size` pending events. Safe to call concurrently."""
+        result = DispatchResult()
+        claimed = self._claim()
+        if not claimed:
+            return result
+
+        outcomes: Dict[uuid.UUID, Optional[str]] = {}  # event id -> error (None: delivered)
+        blocked: Set[Tuple[str, object]] = set()
+        with httpx.Client() as client:
+            for event in claimed:
+                key = (event.entity_type, event.entity_id)
+                if key in blocked:
+                    # Keep later events of this entity behind the one that failed
+                    result.blocked += 1
+                    continue
+                error = self._deliver(event, client)
+                outcomes[event.id] = error
+                if error is not None and event.attempts + 1 < self.max_attempts:
+                    blocked.add(key)
+
+        self._record(claimed, outcomes, result)
+        return result
+
+    def _claim(self) -> List[ClaimedEvent]:
+        """Lease the next deliverable events in one short transaction."""
+        db = self.session_factory()
+        try:
+            if not self._acquire_lock(db):
+                return []
+
+            now = _utcnow()
+            earlier = aliased(ChangeFeed)
+            entity_waiting = select(earlier.id).where(
+                earlier.entity_type == ChangeFeed.entity_type,
+                earlier.entity_id == ChangeFeed.entity_id,
+                earlier.delivery_status == PENDING,
+                earlier.next_attempt_at > now,
+                or_(
+                    earlier.published_at < ChangeFeed.published_at,
+                    and_(earlier.published_at == ChangeFeed.published_at, earlier.id < ChangeFeed.id),
+                ),
+            ).exists()
+            rows = (
+                db.query(ChangeFeed)
+                .filter(
+                    ChangeFeed.delivery_status == PENDING,
+                    or_(ChangeFeed.next_attempt_at.is_(None), ChangeFeed.next_attempt_at <= now),
+                    ~entity_waiting,
+                )
+                .order_by(ChangeFeed.published_at, ChangeFeed.id)
+                .limit(self.batch_size)
+                .all()
+            )
+
+            claimed = [ClaimedEvent.from_row(row) for row in rows]
+            lease_until = now + timedelta(seconds=self.lease_seconds)
+            for row in rows:
+                row.next_attempt_at = lease_until
+            db.commit()
+            return claimed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _record(
+        self,
+        claimed: List[ClaimedEvent],
+        outcomes: Dict[uuid.UUID, Optional[str]],
+        result: DispatchResult,
+    ) -> None:
+        """Store delivery outcomes and release the leases of events not attempted."""
+        db = self.session_factory()
+        try:
+            now = _utcnow()
+            rows = {
+                row.id: row
+                for row in db.query(ChangeFeed).filter(ChangeFeed.id.in_([e.id for e in claimed]))
+            }
+            for event in claimed:
+                row = rows.get(event.id)
+                if row is None:
+                    continue
+                if event.id not in outcomes:
+                    row.next_attempt_at = event.next_attempt_at
+                    continue
+
+                error = outcomes[event.id]
+                row.attempts = event.attempts + 1
+                if error is None:
+                    row.delivery_status = DELIVERED
+                    row.delivered_at = now
+                    row.next_attempt_at = None
+                    row.last_error = None
+                    result.delivered += 1
+                elif row.attempts >= self.max_attempts:
+                    row.delivery_status = FAILED
+                    row.next_attempt_at = None
+                    row.last_error = error[:500]
+                    result.failed += 1
+                    logger.error(
+                        f"[ChangeFeed] Giving up on event {event.id} after {row.attempts} attempts: {error}"
+                    )
+                else:
+                    row.next_attempt_at = now + self.backoff(row.attempts)
+                    row.last_error = error[:500]
+                    result.retried += 1
+                    logger.warning(f"[ChangeFeed] Delivery of {event.id} failed, retrying: {error}")
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _acquire_lock(self, db: Session) -> bool:
+        if db.get_bind().dialect.name != "postgresql":
+            return True
+        return bool(db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _OUTBOX_LOCK_KEY}
+        ).scalar())
+
+    def _deliver(self, event: ClaimedEvent, client: httpx.Client) -> Optional[str]:
+        """Send one event; returns the error message, or None once the subscriber accepted it."""
+        try:
+            publisher.publish_change(
+                entity_type=event.entity_type,
+                entity_id=str(event.entity_id),
+                change_type=event.change_type,
+                payload=event.payload,
+                event_id=str(event.id),
+                client=client,
+            )
+        except Exception as exc:
+            return str(exc) or exc.__class__.__name__
+        return None
+
+
+class OutboxWorker:
+    """Background loop that runs the dispatcher off the request path."""
+
+    def __init__(self, dispatcher: OutboxDispatcher, interval_seconds: Optional[float] = None):
+        self.dispatcher = dispatcher
+        self.interval_seconds = interval_seconds or settings.changefeed_dispatch_interval_seconds
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        """Wake the loop early; callable from any thread."""
+        if self._loop and self._wakeup and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                result = await asyncio.to_thread(self.dispatcher.dispatch_batch)
+            except Exception as exc:
+                logger.error(f"[ChangeFeed] Dispatch batch failed: {exc}")
+                result = DispatchResult()
+
+            if result.processed >= self.dispatcher.batch_size:
+                continue  # Backlog: keep draining
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+_worker: Optional[OutboxWorker] = None
+_worker_lock = threading.Lock()
+
+
+def start_outbox_worker(session_factory: Callable[[], Session]) -> OutboxWorker:
+    """Start the process-wide outbox worker on the running event loop."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = OutboxWorker(OutboxDispatcher(session_factory))
+            _worker.start()
+    return _worker
+
+
+async def stop_outbox_worker() -> None:
+    global _worker
+    worker, _worker = _worker, None
+    if worker:
+        await worker.stop()
+
+
+def notify_outbox() -> None:
+    """Signal that new events were committed."""
+    if _worker is not None:
+        _worker.notify()
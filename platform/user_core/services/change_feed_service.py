@@ -7,7 +7,9 @@ import uuid
 from sqlalchemy.orm import Session
 
 from models import change_feed as change_feed_model
-from audit import logger, publisher
+from audit import logger
+from services import auth_cache
+from services.change_feed_outbox import notify_outbox
 
 
 def _safe_actor(actor_id: Optional[str]) -> str:
@@ -51,7 +53,12 @@ def create_change_event(
     change_type: str,
     payload: Dict[str, Any],
 ) -> change_feed_model.ChangeFeed:
-    """Create a change event row without committing."""
+    """
+    Create a change event row without committing.
+
+    The row is the outbox entry: committing it together with the entity
+    change is what guarantees the event is eventually delivered.
+    """
     change_event = change_feed_model.ChangeFeed(
         entity_type=entity_type,
         entity_id=entity_id,
@@ -64,13 +71,14 @@ def create_change_event(
 
 
 def publish_change_event(change_event: change_feed_model.ChangeFeed) -> None:
-    """Publish a change event to external subscribers."""
-    try:
-        publisher.publish_change(
-            entity_type=change_event.entity_type,
-            entity_id=str(change_event.entity_id),
-            change_type=change_event.change_type,
-            payload=change_event.payload,
-        )
-    except Exception as exc:  # pragma: no cover - defensive logging
-        print(f"ERROR: Failed to publish change event: {exc}")
+    """
+    Post-commit hook for a change event.
+
+    Delivery to subscribers happens in the outbox dispatcher, so this never
+    blocks on the network; it only applies local side effects and wakes the
+    dispatcher.
+    """
+    if change_event.entity_type == "user_profile":
+        # Deactivation/merge must take effect for cached auth immediately
+        auth_cache.invalidate_user(change_event.entity_id)
+    notify_outbox()
@@ -9,6 +9,7 @@ from sqlalchemy.exc import IntegrityError
 
 from models.course_tracking import CourseVisit
 from schemas.course_tracking import CourseVisitCreate
+from services.ski_map_service import invalidate_user_ski_map
 from utils.user_utils import get_or_create_user
 from exceptions.domain import DuplicateCourseVisitError
 
@@ -34,6 +35,7 @@ def record_visit(db: Session, user_id: uuid.UUID, visit: CourseVisitCreate) -> C
         db.add(db_visit)
         db.commit()
         db.refresh(db_visit)
+        invalidate_user_ski_map(user_id)
         return db_visit
     except IntegrityError as e:
         db.rollback()
@@ -68,6 +70,7 @@ def delete_visit(db: Session, visit_id: uuid.UUID, user_id: uuid.UUID) -> bool:
         return False
     db.delete(visit)
     db.commit()
+    invalidate_user_ski_map(user_id)
     return True
 
 
@@ -1,10 +1,101 @@
+from typing import AsyncIterator, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
 from config import settings
+from telemetry.pool_metrics import PoolMetrics, instrument_pool
+
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def _is_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite"
 
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {})
+
+def pool_kwargs(url: URL, pool_class, metrics: PoolMetrics) -> dict:
+    """Pool sizing from settings; SQLite keeps SQLAlchemy's default pool."""
+    if _is_sqlite(url):
+        return {}
+    return {
+        "poolclass": instrument_pool(pool_class, metrics),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def async_database_url(database_url: str) -> URL:
+    """Async-driver URL for `database_url` (asyncpg / aiosqlite)."""
+    url = make_url(database_url)
+    drivername = _ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    url = url.set(drivername=drivername)
+    if drivername == "postgresql+asyncpg":
+        # 0 disables prepared statement caching (needed behind pgbouncer in transaction mode)
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.db_statement_cache_size)}
+        )
+    return url
+
+
+_sync_url = make_url(settings.database_url)
+engine = create_engine(
+    _sync_url,
+    connect_args={"check_same_thread": False} if _is_sqlite(_sync_url) else {},
+    **pool_kwargs(_sync_url, QueuePool, sync_pool_metrics),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Created on first use so importing this module does not require the async driver
+_async_engine: Optional[AsyncEngine] = None
+_async_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        url = async_database_url(settings.database_async_url or settings.database_url)
+        _async_engine = create_async_engine(url, **pool_kwargs(url, AsyncAdaptedQueuePool, async_pool_metrics))
+        _async_sessionmaker = async_sessionmaker(
+            _async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    get_async_engine()
+    return _async_sessionmaker()
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_sessionmaker = None
+
+
+def pool_stats() -> dict:
+    """Checkout-wait metrics and current usage for both pools."""
+    return {
+        "sync": sync_pool_metrics.snapshot(engine.pool),
+        "async": async_pool_metrics.snapshot(_async_engine.pool if _async_engine else None),
+    }
+
+
 def get_db():
     """FastAPI dependency to get a DB session."""
     db = SessionLocal()
@@ -12,3 +103,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency to get an async DB session (non-blocking I/O)."""
+    async with AsyncSessionLocal() as session:
+        yield session
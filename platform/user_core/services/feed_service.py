@@ -6,9 +6,9 @@ import uuid
 from sqlalchemy import desc
 from sqlalchemy.orm import Session
 from models.social import UserFollow, ActivityFeedItem, ActivityLike
-from models.user_profile import UserProfile
 from models.course_tracking import CourseVisit, UserAchievement
 from schemas.social import ActivityFeedItemCreate
+from utils.user_loader import get_user_loader, user_summary
 from .follow_service import is_following
 
 
@@ -30,7 +30,7 @@ def create_feed_item(db: Session, user_id: uuid.UUID, item: ActivityFeedItemCrea
 
 def create_feed_item_from_course_visit(db: Session, course_visit: CourseVisit) -> ActivityFeedItem:
     """Create a feed item when a course visit is recorded."""
-    user = db.query(UserProfile).filter(UserProfile.user_id == course_visit.user_id).first()
+    user = get_user_loader(db).load(course_visit.user_id)
     visibility = user.default_post_visibility if user and user.default_post_visibility else 'public'
 
     content = {
@@ -58,7 +58,7 @@ def create_feed_item_from_course_visit(db: Session, course_visit: CourseVisit) -
 
 def create_feed_item_from_achievement(db: Session, achievement: UserAchievement) -> ActivityFeedItem:
     """Create a feed item when an achievement is earned."""
-    user = db.query(UserProfile).filter(UserProfile.user_id == achievement.user_id).first()
+    user = get_user_loader(db).load(achievement.user_id)
     visibility = user.default_post_visibility if user and user.default_post_visibility else 'public'
 
     content = {
@@ -154,9 +154,7 @@ def enrich_feed_items(db: Session, items: List[ActivityFeedItem], current_user_i
     if not items:
         return []
 
-    user_ids = list(set([item.user_id for item in items]))
-    users = db.query(UserProfile).filter(UserProfile.user_id.in_(user_ids)).all()
-    user_map = {user.user_id: user for user in users}
+    user_map = get_user_loader(db).load_many(item.user_id for item in items)
 
     activity_ids = [item.id for item in items]
     liked_activity_ids = set()
@@ -177,7 +175,6 @@ def enrich_feed_items(db: Session, items: List[ActivityFeedItem], current_user_i
             "likes_count": item.likes_count, "comments_count": item.comments_count,
             "created_at": item.created_at, "updated_at": item.updated_at,
             "is_liked": item.id in liked_activity_ids,
-            "user": {"user_id": user.user_id, "display_name": user.display_name,
-                     "avatar_url": user.avatar_url, "experience_level": user.experience_level} if user else None
+            "user": user_summary(user)
         })
     return enriched
@@ -5,6 +5,7 @@ import uuid
 from sqlalchemy.orm import Session
 from models.social import UserFollow
 from models.user_profile import UserProfile
+from utils.user_loader import get_user_loader
 
 
 def follow_user(db: Session, follower_id: uuid.UUID, following_id: uuid.UUID) -> UserFollow:
@@ -12,7 +13,7 @@ def follow_user(db: Session, follower_id: uuid.UUID, following_id: uuid.UUID) ->
     if follower_id == following_id:
         raise ValueError("Cannot follow yourself")
 
-    target_user = db.query(UserProfile).filter(UserProfile.user_id == following_id).first()
+    target_user = get_user_loader(db).load(following_id)
     if not target_user:
         raise ValueError("User not found")
 
@@ -62,6 +63,7 @@ def get_followers(db: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 5
 
     total = query.count()
     followers = query.offset(skip).limit(limit).all()
+    get_user_loader(db).prime(followers)
     return followers, total
 
 
@@ -73,6 +75,7 @@ def get_following(db: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 5
 
     total = query.count()
     following = query.offset(skip).limit(limit).all()
+    get_user_loader(db).prime(following)
     return following, total
 
 
@@ -12,6 +12,8 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 import httpx
 
+from services.share_card_cache import card_cache_key, get_share_card_cache
+
 
 class ImagenService:
     """Service for generating share card images using Google Imagen 3."""
@@ -209,11 +211,38 @@ Footer: "加油！繼續探索更多雪道"
         return await self._generate_image(prompt)
 
     async def _generate_image(self, prompt: str) -> bytes:
+        """
+        Generate an image, reusing a cached card for identical prompts.
+
+        Args:
+            prompt: Text prompt for image generation
+
+        Returns:
+            Image bytes
+
+        Raises:
+            Exception: If API call fails
+        """
+        config = {
+            "number_of_images": 1,
+            "aspect_ratio": "1:1",  # Square format for social media
+            "safety_filter_level": "block_only_high",
+            "person_generation": "allow_adult"
+        }
+        key = card_cache_key(prompt, {"model": self.model, "config": config})
+
+        return await get_share_card_cache().get_or_generate(
+            key,
+            lambda: self._call_imagen(prompt, config)
+        )
+
+    async def _call_imagen(self, prompt: str, config: Dict[str, Any]) -> bytes:
         """
         Internal method to call Imagen 3 API.
 
         Args:
             prompt: Text prompt for image generation
+            config: Imagen generation config
 
         Returns:
             Image bytes
@@ -229,12 +258,7 @@ Footer: "加油！繼續探索更多雪道"
 
         payload = {
             "prompt": prompt,
-            "config": {
-                "number_of_images": 1,
-                "aspect_ratio": "1:1",  # Square format for social media
-                "safety_filter_level": "block_only_high",
-                "person_generation": "allow_adult"
-            }
+            "config": config
         }
 
         async with httpx.AsyncClient(timeout=60.0) as client:
@@ -2,64 +2,94 @@
 from typing import List, Optional, Tuple
 import uuid
 
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from models.social import ActivityFeedItem, ActivityLike, ActivityComment
-from models.user_profile import UserProfile
+from utils.query_utils import insert_ignore
+from utils.user_loader import get_user_loader, user_summary
+
+
+def _adjust_counter(db: Session, activity_id: uuid.UUID, column, delta: int) -> Optional[int]:
+    """
+    Atomically add `delta` to an activity counter (floored at 0).
+
+    Runs as one `UPDATE ... RETURNING` so concurrent writers never lose
+    increments. Returns the new value, or None if the activity doesn't exist.
+    """
+    new_value = column + delta if delta > 0 else case((column + delta < 0, 0), else_=column + delta)
+    stmt = (
+        update(ActivityFeedItem)
+        .where(ActivityFeedItem.id == activity_id)
+        .values({column.key: new_value})
+        .returning(column)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def _likes_count(db: Session, activity_id: uuid.UUID) -> Optional[int]:
+    return db.execute(
+        select(ActivityFeedItem.likes_count).where(ActivityFeedItem.id == activity_id)
+    ).scalar_one_or_none()
 
 
 def like_activity(db: Session, activity_id: uuid.UUID, user_id: uuid.UUID) -> Tuple[bool, int]:
     """Like an activity. Returns (already_liked, new_likes_count)."""
-    activity = db.query(ActivityFeedItem).filter(ActivityFeedItem.id == activity_id).first()
-    if not activity:
+    try:
+        inserted = insert_ignore(
+            db, ActivityLike,
+            {"activity_id": activity_id, "user_id": user_id},
+            index_elements=["activity_id", "user_id"],
+        )
+    except IntegrityError:
+        # FK violation: the activity doesn't exist
+        db.rollback()
         raise ValueError("Activity not found")
 
-    existing_like = db.query(ActivityLike).filter(
-        ActivityLike.activity_id == activity_id,
-        ActivityLike.user_id == user_id
-    ).first()
-
-    if existing_like:
-        return True, activity.likes_count
+    if not inserted:
+        likes_count = _likes_count(db, activity_id)
+        if likes_count is None:
+            raise ValueError("Activity not found")
+        return True, likes_count
 
-    like = ActivityLike(activity_id=activity_id, user_id=user_id)
-    db.add(like)
-    activity.likes_count += 1
+    likes_count = _adjust_counter(db, activity_id, ActivityFeedItem.likes_count, 1)
+    if likes_count is None:
+        db.rollback()
+        raise ValueError("Activity not found")
     db.commit()
-    db.refresh(activity)
-    return False, activity.likes_count
+    return False, likes_count
 
 
 def unlike_activity(db: Session, activity_id: uuid.UUID, user_id: uuid.UUID) -> Tuple[bool, int]:
     """Unlike an activity. Returns (was_liked, new_likes_count)."""
-    like = db.query(ActivityLike).filter(
-        ActivityLike.activity_id == activity_id,
-        ActivityLike.user_id == user_id
-    ).first()
+    deleted = db.execute(
+        delete(ActivityLike)
+        .where(ActivityLike.activity_id == activity_id, ActivityLike.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
 
-    if not like:
-        activity = db.query(ActivityFeedItem).filter(ActivityFeedItem.id == activity_id).first()
-        return False, activity.likes_count if activity else 0
+    if not deleted:
+        return False, _likes_count(db, activity_id) or 0
 
-    activity = db.query(ActivityFeedItem).filter(ActivityFeedItem.id == activity_id).first()
-    db.delete(like)
-    if activity:
-        activity.likes_count = max(0, activity.likes_count - 1)
+    likes_count = _adjust_counter(db, activity_id, ActivityFeedItem.likes_count, -1)
     db.commit()
-    return True, activity.likes_count if activity else 0
+    return True, likes_count or 0
 
 
 def create_comment(db: Session, activity_id: uuid.UUID, user_id: uuid.UUID,
                    content: str, parent_comment_id: Optional[uuid.UUID] = None) -> ActivityComment:
     """Create a comment on an activity."""
-    activity = db.query(ActivityFeedItem).filter(ActivityFeedItem.id == activity_id).first()
-    if not activity:
-        raise ValueError("Activity not found")
-
     if parent_comment_id:
         parent = db.query(ActivityComment).filter(ActivityComment.id == parent_comment_id).first()
         if not parent or parent.activity_id != activity_id:
             raise ValueError("Parent comment not found or doesn't belong to this activity")
 
+    # The counter update doubles as the existence check for the activity
+    if _adjust_counter(db, activity_id, ActivityFeedItem.comments_count, 1) is None:
+        db.rollback()
+        raise ValueError("Activity not found")
+
     comment = ActivityComment(
         activity_id=activity_id,
         user_id=user_id,
@@ -67,7 +97,6 @@ def create_comment(db: Session, activity_id: uuid.UUID, user_id: uuid.UUID,
         parent_comment_id=parent_comment_id
     )
     db.add(comment)
-    activity.comments_count += 1
     db.commit()
     db.refresh(comment)
     return comment
@@ -95,10 +124,10 @@ def delete_comment(db: Session, comment_id: uuid.UUID, user_id: uuid.UUID) -> bo
     if not comment:
         return False
 
-    activity = db.query(ActivityFeedItem).filter(ActivityFeedItem.id == comment.activity_id).first()
+    activity_id = comment.activity_id
     db.delete(comment)
-    if activity:
-        activity.comments_count = max(0, activity.comments_count - 1)
+    db.flush()
+    _adjust_counter(db, activity_id, ActivityFeedItem.comments_count, -1)
     db.commit()
     return True
 
@@ -108,9 +137,7 @@ def enrich_comments(db: Session, comments: List[ActivityComment]) -> List[dict]:
     if not comments:
         return []
 
-    user_ids = list(set([comment.user_id for comment in comments]))
-    users = db.query(UserProfile).filter(UserProfile.user_id.in_(user_ids)).all()
-    user_map = {user.user_id: user for user in users}
+    user_map = get_user_loader(db).load_many(comment.user_id for comment in comments)
 
     enriched = []
     for comment in comments:
@@ -119,7 +146,6 @@ def enrich_comments(db: Session, comments: List[ActivityComment]) -> List[dict]:
             "id": comment.id, "activity_id": comment.activity_id, "user_id": comment.user_id,
             "content": comment.content, "parent_comment_id": comment.parent_comment_id,
             "created_at": comment.created_at, "updated_at": comment.updated_at,
-            "user": {"user_id": user.user_id, "display_name": user.display_name,
-                     "avatar_url": user.avatar_url, "experience_level": user.experience_level} if user else None
+            "user": user_summary(user)
         })
     return enriched
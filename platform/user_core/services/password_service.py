@@ -1,21 +1,39 @@
 """
 Password hashing and verification service using bcrypt.
+
+bcrypt is deliberately slow (~100-300 ms per call at the default cost), so the
+async auth routes must never run it on the event loop. `hash_password_async`
+and `verify_password_async` run it on a small dedicated pool with a bounded
+queue; when the queue is full they raise `PasswordHasherBusy` so callers can
+shed load (429) instead of letting a login burst pile up behind the pool.
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 import bcrypt
 
+from config.settings import settings
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool's queue is full."""
 
-def hash_password(password: str) -> str:
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
     Hash a password using bcrypt.
 
     Args:
         password: Plain text password
+        rounds: bcrypt cost factor (defaults to settings.password_bcrypt_rounds)
 
     Returns:
         Hashed password string
     """
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.password_bcrypt_rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -34,3 +52,72 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Extract the cost factor from a `$2b$12$...` hash (None if unparsable)."""
+    parts = hashed_password.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash uses a different cost than currently configured."""
+    return hash_rounds(hashed_password) != settings.password_bcrypt_rounds
+
+
+class PasswordHasher:
+    """
+    Bounded executor for bcrypt calls.
+
+    bcrypt releases the GIL while hashing, so a thread pool gives real
+    parallelism without the pickling overhead of a process pool. At most
+    `max_workers + max_pending` calls are admitted at once; further calls
+    fail fast with `PasswordHasherBusy`.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    async def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Password hashing queue is full")
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get the process-wide password hashing pool."""
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher(
+                    max_workers=settings.password_hash_workers,
+                    max_pending=settings.password_hash_max_pending,
+                )
+    return _hasher
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the hashing pool. Raises PasswordHasherBusy when saturated."""
+    return await get_password_hasher().run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool. Raises PasswordHasherBusy when saturated."""
+    return await get_password_hasher().run(verify_password, plain_password, hashed_password)
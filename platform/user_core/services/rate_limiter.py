@@ -0,0 +1,231 @@
+"""
+Rate limiting shared by the API routers.
+
+Uses GCRA (generic cell rate algorithm): each key stores only its
+"theoretical arrival time", so memory is O(1) per key regardless of the
+limit, and a decision is a single atomic Lua call against Redis.
+
+When Redis is not configured or fails, the limiter falls back to the same
+algorithm in process: one float per key, with idle keys swept periodically
+and the key count capped. After a Redis error the limiter stays local for
+`redis_retry_seconds` instead of paying a connection timeout per request.
+
+Every limiter reports decision latency and key cardinality via `stats()`.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+
+try:  # pragma: no cover - optional dependency
+    import redis
+except Exception:  # pragma: no cover - redis import failure
+    redis = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = limiter key, KEYS[2] = HyperLogLog of keys active in this window
+# ARGV[1] = emission interval (ms), ARGV[2] = window (ms), ARGV[3] = member
+_GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local stored = redis.call('GET', KEYS[1])
+local tat = stored and tonumber(stored) or now
+if tat < now then tat = now end
+local new_tat = tat + interval
+if new_tat - now > period then
+  return {0, math.ceil(new_tat - now - period)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+redis.call('PFADD', KEYS[2], ARGV[3])
+redis.call('PEXPIRE', KEYS[2], period * 2)
+return {1, 0}
+"""
+
+_LATENCY_SAMPLES = 1024
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after: float = 0.0  # seconds until the next request would be allowed
+
+
+class RateLimiter:
+    """`limit` requests per `window_seconds` per key, with bursts up to `limit`."""
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        window_seconds: float,
+        redis_url: Optional[str] = None,
+        redis_client: Any = None,
+        max_local_keys: int = 100_000,
+        sweep_interval_seconds: float = 30.0,
+        redis_retry_seconds: float = 5.0,
+    ):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.interval_seconds = window_seconds / limit
+        self.max_local_keys = max_local_keys
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.redis_retry_seconds = redis_retry_seconds
+
+        if redis_client is None and redis_url and redis is not None:
+            try:
+                redis_client = redis.Redis.from_url(
+                    redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=0.5,
+                    socket_timeout=0.5,
+                )
+            except Exception as exc:  # pragma: no cover - invalid URL
+                logger.warning(f"[RateLimit] {name}: Redis unavailable, using local limiter: {exc}")
+                redis_client = None
+        self._redis = redis_client
+        self._script = redis_client.register_script(_GCRA_SCRIPT) if redis_client is not None else None
+        self._redis_down_until = 0.0
+
+        # Local fallback: key -> theoretical arrival time (monotonic seconds)
+        self._tats: Dict[str, float] = {}
+        self._next_sweep = time.monotonic() + sweep_interval_seconds
+        self._lock = threading.Lock()
+
+        # Stats
+        self._decisions = 0
+        self._rejected = 0
+        self._redis_errors = 0
+        self._latencies: deque = deque(maxlen=_LATENCY_SAMPLES)
+
+    def hit(self, key: str) -> RateLimitDecision:
+        """Count one request for `key` and decide whether it is allowed."""
+        started = time.perf_counter()
+        decision = None
+        if self._script is not None and time.monotonic() >= self._redis_down_until:
+            decision = self._hit_redis(key)
+        if decision is None:
+            decision = self._hit_local(key)
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._decisions += 1
+            if not decision.allowed:
+                self._rejected += 1
+            self._latencies.append(elapsed)
+        return decision
+
+    def check(self, key: str, detail: str = "Rate limit exceeded") -> None:
+        """Raise 429 (with Retry-After) when `key` is over its limit."""
+        decision = self.hit(key)
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=429,
+                detail=detail,
+                headers={"Retry-After": str(max(1, int(decision.retry_after + 0.999)))},
+            )
+
+    def _active_keys_key(self) -> str:
+        bucket = int(time.time() // self.window_seconds)
+        return f"{self.name}:gcra-active:{bucket}"
+
+    def _hit_redis(self, key: str) -> Optional[RateLimitDecision]:
+        try:
+            allowed, retry_after_ms = self._script(
+                keys=[f"{self.name}:gcra:{key}", self._active_keys_key()],
+                args=[self.interval_seconds * 1000, self.window_seconds * 1000, key],
+            )
+        except Exception as exc:
+            with self._lock:
+                self._redis_errors += 1
+            self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+            logger.warning(f"[RateLimit] {self.name}: Redis error, using local limiter: {exc}")
+            return None
+        return RateLimitDecision(bool(int(allowed)), int(retry_after_ms) / 1000)
+
+    def _hit_local(self, key: str) -> RateLimitDecision:
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep or len(self._tats) >= self.max_local_keys:
+                self._sweep(now)
+
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + self.interval_seconds
+            if new_tat - now > self.window_seconds:
+                return RateLimitDecision(False, new_tat - now - self.window_seconds)
+            self._tats[key] = new_tat
+            return RateLimitDecision(True)
+
+    def _sweep(self, now: float) -> None:
+        """Drop keys whose budget has fully recovered; enforce the key cap."""
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        overflow = len(self._tats) - int(self.max_local_keys * 0.9)
+        if overflow > 0:
+            # Evict the oldest-inserted keys down to 90% of the cap so the next
+            # sweep is not due on the very next new key; forgetting a key only
+            # loosens its limit
+            for key in list(self._tats)[:overflow]:
+                del self._tats[key]
+        self._next_sweep = now + self.sweep_interval_seconds
+
+    def _redis_active_keys(self) -> Optional[int]:
+        if self._redis is None:
+            return None
+        try:
+            return int(self._redis.pfcount(self._active_keys_key()))
+        except Exception:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Decision counts, latency (ms) and key cardinality."""
+        with self._lock:
+            latencies: List[float] = sorted(self._latencies)
+            snapshot = {
+                "name": self.name,
+                "limit": self.limit,
+                "window_seconds": self.window_seconds,
+                "backend": "redis" if self._script is not None else "local",
+                "decisions": self._decisions,
+                "rejected": self._rejected,
+                "redis_errors": self._redis_errors,
+                "local_keys": len(self._tats),
+            }
+        if latencies:
+            snapshot["latency_ms"] = {
+                "p50": round(latencies[len(latencies) // 2] * 1000, 3),
+                "p99": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3),
+                "max": round(latencies[-1] * 1000, 3),
+            }
+        snapshot["redis_active_keys"] = self._redis_active_keys()
+        return snapshot
+
+
+_registry: Dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, limit: int, window_seconds: float, redis_url: Optional[str] = None) -> RateLimiter:
+    """Process-wide limiter for `name`, created on first use."""
+    with _registry_lock:
+        limiter = _registry.get(name)
+        if limiter is None:
+            limiter = RateLimiter(name, limit, window_seconds, redis_url=redis_url)
+            _registry[name] = limiter
+        return limiter
+
+
+def all_stats() -> List[Dict[str, Any]]:
+    """Stats for every registered limiter."""
+    with _registry_lock:
+        limiters = list(_registry.values())
+    return [limiter.stats() for limiter in limiters]
@@ -0,0 +1,401 @@
+"""
+Read-replica routing.
+
+Read-only endpoints take their session from `get_read_db` /
+`get_async_read_db` instead of `get_db`:
+
+- replicas from `DATABASE_REPLICA_URLS` are used round-robin, but only while
+  the last health check saw them reachable and within
+  `replica_max_lag_seconds` of the primary
+- a caller that wrote recently (any successful non-GET request) reads from
+  the primary for `read_your_writes_seconds`, so they see their own writes
+- with no replicas configured, or none healthy, reads go to the primary
+
+The write marker is a short-lived Redis key per caller, set before the
+write's response goes out, so every worker and pod sees it. Each process
+also remembers its own recent writers, which answers most checks without a
+round trip and keeps stickiness within a worker while Redis is unreachable.
+The window is sized to cover typical replication lag; it is a guard, not a
+consistency guarantee.
+"""
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Iterator, List, Optional, Union
+
+from fastapi import Depends, Header
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config.settings import settings
+from services import auth_cache, db
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except Exception:  # pragma: no cover - redis import failure
+    redis = None  # type: ignore
+    aioredis = None  # type: ignore
+from telemetry.pool_metrics import PoolMetrics
+
+
+logger = logging.getLogger(__name__)
+
+# `Session.info` key set on replica sessions; callers that cache what they read
+# check it so a lagging replica cannot refill a cache right after an invalidation
+REPLICA_INFO_KEY = "read_replica"
+
+_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+@dataclass
+class Replica:
+    url: str
+    engine: Engine
+    session_factory: sessionmaker
+    metrics: PoolMetrics
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+    _async_engine: Optional[AsyncEngine] = field(default=None, repr=False)
+    _async_session_factory: Optional[async_sessionmaker] = field(default=None, repr=False)
+
+    def async_session(self) -> AsyncSession:
+        if self._async_session_factory is None:
+            url = db.async_database_url(self.url)
+            self._async_engine = create_async_engine(
+                url, **db.pool_kwargs(url, AsyncAdaptedQueuePool, self.metrics)
+            )
+            self._async_session_factory = async_sessionmaker(
+                self._async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+        return self._async_session_factory()
+
+
+class RecentWriters:
+    """
+    Caller -> time until which they read from the primary.
+
+    Marks go to Redis (shared by all workers) and to a bounded local map;
+    checks consult the local map first and Redis on a local miss. After a
+    Redis error the shared store is skipped for `redis_retry_seconds`.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        maxsize: int = 100_000,
+        redis_url: Optional[str] = None,
+        redis_client: Any = None,
+        async_redis_client: Any = None,
+        redis_retry_seconds: float = 5.0,
+    ):
+        self.window_seconds = window_seconds
+        self.maxsize = maxsize
+        self.redis_retry_seconds = redis_retry_seconds
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if redis_url and redis is not None:
+            options = dict(decode_responses=True, socket_connect_timeout=0.5, socket_timeout=0.5)
+            try:
+                if redis_client is None:
+                    redis_client = redis.Redis.from_url(redis_url, **options)
+                if async_redis_client is None:
+                    async_redis_client = aioredis.Redis.from_url(redis_url, **options)
+            except Exception as exc:  # pragma: no cover - invalid URL
+                logger.warning(f"[Replica] Redis unavailable, read-your-writes is per process: {exc}")
+        self._redis = redis_client
+        self._async_redis = async_redis_client
+        self._redis_down_until = 0.0
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"read_your_writes:{key}"
+
+    def _window_ms(self) -> int:
+        return max(1, int(self.window_seconds * 1000))
+
+    def _redis_usable(self, client: Any) -> bool:
+        return client is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, exc: Exception) -> None:
+        self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+        logger.warning(f"[Replica] Redis error, read-your-writes is per process: {exc}")
+
+    def _mark_local(self, key: str) -> None:
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.window_seconds
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _is_recent_local(self, key: str) -> bool:
+        with self._lock:
+            until = self._entries.get(key)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._entries[key]
+                return False
+            return True
+
+    def mark(self, key: str) -> None:
+        if self.window_seconds <= 0:
+            return
+        self._mark_local(key)
+        if self._redis_usable(self._redis):
+            try:
+                self._redis.set(self._redis_key(key), 1, px=self._window_ms())
+            except Exception as exc:
+                self._redis_failed(exc)
+
+    async def amark(self, key: str) -> None:
+        """`mark` without blocking the event loop."""
+        if self.window_seconds <= 0:
+            return
+        self._mark_local(key)
+        if self._redis_usable(self._async_redis):
+            try:
+                await self._async_redis.set(self._redis_key(key), 1, px=self._window_ms())
+            except Exception as exc:
+                self._redis_failed(exc)
+
+    def is_recent(self, key: str) -> bool:
+        if self._is_recent_local(key):
+            return True
+        if self._redis_usable(self._redis):
+            try:
+                return bool(self._redis.exists(self._redis_key(key)))
+            except Exception as exc:
+                self._redis_failed(exc)
+        return False
+
+    async def ais_recent(self, key: str) -> bool:
+        """`is_recent` without blocking the event loop."""
+        if self._is_recent_local(key):
+            return True
+        if self._redis_usable(self._async_redis):
+            try:
+                return bool(await self._async_redis.exists(self._redis_key(key)))
+            except Exception as exc:
+                self._redis_failed(exc)
+        return False
+
+
+class ReplicaSet:
+    def __init__(self, urls: List[str], max_lag_seconds: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.replicas: List[Replica] = []
+        for index, url in enumerate(urls):
+            sync_url = make_url(url)
+            metrics = PoolMetrics(f"replica-{index}")
+            engine = create_engine(sync_url, **db.pool_kwargs(sync_url, QueuePool, metrics))
+            self.replicas.append(Replica(
+                url=url,
+                engine=engine,
+                session_factory=sessionmaker(autocommit=False, autoflush=False, bind=engine),
+                metrics=metrics,
+            ))
+        self._counter = itertools.count()
+        self._checker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def pick(self) -> Optional[Replica]:
+        """Next healthy replica, round-robin; None when there is none."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def check_health(self) -> None:
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    if conn.dialect.name == "postgresql":
+                        lag = float(conn.execute(_LAG_QUERY).scalar() or 0)
+                    else:
+                        conn.execute(text("SELECT 1"))
+                        lag = 0.0
+            except Exception as exc:
+                if replica.healthy:
+                    logger.warning(f"[Replica] {replica.engine.url!r} unreachable, reading from primary: {exc}")
+                replica.healthy, replica.lag_seconds, replica.last_error = False, None, str(exc)[:200]
+                continue
+
+            was_healthy = replica.healthy
+            replica.lag_seconds = lag
+            replica.last_error = None
+            replica.healthy = lag <= self.max_lag_seconds
+            if was_healthy and not replica.healthy:
+                logger.warning(f"[Replica] {replica.engine.url!r} lagging {lag:.1f}s, reading from primary")
+
+    def start(self, interval_seconds: float) -> None:
+        """Check replica health now and then every `interval_seconds` in a daemon thread."""
+        if not self.replicas or self._checker is not None:
+            return
+
+        def run() -> None:
+            while not self._stop.is_set():
+                try:
+                    self.check_health()
+                except Exception as exc:  # pragma: no cover - defensive
+                    logger.error(f"[Replica] Health check failed: {exc}")
+                self._stop.wait(interval_seconds)
+
+        self._checker = threading.Thread(target=run, name="replica-health", daemon=True)
+        self._checker.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "url": replica.engine.url.render_as_string(hide_password=True),
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "last_error": replica.last_error,
+                "pool": replica.metrics.snapshot(replica.engine.pool),
+            }
+            for replica in self.replicas
+        ]
+
+
+def _replica_urls() -> List[str]:
+    return [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()]
+
+
+replica_set = ReplicaSet(_replica_urls(), settings.replica_max_lag_seconds)
+# Redis is only consulted when replicas exist; without them every read uses the primary anyway
+recent_writers = RecentWriters(
+    settings.read_your_writes_seconds,
+    redis_url=settings.redis_url if replica_set.replicas else None,
+)
+
+
+def caller_key(authorization: Optional[str], x_user_id: Optional[str]) -> Optional[str]:
+    """
+    Identify the caller for read-your-writes stickiness (None if anonymous).
+    Depends only on the request, never on this process's caches, so the worker
+    that marks a write and the one serving the next read build the same key.
+    """
+    if authorization and authorization.startswith("Bearer "):
+        return f"token:{auth_cache.token_digest(authorization[len('Bearer '):])}"
+    if x_user_id:
+        return f"user:{x_user_id}"
+    return None
+
+
+async def mark_write(authorization: Optional[str], x_user_id: Optional[str]) -> None:
+    key = caller_key(authorization, x_user_id)
+    if key:
+        await recent_writers.amark(key)
+
+
+_READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class WriteTrackingMiddleware:
+    """ASGI middleware: successful non-read requests mark the caller as a recent writer."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in _READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = dict(scope["headers"])
+                authorization = headers.get(b"authorization")
+                x_user_id = headers.get(b"x-user-id")
+                await mark_write(
+                    authorization.decode("latin-1") if authorization else None,
+                    x_user_id.decode("latin-1") if x_user_id else None,
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def is_replica_session(session: Union[Session, AsyncSession]) -> bool:
+    """True when `session` was handed out by `get_read_db`/`get_async_read_db` for a replica."""
+    return REPLICA_INFO_KEY in session.info
+
+
+def _replica_for(authorization: Optional[str], x_user_id: Optional[str]) -> Optional[Replica]:
+    replica = replica_set.pick()
+    if replica is None:
+        return None
+    key = caller_key(authorization, x_user_id)
+    if key and recent_writers.is_recent(key):
+        return None
+    return replica
+
+
+async def _async_replica_for(authorization: Optional[str], x_user_id: Optional[str]) -> Optional[Replica]:
+    replica = replica_set.pick()
+    if replica is None:
+        return None
+    key = caller_key(authorization, x_user_id)
+    if key and await recent_writers.ais_recent(key):
+        return None
+    return replica
+
+
+def get_read_db(
+    authorization: Optional[str] = Header(None),
+    x_user_id: Optional[str] = Header(None, alias="X-User-Id"),
+    primary: Session = Depends(db.get_db),
+) -> Iterator[Session]:
+    """
+    FastAPI dependency: session for read-only endpoints.
+
+    Uses a replica when one is healthy and the caller has not written
+    recently; otherwise the primary session (opened lazily, so unused
+    primary sessions cost no connection).
+    """
+    replica = _replica_for(authorization, x_user_id)
+    if replica is None:
+        yield primary
+        return
+    session = replica.session_factory()
+    session.info[REPLICA_INFO_KEY] = replica.url
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+async def get_async_read_db(
+    authorization: Optional[str] = Header(None),
+    x_user_id: Optional[str] = Header(None, alias="X-User-Id"),
+    primary: AsyncSession = Depends(db.get_async_db),
+) -> AsyncIterator[AsyncSession]:
+    """Async variant of `get_read_db`."""
+    replica = await _async_replica_for(authorization, x_user_id)
+    if replica is None:
+        yield primary
+        return
+    async with replica.async_session() as session:
+        session.info[REPLICA_INFO_KEY] = replica.url
+        yield session
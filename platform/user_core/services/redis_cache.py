@@ -123,6 +123,59 @@ def cache_delete(key: str) -> bool:
         return False
 
 
+def cache_hget(key: str, field: str) -> Optional[Any]:
+    """
+    從 hash 緩存獲取單一欄位
+
+    Args:
+        key: 緩存鍵
+        field: hash 欄位
+
+    Returns:
+        緩存的數據，如果不存在或 Redis 不可用則返回 None
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    try:
+        value = client.hget(key, field)
+        if value:
+            return json.loads(value)
+        return None
+    except Exception as e:
+        print(f"⚠️ Redis 讀取失敗: {e}")
+        return None
+
+
+def cache_hset(key: str, field: str, value: Any, ttl: int = 300) -> bool:
+    """
+    設置 hash 緩存欄位（整個 hash 共用過期時間，可用 cache_delete 一次清除）
+
+    Args:
+        key: 緩存鍵
+        field: hash 欄位
+        value: 要緩存的數據（將被序列化為 JSON）
+        ttl: 整個 hash 的過期時間（秒）
+
+    Returns:
+        是否成功設置
+    """
+    client = get_redis_client()
+    if client is None:
+        return False
+
+    try:
+        pipe = client.pipeline()
+        pipe.hset(key, field, json.dumps(value))
+        pipe.expire(key, ttl)
+        pipe.execute()
+        return True
+    except Exception as e:
+        print(f"⚠️ Redis 寫入失敗: {e}")
+        return False
+
+
 def cache_invalidate_pattern(pattern: str) -> bool:
     """
     根據模式刪除緩存
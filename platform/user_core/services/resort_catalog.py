@@ -0,0 +1,181 @@
+"""
+Process-level resort catalog for the ski map.
+
+The catalog is fetched from resort_api page by page (the list endpoint caps
+`limit` at 100) and indexed by region once per refresh, so ski-map requests
+only join a user's visited set against an in-memory index.
+
+- fresh (younger than `ski_map_catalog_ttl_seconds`): served from memory
+- stale: served from memory while a single background task refreshes it
+- never loaded: the first caller awaits the fetch; concurrent callers share it
+- fetch failure: the previous catalog is kept and the fetch is retried after
+  `ski_map_catalog_retry_seconds`
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGION = "其他"
+PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class CatalogIndex:
+    """Immutable snapshot of the catalog, grouped by region."""
+    regions: Dict[str, Tuple[dict, ...]] = field(default_factory=dict)
+    region_of: Dict[str, str] = field(default_factory=dict)
+    version: str = ""
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.version)
+
+    @property
+    def total(self) -> int:
+        return len(self.region_of)
+
+
+def _normalize(resort: dict) -> Optional[dict]:
+    """Accept both resort_api summaries (`resort_id`, `names`) and flat dicts."""
+    resort_id = resort.get("id") or resort.get("resort_id")
+    if not resort_id:
+        return None
+    names = resort.get("names") or {}
+    return {
+        "id": str(resort_id),
+        "name_zh": resort.get("name_zh") or names.get("zh"),
+        "name_en": resort.get("name_en") or names.get("en"),
+        "region": resort.get("region") or DEFAULT_REGION,
+    }
+
+
+def build_index(resorts: List[dict]) -> CatalogIndex:
+    """Group resorts by region; the version changes whenever the catalog does."""
+    entries = sorted(
+        (entry for entry in map(_normalize, resorts) if entry is not None),
+        key=lambda entry: entry["id"],
+    )
+    regions: Dict[str, List[dict]] = {}
+    region_of: Dict[str, str] = {}
+    for entry in entries:
+        region = entry.pop("region")
+        if entry["id"] in region_of:
+            continue
+        regions.setdefault(region, []).append(entry)
+        region_of[entry["id"]] = region
+
+    digest = hashlib.sha1(
+        json.dumps([regions, sorted(region_of.items())], ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:12]
+    return CatalogIndex(
+        regions={region: tuple(items) for region, items in regions.items()},
+        region_of=region_of,
+        version=digest,
+    )
+
+
+class ResortCatalog:
+    def __init__(
+        self,
+        base_url: str,
+        ttl_seconds: float,
+        retry_seconds: float,
+        timeout_seconds: float = 10.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self.timeout_seconds = timeout_seconds
+        self._transport = transport
+        self._index = CatalogIndex()
+        self._expires_at = 0.0
+        self._refresh: Optional[asyncio.Task] = None
+        self.last_error: Optional[str] = None
+
+    def current(self) -> CatalogIndex:
+        """The loaded catalog as-is (empty before the first fetch); never blocks."""
+        return self._index
+
+    async def get(self) -> CatalogIndex:
+        """The catalog, refreshing it in the background once it is stale."""
+        if time.monotonic() < self._expires_at:
+            return self._index
+        task = self._refresh_task()
+        if self._index.loaded:
+            return self._index
+        return await asyncio.shield(task)
+
+    def prefetch(self) -> None:
+        """Start loading the catalog without waiting for it (call from a running loop)."""
+        if time.monotonic() >= self._expires_at:
+            self._refresh_task()
+
+    def _refresh_task(self) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        if self._refresh is None or self._refresh.done() or self._refresh.get_loop() is not loop:
+            self._refresh = loop.create_task(self.refresh())
+        return self._refresh
+
+    async def refresh(self) -> CatalogIndex:
+        try:
+            resorts = await self._fetch_all()
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.warning(f"[ResortCatalog] Fetch from {self.base_url} failed, keeping previous catalog: {exc}")
+            self.last_error = str(exc)[:200]
+            self._expires_at = time.monotonic() + self.retry_seconds
+            return self._index
+
+        self._index = build_index(resorts)
+        self._expires_at = time.monotonic() + self.ttl_seconds
+        self.last_error = None
+        return self._index
+
+    async def _fetch_all(self) -> List[dict]:
+        resorts: List[dict] = []
+        async with httpx.AsyncClient(
+            base_url=self.base_url, timeout=self.timeout_seconds, transport=self._transport
+        ) as client:
+            while True:
+                response = await client.get("/resorts", params={"limit": PAGE_SIZE, "offset": len(resorts)})
+                response.raise_for_status()
+                data = response.json()
+
+                # Handle both paginated and direct list responses
+                if isinstance(data, list):
+                    return resorts + data
+                if not isinstance(data, dict):
+                    raise ValueError(f"unexpected /resorts payload: {type(data).__name__}")
+                items = data.get("items") or []
+                resorts.extend(items)
+                if not items or len(resorts) >= data.get("total", 0):
+                    return resorts
+
+    def stats(self) -> dict:
+        return {
+            "version": self._index.version or None,
+            "resorts": self._index.total,
+            "regions": len(self._index.regions),
+            "expires_in_seconds": round(max(self._expires_at - time.monotonic(), 0.0), 1),
+            "last_error": self.last_error,
+        }
+
+
+catalog = ResortCatalog(
+    settings.resort_api_url,
+    ttl_seconds=settings.ski_map_catalog_ttl_seconds,
+    retry_seconds=settings.ski_map_catalog_retry_seconds,
+)
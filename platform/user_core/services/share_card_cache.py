@@ -0,0 +1,163 @@
+"""
+Content-addressed cache for generated share card images.
+
+Imagen calls take up to a minute and cost external quota, while identical
+inputs (same visit, achievement or milestone) always describe the same card.
+Cards are keyed by a hash of the prompt and generation parameters, stored in a
+size-capped LRU store, and concurrent requests for the same card share one
+generation call. The generation runs as its own task, so a client that
+disconnects does not cancel it for the other requests waiting on it.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def card_cache_key(prompt: str, params: Dict[str, Any]) -> str:
+    """Stable content hash of a generation request."""
+    canonical = json.dumps({"prompt": prompt, "params": params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ShareCardStore(ABC):
+    """Object-store interface for cached card bytes."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Stored bytes for `key`, or None on a miss."""
+        pass
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        """Store `data` under `key`."""
+        pass
+
+
+class LocalDiskShareCardStore(ShareCardStore):
+    """
+    Cards stored as files under `root`, evicted least-recently-used first once
+    the total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.png"
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU order from file access times after a restart."""
+        entries = []
+        for path in self.root.glob("*.png"):
+            stat = path.stat()
+            entries.append((stat.st_atime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._total_bytes += size
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._sizes:
+                return None
+            self._sizes.move_to_end(key)
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by a concurrent put; treat it as a miss
+            with self._lock:
+                self._total_bytes -= self._sizes.pop(key, 0)
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        # Write-then-rename so readers never see a partial file
+        tmp_path = self._path(key).with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self._path(key))
+
+        with self._lock:
+            self._total_bytes += len(data) - self._sizes.pop(key, 0)
+            self._sizes[key] = len(data)
+            while self._total_bytes > self.max_bytes and self._sizes:
+                evicted, size = self._sizes.popitem(last=False)
+                self._total_bytes -= size
+                try:
+                    self._path(evicted).unlink()
+                except FileNotFoundError:
+                    pass
+
+
+class ShareCardCache:
+    """Read-through card cache with single-flight generation."""
+
+    def __init__(self, store: ShareCardStore):
+        self.store = store
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get_or_generate(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """Return cached bytes for `key`, generating them at most once concurrently."""
+        data = await asyncio.to_thread(self.store.get, key)
+        if data is not None:
+            return data
+
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.get_running_loop().create_task(self._generate_and_store(key, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    async def _generate_and_store(self, key: str, generate: Callable[[], Awaitable[bytes]]) -> bytes:
+        data = await generate()
+        try:
+            await asyncio.to_thread(self.store.put, key, data)
+        except OSError as exc:
+            logger.warning(f"Failed to store share card {key}: {exc}")
+        return data
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Waiters re-raise it; avoid "never retrieved" noise once all left
+
+
+_share_card_cache: Optional[ShareCardCache] = None
+
+
+def get_share_card_cache() -> ShareCardCache:
+    """Get the process-wide share card cache."""
+    global _share_card_cache
+    if _share_card_cache is None:
+        store = LocalDiskShareCardStore(
+            settings.share_card_cache_dir,
+            settings.share_card_cache_max_bytes,
+        )
+        _share_card_cache = ShareCardCache(store)
+    return _share_card_cache
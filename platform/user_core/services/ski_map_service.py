@@ -1,75 +1,114 @@
 """
 Ski map service - visualize user's ski resort conquests.
+
+Region rollups are computed against the shared resort catalog index
+(`services.resort_catalog`); the only per-user input is the set of visited
+resort IDs, which is cached per user and dropped on every course-visit write.
+
+The cache is only filled from primary reads: a replica that has not yet
+replayed a write would otherwise put the pre-write set back right after the
+invalidation. The async variants used by the API run the (blocking) Redis
+calls in a worker thread so they never stall the event loop.
 """
-from typing import Dict, List
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set
 import uuid
-import requests
-import os
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
+from config.settings import settings
 from models.course_tracking import CourseVisit
+from services import read_replicas, redis_cache, resort_catalog
+from services.resort_catalog import CatalogIndex
+
+
+def _visited_key(user_id: uuid.UUID) -> str:
+    return f"user:{user_id}:ski_map:visited"
+
+
+def invalidate_user_ski_map(user_id: uuid.UUID) -> None:
+    """Drop the cached visited set after a user's course visits change."""
+    redis_cache.cache_delete(_visited_key(user_id))
+
+
+def _query_visited_resort_ids(db: Session, user_id: uuid.UUID) -> List[str]:
+    rows = db.query(CourseVisit.resort_id).filter(
+        CourseVisit.user_id == user_id
+    ).distinct().all()
+    return sorted(row[0] for row in rows)
+
+
+def get_visited_resort_ids(db: Session, user_id: uuid.UUID) -> List[str]:
+    """Distinct resort IDs the user has visited (cached per user)."""
+    cache_key = _visited_key(user_id)
+    cached = redis_cache.cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    visited_resort_ids = _query_visited_resort_ids(db, user_id)
+    if not read_replicas.is_replica_session(db):
+        redis_cache.cache_set(cache_key, visited_resort_ids, ttl=settings.ski_map_visited_ttl_seconds)
+    return visited_resort_ids
+
+
+async def aget_visited_resort_ids(db: AsyncSession, user_id: uuid.UUID) -> List[str]:
+    """Async variant of `get_visited_resort_ids`; Redis calls run in a worker thread."""
+    cache_key = _visited_key(user_id)
+    cached = await asyncio.to_thread(redis_cache.cache_get, cache_key)
+    if cached is not None:
+        return cached
+
+    visited_resort_ids = await db.run_sync(_query_visited_resort_ids, user_id)
+    if not read_replicas.is_replica_session(db):
+        await asyncio.to_thread(
+            redis_cache.cache_set, cache_key, visited_resort_ids, settings.ski_map_visited_ttl_seconds
+        )
+    return visited_resort_ids
+
+
+def _region_stats(resorts: Iterable[dict], visited: Set[str]) -> dict:
+    items = [{**resort, "visited": resort["id"] in visited} for resort in resorts]
+    visited_count = sum(1 for item in items if item["visited"])
+    return {
+        "total": len(items),
+        "visited": visited_count,
+        "completion_percentage": round((visited_count / len(items)) * 100, 1) if items else 0.0,
+        "resorts": items,
+    }
 
 
-def get_ski_map_data(db: Session, user_id: uuid.UUID) -> dict:
+def get_ski_map_data(
+    db: Session,
+    user_id: uuid.UUID,
+    catalog: Optional[CatalogIndex] = None
+) -> dict:
     """
     Get ski map data for a user showing visited and unvisited resorts.
 
     Args:
         db: Database session
         user_id: User ID
+        catalog: Resort catalog index (defaults to the currently loaded one)
 
     Returns:
         Dictionary with ski map data including visited resorts and region statistics
     """
-    # 1. Get visited resort IDs from course visits
-    visited_resorts_query = db.query(CourseVisit.resort_id).filter(
-        CourseVisit.user_id == user_id
-    ).distinct()
-
-    visited_resort_ids = [row[0] for row in visited_resorts_query.all()]
-
-    # 2. Fetch all resorts from resort API
-    all_resorts = _fetch_all_resorts()
-
-    # 3. Calculate statistics by region
-    region_stats = {}
-
-    for resort in all_resorts:
-        region = resort.get("region", "其他")  # Default to "其他" if no region
-
-        if region not in region_stats:
-            region_stats[region] = {
-                "total": 0,
-                "visited": 0,
-                "resorts": []
-            }
-
-        is_visited = resort["id"] in visited_resort_ids
-
-        region_stats[region]["total"] += 1
-        if is_visited:
-            region_stats[region]["visited"] += 1
-
-        region_stats[region]["resorts"].append({
-            "id": resort["id"],
-            "name_zh": resort.get("name_zh"),
-            "name_en": resort.get("name_en"),
-            "visited": is_visited
-        })
-
-    # 4. Calculate completion percentages
-    for region_data in region_stats.values():
-        if region_data["total"] > 0:
-            region_data["completion_percentage"] = round(
-                (region_data["visited"] / region_data["total"]) * 100, 1
-            )
-        else:
-            region_data["completion_percentage"] = 0.0
-
-    # 5. Calculate overall statistics
-    total_resorts = len(all_resorts)
+    if catalog is None:
+        catalog = resort_catalog.catalog.current()
+    return build_ski_map_data(user_id, get_visited_resort_ids(db, user_id), catalog)
+
+
+def build_ski_map_data(user_id: uuid.UUID, visited_resort_ids: List[str], catalog: CatalogIndex) -> dict:
+    """Ski map rollups for an already-loaded visited set."""
+    visited = set(visited_resort_ids)
+
+    region_stats: Dict[str, dict] = {
+        region: _region_stats(resorts, visited)
+        for region, resorts in catalog.regions.items()
+    }
+
+    total_resorts = catalog.total
     total_visited = len(visited_resort_ids)
     completion_percentage = round(
         (total_visited / total_resorts) * 100, 1
@@ -85,41 +124,12 @@ def get_ski_map_data(db: Session, user_id: uuid.UUID) -> dict:
     }
 
 
-def _fetch_all_resorts() -> List[dict]:
-    """
-    Fetch all resorts from the resort API service.
-
-    Returns:
-        List of resort dictionaries
-    """
-    # Get resort API URL from environment
-    resort_api_url = os.getenv("RESORT_API_URL", "http://localhost:8000")
-
-    try:
-        response = requests.get(
-            f"{resort_api_url}/resorts",
-            params={"limit": 500},  # Get all resorts
-            timeout=10
-        )
-        response.raise_for_status()
-
-        data = response.json()
-
-        # Handle both paginated and direct list responses
-        if isinstance(data, dict) and "items" in data:
-            return data["items"]
-        elif isinstance(data, list):
-            return data
-        else:
-            return []
-
-    except requests.RequestException as e:
-        print(f"Failed to fetch resorts from API: {e}")
-        # Return empty list if API is unavailable
-        return []
-
-
-def get_region_detail(db: Session, user_id: uuid.UUID, region: str) -> dict:
+def get_region_detail(
+    db: Session,
+    user_id: uuid.UUID,
+    region: str,
+    catalog: Optional[CatalogIndex] = None
+) -> dict:
     """
     Get detailed information for a specific region.
 
@@ -127,18 +137,38 @@ def get_region_detail(db: Session, user_id: uuid.UUID, region: str) -> dict:
         db: Database session
         user_id: User ID
         region: Region name
+        catalog: Resort catalog index (defaults to the currently loaded one)
 
     Returns:
         Dictionary with region details
     """
-    map_data = get_ski_map_data(db, user_id)
+    if catalog is None:
+        catalog = resort_catalog.catalog.current()
+    _check_region(region, catalog)
+    return build_region_detail(region, get_visited_resort_ids(db, user_id), catalog)
 
-    region_data = map_data["region_stats"].get(region)
 
-    if not region_data:
+def _check_region(region: str, catalog: CatalogIndex) -> None:
+    if region not in catalog.regions:
         raise ValueError(f"Region '{region}' not found")
 
+
+def build_region_detail(region: str, visited_resort_ids: List[str], catalog: CatalogIndex) -> dict:
+    """Region detail for an already-loaded visited set (the region must exist)."""
+    resorts = catalog.regions[region]
+    visited = set(visited_resort_ids)
     return {
         "region": region,
-        **region_data
+        **_region_stats(resorts, visited)
     }
+
+
+async def aget_ski_map_data(db: AsyncSession, user_id: uuid.UUID, catalog: CatalogIndex) -> dict:
+    """Async variant of `get_ski_map_data` for the API."""
+    return build_ski_map_data(user_id, await aget_visited_resort_ids(db, user_id), catalog)
+
+
+async def aget_region_detail(db: AsyncSession, user_id: uuid.UUID, region: str, catalog: CatalogIndex) -> dict:
+    """Async variant of `get_region_detail`; unknown regions fail before any lookup."""
+    _check_region(region, catalog)
+    return build_region_detail(region, await aget_visited_resort_ids(db, user_id), catalog)
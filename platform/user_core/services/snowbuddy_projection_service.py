@@ -0,0 +1,182 @@
+"""
+Snowbuddy request-state projections.
+
+`snowbuddy.match.request.*` and `snowbuddy.trip.*` behavior events are folded
+into `snowbuddy_match_requests` / `snowbuddy_trip_applications` in the same
+transaction that stores the event. Readers (e.g. accepting an application)
+then do a keyed lookup instead of scanning event payloads.
+
+Events are applied idempotently: a response older than the last applied
+event does not change the status, and a response that arrives before its
+`sent` event creates the row, which the `sent` event later fills in.
+`rebuild` replays all stored events, e.g. to backfill the tables.
+"""
+from __future__ import annotations
+
+from datetime import datetime, UTC
+from typing import Callable, Dict, List, Optional
+import uuid
+
+from sqlalchemy.orm import Session, lazyload
+
+from models.behavior_event import BehaviorEvent
+from models.snowbuddy import SnowbuddyMatchRequest, SnowbuddyTripApplication
+
+
+PENDING = "pending"
+ACCEPTED = "accepted"
+DECLINED = "declined"
+LEFT = "left"
+
+
+def _naive_utc(value: Optional[datetime]) -> datetime:
+    """Columns store naive UTC; normalize aware datetimes before comparing."""
+    if value is None:
+        return datetime.now(UTC).replace(tzinfo=None)
+    if value.tzinfo is not None:
+        return value.astimezone(UTC).replace(tzinfo=None)
+    return value
+
+
+def _as_uuid(value) -> Optional[uuid.UUID]:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _get_or_create(db: Session, model, request_id: str, occurred_at: datetime, **fields):
+    row = db.get(model, request_id)
+    if row is None:
+        row = model(request_id=request_id, created_at=occurred_at, updated_at=occurred_at, **fields)
+        db.add(row)
+        # Make the row visible to db.get() for later events in the same transaction
+        db.flush([row])
+    return row
+
+
+def _respond(row, status: str, responder_id, occurred_at: datetime) -> None:
+    if occurred_at < _naive_utc(row.updated_at):
+        return
+    row.status = status
+    row.responded_by = responder_id
+    row.updated_at = occurred_at
+
+
+def _match_request_sent(db: Session, event: BehaviorEvent, occurred_at: datetime) -> None:
+    payload = event.payload
+    row = _get_or_create(db, SnowbuddyMatchRequest, payload["request_id"], occurred_at, status=PENDING)
+    row.requester_id = event.user_id
+    row.target_user_id = _as_uuid(payload.get("target_user_id"))
+    row.created_at = occurred_at
+
+
+def _match_request_response(status: str) -> Callable:
+    def handler(db: Session, event: BehaviorEvent, occurred_at: datetime) -> None:
+        row = _get_or_create(db, SnowbuddyMatchRequest, event.payload["request_id"], occurred_at)
+        _respond(row, status, event.user_id, occurred_at)
+    return handler
+
+
+def _trip_apply_sent(db: Session, event: BehaviorEvent, occurred_at: datetime) -> None:
+    payload = event.payload
+    row = _get_or_create(
+        db, SnowbuddyTripApplication, payload["request_id"], occurred_at,
+        trip_id=str(payload["trip_id"]), status=PENDING,
+    )
+    row.applicant_id = event.user_id
+    row.created_at = occurred_at
+
+
+def _trip_apply_response(status: str) -> Callable:
+    def handler(db: Session, event: BehaviorEvent, occurred_at: datetime) -> None:
+        payload = event.payload
+        row = _get_or_create(
+            db, SnowbuddyTripApplication, payload["request_id"], occurred_at,
+            trip_id=str(payload["trip_id"]),
+        )
+        _respond(row, status, event.user_id, occurred_at)
+    return handler
+
+
+def _trip_leave(db: Session, event: BehaviorEvent, occurred_at: datetime) -> None:
+    payload = event.payload
+    applicant_id = _as_uuid(payload.get("user_id")) or event.user_id
+    applications = db.query(SnowbuddyTripApplication).filter(
+        SnowbuddyTripApplication.trip_id == str(payload["trip_id"]),
+        SnowbuddyTripApplication.applicant_id == applicant_id,
+        SnowbuddyTripApplication.status == ACCEPTED,
+    ).all()
+    for application in applications:
+        _respond(application, LEFT, event.user_id, occurred_at)
+
+
+_HANDLERS: Dict[str, Callable[[Session, BehaviorEvent, datetime], None]] = {
+    "snowbuddy.match.request.sent": _match_request_sent,
+    "snowbuddy.match.request.accepted": _match_request_response(ACCEPTED),
+    "snowbuddy.match.request.declined": _match_request_response(DECLINED),
+    "snowbuddy.trip.apply.sent": _trip_apply_sent,
+    "snowbuddy.trip.apply.accepted": _trip_apply_response(ACCEPTED),
+    "snowbuddy.trip.apply.declined": _trip_apply_response(DECLINED),
+    "snowbuddy.trip.leave": _trip_leave,
+}
+
+
+def handles(event_type: str) -> bool:
+    return event_type in _HANDLERS
+
+
+def apply_event(db: Session, event: BehaviorEvent) -> bool:
+    """
+    Fold one event into the projections (the caller commits).
+
+    Returns False for event types without a projection or payloads missing
+    the keys the projection needs.
+    """
+    handler = _HANDLERS.get(event.event_type)
+    if handler is None:
+        return False
+    try:
+        handler(db, event, _naive_utc(event.occurred_at))
+    except KeyError:
+        return False
+    return True
+
+
+def rebuild(db: Session, batch_size: int = 1000) -> int:
+    """Replay every stored snowbuddy event in occurrence order; returns the count applied."""
+    applied = 0
+    query = (
+        db.query(BehaviorEvent)
+        .filter(BehaviorEvent.event_type.in_(list(_HANDLERS)))
+        .order_by(BehaviorEvent.occurred_at, BehaviorEvent.recorded_at)
+        .options(lazyload("*"))
+        .yield_per(batch_size)
+    )
+    for event in query:
+        applied += apply_event(db, event)
+    db.commit()
+    return applied
+
+
+def get_match_request(db: Session, request_id: str) -> Optional[SnowbuddyMatchRequest]:
+    return db.get(SnowbuddyMatchRequest, request_id)
+
+
+def get_trip_application(db: Session, request_id: str) -> Optional[SnowbuddyTripApplication]:
+    return db.get(SnowbuddyTripApplication, request_id)
+
+
+def get_trip_participants(db: Session, trip_id: str) -> List[SnowbuddyTripApplication]:
+    """Accepted applications for a trip (served by idx_snowbuddy_trip_app_trip_status)."""
+    return (
+        db.query(SnowbuddyTripApplication)
+        .filter(
+            SnowbuddyTripApplication.trip_id == trip_id,
+            SnowbuddyTripApplication.status == ACCEPTED,
+        )
+        .order_by(SnowbuddyTripApplication.updated_at)
+        .all()
+    )
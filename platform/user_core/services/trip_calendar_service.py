@@ -0,0 +1,114 @@
+"""
+Trip calendar query service.
+
+Calendar views filter trips by date-range overlap and bucket them by month in
+SQL (served by `idx_trips_date_range`) instead of loading a page of trips and
+filtering in Python. Year overviews are cached in one Redis hash per user
+(one field per year), so every trip write invalidates them with a single
+DEL of a known key.
+"""
+from calendar import monthrange
+from datetime import date
+from typing import Dict, List, Optional
+import uuid
+
+from sqlalchemy import case, extract, func, or_, select
+from sqlalchemy.orm import Session
+
+from models.trip_planning import Trip, TripBuddy
+from models.enums import BuddyStatus, TripStatus
+from services import redis_cache
+
+
+YEAR_OVERVIEW_TTL_SECONDS = 3600
+
+
+def _year_overview_key(user_id: uuid.UUID) -> str:
+    return f"user:{user_id}:trip_calendar:years"
+
+
+def _date_range(year: int, month: Optional[int] = None) -> tuple[date, date]:
+    """First and last day of a year, or of one month within it."""
+    if month is None:
+        return date(year, 1, 1), date(year, 12, 31)
+    return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+
+def _overlaps(range_start: date, range_end: date):
+    """Trips whose [start_date, end_date] intersects [range_start, range_end]."""
+    return (Trip.start_date <= range_end) & (Trip.end_date >= range_start)
+
+
+def get_calendar_trips(
+    db: Session,
+    user_id: uuid.UUID,
+    year: int,
+    month: Optional[int] = None
+) -> List[Trip]:
+    """Get a user's trips overlapping the given year (or month), by start date."""
+    range_start, range_end = _date_range(year, month)
+    return (
+        db.query(Trip)
+        .filter(Trip.user_id == user_id, _overlaps(range_start, range_end))
+        .order_by(Trip.start_date)
+        .all()
+    )
+
+
+def get_year_overview(db: Session, user_id: uuid.UUID, year: int) -> Dict:
+    """
+    Get per-month trip counts for a year.
+
+    Trips are bucketed by the month they start in; trips carried over from the
+    previous year count towards January. Results are cached per user and year.
+    """
+    cache_key = _year_overview_key(user_id)
+    cached = redis_cache.cache_hget(cache_key, str(year))
+    if cached is not None:
+        # JSON object keys come back as strings
+        cached["months"] = {int(m): c for m, c in cached["months"].items()}
+        return cached
+
+    range_start, range_end = _date_range(year)
+    bucket = case(
+        (Trip.start_date < range_start, 1),
+        else_=extract("month", Trip.start_date),
+    ).label("month")
+
+    rows = db.execute(
+        select(
+            bucket,
+            func.count().label("trips"),
+            func.count().filter(Trip.trip_status == TripStatus.COMPLETED).label("completed"),
+        )
+        .where(Trip.user_id == user_id, _overlaps(range_start, range_end))
+        .group_by(bucket)
+    ).all()
+
+    overview = {
+        "year": year,
+        "months": {int(row.month): row.trips for row in rows},
+        "total_trips": sum(row.trips for row in rows),
+        "completed_trips": sum(row.completed for row in rows),
+    }
+    redis_cache.cache_hset(cache_key, str(year), overview, ttl=YEAR_OVERVIEW_TTL_SECONDS)
+    return overview
+
+
+def get_shared_calendar_trips(db: Session, user_id: uuid.UUID) -> List[Trip]:
+    """Get own trips plus trips the user joined as an accepted buddy, in one query."""
+    joined_trip_ids = select(TripBuddy.trip_id).where(
+        TripBuddy.user_id == user_id,
+        TripBuddy.status.in_([BuddyStatus.ACCEPTED, BuddyStatus.CONFIRMED])
+    )
+    return (
+        db.query(Trip)
+        .filter(or_(Trip.user_id == user_id, Trip.trip_id.in_(joined_trip_ids)))
+        .order_by(Trip.start_date)
+        .all()
+    )
+
+
+def invalidate_user_calendar(user_id: uuid.UUID) -> None:
+    """Drop cached calendar rollups after a user's trips change."""
+    redis_cache.cache_delete(_year_overview_key(user_id))
@@ -27,10 +27,19 @@ from services.trip_service import (
     complete_trip,
     generate_share_link,
     get_trip_by_share_token,
+    get_trip_buddies,
     TripNotFoundError,
     UnauthorizedError
 )
 
+# Calendar queries
+from services.trip_calendar_service import (
+    get_calendar_trips,
+    get_year_overview,
+    get_shared_calendar_trips,
+    invalidate_user_calendar
+)
+
 
 class TripPlanningError(Exception):
     """Base exception for trip planning operations."""
@@ -65,4 +74,11 @@ __all__ = [
     'complete_trip',
     'generate_share_link',
     'get_trip_by_share_token',
+    'get_trip_buddies',
+    
+    # Calendar queries
+    'get_calendar_trips',
+    'get_year_overview',
+    'get_shared_calendar_trips',
+    'invalidate_user_calendar',
 ]
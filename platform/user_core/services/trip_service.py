@@ -7,13 +7,15 @@ from uuid import UUID
 from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
-from models.trip_planning import Trip, Season
+from models.trip_planning import Trip, Season, TripBuddy
 from models.course_tracking import CourseVisit
 from models.user_profile import UserProfile
 from models.enums import TripStatus, TripVisibility
 from schemas.trip_planning import TripCreate, TripUpdate, TripBase, TripSummary, UserInfo
 from domain.calendar.enums import EventType
 from services.calendar_service import CalendarService
+from services.trip_calendar_service import invalidate_user_calendar
+from services.ski_map_service import invalidate_user_ski_map
 from repositories.calendar_repository import CalendarEventRepository
 
 
@@ -51,6 +53,7 @@ def create_trip(db: Session, user_id: uuid.UUID, trip_data: TripCreate) -> Trip:
     db.add(trip)
     db.commit()
     db.refresh(trip)
+    invalidate_user_calendar(user_id)
     
     # Create calendar event
     calendar_repo = CalendarEventRepository(db)
@@ -105,6 +108,7 @@ def create_trips_batch(
     db.commit()
     for trip in trips:
         db.refresh(trip)
+    invalidate_user_calendar(user_id)
     return trips
 
 
@@ -232,6 +236,7 @@ def update_trip(
     trip.updated_at = datetime.now(UTC)
     db.commit()
     db.refresh(trip)
+    invalidate_user_calendar(user_id)
     
     # Update calendar event if it exists
     if events:
@@ -266,6 +271,7 @@ def delete_trip(db: Session, trip_id: uuid.UUID, user_id: uuid.UUID) -> bool:
     # Delete trip
     db.delete(trip)
     db.commit()
+    invalidate_user_calendar(user_id)
     return True
 
 
@@ -300,6 +306,8 @@ def complete_trip(
     db.refresh(trip)
     if course_visit:
         db.refresh(course_visit)
+        invalidate_user_ski_map(user_id)
+    invalidate_user_calendar(user_id)
     return trip, course_visit
 
 
@@ -315,6 +323,16 @@ def generate_share_link(db: Session, trip_id: uuid.UUID, user_id: uuid.UUID) ->
     return trip.share_token
 
 
+def get_trip_buddies(db: Session, trip_id: uuid.UUID) -> List[TripBuddy]:
+    """Get all buddy records (requests and members) for a trip."""
+    return (
+        db.query(TripBuddy)
+        .filter(TripBuddy.trip_id == trip_id)
+        .order_by(TripBuddy.requested_at)
+        .all()
+    )
+
+
 def get_trip_by_share_token(db: Session, share_token: str) -> Trip:
     """Get a trip by its share token."""
     trip = db.query(Trip).filter(Trip.share_token == share_token).first()
@@ -12,6 +12,7 @@ from models.trip_planning import TripBuddy
 from models.course_tracking import CourseRecommendation
 from models.gear import GearReminder
 from services.casi_skill_analyzer import update_casi_profile_task
+from services.casi_skill_updater import apply_casi_event_task
 
 
 class _WorkflowHttpAdapter:
@@ -46,9 +47,18 @@ class CasiWorkflowDispatcher:
             settings.casi_workflow_api_key,
         )
 
-    def dispatch(self, *, user_id: uuid.UUID, background_tasks: BackgroundTasks) -> None:
+    def dispatch(
+        self,
+        *,
+        user_id: uuid.UUID,
+        background_tasks: BackgroundTasks,
+        event_id: Optional[uuid.UUID] = None,
+    ) -> None:
         if self._client.configured:
             background_tasks.add_task(self._trigger_remote, user_id)
+        elif event_id is not None:
+            # Fold the new event into the decayed accumulators (O(1) per event)
+            background_tasks.add_task(apply_casi_event_task, event_id)
         else:
             background_tasks.add_task(update_casi_profile_task, user_id)
 
@@ -0,0 +1,73 @@
+"""
+Connection pool checkout metrics.
+
+SQLAlchemy has no "checkout started" event, so the wait for a pooled
+connection is measured by wrapping the pool's `_do_get`. The counters are
+fixed-size: totals plus the maximum wait, and the number of checkouts that
+hit `pool_timeout`.
+"""
+from __future__ import annotations
+
+import threading
+from time import perf_counter
+from typing import Any, Dict, Type
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+
+    def record(self, wait_seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def snapshot(self, pool: Pool | None = None) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            data: Dict[str, Any] = {
+                "name": self.name,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_seconds / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+        if pool is not None and hasattr(pool, "checkedout"):
+            data.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return data
+
+
+def instrument_pool(pool_class: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """Subclass `pool_class` so every checkout records its wait in `metrics`."""
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            connection = pool_class._do_get(self)
+        except exc.TimeoutError:
+            metrics.record(perf_counter() - started, timed_out=True)
+            raise
+        metrics.record(perf_counter() - started)
+        return connection
+
+    return type(f"Instrumented{pool_class.__name__}", (pool_class,), {"_do_get": _do_get})
@@ -0,0 +1,48 @@
+"""
+Startup profiling.
+
+Enabled with `USER_CORE_STARTUP_PROFILE=1`: each import/initialization step
+of the app is timed and a report sorted by cost is logged once startup
+completes. Disabled, `step()` only runs the wrapped block.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator, List, Tuple
+
+logger = logging.getLogger("user_core.startup")
+
+
+class StartupProfiler:
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.steps: List[Tuple[str, float]] = []
+        self._started_at = perf_counter()
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, perf_counter() - start))
+
+    def report(self) -> str:
+        total = perf_counter() - self._started_at
+        lines = [f"Startup profile ({total * 1000:.1f} ms since profiler start):"]
+        for name, elapsed in sorted(self.steps, key=lambda item: item[1], reverse=True):
+            lines.append(f"  {elapsed * 1000:8.1f} ms  {name}")
+        return "\n".join(lines)
+
+    def log_report(self) -> None:
+        if self.enabled:
+            logger.info(self.report())
+
+
+profiler = StartupProfiler(enabled=os.getenv("USER_CORE_STARTUP_PROFILE", "").lower() in ("1", "true"))
@@ -1,10 +1,15 @@
 """Utility functions."""
 from utils.user_utils import get_or_create_user, get_user_or_none, user_exists
 from utils.pagination import paginate, create_paginated_response
-from utils.query_utils import batch_load, eager_load_options, chunked, deduplicate
+from utils.query_utils import (
+    batch_load, eager_load_options, chunked, deduplicate, dialect_insert, insert_ignore
+)
+from utils.user_loader import UserLoader, get_user_loader, user_summary
 
 __all__ = [
     'get_or_create_user', 'get_user_or_none', 'user_exists',
     'paginate', 'create_paginated_response',
-    'batch_load', 'eager_load_options', 'chunked', 'deduplicate'
+    'batch_load', 'eager_load_options', 'chunked', 'deduplicate',
+    'dialect_insert', 'insert_ignore',
+    'UserLoader', 'get_user_loader', 'user_summary'
 ]
@@ -1,5 +1,6 @@
 """Query optimization utilities."""
-from typing import List, TypeVar, Callable, Any
+from typing import Dict, List, TypeVar, Callable, Any
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session, joinedload, selectinload
 
 T = TypeVar('T')
@@ -77,3 +78,38 @@ def deduplicate(items: List[T], key: Callable[[T], Any] = None) -> List[T]:
             seen.add(k)
             result.append(item)
     return result
+
+
+def dialect_insert(db: Session, model):
+    """
+    Dialect-specific INSERT supporting `on_conflict_do_nothing/do_update`.
+
+    Args:
+        db: Database session
+        model: Mapped class or table
+
+    Returns:
+        Insert construct for the session's dialect
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+def insert_ignore(db: Session, model, values: Dict[str, Any], index_elements: List[str]) -> bool:
+    """
+    INSERT ... ON CONFLICT DO NOTHING in a single statement.
+
+    Args:
+        db: Database session
+        model: Mapped class
+        values: Column values for the new row
+        index_elements: Columns of the unique constraint to check
+
+    Returns:
+        True if a row was inserted, False if it already existed
+    """
+    stmt = dialect_insert(db, model).values(**values).on_conflict_do_nothing(
+        index_elements=index_elements
+    )
+    return db.execute(stmt).rowcount == 1
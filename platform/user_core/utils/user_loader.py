@@ -0,0 +1,86 @@
+"""Request-scoped batched user loading (DataLoader style)."""
+from typing import Dict, Iterable, List, Optional
+import uuid
+
+from sqlalchemy.orm import Session
+
+from models.user_profile import UserProfile
+from utils.query_utils import chunked
+
+# SQL `IN` lists are split into chunks of this size
+MAX_IN_CLAUSE_SIZE = 500
+
+_SESSION_INFO_KEY = "user_loader"
+
+
+class UserLoader:
+    """
+    Batch and cache UserProfile lookups for the lifetime of one DB session.
+
+    Callers queue IDs with `prime_ids` (or pass them all to `load_many`);
+    the next load fetches every missing ID with a single `IN` query. Both hits
+    and misses are cached, so repeated lookups within a request are free.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._cache: Dict[uuid.UUID, Optional[UserProfile]] = {}
+        self._pending: set = set()
+
+    def prime_ids(self, user_ids: Iterable[uuid.UUID]) -> None:
+        """Queue IDs to be fetched with the next load."""
+        self._pending.update(uid for uid in user_ids if uid not in self._cache)
+
+    def prime(self, users: Iterable[UserProfile]) -> None:
+        """Seed the cache with already loaded users."""
+        for user in users:
+            self._cache[user.user_id] = user
+            self._pending.discard(user.user_id)
+
+    def load(self, user_id: uuid.UUID) -> Optional[UserProfile]:
+        """Get one user, flushing any queued IDs in the same query."""
+        return self.load_many([user_id]).get(user_id)
+
+    def load_many(self, user_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, UserProfile]:
+        """Get users by ID; missing users are absent from the result."""
+        user_ids = list(user_ids)
+        self.prime_ids(user_ids)
+        self._flush()
+        return {
+            uid: self._cache[uid]
+            for uid in user_ids
+            if self._cache.get(uid) is not None
+        }
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        pending: List[uuid.UUID] = list(self._pending)
+        self._pending.clear()
+        for batch in chunked(pending, MAX_IN_CLAUSE_SIZE):
+            users = self.db.query(UserProfile).filter(UserProfile.user_id.in_(batch)).all()
+            for user in users:
+                self._cache[user.user_id] = user
+        for uid in pending:
+            self._cache.setdefault(uid, None)
+
+
+def get_user_loader(db: Session) -> UserLoader:
+    """Get the UserLoader bound to this session (one per request via get_db)."""
+    loader = db.info.get(_SESSION_INFO_KEY)
+    if loader is None:
+        loader = UserLoader(db)
+        db.info[_SESSION_INFO_KEY] = loader
+    return loader
+
+
+def user_summary(user: Optional[UserProfile]) -> Optional[dict]:
+    """Compact user info used when enriching feed items and comments."""
+    if user is None:
+        return None
+    return {
+        "user_id": user.user_id,
+        "display_name": user.display_name,
+        "avatar_url": user.avatar_url,
+        "experience_level": user.experience_level,
+    }
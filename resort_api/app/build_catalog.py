@@ -0,0 +1,29 @@
+"""
+Compile the resort catalog into a snapshot that loads in milliseconds.
+
+    python -m app.build_catalog [--output PATH]
+
+Run after changing the YAML data or the alias table; a stale snapshot is
+ignored at startup (YAML is loaded instead), so forgetting only costs time.
+"""
+import argparse
+import logging
+from pathlib import Path
+
+from .catalog import write_snapshot
+from .db import DATA_DIRECTORY, SEARCH_ALIASES_FILE, get_snapshot_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile the resort catalog snapshot.")
+    parser.add_argument("--output", type=Path, default=None, help="Snapshot path (default: RESORT_API_CATALOG_SNAPSHOT)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    output = args.output or get_snapshot_path()
+    catalog = write_snapshot(DATA_DIRECTORY, SEARCH_ALIASES_FILE, output)
+    print(f"Wrote {output}: {len(catalog.resorts)} resorts, version {catalog.version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,40 @@
 """
 Card generator - creates shareable resort images.
+
+The resort layer (background, name, tagline, stats) is identical for every
+user, so it is rendered once per resort and cached. Each request only copies
+that layer and draws the personalization line; fully encoded cards are kept
+in a small LRU keyed by (resort, user, date, format).
 """
 import io
-from typing import Optional, Tuple
+import threading
+from typing import Iterable, Optional, Tuple
 from datetime import date
+from cachetools import LRUCache
 from PIL import Image, ImageDraw, ImageFont
+from starlette.concurrency import run_in_threadpool
 
 from .models import Resort
+from .config import get_settings
+
+CARD_FORMATS = {
+    "png": ("PNG", "image/png"),
+    "webp": ("WEBP", "image/webp"),
+}
 
 
 class FontLoader:
     """Handles font loading with fallback."""
-    
+
     _cache: dict = {}
-    
+
     @classmethod
     def get_font(cls, size: int) -> ImageFont.FreeTypeFont:
         """Get font with caching and fallback."""
         if size not in cls._cache:
             cls._cache[size] = cls._load_font(size)
         return cls._cache[size]
-    
+
     @staticmethod
     def _load_font(size: int) -> ImageFont.FreeTypeFont:
         try:
@@ -31,37 +45,56 @@ class FontLoader:
 
 class CardRenderer:
     """Renders resort share cards."""
-    
+
     WIDTH = 800
     HEIGHT = 450
     BG_COLOR = (18, 28, 48)
     TEXT_COLOR = (255, 255, 255)
     MUTED_COLOR = (200, 200, 200)
-    
-    def __init__(self, resort: Resort):
+
+    def __init__(self, resort: Resort, base: Optional[Image.Image] = None):
         self.resort = resort
-        self.img = Image.new('RGB', (self.WIDTH, self.HEIGHT), self.BG_COLOR)
+        self.img = base.copy() if base is not None else Image.new('RGB', (self.WIDTH, self.HEIGHT), self.BG_COLOR)
         self.draw = ImageDraw.Draw(self.img)
-    
-    def render(self, user_name: Optional[str] = None, activity_date: Optional[date] = None) -> bytes:
-        """Render the card and return as PNG bytes."""
+
+    def render_base(self) -> Image.Image:
+        """Render the resort-specific (user-independent) layer."""
         self._draw_resort_name()
         self._draw_tagline()
         self._draw_stats()
+        return self.img
+
+    def render(
+        self,
+        user_name: Optional[str] = None,
+        activity_date: Optional[date] = None,
+        image_format: str = "png"
+    ) -> bytes:
+        """Render the card from scratch and return encoded bytes."""
+        self.render_base()
+        return self.personalize(user_name, activity_date, image_format)
+
+    def personalize(
+        self,
+        user_name: Optional[str] = None,
+        activity_date: Optional[date] = None,
+        image_format: str = "png"
+    ) -> bytes:
+        """Draw the per-user line onto the current image and encode it."""
         if user_name and activity_date:
             self._draw_personalization(user_name, activity_date)
-        return self._to_bytes()
-    
+        return self._to_bytes(image_format)
+
     def _draw_resort_name(self) -> None:
         name = self.resort.names.en or self.resort.names.ja or "Unknown Resort"
         font = FontLoader.get_font(48)
         self.draw.text((40, 40), name, font=font, fill=self.TEXT_COLOR)
-    
+
     def _draw_tagline(self) -> None:
         if self.resort.description and self.resort.description.tagline:
             font = FontLoader.get_font(24)
             self.draw.text((45, 100), self.resort.description.tagline, font=font, fill=self.MUTED_COLOR)
-    
+
     def _draw_stats(self) -> None:
         if not self.resort.snow_stats:
             return
@@ -73,7 +106,7 @@ class CardRenderer:
             y += 40
         if stats.courses_total:
             self.draw.text((40, y), f"Courses: {stats.courses_total}", font=font, fill=self.TEXT_COLOR)
-    
+
     def _draw_personalization(self, user_name: str, activity_date: date) -> None:
         font = FontLoader.get_font(18)
         text = f"{user_name} was here on {activity_date.strftime('%Y-%m-%d')}"
@@ -82,18 +115,89 @@ class CardRenderer:
             (self.WIDTH - text_width - 40, self.HEIGHT - 50),
             text, font=font, fill=self.MUTED_COLOR
         )
-    
-    def _to_bytes(self) -> bytes:
+
+    def _to_bytes(self, image_format: str = "png") -> bytes:
+        pil_format, _ = CARD_FORMATS[image_format]
+        settings = get_settings()
         buffer = io.BytesIO()
-        self.img.save(buffer, format='PNG')
+        if pil_format == "PNG":
+            self.img.save(buffer, format=pil_format, optimize=settings.card_png_optimize)
+        else:
+            self.img.save(buffer, format=pil_format, quality=settings.card_webp_quality)
         return buffer.getvalue()
 
 
+class CardCache:
+    """Pre-rendered resort layers plus an LRU of encoded cards."""
+
+    def __init__(self, base_maxsize: int, card_maxsize: int):
+        self._bases: LRUCache = LRUCache(maxsize=base_maxsize)
+        self._cards: LRUCache = LRUCache(maxsize=card_maxsize)
+        self._lock = threading.Lock()
+
+    def get_base(self, resort: Resort) -> Image.Image:
+        """Get (rendering on first use) the static layer for a resort."""
+        with self._lock:
+            base = self._bases.get(resort.resort_id)
+        if base is None:
+            base = CardRenderer(resort).render_base()
+            with self._lock:
+                self._bases[resort.resort_id] = base
+        return base
+
+    def get_card(self, key: Tuple) -> Optional[bytes]:
+        with self._lock:
+            return self._cards.get(key)
+
+    def put_card(self, key: Tuple, data: bytes) -> None:
+        with self._lock:
+            self._cards[key] = data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bases.clear()
+            self._cards.clear()
+
+
+_settings = get_settings()
+card_cache = CardCache(
+    base_maxsize=_settings.card_base_cache_size,
+    card_maxsize=_settings.card_cache_size,
+)
+
+
+def prerender_resort_cards(resorts: Iterable[Resort]) -> int:
+    """Warm the static layer cache (e.g. at startup). Returns resorts rendered."""
+    count = 0
+    for resort in resorts:
+        card_cache.get_base(resort)
+        count += 1
+    return count
+
+
 def generate_resort_card(
     resort: Resort,
     user_name: Optional[str] = None,
-    activity_date: Optional[date] = None
+    activity_date: Optional[date] = None,
+    image_format: str = "png"
 ) -> bytes:
     """Generate a shareable image card for a resort."""
-    renderer = CardRenderer(resort)
-    return renderer.render(user_name, activity_date)
+    key = (resort.resort_id, user_name, activity_date, image_format)
+    cached = card_cache.get_card(key)
+    if cached is not None:
+        return cached
+
+    renderer = CardRenderer(resort, base=card_cache.get_base(resort))
+    data = renderer.personalize(user_name, activity_date, image_format)
+    card_cache.put_card(key, data)
+    return data
+
+
+async def generate_resort_card_async(
+    resort: Resort,
+    user_name: Optional[str] = None,
+    activity_date: Optional[date] = None,
+    image_format: str = "png"
+) -> bytes:
+    """Generate a card in the thread pool so encoding never blocks the event loop."""
+    return await run_in_threadpool(generate_resort_card, resort, user_name, activity_date, image_format)
@@ -0,0 +1,182 @@
+"""
+The resort catalog and its hot-swappable in-memory copy.
+
+A `Catalog` bundles everything derived from one version of the resort data:
+the validated resorts, the alias table, the search and spatial indexes, the
+pre-encoded response bodies and the content hash identifying that version (which drives
+ETags). Catalogs are never
+mutated; a reload builds a new one on the side and swaps it in with a single
+reference assignment, so requests already holding the old one finish on it.
+
+Loading prefers the compiled snapshot written by `python -m app.build_catalog`:
+a header line (format, source hash, schema hash, aliases) followed by all
+resorts as one JSON document, which pydantic validates in a single native
+pass - no YAML parsing and no per-file work. It is used only when its source
+hash matches the current YAML/alias files and its schema hash matches the
+models; otherwise the YAML files are parsed and validated.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from pydantic import TypeAdapter
+
+from .data_loader import load_resort_data, load_search_aliases
+from .models import Resort
+from .response_bodies import ResponseBodies
+from .services.geo_index import ResortGeoIndex
+from .services.search_index import ResortSearchIndex
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+_RESORTS = TypeAdapter(Dict[str, Resort])
+
+
+def source_version(data_dir: Path, aliases_file: Path) -> str:
+    """Content hash of the YAML files and alias table (read, not parsed)."""
+    digest = hashlib.sha256()
+    files = sorted(data_dir.rglob("*.yaml")) if data_dir.is_dir() else []
+    if aliases_file.is_file():
+        files.append(aliases_file)
+    for path in files:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+@lru_cache(maxsize=1)
+def schema_version() -> str:
+    """Hash of the Resort model schema; a snapshot from other models is stale."""
+    schema = json.dumps(Resort.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(schema.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Catalog:
+    resorts: Dict[str, Resort]
+    aliases: Dict[str, List[str]]
+    version: str
+    source: str  # "snapshot" or "yaml"
+    search_index: ResortSearchIndex = field(init=False, repr=False)
+    geo_index: ResortGeoIndex = field(init=False, repr=False)
+    bodies: ResponseBodies = field(init=False, repr=False)
+    loaded_at: float = field(default_factory=time.time)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "search_index", ResortSearchIndex(self.resorts, self.aliases))
+        object.__setattr__(self, "geo_index", ResortGeoIndex(self.resorts))
+        object.__setattr__(self, "bodies", ResponseBodies(self.resorts))
+
+
+def _read_snapshot(path: Path, version: str) -> Optional[Catalog]:
+    if not path.is_file():
+        return None
+    try:
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            if (
+                header.get("format") != SNAPSHOT_FORMAT
+                or header.get("version") != version
+                or header.get("schema") != schema_version()
+            ):
+                logger.info(f"Catalog snapshot {path} is stale; loading YAML")
+                return None
+            resorts = _RESORTS.validate_json(f.read())
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable catalog snapshot {path}: {e}")
+        return None
+    return Catalog(resorts, header["aliases"], version, "snapshot")
+
+
+def load_catalog(data_dir: Path, aliases_file: Path, snapshot_path: Optional[Path] = None) -> Catalog:
+    """The current catalog: from the snapshot when it is up to date, else from YAML."""
+    version = source_version(data_dir, aliases_file)
+    if snapshot_path is not None:
+        catalog = _read_snapshot(snapshot_path, version)
+        if catalog is not None:
+            return catalog
+    return Catalog(load_resort_data(data_dir), load_search_aliases(aliases_file), version, "yaml")
+
+
+def write_snapshot(data_dir: Path, aliases_file: Path, snapshot_path: Path) -> Catalog:
+    """Compile the YAML catalog into a snapshot file (written atomically)."""
+    catalog = load_catalog(data_dir, aliases_file)
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": catalog.version,
+        "schema": schema_version(),
+        "aliases": catalog.aliases,
+    }
+    tmp_path = snapshot_path.with_name(snapshot_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+        f.write(_RESORTS.dump_json(catalog.resorts, by_alias=True))
+    os.replace(tmp_path, snapshot_path)
+    return catalog
+
+
+class CatalogStore:
+    """
+    Holds the current catalog; `reload()` swaps in a new version atomically
+    and then calls each `on_swap` callback with it, so caches derived from
+    the old catalog outside this module can be dropped.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Catalog],
+        version_of_source: Callable[[], str],
+        on_swap: Sequence[Callable[[Catalog], None]] = (),
+    ):
+        self._loader = loader
+        self._version_of_source = version_of_source
+        self._on_swap = list(on_swap)
+        self._catalog: Optional[Catalog] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> Catalog:
+        catalog = self._catalog
+        if catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._catalog = self._loader()
+                catalog = self._catalog
+        return catalog
+
+    def reload(self) -> Catalog:
+        """Load the catalog again if its source changed; the old one stays on failure."""
+        with self._lock:
+            current = self._catalog
+            if current is not None and self._version_of_source() == current.version:
+                return current
+            started = time.perf_counter()
+            try:
+                catalog = self._loader()
+            except Exception:
+                logger.exception("Catalog reload failed; keeping the current catalog")
+                if current is None:
+                    raise
+                return current
+            self._catalog = catalog
+        logger.info(
+            f"Loaded resort catalog {catalog.version} ({len(catalog.resorts)} resorts, "
+            f"from {catalog.source}) in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        for callback in self._on_swap:
+            try:
+                callback(catalog)
+            except Exception:
+                logger.exception(f"Catalog swap callback {callback!r} failed")
+        return catalog
@@ -30,16 +30,29 @@ class Settings:
     )
     cors_origin_regex: str = r"https://.*\.zeabur\.app"
     
+    # Catalog Settings
+    catalog_snapshot_path: str = ""  # default: resort_api/catalog.snapshot
+    catalog_watch: bool = False  # reload when the YAML data changes (SIGHUP always reloads)
+
     # Cache Settings
     cache_maxsize: int = 128
     cache_ttl: int = 300  # seconds
 
+    # Share Card Settings
+    card_base_cache_size: int = 512  # pre-rendered resort layers
+    card_cache_size: int = 256  # encoded personalized cards
+    card_png_optimize: bool = False
+    card_webp_quality: int = 85
+    card_prerender_on_startup: bool = False
+
 
 @lru_cache
 def get_settings() -> Settings:
     """Returns cached settings instance with env overrides."""
     return Settings(
         user_core_api_url=os.getenv("USER_CORE_API_URL", "http://user-core-api/events"),
+        catalog_snapshot_path=os.getenv("RESORT_API_CATALOG_SNAPSHOT", ""),
+        catalog_watch=os.getenv("RESORT_API_CATALOG_WATCH", "false").lower() == "true",
         cache_maxsize=int(os.getenv("RESORT_API_CACHE_MAXSIZE", "128")),
         cache_ttl=int(os.getenv("RESORT_API_CACHE_TTL", "300")),
         api_key=os.getenv("RESORT_API_KEY", ""),
@@ -47,4 +60,9 @@ def get_settings() -> Settings:
         rate_limit_window=int(os.getenv("RESORT_API_RL_WINDOW", "60")),
         rate_limit_max_requests=int(os.getenv("RESORT_API_RL_MAX", "20")),
         redis_url=os.getenv("RESORT_API_REDIS_URL", os.getenv("REDIS_URL", "")),
+        card_base_cache_size=int(os.getenv("RESORT_API_CARD_BASE_CACHE_SIZE", "512")),
+        card_cache_size=int(os.getenv("RESORT_API_CARD_CACHE_SIZE", "256")),
+        card_png_optimize=os.getenv("RESORT_API_CARD_PNG_OPTIMIZE", "false").lower() == "true",
+        card_webp_quality=int(os.getenv("RESORT_API_CARD_WEBP_QUALITY", "85")),
+        card_prerender_on_startup=os.getenv("RESORT_API_CARD_PRERENDER", "false").lower() == "true",
     )
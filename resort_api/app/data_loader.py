@@ -1,9 +1,13 @@
+import json
+import logging
 import yaml
 from pathlib import Path
 from typing import Dict, List
 
 from .models import Resort
 
+logger = logging.getLogger(__name__)
+
 def load_resort_data(data_path: Path) -> Dict[str, Resort]:
     """
     Scans the specified data path for YAML files, loads, validates,
@@ -11,29 +15,41 @@ def load_resort_data(data_path: Path) -> Dict[str, Resort]:
     """
     resorts: Dict[str, Resort] = {}
     if not data_path.is_dir():
-        print(f"Error: Data path {data_path} is not a valid directory.")
+        logger.error(f"Data path {data_path} is not a valid directory.")
         return resorts
 
-    for yaml_file in data_path.rglob('*.yaml'):
-        print(f"Processing file: {yaml_file.name}")
+    for yaml_file in sorted(data_path.rglob('*.yaml')):
+        logger.debug(f"Processing file: {yaml_file.name}")
         try:
             with open(yaml_file, 'r', encoding='utf-8') as f:
                 data = yaml.safe_load(f)
                 if not data or 'resort_id' not in data:
-                    print(f"Warning: Skipping {yaml_file.name} because it is empty or missing a resort_id.")
+                    logger.warning(f"Skipping {yaml_file.name} because it is empty or missing a resort_id.")
                     continue
                 
                 resort = Resort(**data)
                 if resort.resort_id in resorts:
-                    print(f"Warning: Duplicate resort_id '{resort.resort_id}' found in {yaml_file.name}. Overwriting.")
+                    logger.warning(f"Duplicate resort_id '{resort.resort_id}' found in {yaml_file.name}. Overwriting.")
                 resorts[resort.resort_id] = resort
 
         except yaml.YAMLError as e:
-            print(f"Error parsing YAML file {yaml_file.name}: {e}")
+            logger.error(f"Error parsing YAML file {yaml_file.name}: {e}")
         except Exception as e:
             # Pydantic validation errors will be caught here
-            print(f"Error validating data from {yaml_file.name}: {e}")
+            logger.error(f"Error validating data from {yaml_file.name}: {e}")
             
-    print(f"Successfully loaded {len(resorts)} resorts.")
+    logger.info(f"Successfully loaded {len(resorts)} resorts.")
     return resorts
 
+
+def load_search_aliases(aliases_file: Path) -> Dict[str, List[str]]:
+    """
+    Loads the resort_id -> aliases table (pinyin and common short names)
+    generated by scripts/generate_enhanced_pinyin_map.py.
+    """
+    if not aliases_file.is_file():
+        logger.warning(f"Search aliases file {aliases_file} not found; searching names only.")
+        return {}
+    with open(aliases_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
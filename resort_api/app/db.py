@@ -1,24 +1,48 @@
-from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
-from .data_loader import load_resort_data
+from .catalog import Catalog, CatalogStore, load_catalog, source_version
+from .config import get_settings
 from .models import Resort
+from .services.search_index import ResortSearchIndex
 
 # Define the path to the data directory relative to this file's location
 # Path(__file__).parent -> app/
 # .parent -> resort_api/
 # .parent -> project root/
 DATA_DIRECTORY = Path(__file__).parent.parent.parent / "specs" / "resort-services" / "data"
+SEARCH_ALIASES_FILE = DATA_DIRECTORY.parent / "search_aliases.json"
+DEFAULT_SNAPSHOT_PATH = Path(__file__).parent.parent / "catalog.snapshot"
+
+
+def get_snapshot_path() -> Path:
+    return Path(get_settings().catalog_snapshot_path or DEFAULT_SNAPSHOT_PATH)
+
+
+def _drop_share_cards(catalog: Catalog) -> None:
+    """Share cards are cached by resort_id, so a changed resort must not keep its old card."""
+    from .card_generator import card_cache
+
+    card_cache.clear()
+
+
+catalog_store = CatalogStore(
+    loader=lambda: load_catalog(DATA_DIRECTORY, SEARCH_ALIASES_FILE, get_snapshot_path()),
+    version_of_source=lambda: source_version(DATA_DIRECTORY, SEARCH_ALIASES_FILE),
+    on_swap=[_drop_share_cards],
+)
+
+
+def get_catalog() -> Catalog:
+    """Returns the current catalog, loading it on first call."""
+    return catalog_store.current()
 
-# The function that actually loads the data
-def _load_data() -> Dict[str, Resort]:
-    return load_resort_data(DATA_DIRECTORY)
 
-@lru_cache(maxsize=1)
 def get_resorts_db() -> Dict[str, Resort]:
-    """Returns the in-memory dictionary of resorts, loading it on first call."""
-    return _load_data()
+    """Returns the in-memory dictionary of resorts of the current catalog."""
+    return get_catalog().resorts
+
 
-# For direct access if needed, but get_resorts_db is preferred
-RESORTS_DB: Dict[str, Resort] = get_resorts_db()
+def get_search_index() -> ResortSearchIndex:
+    """Returns the search index of the current catalog."""
+    return get_catalog().search_index
@@ -22,6 +22,15 @@ class ResortNotFoundError(ResortAPIException):
         )
 
 
+class InvalidQueryError(ResortAPIException):
+    """Raised when a query parameter cannot be interpreted."""
+    def __init__(self, parameter: str, detail: str):
+        super().__init__(
+            message=f"Invalid '{parameter}': {detail}",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+
 class ForbiddenError(ResortAPIException):
     """Raised when user lacks permission."""
     def __init__(self, message: str = "Permission denied"):
@@ -0,0 +1,45 @@
+"""
+HTTP validators for catalog-backed responses.
+
+Responses derived only from the catalog change exactly when the catalog
+version does, so the version is their ETag. Compressed variants carry it
+as a weak ETag, since their bytes differ from the identity body.
+"""
+from fastapi import Request, Response
+
+from .catalog import Catalog
+from .response_bodies import EncodedBody
+
+
+def catalog_etag(catalog: Catalog) -> str:
+    return f'"{catalog.version}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names `etag` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+
+
+def encoded_response(request: Request, body: EncodedBody, etag: str) -> Response:
+    """
+    Send a pre-encoded JSON body in the best encoding the client accepts,
+    or 304 when the client already has that version.
+    """
+    coding, content = body.select(request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept-Encoding"}
+    if coding is not None:
+        etag = f"W/{etag}"
+        headers["Content-Encoding"] = coding
+    headers["ETag"] = etag
+    if is_not_modified(request, etag.removeprefix("W/")):
+        return not_modified(etag)
+    return Response(content, media_type="application/json", headers=headers)
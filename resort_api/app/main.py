@@ -1,8 +1,11 @@
 """
 Resort Services API - Application Entry Point
 """
+import asyncio
 import logging
 import os
+import signal
+from contextlib import suppress
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -54,6 +57,59 @@ app.include_router(history_router)
 app.include_router(health_router)
 
 
+async def _reload_catalog(reason: str) -> None:
+    from starlette.concurrency import run_in_threadpool
+    from .db import catalog_store
+
+    logger.info(f"Reloading resort catalog ({reason})")
+    await run_in_threadpool(catalog_store.reload)
+
+
+async def _watch_catalog() -> None:
+    from watchfiles import awatch
+    from .db import DATA_DIRECTORY, SEARCH_ALIASES_FILE
+
+    async for changes in awatch(DATA_DIRECTORY, SEARCH_ALIASES_FILE):
+        await _reload_catalog(f"{len(changes)} file change(s)")
+
+
+@app.on_event("startup")
+async def load_catalog():
+    """Load the catalog (and its indexes) before the first request; reload on SIGHUP or file changes."""
+    from starlette.concurrency import run_in_threadpool
+    from .db import get_catalog
+
+    catalog = await run_in_threadpool(get_catalog)
+    logger.info(f"Serving resort catalog {catalog.version} ({len(catalog.resorts)} resorts, from {catalog.source})")
+
+    loop = asyncio.get_running_loop()
+    # Only possible from the main thread with a Unix event loop
+    with suppress(AttributeError, NotImplementedError, RuntimeError, ValueError):
+        loop.add_signal_handler(signal.SIGHUP, lambda: loop.create_task(_reload_catalog("SIGHUP")))
+    if settings.catalog_watch:
+        app.state.catalog_watcher = loop.create_task(_watch_catalog())
+
+
+@app.on_event("shutdown")
+async def stop_catalog_watcher():
+    watcher = getattr(app.state, "catalog_watcher", None)
+    if watcher is not None:
+        watcher.cancel()
+
+
+@app.on_event("startup")
+async def prerender_share_cards():
+    """Optionally warm the share card cache so first requests skip the base render."""
+    if not settings.card_prerender_on_startup:
+        return
+    from starlette.concurrency import run_in_threadpool
+    from .card_generator import prerender_resort_cards
+    from .db import get_resorts_db
+
+    count = await run_in_threadpool(prerender_resort_cards, get_resorts_db().values())
+    logger.info(f"Pre-rendered share cards for {count} resorts")
+
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     """Return sanitized error responses and log details."""
@@ -5,7 +5,7 @@ from .resort import (
     Names, Coordinates, Season, Description, SnowStats, Course,
     TicketType, Pricing, RentalItem, Rental,
     TransportationDetail, DomesticTransportation, InternationalTransportation, Transportation,
-    Resort, ResortSummary, ResortList
+    Resort, ResortSummary, ResortList, ResortSuggestions
 )
 from .history import SkiHistoryCreate, BehaviorEventPayload, BehaviorEventCreate
 
@@ -14,7 +14,7 @@ __all__ = [
     'Names', 'Coordinates', 'Season', 'Description', 'SnowStats', 'Course',
     'TicketType', 'Pricing', 'RentalItem', 'Rental',
     'TransportationDetail', 'DomesticTransportation', 'InternationalTransportation', 'Transportation',
-    'Resort', 'ResortSummary', 'ResortList',
+    'Resort', 'ResortSummary', 'ResortList', 'ResortSuggestions',
     # History models
     'SkiHistoryCreate', 'BehaviorEventPayload', 'BehaviorEventCreate',
 ]
@@ -133,6 +133,7 @@ class ResortSummary(BaseModel):
     region: str
     country_code: str
     tagline: Optional[str] = None
+    distance_km: Optional[float] = None  # set for near/bbox queries
 
 
 class ResortList(BaseModel):
@@ -140,3 +141,8 @@ class ResortList(BaseModel):
     limit: int
     offset: int
     items: List[ResortSummary]
+
+
+class ResortSuggestions(BaseModel):
+    query: str
+    items: List[ResortSummary]
@@ -0,0 +1,129 @@
+"""
+Pre-encoded JSON bodies for catalog-backed responses.
+
+Resort details and summaries only change with the catalog, so each one is
+serialized once per catalog version, together with a gzip variant (and a
+brotli one when the optional `brotli` package is installed). List and
+suggestion pages are assembled from the summary bytes and kept in a small
+LRU. Handlers send these bytes as they are, skipping response-model
+validation and JSON encoding on every request.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Mapping, Optional, Sequence, Set, Tuple
+
+from .models import Resort
+from .services.resort_service import ResortService
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Optional dependency
+
+# Bodies smaller than this are not worth a compressed variant
+MIN_COMPRESS_SIZE = 512
+_PAGE_CACHE_SIZE = 512
+
+
+def accepted_encodings(header: Optional[str]) -> Set[str]:
+    """Content codings an Accept-Encoding header allows (q=0 excluded)."""
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = params.strip().lower()
+        if q.startswith("q=") and q[2:].strip() in {"0", "0.0", "0.00", "0.000"}:
+            continue
+        accepted.add(coding)
+    if "*" in accepted:
+        accepted.update({"br", "gzip"})
+    return accepted
+
+
+class EncodedBody:
+    """A JSON body with its compressed variants, best first."""
+
+    __slots__ = ("identity", "variants")
+
+    def __init__(self, data: bytes):
+        self.identity = data
+        self.variants: Dict[str, bytes] = {}
+        if len(data) >= MIN_COMPRESS_SIZE:
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(data)
+            self.variants["gzip"] = gzip.compress(data, compresslevel=9, mtime=0)
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        """The smallest variant the client accepts, as (content coding, bytes)."""
+        if self.variants:
+            accepted = accepted_encodings(accept_encoding)
+            for coding, data in self.variants.items():
+                if coding in accepted:
+                    return coding, data
+        return None, self.identity
+
+
+class ResponseBodies:
+    """Encoded resort details and summaries of one catalog, plus cached pages."""
+
+    def __init__(self, resorts: Mapping[str, Resort]):
+        self._details = {
+            resort_id: EncodedBody(resort.model_dump_json(by_alias=True).encode("utf-8"))
+            for resort_id, resort in resorts.items()
+        }
+        self._resorts = resorts
+        self._summaries = {
+            resort_id: ResortService.summarize(resort).model_dump_json(by_alias=True).encode("utf-8")
+            for resort_id, resort in resorts.items()
+        }
+        self._pages: "OrderedDict[Hashable, EncodedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def detail(self, resort_id: str) -> Optional[EncodedBody]:
+        return self._details.get(resort_id)
+
+    def _summary(self, resort_id: str, distances: Mapping[str, float]) -> bytes:
+        if resort_id not in distances:
+            return self._summaries[resort_id]
+        summary = ResortService.summarize(self._resorts[resort_id], distances[resort_id])
+        return summary.model_dump_json(by_alias=True).encode("utf-8")
+
+    def _items(self, resort_ids: Iterable[str], distances: Mapping[str, float]) -> bytes:
+        return b"[" + b",".join(self._summary(resort_id, distances) for resort_id in resort_ids) + b"]"
+
+    def list_page(
+        self,
+        total: int,
+        limit: int,
+        offset: int,
+        resort_ids: Sequence[str],
+        distances: Optional[Mapping[str, float]] = None,
+    ) -> bytes:
+        """A `ResortList` body for one page of resort IDs (with distances for geo queries)."""
+        head = f'{{"total":{total},"limit":{limit},"offset":{offset},"items":'.encode("utf-8")
+        return head + self._items(resort_ids, distances or {}) + b"}"
+
+    def suggestions(self, query: str, resort_ids: Sequence[str]) -> bytes:
+        """A `ResortSuggestions` body."""
+        head = b'{"query":' + json.dumps(query, ensure_ascii=False).encode("utf-8") + b',"items":'
+        return head + self._items(resort_ids, {}) + b"}"
+
+    def page(self, key: Hashable, build: Callable[[], bytes]) -> EncodedBody:
+        """The cached page for `key`, encoding `build()` on a miss."""
+        with self._lock:
+            body = self._pages.get(key)
+            if body is not None:
+                self._pages.move_to_end(key)
+                return body
+        body = EncodedBody(build())
+        with self._lock:
+            self._pages[key] = body
+            if len(self._pages) > _PAGE_CACHE_SIZE:
+                self._pages.popitem(last=False)
+        return body
@@ -4,7 +4,8 @@ Health check routes.
 from fastapi import APIRouter, Depends
 
 from ..services import ResortService
-from ..db import get_resorts_db
+from ..db import get_catalog, get_resorts_db
+from ..rate_limiter import all_stats
 
 router = APIRouter(tags=["health"])
 
@@ -17,3 +18,21 @@ def get_resort_service() -> ResortService:
 def health_check(service: ResortService = Depends(get_resort_service)):
     """Simple health check endpoint."""
     return {"status": "ok", "resort_count": service.count()}
+
+
+@router.get("/health/catalog", summary="Resort Catalog Version")
+def catalog_info():
+    """Version and origin of the catalog being served."""
+    catalog = get_catalog()
+    return {
+        "version": catalog.version,
+        "source": catalog.source,
+        "resort_count": len(catalog.resorts),
+        "loaded_at": catalog.loaded_at,
+    }
+
+
+@router.get("/health/rate-limits", summary="Rate Limiter Stats")
+def rate_limit_stats():
+    """Decision latency and key cardinality for each rate limiter."""
+    return {"limiters": all_stats()}
@@ -2,100 +2,119 @@
 Resort routes - listing, detail, and share card endpoints.
 """
 import io
-import time
-from collections import defaultdict
 from typing import Optional
 from datetime import date
 
-from fastapi import APIRouter, Query, Depends, Header, HTTPException
+from fastapi import APIRouter, Query, Depends, Header, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 
-from ..models import Resort, ResortList
+from ..catalog import Catalog
+from ..models import Resort, ResortList, ResortSuggestions
 from ..services import ResortService
-from ..db import get_resorts_db
-from ..card_generator import generate_resort_card
-from ..exceptions import ResortNotFoundError
+from ..services.geo_index import parse_bbox, parse_point
+from ..db import get_catalog
+from ..http_cache import catalog_etag, encoded_response
+from ..card_generator import CARD_FORMATS, generate_resort_card_async
+from ..exceptions import InvalidQueryError, ResortNotFoundError
 from ..auth_utils import get_optional_user_id
 from ..config import get_settings
 from ..bot_protection import verify_captcha
+from ..rate_limiter import get_rate_limiter
 
 settings = get_settings()
-_REQUEST_HISTORY = defaultdict(list)
-try:
-    import redis
-    _redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True) if settings.redis_url else None
-except Exception:
-    _redis_client = None
+_rate_limiter = get_rate_limiter(
+    "resort", settings.rate_limit_max_requests, settings.rate_limit_window, settings.redis_url
+)
 
 
 def _rate_limit(key: str) -> None:
-    now = time.time()
-    window_start = now - settings.rate_limit_window
-    if _redis_client:
-        try:
-            key_name = f"resort:rl:{key}"
-            pipeline = _redis_client.pipeline()
-            pipeline.zremrangebyscore(key_name, 0, int((now - settings.rate_limit_window) * 1000))
-            pipeline.zcard(key_name)
-            pipeline.zadd(key_name, {str(int(now * 1000)): int(now * 1000)})
-            pipeline.expire(key_name, settings.rate_limit_window)
-            _, count, _, _ = pipeline.execute()
-            if count >= settings.rate_limit_max_requests:
-                raise HTTPException(status_code=429, detail="Rate limit exceeded")
-            return
-        except Exception:
-            pass
-
-    recent = _REQUEST_HISTORY[key]
-    while recent and recent[0] < window_start:
-        recent.pop(0)
-    if len(recent) >= settings.rate_limit_max_requests:
-        raise HTTPException(status_code=429, detail="Rate limit exceeded")
-    recent.append(now)
+    _rate_limiter.check(key)
+
 
 router = APIRouter(prefix="/resorts", tags=["resorts"])
 
 
-def get_resort_service() -> ResortService:
-    """Dependency to get resort service."""
-    return ResortService(get_resorts_db())
+def get_resort_service(catalog: Catalog = Depends(get_catalog)) -> ResortService:
+    """Dependency to get resort service over the current catalog."""
+    return ResortService(catalog.resorts, catalog.search_index, catalog.geo_index)
 
 
 @router.get("", response_model=ResortList)
 def list_resorts(
+    request: Request,
     region: Optional[str] = Query(None, description="Filter by region"),
     country_code: Optional[str] = Query(None, pattern="^[A-Z]{2}$"),
     q: Optional[str] = Query(None, description="Full-text search"),
     amenities: Optional[str] = Query(None, description="Comma-separated amenities"),
+    near: Optional[str] = Query(None, description="Resorts within radius_km of 'lat,lng', nearest first"),
+    radius_km: float = Query(50.0, gt=0, le=2000),
+    bbox: Optional[str] = Query(None, description="Resorts inside 'min_lat,min_lng,max_lat,max_lng'"),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    catalog: Catalog = Depends(get_catalog),
     service: ResortService = Depends(get_resort_service)
-) -> ResortList:
+) -> Response:
     """List and search resorts with pagination."""
-    return service.list_resorts(region, country_code, q, amenities, limit, offset)
+    if near and bbox:
+        raise InvalidQueryError("bbox", "use either near or bbox")
+    try:
+        point = parse_point(near) if near else None
+    except ValueError as e:
+        raise InvalidQueryError("near", str(e))
+    try:
+        box = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise InvalidQueryError("bbox", str(e))
+
+    def build() -> bytes:
+        total, resort_ids, distances = service.query_ids(
+            region, country_code, q, amenities, limit, offset, point, radius_km, box
+        )
+        return catalog.bodies.list_page(total, limit, offset, resort_ids, distances)
+
+    key = ("list", region, country_code, q, amenities, limit, offset, point, radius_km if point else None, box)
+    body = catalog.bodies.page(key, build)
+    return encoded_response(request, body, catalog_etag(catalog))
+
+
+@router.get("/suggest", response_model=ResortSuggestions)
+def suggest_resorts(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=64, description="Partial resort name, alias or pinyin"),
+    limit: int = Query(8, ge=1, le=20),
+    catalog: Catalog = Depends(get_catalog),
+    service: ResortService = Depends(get_resort_service)
+) -> Response:
+    """Search-as-you-type resort suggestions."""
+    body = catalog.bodies.page(
+        ("suggest", q, limit), lambda: catalog.bodies.suggestions(q, service.suggest_ids(q, limit))
+    )
+    return encoded_response(request, body, catalog_etag(catalog))
 
 
 @router.get("/{resort_id}", response_model=Resort)
 def get_resort(
     resort_id: str,
-    service: ResortService = Depends(get_resort_service)
-) -> Resort:
+    request: Request,
+    catalog: Catalog = Depends(get_catalog)
+) -> Response:
     """Get detailed information for a single resort."""
-    resort = service.get_by_id(resort_id)
-    if not resort:
+    body = catalog.bodies.detail(resort_id)
+    if body is None:
         raise ResortNotFoundError(resort_id)
-    return resort
+    return encoded_response(request, body, catalog_etag(catalog))
 
 
 @router.get(
     "/{resort_id}/share-card",
     response_class=StreamingResponse,
-    responses={200: {"content": {"image/png": {}}}, 404: {"description": "Resort not found"}}
+    responses={200: {"content": {"image/png": {}, "image/webp": {}}}, 404: {"description": "Resort not found"}}
 )
 async def get_share_card(
     resort_id: str,
     user_name: Optional[str] = Query(None),
     activity_date: Optional[date] = Query(None),
+    image_format: str = Query("png", alias="format", pattern="^(png|webp)$"),
     service: ResortService = Depends(get_resort_service),
     authenticated_user_id: Optional[str] = Depends(get_optional_user_id),
     x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
@@ -116,5 +135,6 @@ async def get_share_card(
     if not resort:
         raise ResortNotFoundError(resort_id)
     
-    image_bytes = generate_resort_card(resort, user_name, activity_date)
-    return StreamingResponse(io.BytesIO(image_bytes), media_type="image/png")
+    image_bytes = await generate_resort_card_async(resort, user_name, activity_date, image_format)
+    _, media_type = CARD_FORMATS[image_format]
+    return StreamingResponse(io.BytesIO(image_bytes), media_type=media_type)
@@ -0,0 +1,159 @@
+"""
+In-memory spatial index over resort coordinates.
+
+Built once per catalog load. Resorts are bucketed into a lat/lng grid of
+`CELL_DEGREES` cells; a radius query only visits the cells overlapping the
+circle's bounding box and computes exact great-circle distances for the
+resorts in them, so callers asking for "resorts within 100 km of X" never
+scan the whole catalog.
+
+Distances use the haversine formula on a spherical earth (mean radius),
+which is within 0.5% of the ellipsoidal distance - plenty for ranking.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from ..models import Resort
+
+EARTH_RADIUS_KM = 6371.0088
+CELL_DEGREES = 1.0
+_KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    return haversine_many(lat1, lng1, [lat2], [lng2])[0]
+
+
+def haversine_many(lat: float, lng: float, lats: Sequence[float], lngs: Sequence[float]) -> List[float]:
+    """Great-circle distances in kilometres from one point to each of `lats`/`lngs`."""
+    lat_r = math.radians(lat)
+    lng_r = math.radians(lng)
+    cos_lat = math.cos(lat_r)
+    sin, cos, asin, sqrt = math.sin, math.cos, math.asin, math.sqrt
+    distances = []
+    for other_lat, other_lng in zip(lats, lngs):
+        other_lat_r = math.radians(other_lat)
+        h = (sin((other_lat_r - lat_r) / 2) ** 2
+             + cos_lat * cos(other_lat_r) * sin((math.radians(other_lng) - lng_r) / 2) ** 2)
+        distances.append(2 * EARTH_RADIUS_KM * asin(sqrt(min(1.0, h))))
+    return distances
+
+
+def parse_point(text: str) -> Tuple[float, float]:
+    """`"lat,lng"` as floats; ValueError when malformed or out of range."""
+    parts = text.split(",")
+    if len(parts) != 2:
+        raise ValueError("expected 'lat,lng'")
+    lat, lng = (float(part) for part in parts)
+    _check_point(lat, lng)
+    return lat, lng
+
+
+def parse_bbox(text: str) -> Tuple[float, float, float, float]:
+    """
+    `"min_lat,min_lng,max_lat,max_lng"` as floats; ValueError when malformed.
+    `min_lng > max_lng` denotes a box crossing the antimeridian.
+    """
+    parts = text.split(",")
+    if len(parts) != 4:
+        raise ValueError("expected 'min_lat,min_lng,max_lat,max_lng'")
+    min_lat, min_lng, max_lat, max_lng = (float(part) for part in parts)
+    _check_point(min_lat, min_lng)
+    _check_point(max_lat, max_lng)
+    if min_lat > max_lat:
+        raise ValueError("min_lat is greater than max_lat")
+    return min_lat, min_lng, max_lat, max_lng
+
+
+def _check_point(lat: float, lng: float) -> None:
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError("latitude must be within [-90, 90] and longitude within [-180, 180]")
+
+
+def _cell(value: float) -> int:
+    return math.floor(value / CELL_DEGREES)
+
+
+def _lng_cells(min_lng: float, max_lng: float) -> Iterable[int]:
+    """Longitude cells covering [min_lng, max_lng], wrapping across the antimeridian."""
+    if min_lng > max_lng:
+        yield from _lng_cells(min_lng, 180.0)
+        yield from _lng_cells(-180.0, max_lng)
+        return
+    yield from range(_cell(min_lng), _cell(max_lng) + 1)
+
+
+class ResortGeoIndex:
+    """Radius and bounding-box queries over resorts with coordinates."""
+
+    def __init__(self, resorts: Mapping[str, Resort]):
+        self._ids: List[str] = []
+        self._lats = array("d")
+        self._lngs = array("d")
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for resort in resorts.values():
+            coordinates = resort.coordinates
+            if coordinates is None or coordinates.lat is None or coordinates.lng is None:
+                continue
+            doc = len(self._ids)
+            self._ids.append(resort.resort_id)
+            self._lats.append(coordinates.lat)
+            self._lngs.append(coordinates.lng)
+            self._cells[(_cell(coordinates.lat), _cell(coordinates.lng))].append(doc)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _candidates(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> List[int]:
+        docs: List[int] = []
+        lng_cells = list(_lng_cells(min_lng, max_lng))
+        for lat_cell in range(_cell(min_lat), _cell(max_lat) + 1):
+            for lng_cell in lng_cells:
+                docs.extend(self._cells.get((lat_cell, lng_cell), ()))
+        return docs
+
+    def _ranked(self, lat: float, lng: float, docs: List[int], radius_km: Optional[float]) -> List[Tuple[str, float]]:
+        distances = haversine_many(lat, lng, [self._lats[d] for d in docs], [self._lngs[d] for d in docs])
+        ranked = [
+            (self._ids[doc], distance)
+            for doc, distance in zip(docs, distances)
+            if radius_km is None or distance <= radius_km
+        ]
+        ranked.sort(key=lambda item: (item[1], item[0]))
+        return ranked
+
+    def near(self, lat: float, lng: float, radius_km: float) -> List[Tuple[str, float]]:
+        """Resort IDs within `radius_km` of the point, nearest first, with distances in km."""
+        lat_span = radius_km / _KM_PER_DEGREE
+        min_lat, max_lat = max(-90.0, lat - lat_span), min(90.0, lat + lat_span)
+        # Longitude degrees shrink with latitude; near a pole the circle covers every longitude
+        widest = max(abs(min_lat), abs(max_lat))
+        if widest >= 89.0:
+            min_lng, max_lng = -180.0, 180.0
+        else:
+            lng_span = lat_span / math.cos(math.radians(widest))
+            if lng_span >= 180:
+                min_lng, max_lng = -180.0, 180.0
+            else:
+                min_lng = (lng - lng_span + 180) % 360 - 180
+                max_lng = (lng + lng_span + 180) % 360 - 180
+        docs = self._candidates(min_lat, min_lng, max_lat, max_lng)
+        return self._ranked(lat, lng, docs, radius_km)
+
+    def within_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> List[Tuple[str, float]]:
+        """Resort IDs inside the box, nearest to its centre first, with those distances in km."""
+        wraps = min_lng > max_lng
+        docs = [
+            doc for doc in self._candidates(min_lat, min_lng, max_lat, max_lng)
+            if min_lat <= self._lats[doc] <= max_lat
+            and ((min_lng <= self._lngs[doc] or self._lngs[doc] <= max_lng) if wraps
+                 else min_lng <= self._lngs[doc] <= max_lng)
+        ]
+        center_lng = (min_lng + max_lng + (360 if wraps else 0)) / 2
+        center_lng = (center_lng + 180) % 360 - 180
+        return self._ranked((min_lat + max_lat) / 2, center_lng, docs, None)
@@ -1,22 +1,48 @@
 """
 Resort service - handles resort query and filtering logic.
 """
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from cachetools import TTLCache, cached
 from cachetools.keys import hashkey
 
 from ..models import Resort, ResortSummary, ResortList
 from ..config import get_settings
+from .geo_index import ResortGeoIndex
+from .search_index import ResortSearchIndex
+
+Point = Tuple[float, float]
+BBox = Tuple[float, float, float, float]
 
 
 class ResortService:
     """Service for resort-related operations."""
     
-    def __init__(self, resorts_db: Dict[str, Resort]):
+    def __init__(
+        self,
+        resorts_db: Dict[str, Resort],
+        search_index: Optional[ResortSearchIndex] = None,
+        geo_index: Optional[ResortGeoIndex] = None
+    ):
         self._db = resorts_db
+        self._index = search_index
+        self._geo_index = geo_index
         settings = get_settings()
         self._cache = TTLCache(maxsize=settings.cache_maxsize, ttl=settings.cache_ttl)
     
+    @property
+    def search_index(self) -> ResortSearchIndex:
+        """Search index over this catalog (built here when none was provided)."""
+        if self._index is None:
+            self._index = ResortSearchIndex(self._db)
+        return self._index
+    
+    @property
+    def geo_index(self) -> ResortGeoIndex:
+        """Spatial index over this catalog (built here when none was provided)."""
+        if self._geo_index is None:
+            self._geo_index = ResortGeoIndex(self._db)
+        return self._geo_index
+    
     def get_by_id(self, resort_id: str) -> Optional[Resort]:
         """Get a single resort by ID."""
         return self._db.get(resort_id)
@@ -36,18 +62,38 @@ class ResortService:
         q: Optional[str] = None,
         amenities: Optional[str] = None,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        near: Optional[Point] = None,
+        radius_km: float = 50.0,
+        bbox: Optional[BBox] = None
     ) -> ResortList:
         """List resorts with filtering and pagination."""
-        cache_key = hashkey(region, country_code, q, amenities, limit, offset)
+        cache_key = hashkey(region, country_code, q, amenities, limit, offset, near, radius_km, bbox)
         
         if cache_key in self._cache:
             return self._cache[cache_key]
         
-        result = self._query_resorts(region, country_code, q, amenities, limit, offset)
+        result = self._query_resorts(region, country_code, q, amenities, limit, offset, near, radius_km, bbox)
         self._cache[cache_key] = result
         return result
     
+    def query_ids(
+        self,
+        region: Optional[str] = None,
+        country_code: Optional[str] = None,
+        q: Optional[str] = None,
+        amenities: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        near: Optional[Point] = None,
+        radius_km: float = 50.0,
+        bbox: Optional[BBox] = None
+    ) -> Tuple[int, List[str], Dict[str, float]]:
+        """Total match count, the resort IDs of the requested page and their distances (geo queries only)."""
+        results, distances = self._filter(region, country_code, q, amenities, near, radius_km, bbox)
+        page = [r.resort_id for r in results[offset:offset + limit]]
+        return len(results), page, {resort_id: distances[resort_id] for resort_id in page if resort_id in distances}
+    
     def _query_resorts(
         self,
         region: Optional[str],
@@ -55,10 +101,52 @@ class ResortService:
         q: Optional[str],
         amenities: Optional[str],
         limit: int,
-        offset: int
+        offset: int,
+        near: Optional[Point] = None,
+        radius_km: float = 50.0,
+        bbox: Optional[BBox] = None
     ) -> ResortList:
         """Core query logic."""
-        results = list(self._db.values())
+        results, distances = self._filter(region, country_code, q, amenities, near, radius_km, bbox)
+        
+        # Pagination
+        total = len(results)
+        paginated = results[offset:offset + limit]
+        
+        summaries = [self.summarize(r, distances.get(r.resort_id)) for r in paginated]
+        
+        return ResortList(total=total, limit=limit, offset=offset, items=summaries)
+    
+    def _filter(
+        self,
+        region: Optional[str],
+        country_code: Optional[str],
+        q: Optional[str],
+        amenities: Optional[str],
+        near: Optional[Point] = None,
+        radius_km: float = 50.0,
+        bbox: Optional[BBox] = None
+    ) -> Tuple[List[Resort], Dict[str, float]]:
+        """
+        Matching resorts in result order, and their distances in km for
+        geo queries: `q` orders by relevance, otherwise `near` orders by
+        distance from the point and `bbox` by distance from its centre.
+        """
+        geo: Optional[List[Tuple[str, float]]] = None
+        if near is not None:
+            geo = self.geo_index.near(near[0], near[1], radius_km)
+        elif bbox is not None:
+            geo = self.geo_index.within_bbox(*bbox)
+        distances = {resort_id: round(distance, 2) for resort_id, distance in geo} if geo is not None else {}
+        
+        if q:
+            # Ranked by relevance; the filters below keep that order
+            results = [self._db[resort_id] for resort_id, _ in self.search_index.search(q)
+                       if resort_id in self._db and (geo is None or resort_id in distances)]
+        elif geo is not None:
+            results = [self._db[resort_id] for resort_id, _ in geo if resort_id in self._db]
+        else:
+            results = list(self._db.values())
         
         # Apply filters
         if region:
@@ -71,44 +159,24 @@ class ResortService:
             required = {a.strip().lower() for a in amenities.split(',') if a.strip()}
             results = [r for r in results if r.amenities and required.issubset(set(a.lower() for a in r.amenities))]
         
-        if q:
-            results = self._text_search(results, q.lower())
-        
-        # Pagination
-        total = len(results)
-        paginated = results[offset:offset + limit]
-        
-        # Convert to summaries
-        summaries = [
-            ResortSummary(
-                resort_id=r.resort_id,
-                names=r.names,
-                region=r.region,
-                country_code=r.country_code,
-                tagline=r.description.tagline if r.description else None
-            )
-            for r in paginated
-        ]
-        
-        return ResortList(total=total, limit=limit, offset=offset, items=summaries)
+        return results, distances
+    
+    def suggest_ids(self, q: str, limit: int = 8) -> List[str]:
+        """Resort IDs for search-as-you-type suggestions."""
+        return [resort_id for resort_id in self.search_index.suggest(q, limit) if resort_id in self._db]
     
-    def _text_search(self, resorts: list[Resort], query: str) -> list[Resort]:
-        """Full-text search on names and tagline."""
-        results = []
-        for r in resorts:
-            if self._matches_query(r, query):
-                results.append(r)
-        return results
+    def suggest(self, q: str, limit: int = 8) -> List[ResortSummary]:
+        """Search-as-you-type suggestions for a partial query."""
+        return [self.summarize(self._db[resort_id]) for resort_id in self.suggest_ids(q, limit)]
     
-    def _matches_query(self, resort: Resort, query: str) -> bool:
-        """Check if resort matches search query."""
-        if resort.names.en and query in resort.names.en.lower():
-            return True
-        if resort.names.ja and query in resort.names.ja.lower():
-            return True
-        if resort.names.zh and query in resort.names.zh.lower():
-            return True
-        if resort.description and resort.description.tagline:
-            if query in resort.description.tagline.lower():
-                return True
-        return False
+    @staticmethod
+    def summarize(resort: Resort, distance_km: Optional[float] = None) -> ResortSummary:
+        """The list/suggestion view of a resort."""
+        return ResortSummary(
+            resort_id=resort.resort_id,
+            names=resort.names,
+            region=resort.region,
+            country_code=resort.country_code,
+            tagline=resort.description.tagline if resort.description else None,
+            distance_km=distance_km
+        )
@@ -0,0 +1,261 @@
+"""
+In-memory resort search index.
+
+Built once per catalog load from resort names (zh/en/ja), taglines and the
+alias table (`specs/resort-services/search_aliases.json`, generated by
+`scripts/generate_enhanced_pinyin_map.py` with pinyin and common aliases):
+
+- Latin text (English/romaji names, pinyin, aliases) is indexed as words;
+  query words also match as word prefixes and, from 4 letters on, within
+  a small edit distance ("hakbua" -> "hakuba")
+- CJK text is indexed as character bigrams (and single characters), so
+  "八方" finds 白馬八方尾根 without word segmentation
+- matches are ranked with BM25 over name, alias and tagline fields
+- a sorted key list (a flattened prefix trie) serves search-as-you-type
+  suggestions on whole names, any word of a name, and aliases
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from ..models import Resort
+
+
+# Field weights for term frequencies
+WEIGHT_NAME = 3.0
+WEIGHT_ALIAS = 2.0
+WEIGHT_TAGLINE = 1.0
+
+# Score factors for inexact query-term matches
+PREFIX_FACTOR = 0.8
+TYPO_FACTORS = {1: 0.6, 2: 0.4}
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_MAX_EXPANSIONS = 50
+_QUERY_CACHE_SIZE = 1024
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"  # kana, CJK ideographs
+_TOKEN_RE = re.compile(rf"[a-z0-9]+|[{_CJK}]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+
+
+def normalize(text: str) -> str:
+    """NFKC, case-folded, with Latin diacritics removed ("Zaō" -> "zao")."""
+    folded = unicodedata.normalize("NFKC", text).casefold()
+    return "".join(
+        unicodedata.normalize("NFKD", ch)[0] if "\u00c0" <= ch <= "\u024f" else ch
+        for ch in folded
+    )
+
+
+def _is_cjk(token: str) -> bool:
+    return bool(_CJK_RE.match(token))
+
+
+def tokenize(text: str) -> List[str]:
+    """Latin words and CJK runs of normalized text."""
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def _cjk_terms(run: str) -> List[str]:
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def _terms(text: str) -> List[str]:
+    """Index terms: words and their concatenation for Latin, bigrams and characters for CJK."""
+    terms: List[str] = []
+    words = []
+    for token in tokenize(text):
+        if _is_cjk(token):
+            terms.extend(_cjk_terms(token))
+            if len(token) > 1:
+                terms.extend(token)
+        else:
+            words.append(token)
+            terms.append(token)
+    if len(words) > 1:
+        terms.append("".join(words))
+    return terms
+
+
+def edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Edit distance of `a` and `b` (insertions, deletions, substitutions and
+    adjacent transpositions) if it is at most `limit`, else None.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    before: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return None
+        before, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class ResortSearchIndex:
+    """Ranked text search and prefix suggestions over a resort catalog."""
+
+    def __init__(self, resorts: Mapping[str, Resort], aliases: Optional[Mapping[str, Sequence[str]]] = None):
+        aliases = aliases or {}
+        self._ids: List[str] = []
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._doc_len: List[float] = []
+        # (key, kind, doc): kind 0 = full name, 1 = name from a later word, 2 = alias
+        suggest_keys: List[Tuple[str, int, int]] = []
+
+        for doc, resort in enumerate(resorts.values()):
+            self._ids.append(resort.resort_id)
+            weighted: Dict[str, float] = defaultdict(float)
+            names = [name for name in (resort.names.zh, resort.names.en, resort.names.ja) if name]
+            tagline = resort.description.tagline if resort.description else None
+            fields = [(name, WEIGHT_NAME) for name in names]
+            fields += [(alias, WEIGHT_ALIAS) for alias in aliases.get(resort.resort_id, ())]
+            if tagline:
+                fields.append((tagline, WEIGHT_TAGLINE))
+            for text, weight in fields:
+                for term in _terms(text):
+                    weighted[term] += weight
+            for term, tf in weighted.items():
+                self._postings[term][doc] = tf
+            self._doc_len.append(sum(weighted.values()))
+
+            for name in names:
+                words = tokenize(name)
+                for start in range(len(words)):
+                    suggest_keys.append(("".join(words[start:]), 0 if start == 0 else 1, doc))
+            for alias in aliases.get(resort.resort_id, ()):
+                suggest_keys.append(("".join(tokenize(alias)), 2, doc))
+
+        count = len(self._ids)
+        self._avg_len = (sum(self._doc_len) / count) if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self._postings.items()
+        }
+        self._terms = sorted(self._postings)
+        self._latin_by_length: Dict[int, List[str]] = defaultdict(list)
+        for term in self._terms:
+            if not _is_cjk(term):
+                self._latin_by_length[len(term)].append(term)
+        self._suggest_keys = sorted(set(key for key in suggest_keys if key[0]))
+        # Query LRU; searches run in the threadpool, so it is guarded by a lock
+        self._cache: "OrderedDict[str, List[Tuple[str, float]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _bm25(self, term: str, doc: int, tf: float) -> float:
+        norm = 1 - _BM25_B + _BM25_B * self._doc_len[doc] / (self._avg_len or 1)
+        return self._idf[term] * tf * (_BM25_K1 + 1) / (tf + _BM25_K1 * norm)
+
+    def _terms_with_prefix(self, prefix: str) -> Iterable[str]:
+        for i in range(bisect_left(self._terms, prefix), len(self._terms)):
+            if not self._terms[i].startswith(prefix):
+                return
+            yield self._terms[i]
+
+    def _alternatives(self, word: str) -> List[Tuple[str, float]]:
+        """Index terms a Latin query word may stand for, with score factors."""
+        alternatives = [(word, 1.0)] if word in self._postings else []
+        if len(word) >= 2:
+            for term in self._terms_with_prefix(word):
+                if term != word and not _is_cjk(term):
+                    alternatives.append((term, PREFIX_FACTOR))
+                    if len(alternatives) >= _MAX_EXPANSIONS:
+                        break
+        if not alternatives and len(word) >= 4:
+            limit = 2 if len(word) >= 8 else 1
+            for length in range(len(word) - limit, len(word) + limit + 1):
+                for term in self._latin_by_length.get(length, ()):
+                    distance = edit_distance(word, term, limit)
+                    if distance is not None:
+                        alternatives.append((term, TYPO_FACTORS[distance]))
+        return alternatives
+
+    def _clauses(self, query: str) -> List[List[Tuple[str, float]]]:
+        """One clause per query term; a resort matches when every clause does."""
+        clauses = []
+        for token in tokenize(query):
+            if _is_cjk(token):
+                clauses.extend([[(term, 1.0)] for term in _cjk_terms(token)])
+            else:
+                clauses.append(self._alternatives(token))
+        return clauses
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Resort IDs matching every term of `query`, best first, with their scores."""
+        key = normalize(query).strip()
+        with self._cache_lock:
+            ranked = self._cache.get(key)
+            if ranked is not None:
+                self._cache.move_to_end(key)
+        if ranked is None:
+            ranked = self._search(key)
+            with self._cache_lock:
+                self._cache[key] = ranked
+                if len(self._cache) > _QUERY_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return ranked if limit is None else ranked[:limit]
+
+    def _search(self, query: str) -> List[Tuple[str, float]]:
+        clauses = self._clauses(query)
+        if not clauses:
+            return []
+        scores: Optional[Dict[int, float]] = None
+        for alternatives in clauses:
+            best: Dict[int, float] = {}
+            for term, factor in alternatives:
+                for doc, tf in self._postings.get(term, {}).items():
+                    if scores is not None and doc not in scores:
+                        continue
+                    score = factor * self._bm25(term, doc, tf)
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            if scores is None:
+                scores = best
+            else:
+                scores = {doc: scores[doc] + score for doc, score in best.items()}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self._ids[item[0]]))
+        return [(self._ids[doc], score) for doc, score in ranked]
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[str]:
+        """
+        Resort IDs for search-as-you-type: names and aliases starting with
+        `prefix` first (full names before later words before aliases, shorter
+        keys first), then ranked search matches.
+        """
+        key = "".join(tokenize(prefix))
+        if not key:
+            return []
+        best: Dict[int, Tuple[int, int, int]] = {}
+        for i in range(bisect_left(self._suggest_keys, (key,)), len(self._suggest_keys)):
+            candidate, kind, doc = self._suggest_keys[i]
+            if not candidate.startswith(key):
+                break
+            rank = (candidate != key, kind, len(candidate))
+            if doc not in best or rank < best[doc]:
+                best[doc] = rank
+        ids = [self._ids[doc] for doc, _ in sorted(best.items(), key=lambda item: (item[1], self._ids[item[0]]))]
+        if len(ids) < limit:
+            ids += [resort_id for resort_id, _ in self.search(prefix) if resort_id not in ids]
+        return ids[:limit]
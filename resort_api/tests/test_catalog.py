@@ -0,0 +1,158 @@
+"""
+Tests for the resort catalog snapshot, hot reload and ETag handling.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path for proper package imports
+parent_path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(parent_path))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.card_generator import card_cache
+from app.catalog import CatalogStore, load_catalog, source_version, write_snapshot
+from app.db import DATA_DIRECTORY, SEARCH_ALIASES_FILE, catalog_store, get_catalog
+from app.main import app
+
+RESORT_YAML = """
+resort_id: {resort_id}
+names:
+  zh: {zh}
+  en: {en}
+country_code: JP
+region: Nagano
+"""
+
+
+@pytest.fixture
+def data(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "happo.yaml").write_text(
+        RESORT_YAML.format(resort_id="hakuba_happo_one", zh="白馬八方尾根", en="Hakuba Happo-one"),
+        encoding="utf-8",
+    )
+    aliases = tmp_path / "search_aliases.json"
+    aliases.write_text('{"hakuba_happo_one": ["baima"]}', encoding="utf-8")
+    return data_dir, aliases
+
+
+def _add_naeba(data_dir):
+    (data_dir / "naeba.yaml").write_text(
+        RESORT_YAML.format(resort_id="yuzawa_naeba", zh="苗場", en="Naeba"),
+        encoding="utf-8",
+    )
+
+
+def test_snapshot_round_trip(data, tmp_path):
+    data_dir, aliases = data
+    snapshot = tmp_path / "catalog.snapshot"
+    written = write_snapshot(data_dir, aliases, snapshot)
+
+    loaded = load_catalog(data_dir, aliases, snapshot)
+    assert loaded.source == "snapshot"
+    assert loaded.version == written.version
+    assert loaded.resorts == written.resorts
+    assert loaded.aliases == {"hakuba_happo_one": ["baima"]}
+    assert loaded.search_index.search("baima")[0][0] == "hakuba_happo_one"
+
+
+def test_stale_or_corrupt_snapshot_falls_back_to_yaml(data, tmp_path):
+    data_dir, aliases = data
+    snapshot = tmp_path / "catalog.snapshot"
+    write_snapshot(data_dir, aliases, snapshot)
+    _add_naeba(data_dir)
+
+    stale = load_catalog(data_dir, aliases, snapshot)
+    assert stale.source == "yaml"
+    assert set(stale.resorts) == {"hakuba_happo_one", "yuzawa_naeba"}
+
+    snapshot.write_bytes(b"not a snapshot")
+    assert load_catalog(data_dir, aliases, snapshot).source == "yaml"
+
+
+def test_reload_swaps_only_when_source_changes(data):
+    data_dir, aliases = data
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return load_catalog(data_dir, aliases)
+
+    store = CatalogStore(loader, lambda: source_version(data_dir, aliases))
+    first = store.current()
+    assert store.reload() is first
+    assert len(loads) == 1
+
+    _add_naeba(data_dir)
+    second = store.reload()
+    assert second is not first
+    assert second.version != first.version
+    assert store.current() is second
+    assert "yuzawa_naeba" in second.resorts
+
+
+def test_reload_notifies_swap_callbacks(data):
+    data_dir, aliases = data
+    swapped = []
+    store = CatalogStore(
+        lambda: load_catalog(data_dir, aliases),
+        lambda: source_version(data_dir, aliases),
+        on_swap=[swapped.append, lambda catalog: 1 / 0],
+    )
+    first = store.current()
+    store.reload()
+    assert swapped == []
+
+    _add_naeba(data_dir)
+    second = store.reload()
+    assert swapped == [second] and second is not first
+    assert store.current() is second
+
+
+def test_catalog_swap_drops_cached_share_cards():
+    card_cache.put_card(("hakuba_happo_one", None, None, "png"), b"old card")
+    for callback in catalog_store._on_swap:
+        callback(catalog_store.current())
+    assert card_cache.get_card(("hakuba_happo_one", None, None, "png")) is None
+
+
+def test_failed_reload_keeps_current_catalog(data):
+    data_dir, aliases = data
+    store = CatalogStore(lambda: load_catalog(data_dir, aliases), lambda: source_version(data_dir, aliases))
+    first = store.current()
+
+    (data_dir / "broken.yaml").write_text("resort_id: [unclosed", encoding="utf-8")
+    store._loader = lambda: (_ for _ in ()).throw(ValueError("bad data"))
+    assert store.reload() is first
+    assert store.current() is first
+
+
+def test_resort_detail_etag_and_not_modified():
+    client = TestClient(app)
+    resort_id = next(iter(get_catalog().resorts))
+
+    response = client.get(f"/resorts/{resort_id}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.removeprefix("W/") == f'"{get_catalog().version}"'
+
+    cached = client.get(f"/resorts/{resort_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    changed = client.get(f"/resorts/{resort_id}", headers={"If-None-Match": '"other"'})
+    assert changed.status_code == 200
+    assert client.get("/resorts/does_not_exist", headers={"If-None-Match": etag}).status_code == 404
+
+
+def test_health_catalog_reports_version():
+    client = TestClient(app)
+    response = client.get("/health/catalog")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["version"] == source_version(DATA_DIRECTORY, SEARCH_ALIASES_FILE)
+    assert body["resort_count"] == len(get_catalog().resorts)
+    assert body["source"] in {"snapshot", "yaml"}
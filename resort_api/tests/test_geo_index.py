@@ -0,0 +1,110 @@
+"""
+Tests for the resort spatial index and near/bbox queries.
+"""
+import random
+import sys
+from pathlib import Path
+
+# Add parent directory to path for proper package imports
+parent_path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(parent_path))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import Resort
+from app.services.geo_index import ResortGeoIndex, haversine_km, haversine_many, parse_bbox, parse_point
+
+
+def _resort(resort_id, lat, lng):
+    return Resort(
+        resort_id=resort_id,
+        names={"en": resort_id},
+        country_code="JP",
+        region="Test",
+        coordinates={"lat": lat, "lng": lng} if lat is not None else None,
+    )
+
+
+def test_haversine():
+    # Tokyo Station to Osaka Station
+    assert haversine_km(35.6812, 139.7671, 34.7025, 135.4959) == pytest.approx(403, abs=2)
+    assert haversine_km(10, 20, 10, 20) == 0
+    assert haversine_many(0, 0, [0, 0], [1, -1]) == pytest.approx([111.2, 111.2], abs=0.1)
+
+
+def test_near_matches_brute_force():
+    rng = random.Random(7)
+    points = {f"r{i}": (rng.uniform(-70, 70), rng.uniform(-180, 180)) for i in range(300)}
+    index = ResortGeoIndex({rid: _resort(rid, lat, lng) for rid, (lat, lng) in points.items()})
+    for _ in range(30):
+        lat, lng, radius = rng.uniform(-70, 70), rng.uniform(-180, 180), rng.uniform(50, 3000)
+        expected = sorted(
+            (haversine_km(lat, lng, *point), rid) for rid, point in points.items()
+            if haversine_km(lat, lng, *point) <= radius
+        )
+        assert [rid for rid, _ in index.near(lat, lng, radius)] == [rid for _, rid in expected]
+
+
+def test_near_across_antimeridian_and_pole():
+    index = ResortGeoIndex({
+        "east": _resort("east", 0, 179.9),
+        "west": _resort("west", 0, -179.9),
+        "polar": _resort("polar", 89.5, 10),
+        "polar_far_side": _resort("polar_far_side", 89.5, -170),
+        "unknown": _resort("unknown", None, None),
+    })
+    assert len(index) == 4
+    assert [rid for rid, _ in index.near(0, 179.95, 50)] == ["east", "west"]
+    assert {rid for rid, _ in index.near(89.9, 0, 200)} == {"polar", "polar_far_side"}
+
+
+def test_bbox():
+    index = ResortGeoIndex({
+        "inside": _resort("inside", 36.7, 137.85),
+        "edge": _resort("edge", 36.0, 137.0),
+        "outside": _resort("outside", 43.0, 141.0),
+        "east": _resort("east", 0, 179.5),
+        "west": _resort("west", 0, -179.5),
+    })
+    assert [rid for rid, _ in index.within_bbox(36, 137, 37, 138)] == ["inside", "edge"]
+    assert {rid for rid, _ in index.within_bbox(-1, 179, 1, -179)} == {"east", "west"}
+
+
+def test_parse_errors():
+    assert parse_point("36.7, 137.85") == (36.7, 137.85)
+    assert parse_bbox("1,2,3,4") == (1, 2, 3, 4)
+    for text in ["36.7", "a,b", "91,0", "0,181"]:
+        with pytest.raises(ValueError):
+            parse_point(text)
+    with pytest.raises(ValueError):
+        parse_bbox("3,2,1,4")
+
+
+def test_list_near_and_bbox():
+    client = TestClient(app)
+
+    near = client.get("/resorts", params={"near": "36.70,137.85", "radius_km": 30}).json()
+    distances = [item["distance_km"] for item in near["items"]]
+    assert near["total"] > 0
+    assert distances == sorted(distances)
+    assert all(d <= 30 for d in distances)
+    assert near["items"][0]["resort_id"].startswith("hakuba_")
+
+    bbox = client.get("/resorts", params={"bbox": "41,139,46,146"}).json()
+    assert bbox["total"] > 0
+    assert all(item["resort_id"].startswith("hokkaido_") for item in bbox["items"])
+
+    combined = client.get("/resorts", params={"near": "36.70,137.85", "radius_km": 30, "q": "goryu"}).json()
+    assert [item["resort_id"] for item in combined["items"]] == ["hakuba_goryu_47"]
+
+    assert client.get("/resorts").json()["items"][0]["distance_km"] is None
+
+
+def test_list_rejects_invalid_geo_parameters():
+    client = TestClient(app)
+    assert client.get("/resorts", params={"near": "95,0"}).status_code == 422
+    assert client.get("/resorts", params={"bbox": "1,2,3"}).status_code == 422
+    assert client.get("/resorts", params={"near": "1,2", "bbox": "1,2,3,4"}).status_code == 422
+    assert client.get("/resorts", params={"near": "1,2", "radius_km": 0}).status_code == 422
@@ -145,3 +145,21 @@ def test_get_share_card_not_found():
     resort_id = "non_existent_resort"
     response = client.get(f"/resorts/{resort_id}/share-card")
     assert response.status_code == 404
+
+
+def test_share_card_reuses_cached_base_layer():
+    """Personalized cards are composited onto a cached per-resort layer."""
+    from datetime import date
+    from resort_api.app.card_generator import card_cache, generate_resort_card, CardRenderer
+
+    resort = get_resorts_db()["hakuba_happo_one"]
+    card_cache.clear()
+
+    first = generate_resort_card(resort, "Alice", date(2024, 1, 5))
+    with patch.object(CardRenderer, "render_base", side_effect=AssertionError("re-rendered")):
+        second = generate_resort_card(resort, "Bob", date(2024, 1, 5))
+        assert generate_resort_card(resort, "Alice", date(2024, 1, 5)) is first
+
+    assert first != second
+    assert first == CardRenderer(resort).render("Alice", date(2024, 1, 5))
+    assert generate_resort_card(resort, image_format="webp")[:4] == b"RIFF"
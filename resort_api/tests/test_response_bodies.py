@@ -0,0 +1,84 @@
+"""
+Tests for the pre-encoded resort response bodies.
+"""
+import gzip
+import sys
+from pathlib import Path
+
+# Add parent directory to path for proper package imports
+parent_path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(parent_path))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from app.db import get_catalog
+from app.main import app
+from app.models import ResortList
+from app.response_bodies import EncodedBody, accepted_encodings
+from app.services import ResortService
+
+client = TestClient(app)
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("br;q=0, gzip;q=0.5") == {"gzip"}
+    assert "gzip" in accepted_encodings("*")
+    assert accepted_encodings(None) == set()
+
+
+def test_small_bodies_are_not_compressed():
+    body = EncodedBody(b'{"a":1}')
+    assert body.variants == {}
+    assert body.select("gzip") == (None, b'{"a":1}')
+
+
+def test_detail_body_matches_model_serialization():
+    catalog = get_catalog()
+    for resort_id, resort in catalog.resorts.items():
+        body = catalog.bodies.detail(resort_id)
+        assert body.identity == JSONResponse(jsonable_encoder(resort)).body
+        if "gzip" in body.variants:
+            assert gzip.decompress(body.variants["gzip"]) == body.identity
+
+
+def test_list_page_matches_model_serialization():
+    catalog = get_catalog()
+    service = ResortService(catalog.resorts, catalog.search_index)
+    total, resort_ids, _ = service.query_ids(limit=5, offset=2)
+    expected = ResortList(total=total, limit=5, offset=2, items=[service.summarize(catalog.resorts[i]) for i in resort_ids])
+    assert catalog.bodies.list_page(total, 5, 2, resort_ids) == JSONResponse(jsonable_encoder(expected)).body
+
+
+def test_detail_served_gzipped_or_plain():
+    resort_id = next(iter(get_catalog().resorts))
+
+    compressed = client.get(f"/resorts/{resort_id}", headers={"Accept-Encoding": "gzip"})
+    assert compressed.status_code == 200
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"].startswith("W/")
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.json()["resort_id"] == resort_id
+
+    plain = client.get(f"/resorts/{resort_id}", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["content-type"] == "application/json"
+    assert plain.json() == compressed.json()
+
+
+def test_list_pages_are_cached_per_query():
+    catalog = get_catalog()
+    first = client.get("/resorts", params={"q": "hakuba", "limit": 3})
+    assert first.status_code == 200
+    cached = catalog.bodies.page(("list", None, None, "hakuba", None, 3, 0, None, None, None), lambda: b"rebuilt")
+    assert cached.identity == first.content
+    second = client.get("/resorts", params={"q": "hakuba", "limit": 3})
+    assert second.json() == first.json()
+    assert second.json()["limit"] == 3
+
+    not_modified = client.get("/resorts", params={"q": "hakuba"}, headers={"If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == client.get("/resorts", params={"q": "hakuba"}).headers["etag"]
@@ -0,0 +1,108 @@
+"""
+Tests for the resort search index and /resorts/suggest.
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path for proper package imports
+parent_path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(parent_path))
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import Resort
+from app.services import search_index
+from app.services.search_index import ResortSearchIndex, edit_distance, normalize
+
+
+def _resort(resort_id, zh, en, ja=None, tagline=None):
+    return Resort(
+        resort_id=resort_id,
+        names={"zh": zh, "en": en, "ja": ja},
+        country_code="JP",
+        region="Nagano",
+        description={"tagline": tagline} if tagline else None,
+    )
+
+
+CATALOG = {r.resort_id: r for r in [
+    _resort("hakuba_happo_one", "白馬八方尾根滑雪場", "Hakuba Happo-one Ski Resort", "白馬八方尾根スキー場"),
+    _resort("hakuba_goryu_47", "白馬五龍滑雪場", "Hakuba Goryu Ski Resort", tagline="Next to Happo-one"),
+    _resort("yuzawa_naeba", "苗場滑雪場", "Naeba Ski Resort", "苗場スキー場"),
+    _resort("yamagata_zao_onsen", "藏王溫泉滑雪場", "Zaō Onsen Ski Resort"),
+]}
+ALIASES = {"hakuba_happo_one": ["八方", "baima", "bafang"], "yuzawa_naeba": ["miaochang"]}
+
+
+def _ids(results):
+    return [resort_id for resort_id, _ in results]
+
+
+class TestSearch:
+    index = ResortSearchIndex(CATALOG, ALIASES)
+
+    def test_cjk_substring_without_segmentation(self):
+        assert _ids(self.index.search("八方")) == ["hakuba_happo_one"]
+        assert _ids(self.index.search("苗場")) == ["yuzawa_naeba"]
+        assert set(_ids(self.index.search("白馬"))) == {"hakuba_happo_one", "hakuba_goryu_47"}
+
+    def test_pinyin_and_aliases(self):
+        assert _ids(self.index.search("baima")) == ["hakuba_happo_one"]
+        assert _ids(self.index.search("Miaochang")) == ["yuzawa_naeba"]
+
+    def test_every_term_must_match(self):
+        assert _ids(self.index.search("hakuba goryu")) == ["hakuba_goryu_47"]
+        assert self.index.search("hakuba naeba") == []
+
+    def test_prefixes_typos_and_diacritics(self):
+        assert _ids(self.index.search("nae")) == ["yuzawa_naeba"]
+        assert _ids(self.index.search("hakbua goryu")) == ["hakuba_goryu_47"]
+        assert _ids(self.index.search("zao")) == ["yamagata_zao_onsen"]
+        assert self.index.search("xyzzy") == []
+
+    def test_name_matches_outrank_tagline_matches(self):
+        assert _ids(self.index.search("happo")) == ["hakuba_happo_one", "hakuba_goryu_47"]
+
+    def test_query_cache_is_thread_safe(self, monkeypatch):
+        monkeypatch.setattr(search_index, "_QUERY_CACHE_SIZE", 4)
+        index = ResortSearchIndex(CATALOG, ALIASES)
+        queries = ["hakuba", "naeba", "zao", "happo", "goryu", "白馬", "八方", "baima"] * 200
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(index.search, queries))
+
+        assert results[:8] == [index.search(query) for query in queries[:8]]
+        assert len(index._cache) == 4
+
+    def test_suggest(self):
+        assert self.index.suggest("Hak", 5) == ["hakuba_goryu_47", "hakuba_happo_one"]
+        assert self.index.suggest("happo", 5)[0] == "hakuba_happo_one"
+        assert self.index.suggest("八", 5) == ["hakuba_happo_one"]
+        assert self.index.suggest("  ", 5) == []
+
+
+def test_helpers():
+    assert normalize("Ｈａｋｕｂａ Zaō") == "hakuba zao"
+    assert edit_distance("hakbua", "hakuba", 1) == 1
+    assert edit_distance("niseko", "naeba", 2) is None
+
+
+client = TestClient(app)
+
+
+def test_list_resorts_query_uses_index():
+    items = client.get("/resorts", params={"q": "八方"}).json()["items"]
+    assert items[0]["resort_id"] == "hakuba_happo_one"
+
+
+def test_suggest_endpoint():
+    response = client.get("/resorts/suggest", params={"q": "baima", "limit": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["query"] == "baima"
+    assert 0 < len(data["items"]) <= 3
+    assert all(item["resort_id"].startswith("hakuba_") for item in data["items"])
+
+    assert client.get("/resorts/suggest").status_code == 422
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """
 生成增強版拼音映射表 - 包含常見別名和簡稱
+
+輸出：
+- 前端 pinyinMapper.ts
+- resort_api 搜尋索引使用的 specs/resort-services/search_aliases.json
 """
+import json
 import yaml
 from pathlib import Path
 from pypinyin import lazy_pinyin
 
 # 資料庫路徑
 DATA_DIR = Path(__file__).parent.parent / "specs" / "resort-services" / "data"
+ALIASES_FILE = DATA_DIR.parent / "search_aliases.json"
 
 # 手動定義的常見別名和簡稱
 COMMON_ALIASES = {
@@ -151,7 +157,8 @@ def main():
                     'resort_id': resort_id,
                     'zh_name': zh_name,
                     'en_name': en_name,
-                    'pinyin': list(set(pinyin_variants))[:15]  # 限制最多15個變體
+                    'pinyin': list(set(pinyin_variants))[:15],  # 限制最多15個變體
+                    'aliases': pinyin_variants,
                 })
 
                 print(f"  ✅ {zh_name}: {len(pinyin_variants)} 個變體")
@@ -241,6 +248,13 @@ export function isPossiblyPinyin(input: string): boolean {
         f.write(ts_code)
 
     print(f"\n✅ 已生成 {output_file}")
+
+    # resort_api 搜尋索引用的別名表（完整變體，依 resort_id 排序）
+    aliases = {m['resort_id']: m['aliases'] for m in sorted(mappings, key=lambda m: m['resort_id'])}
+    with open(ALIASES_FILE, 'w', encoding='utf-8') as f:
+        json.dump(aliases, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    print(f"✅ 已生成 {ALIASES_FILE}")
     print(f"✅ 總共 {len(mappings)} 個雪場映射")
     print(f"✅ 平均每個雪場 {sum(len(m['pinyin']) for m in mappings) / len(mappings):.1f} 個變體")
 
@@ -61,6 +61,38 @@ async def post_event(event_payload: Dict[str, Any]) -> bool:
             return False
 
 
+async def get_trip_application(request_id: str) -> Optional[Dict[str, Any]]:
+    """Get the current state of a trip application (None if unknown)."""
+    settings = get_settings()
+    async with httpx.AsyncClient() as client:
+        try:
+            response = await client.get(
+                f"{settings.user_core_api_url}/snowbuddy/trip-applications/{request_id}"
+            )
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+        except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            print(f"Error getting trip application {request_id}: {e}")
+            return None
+
+
+async def get_trip_participants(trip_id: str) -> List[Dict[str, Any]]:
+    """Get accepted applications for a trip."""
+    settings = get_settings()
+    async with httpx.AsyncClient() as client:
+        try:
+            response = await client.get(
+                f"{settings.user_core_api_url}/snowbuddy/trips/{trip_id}/participants"
+            )
+            response.raise_for_status()
+            return response.json().get("participants", [])
+        except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            print(f"Error getting participants for trip {trip_id}: {e}")
+            return []
+
+
 async def create_calendar_event(event_payload: Dict[str, Any]) -> Dict[str, Any]:
     """Create a calendar event via user-core service."""
     settings = get_settings()
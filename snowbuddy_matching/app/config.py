@@ -29,6 +29,22 @@ class Settings:
     matching_workflow_callback_url: Optional[str] = None
     matching_workflow_timeout_seconds: int = 3600
     matching_notification_webhook_url: Optional[str] = None
+    matching_pool_ttl_seconds: int = 60  # Reuse a candidate pool this long
+    matching_dedup_window_seconds: int = 30  # Identical re-submissions map to the same search
+    matching_top_k: int = 200  # Results kept per search
+    matching_chunk_size: int = 50  # Candidates scored between partial result writes
+    matching_time_budget_seconds: float = 0  # Stop scoring and keep the best so far after this (0 = no limit)
+    matching_max_candidates: int = 0  # Score at most this many pool candidates (0 = all)
+    matching_queue_enabled: bool = False  # Run searches on worker processes via a Redis stream
+    matching_queue_stream: str = "matching:jobs"
+    matching_queue_group: str = "matching-workers"
+    matching_queue_visibility_seconds: int = 60  # Reclaim jobs whose worker went silent this long
+    matching_queue_max_attempts: int = 3
+    matching_queue_max_per_seeker: int = 3  # Queued or running searches per seeker (0 = no limit)
+    matching_worker_processes: int = 0  # 0 = one per CPU core
+    matching_stream_timeout_seconds: int = 300  # Longest a search event stream stays open
+    matching_stream_heartbeat_seconds: int = 15  # Keep-alive interval on idle streams
+    matching_watch_poll_seconds: float = 2.0  # Workflow status poll interval for watchers
 
     # AWS credentials (for SigV4 signing)
     aws_region: Optional[str] = None
@@ -54,6 +70,22 @@ def get_settings() -> Settings:
         matching_workflow_callback_url=os.getenv("MATCHING_WORKFLOW_CALLBACK_URL"),
         matching_workflow_timeout_seconds=int(os.getenv("MATCHING_WORKFLOW_TIMEOUT_SECONDS", "3600")),
         matching_notification_webhook_url=os.getenv("MATCHING_NOTIFICATION_WEBHOOK_URL"),
+        matching_pool_ttl_seconds=int(os.getenv("MATCHING_POOL_TTL_SECONDS", "60")),
+        matching_dedup_window_seconds=int(os.getenv("MATCHING_DEDUP_WINDOW_SECONDS", "30")),
+        matching_top_k=int(os.getenv("MATCHING_TOP_K", "200")),
+        matching_chunk_size=int(os.getenv("MATCHING_CHUNK_SIZE", "50")),
+        matching_time_budget_seconds=float(os.getenv("MATCHING_TIME_BUDGET_SECONDS", "0")),
+        matching_max_candidates=int(os.getenv("MATCHING_MAX_CANDIDATES", "0")),
+        matching_queue_enabled=os.getenv("MATCHING_QUEUE_ENABLED", "false").lower() == "true",
+        matching_queue_stream=os.getenv("MATCHING_QUEUE_STREAM", "matching:jobs"),
+        matching_queue_group=os.getenv("MATCHING_QUEUE_GROUP", "matching-workers"),
+        matching_queue_visibility_seconds=int(os.getenv("MATCHING_QUEUE_VISIBILITY_SECONDS", "60")),
+        matching_queue_max_attempts=int(os.getenv("MATCHING_QUEUE_MAX_ATTEMPTS", "3")),
+        matching_queue_max_per_seeker=int(os.getenv("MATCHING_QUEUE_MAX_PER_SEEKER", "3")),
+        matching_worker_processes=int(os.getenv("MATCHING_WORKER_PROCESSES", "0")),
+        matching_stream_timeout_seconds=int(os.getenv("MATCHING_STREAM_TIMEOUT_SECONDS", "300")),
+        matching_stream_heartbeat_seconds=int(os.getenv("MATCHING_STREAM_HEARTBEAT_SECONDS", "15")),
+        matching_watch_poll_seconds=float(os.getenv("MATCHING_WATCH_POLL_SECONDS", "2")),
         aws_region=os.getenv("AWS_REGION"),
         aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
         aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
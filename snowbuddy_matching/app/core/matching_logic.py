@@ -20,7 +20,7 @@ WEIGHT_ROLE = 0.15
 WEIGHT_KNOWLEDGE = 0.1
 
 # Re-export filter_candidates for backward compatibility
-__all__ = ['calculate_total_match_score', 'filter_candidates']
+__all__ = ['calculate_total_match_score', 'combine_scores', 'filter_candidates']
 
 
 def calculate_total_match_score(
@@ -35,7 +35,21 @@ def calculate_total_match_score(
     s_location = calculate_location_score(seeker_pref, candidate, all_resorts)
     s_availability = calculate_availability_score(seeker_pref, candidate)
     s_role = calculate_role_score(seeker_pref, candidate)
-    
+    s_knowledge = (
+        calculate_knowledge_score(seeker_knowledge, candidate_knowledge)
+        if seeker_pref.include_knowledge_score else None
+    )
+    return combine_scores(s_skill, s_location, s_availability, s_role, s_knowledge)
+
+
+def combine_scores(
+    s_skill: float,
+    s_location: float,
+    s_availability: float,
+    s_role: float,
+    s_knowledge: Optional[float] = None
+) -> float:
+    """Weight component scores; without a knowledge score its weight is redistributed."""
     total = (
         s_skill * WEIGHT_SKILL +
         s_location * WEIGHT_LOCATION +
@@ -43,8 +57,7 @@ def calculate_total_match_score(
         s_role * WEIGHT_ROLE
     )
     
-    if seeker_pref.include_knowledge_score:
-        s_knowledge = calculate_knowledge_score(seeker_knowledge, candidate_knowledge)
+    if s_knowledge is not None:
         total += s_knowledge * WEIGHT_KNOWLEDGE
     else:
         # Redistribute knowledge weight
@@ -0,0 +1,42 @@
+"""
+Bounded top-k ranking for incremental matching.
+"""
+import heapq
+from typing import Generic, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TopK(Generic[T]):
+    """
+    Keeps the `k` highest-scored items seen so far in a min-heap.
+
+    Ties keep arrival order, like a stable descending sort of everything
+    pushed.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, int, T]] = []
+        self._seen = 0
+
+    def push(self, score: float, item: T) -> bool:
+        """Offer an item; returns whether it entered the top k."""
+        entry = (score, -self._seen, item)
+        self._seen += 1
+        if self.k <= 0:
+            return False
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] <= self._heap[0][:2]:
+            return False
+        heapq.heapreplace(self._heap, entry)
+        return True
+
+    def ranked(self) -> List[T]:
+        """Items best first."""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
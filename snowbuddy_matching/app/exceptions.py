@@ -22,6 +22,15 @@ class SearchNotFoundError(MatchingServiceException):
         )
 
 
+class SearchQueueFullError(MatchingServiceException):
+    """Raised when a seeker already has the maximum number of queued searches."""
+    def __init__(self, seeker_id: str):
+        super().__init__(
+            message="Too many searches in progress; wait for one to finish.",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+
 class ExternalServiceError(MatchingServiceException):
     """Raised when external service call fails."""
     def __init__(self, service: str, detail: str = ""):
@@ -1,9 +1,13 @@
 """
 Health check routes.
 """
-from typing import Dict
+from typing import Any, Dict
 from fastapi import APIRouter
 
+from ..config import get_settings
+from ..rate_limiter import all_stats
+from ..services.matching_queue import get_matching_job_queue
+
 router = APIRouter(tags=["health"])
 
 
@@ -11,3 +15,17 @@ router = APIRouter(tags=["health"])
 def health_check() -> Dict[str, str]:
     """Simple endpoint to verify service availability."""
     return {"status": "ok"}
+
+
+@router.get("/health/rate-limits", summary="Rate Limiter Stats")
+def rate_limit_stats() -> Dict[str, list]:
+    """Decision latency and key cardinality for each rate limiter."""
+    return {"limiters": all_stats()}
+
+
+@router.get("/health/matching-queue", summary="Matching Queue Depth")
+def matching_queue_stats() -> Dict[str, Any]:
+    """Jobs waiting for and held by matching workers, when the worker queue is enabled."""
+    if not get_settings().matching_queue_enabled:
+        return {"enabled": False}
+    return {"enabled": True, **get_matching_job_queue().stats()}
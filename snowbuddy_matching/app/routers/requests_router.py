@@ -12,6 +12,9 @@ from ..exceptions import ExternalServiceError
 
 router = APIRouter(tags=["requests"])
 
+# Past tense of a response action, as used in event types and responses
+RESPONSE_ACTIONS = {"accept": "accepted", "decline": "declined"}
+
 
 @router.post("/requests", status_code=status.HTTP_202_ACCEPTED)
 async def send_match_request(
@@ -43,14 +46,15 @@ async def respond_to_match_request(
     responder_id: str = Depends(get_current_user_id)
 ):
     """Respond to a received match request."""
+    outcome = RESPONSE_ACTIONS[action]
     event = {
         "user_id": responder_id,
         "source_project": "snowbuddy-matching",
-        "event_type": f"snowbuddy.match.request.{action}ed",
+        "event_type": f"snowbuddy.match.request.{outcome}",
         "occurred_at": datetime.now(UTC).isoformat(),
         "payload": {"request_id": request_id}
     }
     success = await user_core_client.post_event(event)
     if not success:
         raise ExternalServiceError("user-core")
-    return {"status": f"request {action}ed"}
+    return {"status": f"request {outcome}"}
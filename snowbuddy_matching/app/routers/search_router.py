@@ -2,12 +2,17 @@
 Search routes - matching search endpoints.
 """
 import uuid
-import time
 import os
-from collections import defaultdict
-from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException, Header
+import json
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException, Header, Query
+from fastapi.responses import StreamingResponse
 
 from ..models.matching import MatchingPreference
+from ..services.redis_repository import SUMMARY_FIELDS
+from ..services.search_events import is_terminal
 from ..services import (
     MatchingWorkflowOrchestrator,
     get_matching_workflow_orchestrator,
@@ -18,43 +23,17 @@ from ..exceptions import SearchNotFoundError
 from ..auth_utils import get_current_user_id
 from ..bot_protection import verify_captcha
 from ..config import get_settings
+from ..rate_limiter import get_rate_limiter
 
 router = APIRouter(prefix="/matching", tags=["matching"])
-_REQUEST_HISTORY = defaultdict(list)
 RATE_LIMIT_WINDOW = 60
 RATE_LIMIT_MAX_REQUESTS = 15
 settings = get_settings()
-try:
-    import redis
-    _redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True) if settings.redis_url else None
-except Exception:
-    _redis_client = None
+_rate_limiter = get_rate_limiter("matching", RATE_LIMIT_MAX_REQUESTS, RATE_LIMIT_WINDOW, settings.redis_url)
 
 
 def _rate_limit(user_id: str) -> None:
-    now = time.time()
-    window_start = now - RATE_LIMIT_WINDOW
-    if _redis_client:
-        try:
-            key_name = f"matching:rl:{user_id}"
-            pipeline = _redis_client.pipeline()
-            pipeline.zremrangebyscore(key_name, 0, int((now - RATE_LIMIT_WINDOW) * 1000))
-            pipeline.zcard(key_name)
-            pipeline.zadd(key_name, {str(int(now * 1000)): int(now * 1000)})
-            pipeline.expire(key_name, RATE_LIMIT_WINDOW)
-            _, count, _, _ = pipeline.execute()
-            if count >= RATE_LIMIT_MAX_REQUESTS:
-                raise HTTPException(status_code=429, detail="Rate limit exceeded")
-            return
-        except Exception:
-            pass
-
-    recent = _REQUEST_HISTORY[user_id]
-    while recent and recent[0] < window_start:
-        recent.pop(0)
-    if len(recent) >= RATE_LIMIT_MAX_REQUESTS:
-        raise HTTPException(status_code=429, detail="Rate limit exceeded")
-    recent.append(now)
+    _rate_limiter.check(user_id)
 
 
 @router.post("/searches", status_code=status.HTTP_202_ACCEPTED)
@@ -79,9 +58,8 @@ async def start_search(
 
     _rate_limit(seeker_id)
     await verify_captcha(captcha_token)
-    search_id = str(uuid.uuid4())
-    await orchestrator.start_matching(
-        search_id=search_id,
+    search_id = await orchestrator.start_matching(
+        search_id=str(uuid.uuid4()),
         seeker_id=seeker_id,
         seeker_preferences=seeker_prefs,
         background_tasks=background_tasks,
@@ -89,14 +67,89 @@ async def start_search(
     return {"search_id": search_id}
 
 
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(selected) - set(SUMMARY_FIELDS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return selected
+
+
 @router.get("/searches/{search_id}")
 async def get_search_results(
     search_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description=f"Comma-separated subset of {', '.join(SUMMARY_FIELDS)}"),
+    wait: float = Query(0, ge=0, le=30, description="Long-poll: seconds to wait for the next change"),
     authenticated_user_id: str = Depends(get_current_user_id),
     service: MatchingService = Depends(get_matching_service)
 ):
-    """Retrieve status and results of a snowbuddy search."""
-    result = await service.get_results(search_id)
+    """
+    Retrieve status and one page of results of a snowbuddy search.
+
+    With `wait`, an unfinished search is held open until its state changes
+    (or `wait` seconds pass) - the fallback for clients without SSE.
+    """
+    selected = _parse_fields(fields)
+    if not wait:
+        result = await service.get_results(search_id, offset=offset, limit=limit, fields=selected)
+    else:
+        async with aclosing(service.watch(
+            search_id, timeout_seconds=wait, offset=offset, limit=limit, fields=selected,
+        )) as states:
+            result = await anext(states)
+            if not is_terminal(result):
+                async for state in states:
+                    if state is not None:
+                        result = state
+                        break
     if not result:
         raise SearchNotFoundError(search_id)
     return result
+
+
+def _sse(state: Optional[Dict[str, Any]]) -> str:
+    if state is None:
+        return ": keep-alive\n\n"
+    return f"event: {state.get('status', 'message')}\ndata: {json.dumps(state)}\n\n"
+
+
+@router.get("/searches/{search_id}/events")
+async def stream_search_events(
+    search_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description=f"Comma-separated subset of {', '.join(SUMMARY_FIELDS)}"),
+    authenticated_user_id: str = Depends(get_current_user_id),
+    service: MatchingService = Depends(get_matching_service)
+):
+    """
+    Server-sent events for a search: the current page, then every change
+    (`processing` updates, then `completed` or `failed`) until it finishes.
+    """
+    states = service.watch(
+        search_id,
+        timeout_seconds=settings.matching_stream_timeout_seconds,
+        offset=offset,
+        limit=limit,
+        fields=_parse_fields(fields),
+    )
+    first = await anext(states)
+    if first is None:
+        await states.aclose()
+        raise SearchNotFoundError(search_id)
+
+    async def events() -> AsyncIterator[str]:
+        async with aclosing(states):
+            yield _sse(first)
+            async for state in states:
+                yield _sse(state)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
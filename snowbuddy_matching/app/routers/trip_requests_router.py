@@ -9,6 +9,7 @@ import uuid
 from ..clients import user_core_client
 from ..auth_utils import get_current_user_id
 from ..exceptions import ExternalServiceError
+from .requests_router import RESPONSE_ACTIONS
 from ..services.trip_integration import TripIntegrationService
 from ..services.behavior_event_service import BehaviorEventService
 from ..models.trip_participant import TripParticipantCreate, TripParticipantResponse
@@ -53,10 +54,11 @@ async def respond_to_trip_application(
     """Respond to a trip application (trip owner only)."""
     
     # 記錄回應事件
+    outcome = RESPONSE_ACTIONS[action]
     event = {
         "user_id": responder_id,
         "source_project": "snowbuddy-matching",
-        "event_type": f"snowbuddy.trip.apply.{action}ed",
+        "event_type": f"snowbuddy.trip.apply.{outcome}",
         "occurred_at": datetime.now(UTC).isoformat(),
         "payload": {
             "request_id": request_id,
@@ -81,7 +83,7 @@ async def respond_to_trip_application(
                 
                 if participant:
                     return {
-                        "status": f"application {action}ed",
+                        "status": f"application {outcome}",
                         "participant": TripParticipantResponse(
                             trip_id=participant.trip_id,
                             user_id=participant.user_id,
@@ -97,7 +99,7 @@ async def respond_to_trip_application(
             # Calendar 整合失敗不影響申請接受
             print(f"Calendar integration failed: {e}")
     
-    return {"status": f"application {action}ed"}
+    return {"status": f"application {outcome}"}
 
 
 @router.delete("/trips/{trip_id}/participants/{user_id}", status_code=status.HTTP_200_OK)
@@ -145,6 +147,16 @@ async def get_trip_participants(
     current_user_id: str = Depends(get_current_user_id)
 ):
     """Get all participants of a trip."""
-    # TODO: 實現參與者查詢
-    # 需要從 BehaviorEvent 中查詢所有相關事件
-    return {"participants": []}
+    behavior_service = BehaviorEventService()
+    applications = await behavior_service.get_trip_participants(trip_id)
+    return {
+        "participants": [
+            {
+                "user_id": application["applicant_id"],
+                "request_id": application["request_id"],
+                "joined_at": application["updated_at"],
+            }
+            for application in applications
+            if application.get("applicant_id")
+        ]
+    }
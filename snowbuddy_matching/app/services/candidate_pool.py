@@ -0,0 +1,119 @@
+"""
+Shared candidate pools for matching searches.
+
+Most of a match score depends only on the pool-defining preferences (skill
+band, resorts/regions, availability), not on who is searching. Searches with
+the same pool fingerprint therefore share one filtered, pre-scored pool:
+
+- while a pool is being built, other searches await the same build
+  (single-flight) instead of fetching users and resorts again
+- a built pool is reused for `matching_pool_ttl_seconds`
+- each search re-ranks the pool for its seeker-specific terms (role,
+  knowledge score) and drops the seeker themselves
+
+Pools are per worker process; the freshness window bounds how stale a
+reused pool can be.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..config import get_settings
+from ..models.matching import CandidateProfile, MatchingPreference
+
+
+def _canonical(prefs: MatchingPreference, fields: tuple) -> Dict[str, Any]:
+    data = prefs.model_dump(mode="json", include=set(fields))
+    return {key: sorted(value) if isinstance(value, list) else value for key, value in data.items()}
+
+
+_POOL_FIELDS = ("skill_level_min", "skill_level_max", "preferred_resorts", "preferred_regions", "availability")
+
+
+def _digest(data: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def pool_fingerprint(prefs: MatchingPreference) -> str:
+    """Fingerprint of the preferences that decide the candidate pool and its base scores."""
+    return _digest(_canonical(prefs, _POOL_FIELDS))
+
+
+def search_fingerprint(seeker_id: str, prefs: MatchingPreference) -> str:
+    """Fingerprint of a whole search: same seeker, same preferences."""
+    return _digest({"seeker_id": seeker_id, **_canonical(prefs, tuple(MatchingPreference.model_fields))})
+
+
+@dataclass(frozen=True)
+class PoolEntry:
+    """A candidate with its seeker-independent component scores."""
+    candidate: CandidateProfile
+    skill: float
+    location: float
+    availability: float
+
+
+@dataclass
+class CandidatePool:
+    entries: List[PoolEntry]
+    built_at: float = field(default_factory=time.monotonic)
+    # Candidate knowledge profiles, fetched on first use by a knowledge-scored search
+    knowledge: Dict[str, Any] = field(default_factory=dict)
+
+
+class CandidatePoolCache:
+    """Fingerprint -> fresh pool, with single-flight builds."""
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._pools: "OrderedDict[str, CandidatePool]" = OrderedDict()
+        self._building: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.builds = 0
+
+    async def get(self, fingerprint: str, build: Callable[[], Awaitable[CandidatePool]]) -> CandidatePool:
+        pool = self._pools.get(fingerprint)
+        if pool is not None and time.monotonic() - pool.built_at < self.ttl_seconds:
+            self.hits += 1
+            return pool
+
+        task = self._building.get(fingerprint)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            self.builds += 1
+            task = asyncio.get_running_loop().create_task(build())
+            self._building[fingerprint] = task
+            task.add_done_callback(lambda done: self._finish(fingerprint, done))
+        else:
+            self.hits += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, fingerprint: str, task: asyncio.Task) -> None:
+        if self._building.get(fingerprint) is task:
+            del self._building[fingerprint]
+        if task.cancelled() or task.exception() is not None or self.ttl_seconds <= 0:
+            return
+        self._pools[fingerprint] = task.result()
+        self._pools.move_to_end(fingerprint)
+        while len(self._pools) > self.maxsize:
+            self._pools.popitem(last=False)
+
+    def clear(self) -> None:
+        self._pools.clear()
+
+
+_cache: Optional[CandidatePoolCache] = None
+
+
+def get_candidate_pool_cache() -> CandidatePoolCache:
+    """Get or create the process-wide pool cache."""
+    global _cache
+    if _cache is None:
+        _cache = CandidatePoolCache(ttl_seconds=get_settings().matching_pool_ttl_seconds)
+    return _cache
@@ -0,0 +1,212 @@
+"""
+Durable job queue for local matching workers.
+
+With `MATCHING_QUEUE_ENABLED`, searches no longer run in the API process:
+the orchestrator appends a job to the `matching:jobs` stream and worker
+processes (`python -m app.worker`) consume it through the
+`matching-workers` consumer group.
+
+- a job is acknowledged (and deleted) only once its search has run
+- a failed job is re-appended with `attempt + 1` until
+  `matching_queue_max_attempts`
+- a job whose worker went silent for `matching_queue_visibility_seconds`
+  (crash, pod restart) is reclaimed by another worker, which counts as an
+  attempt; running jobs refresh their claim so they are not reclaimed
+- a seeker holds at most `matching_queue_max_per_seeker` queued or running
+  searches (`matching:queue:seeker:{id}`), so one user's burst cannot starve
+  everyone else's searches; a slot is freed at most once per held slot, so a
+  counter whose TTL lapsed under a long-running job never goes negative
+- a worker that shuts down cleanly leaves the consumer group, so
+  `stats()["consumers"]` counts live workers plus any that crashed
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+import redis
+
+from ..config import get_settings
+from ..exceptions import SearchQueueFullError
+from ..models.matching import MatchingPreference
+
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = seeker slot counter; a missing counter (TTL lapsed) stays missing
+_RELEASE_SLOT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return 0
+end
+local held = redis.call('DECR', KEYS[1])
+if held <= 0 then
+  redis.call('DEL', KEYS[1])
+end
+return held
+"""
+
+
+def _seeker_key(seeker_id: str) -> str:
+    return f"matching:queue:seeker:{seeker_id}"
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+@dataclass(frozen=True)
+class MatchingJob:
+    message_id: str
+    search_id: str
+    seeker_id: str
+    preferences: MatchingPreference
+    attempt: int = 1
+
+    @classmethod
+    def from_message(cls, message_id: Any, fields: Dict[Any, Any]) -> "MatchingJob":
+        data = {_text(key): _text(value) for key, value in fields.items()}
+        return cls(
+            message_id=_text(message_id),
+            search_id=data["search_id"],
+            seeker_id=data["seeker_id"],
+            preferences=MatchingPreference.model_validate_json(data["preferences"]),
+            attempt=int(data.get("attempt", 1)),
+        )
+
+    def to_fields(self) -> Dict[str, str]:
+        return {
+            "search_id": self.search_id,
+            "seeker_id": self.seeker_id,
+            "preferences": self.preferences.model_dump_json(),
+            "attempt": str(self.attempt),
+        }
+
+
+class MatchingJobQueue:
+    """Matching jobs on a Redis stream, consumed through a consumer group."""
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        settings = get_settings()
+        self._client = client or redis.from_url(settings.redis_url)
+        self.stream = settings.matching_queue_stream
+        self.group = settings.matching_queue_group
+        self.visibility_seconds = settings.matching_queue_visibility_seconds
+        self.max_attempts = settings.matching_queue_max_attempts
+        self._max_per_seeker = settings.matching_queue_max_per_seeker
+        self._slot_ttl = settings.redis_ttl
+        self._group_ready = False
+        self._release_slot = self._client.register_script(_RELEASE_SLOT_SCRIPT)
+
+    def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            self._client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except redis.ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    def enqueue(self, search_id: str, seeker_id: str, preferences: MatchingPreference) -> None:
+        """Queue a search; raises SearchQueueFullError when the seeker has no free slot."""
+        self._ensure_group()
+        slots = _seeker_key(seeker_id)
+        held = self._client.incr(slots)
+        self._client.expire(slots, self._slot_ttl)
+        if self._max_per_seeker > 0 and held > self._max_per_seeker:
+            self._client.decr(slots)
+            raise SearchQueueFullError(seeker_id)
+        job = MatchingJob(message_id="", search_id=search_id, seeker_id=seeker_id, preferences=preferences)
+        self._client.xadd(self.stream, job.to_fields())
+
+    def claim(self, consumer: str, block_ms: int = 5000) -> Optional[MatchingJob]:
+        """
+        The next job for `consumer`: an abandoned one first, else a new one,
+        waiting up to `block_ms`. An abandoned job's `attempt` includes the
+        deliveries that never finished, so it may exceed `max_attempts`.
+        """
+        self._ensure_group()
+        _, abandoned, *_ = self._client.xautoclaim(
+            self.stream, self.group, consumer,
+            min_idle_time=self.visibility_seconds * 1000, start_id="0-0", count=1,
+        )
+        for message_id, fields in abandoned:
+            if not fields:
+                continue
+            job = MatchingJob.from_message(message_id, fields)
+            pending = self._client.xpending_range(
+                self.stream, self.group, min=job.message_id, max=job.message_id, count=1,
+            )
+            deliveries = pending[0]["times_delivered"] if pending else 1
+            logger.warning(f"[MatchingQueue] Reclaimed search {job.search_id} after {deliveries} deliveries")
+            return replace(job, attempt=job.attempt + deliveries - 1)
+
+        response = self._client.xreadgroup(self.group, consumer, {self.stream: ">"}, count=1, block=block_ms)
+        for _, messages in response or []:
+            for message_id, fields in messages:
+                return MatchingJob.from_message(message_id, fields)
+        return None
+
+    def touch(self, job: MatchingJob, consumer: str) -> None:
+        """Reset the job's idle time so it is not reclaimed while running."""
+        self._client.xclaim(self.stream, self.group, consumer, 0, [job.message_id], justid=True)
+
+    def ack(self, job: MatchingJob) -> None:
+        """Finish a job and free its seeker slot."""
+        pipe = self._client.pipeline()
+        pipe.xack(self.stream, self.group, job.message_id)
+        pipe.xdel(self.stream, job.message_id)
+        self._release_slot(keys=[_seeker_key(job.seeker_id)], client=pipe)
+        pipe.execute()
+
+    def retry(self, job: MatchingJob) -> bool:
+        """Re-queue a failed job; returns False (and finishes it) once attempts are used up."""
+        if job.attempt >= self.max_attempts:
+            self.ack(job)
+            return False
+        pipe = self._client.pipeline()
+        pipe.xadd(self.stream, replace(job, attempt=job.attempt + 1).to_fields())
+        pipe.xack(self.stream, self.group, job.message_id)
+        pipe.xdel(self.stream, job.message_id)
+        pipe.execute()
+        return True
+
+    def remove_consumer(self, consumer: str) -> bool:
+        """
+        Leave the consumer group on shutdown. A consumer still holding jobs
+        stays, so those jobs remain reclaimable; returns whether it was removed.
+        """
+        held = self._client.xpending_range(
+            self.stream, self.group, min="-", max="+", count=1, consumername=consumer,
+        )
+        if held:
+            return False
+        self._client.xgroup_delconsumer(self.stream, self.group, consumer)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth: jobs waiting for a worker and jobs being worked on."""
+        try:
+            depth = self._client.xlen(self.stream)
+            groups = self._client.xinfo_groups(self.stream)
+        except redis.ResponseError:
+            return {"waiting": 0, "running": 0, "consumers": 0}
+        group = next((g for g in groups if _text(g["name"]) == self.group), None)
+        running = int(group["pending"]) if group else 0
+        return {
+            "waiting": max(depth - running, 0),
+            "running": running,
+            "consumers": int(group["consumers"]) if group else 0,
+        }
+
+
+_queue: Optional[MatchingJobQueue] = None
+
+
+def get_matching_job_queue() -> MatchingJobQueue:
+    """Get or create the job queue instance."""
+    global _queue
+    if _queue is None:
+        _queue = MatchingJobQueue()
+    return _queue
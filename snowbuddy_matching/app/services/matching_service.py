@@ -1,68 +1,159 @@
 """Matching service - orchestrates the matching process with calendar integration."""
-from typing import List, Dict, Any, Optional
+import asyncio
+import logging
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional, Sequence
 from datetime import datetime, timezone
 
 from ..models.matching import MatchSummary, MatchingPreference
-from ..core.matching_logic import calculate_total_match_score, filter_candidates
+from ..core.matching_logic import combine_scores, filter_candidates
+from ..core.ranking import TopK
+from ..core.scorers import (
+    calculate_skill_score,
+    calculate_location_score,
+    calculate_availability_score,
+    calculate_role_score,
+    calculate_knowledge_score,
+)
 from ..clients import user_core_client, resort_services_client, knowledge_engagement_client
-from .redis_repository import get_redis_repository
+from .candidate_pool import CandidatePool, PoolEntry, get_candidate_pool_cache, pool_fingerprint
+from ..config import get_settings
+from .redis_repository import SUMMARY_FIELDS, get_redis_repository
+from .search_events import get_search_event_bus, polling_subscription, watch_search
 from .workflow_clients import get_matching_workflow_client
 from .matching_notifications import MatchingNotificationDispatcher
 
 
+logger = logging.getLogger(__name__)
+
+
 class MatchingService:
     """Service for snowbuddy matching operations."""
     
     def __init__(self):
         self._redis = get_redis_repository()
+        self._pools = get_candidate_pool_cache()
         self._workflow_client = get_matching_workflow_client()
         self._notifier = MatchingNotificationDispatcher()
     
-    async def run_matching(self, search_id: str, seeker_id: str, seeker_prefs: MatchingPreference) -> None:
-        """Execute the full matching process with calendar integration."""
+    async def run_matching(
+        self,
+        search_id: str,
+        seeker_id: str,
+        seeker_prefs: MatchingPreference,
+        final_attempt: bool = True,
+    ) -> None:
+        """
+        Execute the full matching process with calendar integration.
+
+        A failure marks the search failed only on its `final_attempt`;
+        otherwise it stays processing for the queue's retry.
+        """
         # 1. Mark as processing when running locally
         if not self._workflow_client:
             self._redis.set_processing(search_id)
         
-        # 2. Fetch external data
-        all_users = await user_core_client.get_users()
-        all_resorts = await resort_services_client.get_resorts()
+        try:
+            payload = await self._rank(search_id, seeker_id, seeker_prefs)
+        except Exception:
+            if final_attempt and not self._workflow_client:
+                self._redis.set_failed(search_id)
+            raise
+        await self._notifier.notify_completion(
+            search_id=search_id,
+            seeker_id=seeker_id,
+            results=payload,
+        )
+        
+        # 7. Create calendar event for matching request
+        await self._create_matching_calendar_event(search_id, seeker_id, seeker_prefs)
+    
+    async def _rank(
+        self,
+        search_id: str,
+        seeker_id: str,
+        seeker_prefs: MatchingPreference
+    ) -> List[Dict[str, Any]]:
+        """Rank candidates for the seeker and store the results."""
+        settings = get_settings()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.matching_time_budget_seconds
+        
+        # 2. Filtered, pre-scored candidate pool (shared by searches with the same fingerprint)
+        pool = await self._pools.get(
+            pool_fingerprint(seeker_prefs),
+            lambda: self._build_pool(seeker_prefs),
+        )
         
         # 3. 獲取 seeker 的 CASI 技能資料
         seeker_casi = await user_core_client.get_casi_skills(seeker_id)
         
-        # 3. Filter candidates
-        candidates = filter_candidates(seeker_prefs, all_users, seeker_id)
-        
-        # 4. Fetch knowledge profiles if needed
+        # 4. Fetch the seeker's knowledge profile if needed
         seeker_knowledge = None
-        candidate_knowledge_map: Dict[str, Any] = {}
-        
         if seeker_prefs.include_knowledge_score:
             seeker_knowledge = await knowledge_engagement_client.get_skill_profile(seeker_id)
-            for candidate in candidates:
-                profile = await knowledge_engagement_client.get_skill_profile(candidate.user_id)
-                if profile:
-                    candidate_knowledge_map[candidate.user_id] = profile
         
-        # 5. Score candidates
-        scored = self._score_candidates(
-            seeker_prefs, candidates, all_resorts,
-            seeker_knowledge, candidate_knowledge_map
-        )
+        # 5. Score the pool chunk by chunk, keeping the best `matching_top_k`;
+        #    partial results are stored after each chunk that changed them,
+        #    and the best so far is final once the budget is spent
+        entries = pool.entries
+        if settings.matching_max_candidates > 0:
+            entries = entries[:settings.matching_max_candidates]
+        chunk_size = max(1, settings.matching_chunk_size)
+        top: TopK[MatchSummary] = TopK(settings.matching_top_k)
+        
+        for start in range(0, len(entries), chunk_size):
+            chunk = entries[start:start + chunk_size]
+            if seeker_prefs.include_knowledge_score:
+                await self._load_pool_knowledge(pool, chunk)
+            changed = False
+            for summary in self._score_candidates(seeker_id, seeker_prefs, pool, seeker_knowledge, chunk):
+                changed = top.push(summary.match_score, summary) or changed
+            
+            if start + chunk_size >= len(entries):
+                break
+            if settings.matching_time_budget_seconds > 0 and loop.time() >= deadline:
+                logger.info(
+                    "Search %s hit its time budget after %d of %d candidates",
+                    search_id, start + chunk_size, len(entries),
+                )
+                break
+            if changed and not self._workflow_client:
+                self._redis.set_partial(search_id, [r.model_dump() for r in top.ranked()])
+            await asyncio.sleep(0)
         
         # 6. Store results
-        payload = [r.model_dump() for r in scored]
+        payload = [r.model_dump() for r in top.ranked()]
         if not self._workflow_client:
             self._redis.set_completed(search_id, payload)
-        await self._notifier.notify_completion(
-            search_id=search_id,
-            seeker_id=seeker_id,
-            results=payload,
-        )
+        return payload
+    
+    async def _build_pool(self, seeker_prefs: MatchingPreference) -> CandidatePool:
+        """Fetch users and resorts, filter, and compute seeker-independent scores."""
+        all_users = await user_core_client.get_users()
+        all_resorts = await resort_services_client.get_resorts()
         
-        # 7. Create calendar event for matching request
-        await self._create_matching_calendar_event(search_id, seeker_id, seeker_prefs)
+        # The seeker is excluded when the pool is ranked, so the pool can be shared
+        candidates = filter_candidates(seeker_prefs, all_users, seeker_id=None)
+        return CandidatePool(entries=[
+            PoolEntry(
+                candidate=candidate,
+                skill=calculate_skill_score(seeker_prefs, candidate),
+                location=calculate_location_score(seeker_prefs, candidate, all_resorts),
+                availability=calculate_availability_score(seeker_prefs, candidate),
+            )
+            for candidate in candidates
+        ])
+    
+    async def _load_pool_knowledge(self, pool: CandidatePool, entries: Sequence[PoolEntry]) -> None:
+        """Fetch knowledge profiles for these pool candidates not fetched yet."""
+        missing = [
+            entry.candidate.user_id for entry in entries
+            if entry.candidate.user_id not in pool.knowledge
+        ]
+        profiles = await asyncio.gather(
+            *(knowledge_engagement_client.get_skill_profile(user_id) for user_id in missing)
+        )
+        pool.knowledge.update(zip(missing, profiles))
     
     async def _create_matching_calendar_event(
         self,
@@ -93,36 +184,93 @@ class MatchingService:
     
     def _score_candidates(
         self,
+        seeker_id: str,
         seeker_prefs: MatchingPreference,
-        candidates: List,
-        all_resorts: List[Dict[str, Any]],
+        pool: CandidatePool,
         seeker_knowledge: Any,
-        candidate_knowledge_map: Dict[str, Any]
-    ) -> List[MatchSummary]:
-        """Score and rank candidates."""
-        scored = []
-        for candidate in candidates:
-            candidate_knowledge = candidate_knowledge_map.get(candidate.user_id) if seeker_prefs.include_knowledge_score else None
+        entries: Sequence[PoolEntry],
+    ) -> Iterator[MatchSummary]:
+        """Score pool entries for this seeker, yielding those worth ranking."""
+        for entry in entries:
+            candidate = entry.candidate
+            if candidate.user_id == seeker_id:
+                continue
+            
+            s_knowledge = None
+            if seeker_prefs.include_knowledge_score:
+                s_knowledge = calculate_knowledge_score(seeker_knowledge, pool.knowledge.get(candidate.user_id))
             
-            score = calculate_total_match_score(
-                seeker_prefs, candidate, all_resorts,
-                seeker_knowledge, candidate_knowledge
+            score = combine_scores(
+                entry.skill, entry.location, entry.availability,
+                calculate_role_score(seeker_prefs, candidate),
+                s_knowledge,
             )
             
             if score > 0.2:
-                scored.append(MatchSummary(**candidate.model_dump(), match_score=score))
-        
-        scored.sort(key=lambda x: x.match_score, reverse=True)
-        return scored
+                yield MatchSummary(**candidate.model_dump(), match_score=score)
     
-    async def get_results(self, search_id: str) -> Optional[Dict[str, Any]]:
-        """Get search results from workflow state or Redis."""
+    async def get_results(
+        self,
+        search_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get one page of search results from workflow state or Redis."""
         if self._workflow_client:
-            return await self._workflow_client.get_search_status(
+            state = await self._workflow_client.get_search_status(
                 search_id,
                 include_candidates=True,
             )
-        return self._redis.get_results(search_id)
+            return _page(state, offset, limit, fields)
+        return self._redis.get_results(search_id, offset=offset, limit=limit, fields=fields)
+    
+    async def watch(
+        self,
+        search_id: str,
+        timeout_seconds: float,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield the current page of a search, then each change (see search_events.watch_search)."""
+        settings = get_settings()
+        if self._workflow_client:
+            subscription = polling_subscription(settings.matching_watch_poll_seconds)
+        else:
+            subscription = get_search_event_bus().subscribe(search_id)
+        async with subscription as messages:
+            async for state in watch_search(
+                lambda: self.get_results(search_id, offset=offset, limit=limit, fields=fields),
+                messages,
+                timeout_seconds=timeout_seconds,
+                heartbeat_seconds=settings.matching_stream_heartbeat_seconds,
+            ):
+                yield state
+
+
+def _page(
+    state: Optional[Dict[str, Any]],
+    offset: int,
+    limit: Optional[int],
+    fields: Optional[Sequence[str]],
+) -> Optional[Dict[str, Any]]:
+    """Apply the Redis page shape to a workflow-managed result list."""
+    if not state or not isinstance(state.get("results"), list):
+        return state
+    results = state["results"]
+    end = None if limit is None else offset + limit
+    wanted = SUMMARY_FIELDS if fields is None else fields
+    return {
+        **state,
+        "total": len(results),
+        "offset": offset,
+        "limit": limit,
+        "results": [
+            {field: result[field] for field in wanted if field in result}
+            for result in results[offset:end]
+        ],
+    }
 
 
 def get_matching_service() -> MatchingService:
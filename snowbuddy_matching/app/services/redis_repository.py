@@ -1,43 +1,215 @@
 """
 Redis repository for search results storage.
+
+A search is stored as:
+
+- `matching:search:{id}`         hash with `status` and `total`
+- `matching:search:{id}:ranked`  sorted set of user_id scored by match_score
+
+Candidate display fields live once per candidate in
+`matching:candidate:{user_id}` (msgpack `[nickname, skill_level, self_role]`),
+shared by every search that ranks them; each search refreshes their TTL.
+Polls read one page of the sorted set plus an MGET of that page's candidates.
+`matching:dedup:{fingerprint}` maps a seeker's identical re-submission to the
+search already started for it.
+
+While a search is processing, the ranked set holds its best results so far.
+The repository remembers what it last wrote for each processing search, so a
+partial update only sends the ranked entries that changed and the candidate
+records of newcomers; the completed write rewrites the set in full.
+Each state change is also published on `matching:search:{id}:events` for
+push watchers (see search_events).
 """
 import json
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence
+
+import msgpack
 import redis
 
 from ..config import get_settings
+from .search_events import events_channel
+
+
+SUMMARY_FIELDS = ("user_id", "nickname", "skill_level", "self_role", "match_score")
+_CANDIDATE_FIELDS = ("nickname", "skill_level", "self_role")
+
+
+def _meta_key(search_id: str) -> str:
+    return f"matching:search:{search_id}"
+
+
+def _ranked_key(search_id: str) -> str:
+    return f"matching:search:{search_id}:ranked"
+
+
+def _candidate_key(user_id: str) -> str:
+    return f"matching:candidate:{user_id}"
+
+
+def _dedup_key(fingerprint: str) -> str:
+    return f"matching:dedup:{fingerprint}"
+
+
+def _publish(pipe: Any, search_id: str, search_status: str, total: int) -> None:
+    pipe.publish(events_channel(search_id), json.dumps({"status": search_status, "total": total}))
 
 
 class RedisRepository:
     """Handles Redis operations for search results."""
-    
-    def __init__(self):
+
+    def __init__(self, client: Optional[redis.Redis] = None):
         settings = get_settings()
-        self._client = redis.from_url(settings.redis_url)
+        self._client = client or redis.from_url(settings.redis_url)
         self._ttl = settings.redis_ttl
-    
+        # search_id -> ranked set as last written by set_partial
+        self._partials: Dict[str, Dict[str, float]] = {}
+
+    def set_queued(self, search_id: str) -> None:
+        """Mark a search as waiting for a matching worker."""
+        meta_key = _meta_key(search_id)
+        pipe = self._client.pipeline()
+        pipe.hset(meta_key, mapping={"status": "queued", "total": 0})
+        pipe.expire(meta_key, self._ttl)
+        _publish(pipe, search_id, "queued", 0)
+        pipe.execute()
+
     def set_processing(self, search_id: str) -> None:
         """Mark a search as processing."""
-        self._client.set(
-            search_id,
-            json.dumps({"status": "processing", "results": []}),
-            ex=self._ttl
+        self._partials.pop(search_id, None)
+        meta_key = _meta_key(search_id)
+        pipe = self._client.pipeline()
+        pipe.hset(meta_key, mapping={"status": "processing", "total": 0})
+        pipe.expire(meta_key, self._ttl)
+        _publish(pipe, search_id, "processing", 0)
+        pipe.execute()
+
+    def set_partial(self, search_id: str, results: List[Dict[str, Any]]) -> None:
+        """
+        Store the best results so far of a search that is still processing.
+        After the first partial write only the difference to the previous one
+        is sent.
+        """
+        self._partials[search_id] = self._store_ranked(
+            search_id, results, "processing", self._partials.get(search_id)
         )
-    
+
     def set_completed(self, search_id: str, results: List[Dict[str, Any]]) -> None:
-        """Store completed search results."""
-        self._client.set(
-            search_id,
-            json.dumps({"status": "completed", "results": results}),
-            ex=self._ttl
-        )
-    
-    def get_results(self, search_id: str) -> Optional[Dict[str, Any]]:
-        """Get search results by ID."""
-        data = self._client.get(search_id)
-        if data:
-            return json.loads(data)
-        return None
+        """Store completed search results (MatchSummary dicts)."""
+        self._partials.pop(search_id, None)
+        self._store_ranked(search_id, results, "completed")
+
+    def _store_ranked(
+        self,
+        search_id: str,
+        results: List[Dict[str, Any]],
+        search_status: str,
+        previous: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        meta_key, ranked_key = _meta_key(search_id), _ranked_key(search_id)
+        ranked = {result["user_id"]: result["match_score"] for result in results}
+
+        pipe = self._client.pipeline()
+        if previous is None:
+            pipe.delete(ranked_key)
+            changed = ranked
+        else:
+            removed = [user_id for user_id in previous if user_id not in ranked]
+            if removed:
+                pipe.zrem(ranked_key, *removed)
+            changed = {
+                user_id: score for user_id, score in ranked.items()
+                if previous.get(user_id) != score
+            }
+        if changed:
+            pipe.zadd(ranked_key, changed)
+        if ranked:
+            pipe.expire(ranked_key, self._ttl)
+        for result in results:
+            if previous is not None and result["user_id"] in previous:
+                continue
+            pipe.set(
+                _candidate_key(result["user_id"]),
+                msgpack.packb([result[field] for field in _CANDIDATE_FIELDS]),
+                ex=self._ttl,
+            )
+        pipe.hset(meta_key, mapping={"status": search_status, "total": len(ranked)})
+        pipe.expire(meta_key, self._ttl)
+        _publish(pipe, search_id, search_status, len(ranked))
+        pipe.execute()
+        return ranked
+
+    def set_failed(self, search_id: str) -> None:
+        """Mark a search as failed so watchers stop waiting for it."""
+        self._partials.pop(search_id, None)
+        meta_key = _meta_key(search_id)
+        pipe = self._client.pipeline()
+        pipe.hset(meta_key, mapping={"status": "failed", "total": 0})
+        pipe.expire(meta_key, self._ttl)
+        _publish(pipe, search_id, "failed", 0)
+        pipe.execute()
+
+    def claim_search(self, fingerprint: str, search_id: str, window_seconds: int) -> str:
+        """
+        Register `search_id` for a search fingerprint, unless another search
+        claimed it within `window_seconds`; returns the search to use.
+        """
+        key = _dedup_key(fingerprint)
+        if self._client.set(key, search_id, nx=True, ex=window_seconds):
+            return search_id
+        existing = self._client.get(key)
+        return existing.decode() if existing else search_id
+
+    def release_search(self, fingerprint: str, search_id: str) -> None:
+        """Drop the dedup claim of a search that was never started."""
+        key = _dedup_key(fingerprint)
+        existing = self._client.get(key)
+        if existing is not None and existing.decode() == search_id:
+            self._client.delete(key)
+
+    def get_results(
+        self,
+        search_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get one page of search results by ID, best match first. A search
+        still processing returns its partial results so far.
+
+        `fields` restricts each result to those SUMMARY_FIELDS; candidate
+        records are only read when a candidate field is requested.
+        """
+        search_status, total = self._client.hmget(_meta_key(search_id), "status", "total")
+        if search_status is None:
+            return None
+
+        page: Dict[str, Any] = {
+            "status": search_status.decode(),
+            "total": int(total or 0),
+            "offset": offset,
+            "limit": limit,
+            "results": [],
+        }
+        if not page["total"]:
+            return page
+
+        end = -1 if limit is None else offset + limit - 1
+        ranked = self._client.zrevrange(_ranked_key(search_id), offset, end, withscores=True)
+        if not ranked:
+            return page
+
+        wanted = SUMMARY_FIELDS if fields is None else fields
+        packed: List[Optional[bytes]] = [None] * len(ranked)
+        if any(field in _CANDIDATE_FIELDS for field in wanted):
+            packed = self._client.mget([_candidate_key(member.decode()) for member, _ in ranked])
+
+        for (member, score), candidate in zip(ranked, packed):
+            result: Dict[str, Any] = {"user_id": member.decode(), "match_score": score}
+            if candidate is not None:
+                result.update(zip(_CANDIDATE_FIELDS, msgpack.unpackb(candidate)))
+            page["results"].append({field: result[field] for field in wanted if field in result})
+        return page
 
 
 # Singleton instance
@@ -0,0 +1,145 @@
+"""
+Push delivery of search progress.
+
+Every state change of a locally-run search is published on
+`matching:search:{id}:events` (see RedisRepository). A watcher subscribes
+first and reads the stored page second, so a change landing in between is
+never missed; messages are only signals and each one re-reads the page, so a
+watcher always sees the same shape as `GET /matching/searches/{id}`.
+
+Searches run by the durable workflow publish nothing here; their watchers
+poll the workflow status every `matching_watch_poll_seconds` instead.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from ..config import get_settings
+
+
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+def events_channel(search_id: str) -> str:
+    return f"matching:search:{search_id}:events"
+
+
+def is_terminal(state: Optional[Dict[str, Any]]) -> bool:
+    return state is None or str(state.get("status", "")).lower() in TERMINAL_STATUSES
+
+
+class _RedisSubscription:
+    def __init__(self, pubsub: aioredis.client.PubSub):
+        self._pubsub = pubsub
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """The next published message, or None after `timeout` seconds."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+            if message is not None and message["type"] == "message":
+                return json.loads(message["data"])
+        return None
+
+
+class _PollingSubscription:
+    def __init__(self, interval: float):
+        self._interval = interval
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Signal a re-read every `interval` seconds."""
+        if timeout < self._interval:
+            await asyncio.sleep(timeout)
+            return None
+        await asyncio.sleep(self._interval)
+        return {}
+
+
+class SearchEventBus:
+    """Subscriptions to search event channels over an asyncio Redis client."""
+
+    def __init__(self, redis_url: str):
+        self._redis_url = redis_url
+        self._client: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> aioredis.Redis:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = aioredis.from_url(self._redis_url)
+            self._loop = loop
+        return self._client
+
+    @asynccontextmanager
+    async def subscribe(self, search_id: str) -> AsyncIterator[_RedisSubscription]:
+        pubsub = self._get_client().pubsub()
+        await pubsub.subscribe(events_channel(search_id))
+        try:
+            yield _RedisSubscription(pubsub)
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.aclose()
+            except redis.RedisError:
+                pass
+
+
+@asynccontextmanager
+async def polling_subscription(interval: float) -> AsyncIterator[_PollingSubscription]:
+    yield _PollingSubscription(interval)
+
+
+async def watch_search(
+    load: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    subscription: Any,
+    timeout_seconds: float,
+    heartbeat_seconds: float,
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Yield the current page, then every changed page until the search is
+    terminal or `timeout_seconds` pass.
+
+    The first item is None when the search does not exist; later None items
+    are heartbeats, yielded after `heartbeat_seconds` without a change.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds
+    state = await load()
+    yield state
+    last_sent = loop.time()
+
+    while not is_terminal(state):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return
+        signal = await subscription.next(min(heartbeat_seconds, remaining))
+        if signal is not None:
+            latest = await load()
+            if latest is None:
+                return
+            if latest != state:
+                state = latest
+                last_sent = loop.time()
+                yield state
+                continue
+        if loop.time() - last_sent >= heartbeat_seconds:
+            last_sent = loop.time()
+            yield None
+
+
+_bus: Optional[SearchEventBus] = None
+
+
+def get_search_event_bus() -> SearchEventBus:
+    """Get or create the process-wide event bus."""
+    global _bus
+    if _bus is None:
+        _bus = SearchEventBus(get_settings().redis_url)
+    return _bus
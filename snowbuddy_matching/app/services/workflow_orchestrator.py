@@ -1,16 +1,25 @@
 """Workflow dispatching helpers for Snowbuddy matching."""
 from __future__ import annotations
 
+import logging
 from typing import Optional
 
+import redis
 from fastapi import BackgroundTasks
 
 from ..config import get_settings
+from ..exceptions import SearchQueueFullError
 from ..models.matching import MatchingPreference
+from .candidate_pool import search_fingerprint
+from .matching_queue import MatchingJobQueue, get_matching_job_queue
 from .matching_service import MatchingService, get_matching_service
+from .redis_repository import RedisRepository, get_redis_repository
 from .workflow_clients import get_matching_workflow_client
 
 
+logger = logging.getLogger(__name__)
+
+
 class MatchingWorkflowOrchestrator:
     """Coordinates between local matching service and durable workflows."""
 
@@ -18,9 +27,13 @@ class MatchingWorkflowOrchestrator:
         self,
         matching_service: MatchingService,
         workflow_client: Optional[MatchingWorkflowClient] = None,
+        repository: Optional[RedisRepository] = None,
+        queue: Optional[MatchingJobQueue] = None,
     ) -> None:
         self._matching_service = matching_service
         self._workflow_client = workflow_client
+        self._repository = repository
+        self._queue = queue
 
     async def start_matching(
         self,
@@ -29,8 +42,18 @@ class MatchingWorkflowOrchestrator:
         seeker_id: str,
         seeker_preferences: MatchingPreference,
         background_tasks: Optional[BackgroundTasks] = None,
-    ) -> None:
-        """Kick off the matching workflow using LDF when available."""
+    ) -> str:
+        """
+        Kick off the matching workflow using LDF when available, else the
+        worker queue when enabled, else an in-process background task.
+
+        Returns the search ID to poll: an identical search by the same seeker
+        within the dedup window returns the earlier search instead of
+        starting a new one.
+        """
+        claimed = self._claim(search_id, seeker_id, seeker_preferences)
+        if claimed != search_id:
+            return claimed
 
         if self._workflow_client:
             settings = get_settings()
@@ -41,7 +64,20 @@ class MatchingWorkflowOrchestrator:
                 callback_webhook=settings.matching_workflow_callback_url,
                 timeout_seconds=settings.matching_workflow_timeout_seconds,
             )
-            return
+            return search_id
+
+        if self._queue is not None:
+            if self._repository is not None:
+                self._repository.set_queued(search_id)
+            try:
+                self._queue.enqueue(search_id, seeker_id, seeker_preferences)
+            except SearchQueueFullError:
+                if self._repository is not None:
+                    self._repository.release_search(
+                        search_fingerprint(seeker_id, seeker_preferences), search_id
+                    )
+                raise
+            return search_id
 
         # Fallback: run existing in-process background task.
         if background_tasks is not None:
@@ -53,6 +89,19 @@ class MatchingWorkflowOrchestrator:
             )
         else:
             await self._matching_service.run_matching(search_id, seeker_id, seeker_preferences)
+        return search_id
+
+    def _claim(self, search_id: str, seeker_id: str, seeker_preferences: MatchingPreference) -> str:
+        window = get_settings().matching_dedup_window_seconds
+        if self._repository is None or window <= 0:
+            return search_id
+        try:
+            return self._repository.claim_search(
+                search_fingerprint(seeker_id, seeker_preferences), search_id, window
+            )
+        except redis.RedisError as exc:
+            logger.warning(f"[Matching] Dedup unavailable, starting a new search: {exc}")
+            return search_id
 
 
 _orchestrator: Optional[MatchingWorkflowOrchestrator] = None
@@ -67,5 +116,7 @@ def get_matching_workflow_orchestrator() -> MatchingWorkflowOrchestrator:
         _orchestrator = MatchingWorkflowOrchestrator(
             matching_service=get_matching_service(),
             workflow_client=workflow_client,
+            repository=get_redis_repository(),
+            queue=get_matching_job_queue() if get_settings().matching_queue_enabled else None,
         )
     return _orchestrator
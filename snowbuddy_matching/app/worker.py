@@ -0,0 +1,116 @@
+"""
+Snowbuddy Matching Service - matching worker processes.
+
+    python -m app.worker [--processes N]
+
+Each process consumes the matching job queue (see services/matching_queue)
+and runs one search at a time, so scoring never competes with the API tier
+for CPU. SIGTERM lets every process finish its current search first, after
+which it leaves the consumer group.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+from typing import Callable
+
+from .config import get_settings
+from .services.matching_queue import MatchingJob, MatchingJobQueue, get_matching_job_queue
+from .services.matching_service import MatchingService
+from .services.redis_repository import get_redis_repository
+
+logger = logging.getLogger("snowbuddy_matching.worker")
+
+
+async def _keep_claimed(queue: MatchingJobQueue, job: MatchingJob, consumer: str) -> None:
+    interval = max(queue.visibility_seconds / 3, 1)
+    while True:
+        await asyncio.sleep(interval)
+        queue.touch(job, consumer)
+
+
+async def process_job(queue: MatchingJobQueue, service: MatchingService, job: MatchingJob, consumer: str) -> None:
+    """Run one queued search, then acknowledge or retry it."""
+    if job.attempt > queue.max_attempts:
+        logger.error(f"Search {job.search_id} abandoned {job.attempt} times, giving up")
+        get_redis_repository().set_failed(job.search_id)
+        queue.ack(job)
+        return
+
+    heartbeat = asyncio.create_task(_keep_claimed(queue, job, consumer))
+    try:
+        await service.run_matching(
+            job.search_id,
+            job.seeker_id,
+            job.preferences,
+            final_attempt=job.attempt >= queue.max_attempts,
+        )
+    except Exception:
+        logger.exception(f"Search {job.search_id} failed on attempt {job.attempt}")
+        if not queue.retry(job):
+            logger.error(f"Search {job.search_id} failed after {job.attempt} attempts")
+    else:
+        queue.ack(job)
+    finally:
+        heartbeat.cancel()
+
+
+async def run_worker(consumer: str, stopping: Callable[[], bool]) -> None:
+    """Claim and process jobs until `stopping()`."""
+    queue = get_matching_job_queue()
+    service = MatchingService()
+    logger.info(f"Matching worker {consumer} consuming {queue.stream}")
+    try:
+        while not stopping():
+            job = queue.claim(consumer, block_ms=5000)
+            if job is not None:
+                await process_job(queue, service, job, consumer)
+    finally:
+        try:
+            queue.remove_consumer(consumer)
+        except Exception:
+            logger.exception(f"Matching worker {consumer} could not leave {queue.group}")
+
+
+def _worker_main(index: int) -> None:
+    logging.basicConfig(level=logging.INFO)
+    stop = []
+    signal.signal(signal.SIGTERM, lambda *_: stop.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stop.append(True))
+    consumer = f"{socket.gethostname()}-{os.getpid()}-{index}"
+    asyncio.run(run_worker(consumer, lambda: bool(stop)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run snowbuddy matching workers.")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=get_settings().matching_worker_processes or os.cpu_count() or 1,
+        help="Worker processes (default: MATCHING_WORKER_PROCESSES, else one per CPU core)",
+    )
+    args = parser.parse_args()
+    if args.processes <= 1:
+        _worker_main(0)
+        return
+
+    workers = [multiprocessing.Process(target=_worker_main, args=(index,)) for index in range(args.processes)]
+    for worker in workers:
+        worker.start()
+
+    def forward(signum, _frame):
+        for worker in workers:
+            if worker.is_alive():
+                os.kill(worker.pid, signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Unit tests for shared candidate pools and search deduplication.
+"""
+import asyncio
+import sys
+from pathlib import Path
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add parent to path for proper imports
+parent_path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(parent_path))
+
+from app.core.matching_logic import calculate_total_match_score
+from app.models.matching import CandidateProfile, MatchingPreference
+from app.services import candidate_pool, matching_service
+from app.services.candidate_pool import CandidatePool, CandidatePoolCache, pool_fingerprint, search_fingerprint
+from app.services.workflow_orchestrator import MatchingWorkflowOrchestrator
+
+
+USERS = [
+    {"user_id": f"user-{i}", "nickname": f"Rider {i}", "skill_level": 4 + i % 4,
+     "self_role": ["buddy", "coach", "student"][i % 3],
+     "preferences": {"preferred_resorts": ["niseko"], "availability": ["2025-02-01"]}}
+    for i in range(6)
+]
+RESORTS = [{"resort_id": "niseko", "region": "hokkaido"}]
+
+
+class TestFingerprints:
+    def test_pool_fingerprint_ignores_order_and_seeker_terms(self):
+        a = MatchingPreference(preferred_resorts=["niseko", "rusutsu"], seeking_role="buddy")
+        b = MatchingPreference(preferred_resorts=["rusutsu", "niseko"], seeking_role="coach",
+                               include_knowledge_score=True)
+        assert pool_fingerprint(a) == pool_fingerprint(b)
+        assert pool_fingerprint(a) != pool_fingerprint(MatchingPreference(preferred_resorts=["niseko"]))
+
+    def test_search_fingerprint_is_per_seeker_and_role(self):
+        prefs = MatchingPreference(preferred_resorts=["niseko"])
+        assert search_fingerprint("u1", prefs) == search_fingerprint("u1", prefs.model_copy())
+        assert search_fingerprint("u1", prefs) != search_fingerprint("u2", prefs)
+        assert search_fingerprint("u1", prefs) != search_fingerprint(
+            "u1", prefs.model_copy(update={"seeking_role": "coach"})
+        )
+
+
+class TestCandidatePoolCache:
+    def test_concurrent_searches_share_one_build(self):
+        cache = CandidatePoolCache(ttl_seconds=60)
+        builds = []
+
+        async def build():
+            builds.append(1)
+            await asyncio.sleep(0.01)
+            return CandidatePool(entries=[])
+
+        async def scenario():
+            return await asyncio.gather(*(cache.get("fp", build) for _ in range(5)))
+
+        pools = asyncio.run(scenario())
+        assert len(builds) == 1
+        assert all(pool is pools[0] for pool in pools)
+        # Reused while fresh
+        assert asyncio.run(cache.get("fp", build)) is pools[0]
+        assert len(builds) == 1
+
+    def test_stale_and_failed_pools_are_rebuilt(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(candidate_pool.time, "monotonic", lambda: now[0])
+        cache = CandidatePoolCache(ttl_seconds=60)
+        calls = []
+
+        async def failing():
+            calls.append("fail")
+            raise RuntimeError("user-core down")
+
+        async def build():
+            calls.append("build")
+            return CandidatePool(entries=[], built_at=now[0])
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(cache.get("fp", failing))
+        first = asyncio.run(cache.get("fp", build))
+        now[0] += 61
+        assert asyncio.run(cache.get("fp", build)) is not first
+        assert calls == ["fail", "build", "build"]
+
+
+class TestMatchingServiceReuse:
+    @pytest.fixture
+    def service(self, monkeypatch):
+        get_users = AsyncMock(return_value=USERS)
+        monkeypatch.setattr(matching_service.user_core_client, "get_users", get_users)
+        monkeypatch.setattr(matching_service.user_core_client, "get_casi_skills", AsyncMock(return_value=None))
+        monkeypatch.setattr(matching_service.user_core_client, "create_calendar_event", AsyncMock())
+        monkeypatch.setattr(matching_service.resort_services_client, "get_resorts", AsyncMock(return_value=RESORTS))
+        monkeypatch.setattr(candidate_pool, "_cache", CandidatePoolCache(ttl_seconds=60))
+
+        class Store(dict):
+            def set_processing(self, search_id):
+                pass
+
+            def set_completed(self, search_id, results):
+                self[search_id] = results
+
+        service = matching_service.MatchingService()
+        service._redis = service.stored = Store()
+        service._workflow_client = None
+        service._notifier = AsyncMock()
+        service.get_users = get_users
+        return service
+
+    def test_pool_is_reused_and_reranked_per_seeker(self, service):
+        buddy = MatchingPreference(preferred_resorts=["niseko"], availability=[date(2025, 2, 1)])
+        coach = buddy.model_copy(update={"seeking_role": "coach"})
+
+        asyncio.run(service.run_matching("s1", "user-0", buddy))
+        asyncio.run(service.run_matching("s2", "user-1", coach))
+
+        assert service.get_users.await_count == 1
+        s1, s2 = service.stored["s1"], service.stored["s2"]
+        assert s1 and s2
+        assert "user-0" not in {r["user_id"] for r in s1}
+        assert "user-1" not in {r["user_id"] for r in s2}
+        assert "user-0" in {r["user_id"] for r in s2}
+
+        # Re-ranked scores match scoring from scratch
+        for prefs, results in ((buddy, s1), (coach, s2)):
+            for result in results:
+                user = next(u for u in USERS if u["user_id"] == result["user_id"])
+                expected = calculate_total_match_score(prefs, CandidateProfile(**user), RESORTS)
+                assert result["match_score"] == expected
+
+
+class TestSearchDedup:
+    def test_identical_resubmission_returns_existing_search(self):
+        class Repository:
+            def __init__(self):
+                self.claims = {}
+
+            def claim_search(self, fingerprint, search_id, window_seconds):
+                return self.claims.setdefault(fingerprint, search_id)
+
+        service = AsyncMock()
+        orchestrator = MatchingWorkflowOrchestrator(matching_service=service, repository=Repository())
+        prefs = MatchingPreference(preferred_resorts=["niseko"])
+
+        async def scenario():
+            first = await orchestrator.start_matching(search_id="s1", seeker_id="u1", seeker_preferences=prefs)
+            again = await orchestrator.start_matching(search_id="s2", seeker_id="u1", seeker_preferences=prefs)
+            other = await orchestrator.start_matching(search_id="s3", seeker_id="u2", seeker_preferences=prefs)
+            return first, again, other
+
+        assert asyncio.run(scenario()) == ("s1", "s1", "s3")
+        assert service.run_matching.await_count == 2
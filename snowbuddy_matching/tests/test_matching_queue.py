@@ -0,0 +1,281 @@
+"""
+Unit tests for the durable matching job queue and its workers.
+"""
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add parent to path for proper imports
+parent_path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(parent_path))
+
+from app import worker
+from app.exceptions import SearchQueueFullError
+from app.models.matching import MatchingPreference
+from app.services.matching_queue import MatchingJobQueue
+from app.services.workflow_orchestrator import MatchingWorkflowOrchestrator
+
+
+class InMemoryStreams:
+    """One stream with one consumer group; `now` is advanced by hand (ms)."""
+
+    def __init__(self):
+        self.now = 0
+        self.entries = {}  # id -> fields
+        self.pending = {}  # id -> [consumer, delivered_at, times_delivered]
+        self.last_delivered = 0
+        self.counters = {}
+        self.consumers = set()
+        self._seq = 0
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+    def xgroup_create(self, name, groupname, id="0", mkstream=False):
+        pass
+
+    def incr(self, key):
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+    def decr(self, key):
+        self.counters[key] = self.counters.get(key, 0) - 1
+        return self.counters[key]
+
+    def expire(self, key, seconds):
+        pass
+
+    def register_script(self, source):
+        def release_slot(keys, args=(), client=None):
+            if keys[0] not in self.counters:
+                return 0
+            held = self.decr(keys[0])
+            if held <= 0:
+                del self.counters[keys[0]]
+            return held
+        return release_slot
+
+    def xadd(self, name, fields):
+        self._seq += 1
+        message_id = f"{self._seq}-0".encode()
+        self.entries[message_id] = {k.encode(): v.encode() for k, v in fields.items()}
+        return message_id
+
+    def xreadgroup(self, groupname, consumername, streams, count=None, block=None):
+        self.consumers.add(consumername)
+        fresh = [mid for mid in self.entries if int(mid.split(b"-")[0]) > self.last_delivered][:count]
+        if not fresh:
+            return []
+        for mid in fresh:
+            self.pending[mid] = [consumername, self.now, 1]
+            self.last_delivered = int(mid.split(b"-")[0])
+        return [[b"stream", [(mid, self.entries[mid]) for mid in fresh]]]
+
+    def xautoclaim(self, name, groupname, consumername, min_idle_time, start_id="0-0", count=None):
+        self.consumers.add(consumername)
+        idle = [mid for mid, (_, at, _) in self.pending.items() if self.now - at >= min_idle_time][:count]
+        for mid in idle:
+            entry = self.pending[mid]
+            self.pending[mid] = [consumername, self.now, entry[2] + 1]
+        return [b"0-0", [(mid, self.entries.get(mid)) for mid in idle], []]
+
+    def xpending_range(self, name, groupname, min, max, count, consumername=None):
+        if consumername is not None:
+            return [{"message_id": mid} for mid, (c, _, _) in self.pending.items() if c == consumername][:count]
+        mid = min.encode()
+        if mid not in self.pending:
+            return []
+        return [{"message_id": mid, "times_delivered": self.pending[mid][2]}]
+
+    def xclaim(self, name, groupname, consumername, min_idle_time, message_ids, justid=False):
+        for mid in message_ids:
+            self.pending[mid.encode()][1] = self.now
+
+    def xack(self, name, groupname, message_id):
+        self.pending.pop(message_id.encode(), None)
+
+    def xdel(self, name, message_id):
+        self.entries.pop(message_id.encode(), None)
+
+    def xlen(self, name):
+        return len(self.entries)
+
+    def xgroup_delconsumer(self, name, groupname, consumername):
+        self.consumers.discard(consumername)
+
+    def xinfo_groups(self, name):
+        return [{"name": b"matching-workers", "consumers": len(self.consumers), "pending": len(self.pending)}]
+
+
+PREFS = MatchingPreference(preferred_resorts=["niseko"], seeking_role="coach")
+
+
+@pytest.fixture
+def streams():
+    return InMemoryStreams()
+
+
+@pytest.fixture
+def queue(streams):
+    return MatchingJobQueue(client=streams)
+
+
+def test_enqueue_claim_ack(queue, streams):
+    queue.enqueue("s1", "u1", PREFS)
+    assert queue.stats() == {"waiting": 1, "running": 0, "consumers": 0}
+
+    job = queue.claim("w1")
+    assert (job.search_id, job.seeker_id, job.preferences, job.attempt) == ("s1", "u1", PREFS, 1)
+    assert queue.stats() == {"waiting": 0, "running": 1, "consumers": 1}
+    assert queue.claim("w2") is None
+
+    queue.ack(job)
+    assert queue.stats() == {"waiting": 0, "running": 0, "consumers": 2}
+    assert "matching:queue:seeker:u1" not in streams.counters
+
+
+def test_slot_counter_never_goes_negative(queue, streams):
+    queue.enqueue("s1", "u1", PREFS)
+    job = queue.claim("w1")
+    del streams.counters["matching:queue:seeker:u1"]  # TTL lapsed while the search ran
+
+    queue.ack(job)
+    assert "matching:queue:seeker:u1" not in streams.counters
+    for i in range(queue._max_per_seeker):
+        queue.enqueue(f"s{i + 2}", "u1", PREFS)
+    with pytest.raises(SearchQueueFullError):
+        queue.enqueue("one-too-many", "u1", PREFS)
+
+
+def test_consumer_leaves_group_only_when_idle(queue):
+    queue.enqueue("s1", "u1", PREFS)
+    job = queue.claim("w1")
+    assert queue.remove_consumer("w1") is False
+    assert queue.stats()["consumers"] == 1
+
+    queue.ack(job)
+    assert queue.remove_consumer("w1") is True
+    assert queue.stats()["consumers"] == 0
+
+
+def test_per_seeker_slots(queue):
+    for i in range(queue._max_per_seeker):
+        queue.enqueue(f"s{i}", "u1", PREFS)
+    with pytest.raises(SearchQueueFullError):
+        queue.enqueue("one-too-many", "u1", PREFS)
+    queue.enqueue("other-seeker", "u2", PREFS)
+
+    queue.ack(queue.claim("w1"))
+    queue.enqueue("after-a-slot-freed", "u1", PREFS)
+
+
+def test_retry_until_attempts_are_used_up(queue):
+    queue.enqueue("s1", "u1", PREFS)
+    attempts = []
+    while (job := queue.claim("w1")) is not None:
+        attempts.append(job.attempt)
+        queue.retry(job)
+    assert attempts == list(range(1, queue.max_attempts + 1))
+    assert queue.stats()["waiting"] == 0
+
+
+def test_abandoned_job_is_reclaimed_unless_touched(queue, streams):
+    queue.enqueue("s1", "u1", PREFS)
+    job = queue.claim("crashed-worker")
+
+    streams.now += queue.visibility_seconds * 1000 - 1
+    queue.touch(job, "crashed-worker")
+    streams.now += queue.visibility_seconds * 1000 - 1
+    assert queue.claim("w2") is None
+
+    streams.now += 1
+    reclaimed = queue.claim("w2")
+    assert (reclaimed.message_id, reclaimed.attempt) == (job.message_id, 2)
+
+
+class TestWorker:
+    def test_clean_shutdown_leaves_the_group(self, queue, monkeypatch):
+        monkeypatch.setattr(worker, "get_matching_job_queue", lambda: queue)
+        monkeypatch.setattr(worker, "MatchingService", AsyncMock)
+        queue.enqueue("s1", "u1", PREFS)
+        checks = iter([False, True])
+
+        asyncio.run(worker.run_worker("w1", lambda: next(checks)))
+        assert queue.stats() == {"waiting": 0, "running": 0, "consumers": 0}
+
+    def test_success_acks(self, queue, monkeypatch):
+        queue.enqueue("s1", "u1", PREFS)
+        service = AsyncMock()
+        asyncio.run(worker.process_job(queue, service, queue.claim("w1"), "w1"))
+
+        service.run_matching.assert_awaited_once_with("s1", "u1", PREFS, final_attempt=False)
+        assert queue.stats()["running"] == 0 and queue.stats()["waiting"] == 0
+
+    def test_failure_is_retried_then_final(self, queue):
+        queue.enqueue("s1", "u1", PREFS)
+        service = AsyncMock()
+        service.run_matching.side_effect = RuntimeError("user-core down")
+
+        while (job := queue.claim("w1")) is not None:
+            asyncio.run(worker.process_job(queue, service, job, "w1"))
+
+        finals = [call.kwargs["final_attempt"] for call in service.run_matching.await_args_list]
+        assert finals == [False] * (queue.max_attempts - 1) + [True]
+
+    def test_job_abandoned_too_often_is_failed(self, queue, streams, monkeypatch):
+        repository = type("Repo", (), {"set_failed": lambda self, search_id: failed.append(search_id)})()
+        failed = []
+        monkeypatch.setattr(worker, "get_redis_repository", lambda: repository)
+        queue.enqueue("s1", "u1", PREFS)
+        queue.claim("w1")
+        for _ in range(queue.max_attempts):
+            streams.now += queue.visibility_seconds * 1000
+            job = queue.claim("w2")
+
+        service = AsyncMock()
+        asyncio.run(worker.process_job(queue, service, job, "w2"))
+        assert failed == ["s1"]
+        service.run_matching.assert_not_awaited()
+
+
+class TestOrchestratorQueueMode:
+    class Repository:
+        def __init__(self):
+            self.claims, self.statuses = {}, {}
+
+        def claim_search(self, fingerprint, search_id, window_seconds):
+            return self.claims.setdefault(fingerprint, search_id)
+
+        def release_search(self, fingerprint, search_id):
+            if self.claims.get(fingerprint) == search_id:
+                del self.claims[fingerprint]
+
+        def set_queued(self, search_id):
+            self.statuses[search_id] = "queued"
+
+    def test_searches_are_queued_not_run(self, queue):
+        service, repository = AsyncMock(), self.Repository()
+        orchestrator = MatchingWorkflowOrchestrator(matching_service=service, repository=repository, queue=queue)
+
+        search_id = asyncio.run(orchestrator.start_matching(search_id="s1", seeker_id="u1", seeker_preferences=PREFS))
+        assert search_id == "s1"
+        assert repository.statuses == {"s1": "queued"}
+        assert queue.claim("w1").search_id == "s1"
+        service.run_matching.assert_not_awaited()
+
+    def test_rejected_search_releases_its_dedup_claim(self, queue):
+        repository = self.Repository()
+        orchestrator = MatchingWorkflowOrchestrator(matching_service=AsyncMock(), repository=repository, queue=queue)
+        for i in range(queue._max_per_seeker):
+            prefs = PREFS.model_copy(update={"preferred_resorts": [f"resort-{i}"]})
+            asyncio.run(orchestrator.start_matching(search_id=f"s{i}", seeker_id="u1", seeker_preferences=prefs))
+
+        with pytest.raises(SearchQueueFullError):
+            asyncio.run(orchestrator.start_matching(search_id="late", seeker_id="u1", seeker_preferences=PREFS))
+        assert "late" not in repository.claims.values()
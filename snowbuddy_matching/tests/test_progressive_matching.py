@@ -0,0 +1,131 @@
+"""
+Unit tests for chunked top-k matching with partial results.
+"""
+import asyncio
+import dataclasses
+import random
+import sys
+from pathlib import Path
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add parent to path for proper imports
+parent_path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(parent_path))
+
+from app.config import get_settings
+from app.core.ranking import TopK
+from app.models.matching import MatchingPreference
+from app.services import candidate_pool, matching_service
+from app.services.candidate_pool import CandidatePoolCache
+
+
+USERS = [
+    {"user_id": f"user-{i}", "nickname": f"Rider {i}", "skill_level": 3 + i % 6,
+     "self_role": ["buddy", "coach", "student"][i % 3],
+     "preferences": {"preferred_resorts": ["niseko"], "availability": ["2025-02-01"]}}
+    for i in range(12)
+]
+RESORTS = [{"resort_id": "niseko", "region": "hokkaido"}]
+PREFS = MatchingPreference(preferred_resorts=["niseko"], availability=[date(2025, 2, 1)])
+
+
+class TestTopK:
+    def test_matches_sorted_prefix(self):
+        rng = random.Random(7)
+        scores = [round(rng.random(), 1) for _ in range(200)]
+        top = TopK(10)
+        for index, score in enumerate(scores):
+            top.push(score, index)
+
+        expected = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:10]
+        assert top.ranked() == expected
+
+    def test_push_reports_whether_item_entered(self):
+        top = TopK(2)
+        assert top.push(0.5, "a") and top.push(0.7, "b")
+        assert not top.push(0.5, "tie loses to earlier")
+        assert top.push(0.6, "c")
+        assert top.ranked() == ["b", "c"]
+
+
+class Store(dict):
+    def __init__(self):
+        super().__init__()
+        self.partials = []
+
+    def set_processing(self, search_id):
+        pass
+
+    def set_partial(self, search_id, results):
+        self.partials.append(results)
+
+    def set_completed(self, search_id, results):
+        self[search_id] = results
+
+    def set_failed(self, search_id):
+        self[search_id] = "failed"
+
+
+@pytest.fixture
+def run(monkeypatch):
+    monkeypatch.setattr(matching_service.user_core_client, "get_users", AsyncMock(return_value=USERS))
+    monkeypatch.setattr(matching_service.user_core_client, "get_casi_skills", AsyncMock(return_value=None))
+    monkeypatch.setattr(matching_service.user_core_client, "create_calendar_event", AsyncMock())
+    monkeypatch.setattr(matching_service.resort_services_client, "get_resorts", AsyncMock(return_value=RESORTS))
+    monkeypatch.setattr(candidate_pool, "_cache", CandidatePoolCache(ttl_seconds=0))
+
+    def run(prefs=PREFS, **overrides):
+        settings = dataclasses.replace(get_settings(), **overrides)
+        monkeypatch.setattr(matching_service, "get_settings", lambda: settings)
+        service = matching_service.MatchingService()
+        service._redis = Store()
+        service._workflow_client = None
+        service._notifier = AsyncMock()
+        asyncio.run(service.run_matching("s1", "user-0", prefs))
+        return service._redis
+
+    return run
+
+
+def test_partial_results_then_full_top_k(run):
+    everything = run(matching_top_k=1000, matching_chunk_size=1000)["s1"]
+    store = run(matching_top_k=5, matching_chunk_size=3)
+
+    assert store["s1"] == everything[:5]
+    assert store.partials
+    for partial in store.partials:
+        assert len(partial) <= 5
+        scores = [r["match_score"] for r in partial]
+        assert scores == sorted(scores, reverse=True)
+
+
+def test_time_budget_keeps_best_so_far(run):
+    store = run(matching_chunk_size=3, matching_time_budget_seconds=1e-9)
+
+    first_chunk = {u["user_id"] for u in USERS[:3]}
+    assert store["s1"]
+    assert {r["user_id"] for r in store["s1"]} <= first_chunk
+    assert store.partials == []
+
+
+def test_candidate_budget(run):
+    store = run(matching_max_candidates=4)
+    assert {r["user_id"] for r in store["s1"]} <= {u["user_id"] for u in USERS[:4]}
+
+
+def test_knowledge_is_fetched_per_chunk(run, monkeypatch):
+    fetched = []
+
+    async def get_skill_profile(user_id):
+        fetched.append(user_id)
+        return None
+
+    monkeypatch.setattr(matching_service.knowledge_engagement_client, "get_skill_profile", get_skill_profile)
+    run(PREFS.model_copy(update={"include_knowledge_score": True}), matching_chunk_size=4,
+        matching_time_budget_seconds=1e-9)
+
+    # The seeker, then only the first chunk before the budget ran out
+    assert fetched == ["user-0"] + [u["user_id"] for u in USERS[:4]]
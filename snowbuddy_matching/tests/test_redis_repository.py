@@ -0,0 +1,171 @@
+"""
+Unit tests for compact search-result storage.
+"""
+import json
+import sys
+from pathlib import Path
+
+import msgpack
+import pytest
+
+# Add parent to path for proper imports
+parent_path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(parent_path))
+
+from app.services.redis_repository import RedisRepository
+
+
+class InMemoryRedis:
+    """The handful of Redis commands the repository uses (bytes in, bytes out)."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.published = []
+
+    @staticmethod
+    def _b(value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update({self._b(k): self._b(v) for k, v in mapping.items()})
+
+    def hmget(self, key, *fields):
+        entry = self.data.get(key, {})
+        return [entry.get(self._b(field)) for field in fields]
+
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update({self._b(k): float(v) for k, v in mapping.items()})
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.data.get(key, {}).pop(self._b(member), None)
+
+    def zrevrange(self, key, start, end, withscores=False):
+        ranked = sorted(self.data.get(key, {}).items(), key=lambda item: (item[1], item[0]), reverse=True)
+        return ranked[start:None if end == -1 else end + 1]
+
+    def set(self, key, value, ex=None):
+        self.sets = getattr(self, "sets", [])
+        self.sets.append(key)
+        self.data[key] = value
+        self.ttls[key] = ex
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    def mget(self, keys):
+        self.mget_calls = getattr(self, "mget_calls", 0) + 1
+        return [self.data.get(key) for key in keys]
+
+
+RESULTS = [
+    {"user_id": f"user-{i}", "nickname": f"Rider {i}", "skill_level": 5, "self_role": "buddy",
+     "match_score": round(0.9 - i * 0.01, 2)}
+    for i in range(30)
+]
+
+
+@pytest.fixture
+def store():
+    return InMemoryRedis()
+
+
+@pytest.fixture
+def repository(store):
+    return RedisRepository(client=store)
+
+
+def test_processing_then_completed(repository):
+    repository.set_processing("s1")
+    assert repository.get_results("s1") == {
+        "status": "processing", "total": 0, "offset": 0, "limit": None, "results": []
+    }
+
+    repository.set_completed("s1", RESULTS)
+    page = repository.get_results("s1", offset=0, limit=10)
+    assert page["status"] == "completed"
+    assert page["total"] == 30
+    assert page["results"][0] == RESULTS[0]
+    assert [r["user_id"] for r in page["results"]] == [r["user_id"] for r in RESULTS[:10]]
+
+
+def test_pages_are_ranked_slices(repository):
+    repository.set_completed("s1", RESULTS)
+    page = repository.get_results("s1", offset=25, limit=10)
+    assert [r["user_id"] for r in page["results"]] == [r["user_id"] for r in RESULTS[25:]]
+
+
+def test_field_projection_skips_candidate_reads(repository, store):
+    repository.set_completed("s1", RESULTS)
+    page = repository.get_results("s1", limit=3, fields=["user_id", "match_score"])
+
+    assert page["results"] == [{"user_id": r["user_id"], "match_score": r["match_score"]} for r in RESULTS[:3]]
+    assert getattr(store, "mget_calls", 0) == 0
+
+
+def test_candidates_are_stored_once_across_searches(repository, store):
+    repository.set_completed("s1", RESULTS[:5])
+    repository.set_completed("s2", RESULTS[:5])
+
+    candidate_keys = [key for key in store.data if key.startswith("matching:candidate:")]
+    assert len(candidate_keys) == 5
+    assert msgpack.unpackb(store.data["matching:candidate:user-0"]) == ["Rider 0", 5, "buddy"]
+    assert store.ttls["matching:candidate:user-0"] == repository._ttl
+
+
+def test_partial_results_are_readable_while_processing(repository, store):
+    repository.set_processing("s1")
+    repository.set_partial("s1", RESULTS[:5])
+    page = repository.get_results("s1", limit=3)
+    assert (page["status"], page["total"]) == ("processing", 5)
+    assert page["results"] == RESULTS[:3]
+
+    repository.set_partial("s1", RESULTS[1:4])
+    assert [r["user_id"] for r in repository.get_results("s1")["results"]] == [r["user_id"] for r in RESULTS[1:4]]
+    assert store.published[-1] == ("matching:search:s1:events", {"status": "processing", "total": 3})
+
+
+def test_partial_writes_only_send_changed_entries(repository, store):
+    repository.set_processing("s1")
+    repository.set_partial("s1", RESULTS[:5])
+    store.sets = []
+    store.data["matching:search:s1:ranked"].clear()  # the next write must not resend unchanged members
+
+    repository.set_partial("s1", RESULTS[1:4] + RESULTS[10:12])
+
+    assert store.sets == ["matching:candidate:user-10", "matching:candidate:user-11"]
+    assert set(store.data["matching:search:s1:ranked"]) == {b"user-10", b"user-11"}
+
+    repository.set_completed("s1", RESULTS[:3])
+    assert [r["user_id"] for r in repository.get_results("s1")["results"]] == ["user-0", "user-1", "user-2"]
+    assert repository._partials == {}
+
+
+def test_state_changes_are_published(repository, store):
+    repository.set_processing("s1")
+    repository.set_completed("s1", RESULTS[:3])
+    repository.set_failed("s2")
+
+    assert store.published == [
+        ("matching:search:s1:events", {"status": "processing", "total": 0}),
+        ("matching:search:s1:events", {"status": "completed", "total": 3}),
+        ("matching:search:s2:events", {"status": "failed", "total": 0}),
+    ]
+    assert repository.get_results("s2")["status"] == "failed"
+
+
+def test_unknown_search(repository):
+    assert repository.get_results("missing") is None
@@ -0,0 +1,148 @@
+"""
+Unit tests for pushed search progress (SSE and long-poll).
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add parent to path for proper imports
+parent_path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(parent_path))
+
+from app.main import app
+from app.services import get_matching_service
+from app.services.search_events import polling_subscription, watch_search
+
+
+PROCESSING = {"status": "processing", "total": 0, "offset": 0, "limit": 20, "results": []}
+COMPLETED = {"status": "completed", "total": 1, "offset": 0, "limit": 20,
+             "results": [{"user_id": "user-1", "match_score": 0.9}]}
+
+
+class QueueSubscription:
+    """Delivers messages put on the queue, None on timeout."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    async def next(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+def _collect(states, subscription, timeout=1.0, heartbeat=0.05, publish=()):
+    store = {"state": states[0]}
+
+    async def load():
+        return store["state"]
+
+    async def scenario():
+        seen = []
+        async for state in watch_search(load, subscription, timeout, heartbeat):
+            seen.append(state)
+            if publish and len(seen) == 1:
+                for state in publish:
+                    store["state"] = state
+                    await subscription.queue.put({"status": state["status"]})
+                    await asyncio.sleep(0)
+        return seen
+
+    return asyncio.run(scenario())
+
+
+class TestWatchSearch:
+    def test_pushes_changes_until_terminal(self):
+        subscription = QueueSubscription()
+        seen = _collect([PROCESSING], subscription, publish=[COMPLETED])
+        assert [state for state in seen if state] == [PROCESSING, COMPLETED]
+
+    def test_terminal_search_yields_once(self):
+        assert _collect([COMPLETED], QueueSubscription()) == [COMPLETED]
+
+    def test_missing_search(self):
+        assert _collect([None], QueueSubscription()) == [None]
+
+    def test_idle_stream_sends_heartbeats_until_timeout(self):
+        seen = _collect([PROCESSING], QueueSubscription(), timeout=0.2, heartbeat=0.05)
+        assert seen[0] == PROCESSING
+        assert len(seen) > 2 and all(state is None for state in seen[1:])
+
+    def test_polling_subscription_rereads_state(self):
+        calls = []
+
+        async def load():
+            calls.append(1)
+            return COMPLETED if len(calls) > 2 else PROCESSING
+
+        async def scenario():
+            async with polling_subscription(0.01) as subscription:
+                return [state async for state in watch_search(load, subscription, 1.0, 0.5)]
+
+        assert asyncio.run(scenario()) == [PROCESSING, COMPLETED]
+
+
+class FakeService:
+    def __init__(self, states):
+        self.states = states
+        self.closed = False
+
+    async def get_results(self, search_id, offset=0, limit=None, fields=None):
+        return self.states[0]
+
+    async def watch(self, search_id, timeout_seconds, offset=0, limit=None, fields=None):
+        try:
+            for state in self.states:
+                yield state
+        finally:
+            self.closed = True
+
+
+@pytest.fixture
+def client_for():
+    def make(states):
+        service = FakeService(states)
+        app.dependency_overrides[get_matching_service] = lambda: service
+        return TestClient(app), service
+
+    yield make
+    app.dependency_overrides.pop(get_matching_service, None)
+
+
+HEADERS = {"X-User-Id": "test-user-123"}
+
+
+def test_event_stream(client_for):
+    client, service = client_for([PROCESSING, None, COMPLETED])
+    response = client.get("/matching/searches/s1/events", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = response.text.split("\n\n")
+    assert frames[0] == f"event: processing\ndata: {json.dumps(PROCESSING)}"
+    assert frames[1] == ": keep-alive"
+    assert frames[2] == f"event: completed\ndata: {json.dumps(COMPLETED)}"
+    assert service.closed
+
+
+def test_event_stream_unknown_search(client_for):
+    client, service = client_for([None])
+    assert client.get("/matching/searches/missing/events", headers=HEADERS).status_code == 404
+    assert service.closed
+
+
+def test_long_poll_returns_next_change(client_for):
+    client, _ = client_for([PROCESSING, None, COMPLETED])
+    response = client.get("/matching/searches/s1", params={"wait": 5}, headers=HEADERS)
+    assert response.json() == COMPLETED
+
+
+def test_long_poll_times_out_with_current_state(client_for):
+    client, _ = client_for([PROCESSING, None])
+    response = client.get("/matching/searches/s1", params={"wait": 1}, headers=HEADERS)
+    assert response.json() == PROCESSING
@@ -65,3 +65,37 @@ async def test_respond_to_match_request_emits_event(mock_clients):
     payload = mock_clients["post_event"].await_args.args[0]
     assert payload["event_type"] == "snowbuddy.match.request.accepted"
     assert payload["payload"]["request_id"] == "req-1"
+
+
+def test_trip_participants_come_from_user_core_projection(mocker):
+    get_participants = mocker.patch(
+        "snowbuddy_matching.app.clients.user_core_client.get_trip_participants",
+        new_callable=AsyncMock,
+        return_value=[{
+            "request_id": "req-1", "trip_id": "trip-1", "applicant_id": "user-456",
+            "status": "accepted", "updated_at": "2025-01-01T00:00:00",
+        }],
+    )
+
+    response = client.get("/trips/trip-1/participants", headers=AUTH_HEADERS)
+
+    assert response.status_code == 200
+    assert response.json() == {"participants": [
+        {"user_id": "user-456", "request_id": "req-1", "joined_at": "2025-01-01T00:00:00"}
+    ]}
+    get_participants.assert_awaited_once_with("trip-1")
+
+
+@pytest.mark.anyio
+async def test_applicant_lookup_is_keyed_and_checks_trip(mocker):
+    from snowbuddy_matching.app.services.behavior_event_service import BehaviorEventService
+
+    mocker.patch(
+        "snowbuddy_matching.app.clients.user_core_client.get_trip_application",
+        new_callable=AsyncMock,
+        return_value={"request_id": "req-1", "trip_id": "trip-1", "applicant_id": "user-456"},
+    )
+    service = BehaviorEventService()
+
+    assert await service.get_applicant_id_from_request("req-1", "trip-1") == "user-456"
+    assert await service.get_applicant_id_from_request("req-1", "other-trip") is None
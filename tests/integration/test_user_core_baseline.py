@@ -6,6 +6,7 @@ import pytest
 import uuid
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 import sys
 from pathlib import Path
@@ -14,7 +15,7 @@ USER_CORE_ROOT = Path(__file__).resolve().parents[2] / "platform" / "user_core"
 sys.path.insert(0, str(USER_CORE_ROOT))
 
 from api.main import app
-from services.db import get_db
+from services.db import get_db, get_async_db
 from models.user_profile import Base as UserBase
 from models.change_feed import Base as ChangeFeedBase
 from models.notification_preference import Base as PrefBase
@@ -41,6 +42,14 @@ def override_get_db():
             db.close()
 
 app.dependency_overrides[get_db] = override_get_db
+
+async_engine = create_async_engine(SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://"))
+
+async def override_get_async_db():
+    async with AsyncSession(async_engine, autoflush=False, expire_on_commit=False) as db:
+        yield db
+
+app.dependency_overrides[get_async_db] = override_get_async_db
 client = TestClient(app)
 
 @pytest.fixture(scope="session", autouse=True)
@@ -0,0 +1,67 @@
+"""
+Tests for achievement definition loading.
+
+Tests verify:
+- Definitions are written with a single bulk upsert statement
+- Reloading updates existing rows instead of duplicating them
+"""
+import pytest
+import yaml
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from models.user_profile import Base
+from models.course_tracking import AchievementDefinition
+from services import achievement_service
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _definition(achievement_type, points):
+    return {
+        "achievement_type": achievement_type, "name_zh": "名稱", "name_en": "Name",
+        "icon": "🎿", "category": "basic", "points": points,
+        "requirements": {"type": "course_count", "min": 1},
+    }
+
+
+def test_bulk_upsert(engine, tmp_path):
+    yaml_path = tmp_path / "defs.yaml"
+    yaml_path.write_text(yaml.safe_dump([_definition("a", 10), _definition("b", 20)]))
+    db = sessionmaker(bind=engine)()
+
+    with count_queries(engine) as statements:
+        assert achievement_service.load_definitions(db, str(yaml_path)) == 2
+    assert len(statements) == 1
+
+    yaml_path.write_text(yaml.safe_dump([_definition("a", 15), _definition("c", 5)]))
+    achievement_service.load_definitions(db, str(yaml_path))
+
+    points = {d.achievement_type: d.points for d in db.query(AchievementDefinition)}
+    assert points == {"a": 15, "b": 20, "c": 5}
+    db.close()
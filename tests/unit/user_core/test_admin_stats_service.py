@@ -0,0 +1,182 @@
+"""
+Tests for admin statistics rollup and search.
+
+Tests verify:
+- All dashboard counts come from a single query
+- The rollup is reused while fresh and recomputed once stale
+- Search matches the normalized search_text column
+- Counts are exact up to the cap and flagged as estimates beyond it
+- The migration adds and backfills search_text on an existing user_profiles table
+"""
+import pytest
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, UTC, timedelta
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from models.user_profile import Base, UserProfile
+from models.admin_stats import UserStatsRollup
+from models.enums import UserStatus
+from services import admin_stats_service
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _user(email, display_name=None, **kwargs):
+    return UserProfile(
+        user_id=uuid.uuid4(), email=email, hashed_password="x",
+        display_name=display_name, **kwargs
+    )
+
+
+@pytest.fixture
+def users(db):
+    old = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=60)
+    db.add_all([
+        _user("alice@example.com", "Alice Chen", experience_level="beginner", roles=["admin", "user"]),
+        _user("bob@example.com", "Bob", experience_level="beginner", roles=["user"]),
+        _user("carol@example.com", "Carol", experience_level="advanced",
+              status=UserStatus.inactive, created_at=old),
+        _user("dave@example.com", None, status=UserStatus.merged, created_at=old),
+    ])
+    db.commit()
+
+
+class TestStatistics:
+
+    def test_single_query(self, engine, db, users):
+        with count_queries(engine) as statements:
+            stats = admin_stats_service.compute_user_statistics(db)
+
+        assert len(statements) == 1
+        assert stats == {
+            "total_users": 4,
+            "active_users": 2,
+            "inactive_users": 1,
+            "new_users_last_7_days": 2,
+            "new_users_last_30_days": 2,
+            "admin_users": 1,
+            "users_by_experience_level": {"beginner": 2, "advanced": 1, "unknown": 1},
+        }
+
+    def test_rollup_refreshes_when_stale(self, db, users):
+        rollup = admin_stats_service.get_user_statistics(db, max_age_seconds=300)
+        assert rollup.total_users == 4
+
+        db.add(_user("erin@example.com"))
+        db.commit()
+        assert admin_stats_service.get_user_statistics(db, max_age_seconds=300).total_users == 4
+        assert admin_stats_service.get_user_statistics(db, max_age_seconds=0).total_users == 5
+        assert db.query(UserStatsRollup).count() == 1
+
+    def test_stale_rollup_is_refreshed_on_write_session(self, engine, db, users):
+        write_db = sessionmaker(bind=engine)()
+        try:
+            rollup = admin_stats_service.get_user_statistics(db, max_age_seconds=0, write_db=write_db)
+            assert rollup in write_db
+            assert rollup not in db
+            assert rollup.total_users == 4
+        finally:
+            write_db.close()
+
+
+class TestSearch:
+
+    def test_matches_email_and_display_name(self, db, users):
+        query = admin_stats_service.apply_search(db.query(UserProfile), "  CHEN ")
+        assert [u.email for u in query] == ["alice@example.com"]
+
+        query = admin_stats_service.apply_search(db.query(UserProfile), "example.com")
+        assert query.count() == 4
+
+    def test_wildcards_are_literal(self, db, users):
+        query = admin_stats_service.apply_search(db.query(UserProfile), "%")
+        assert query.count() == 0
+
+    def test_search_text_follows_updates(self, db, users):
+        bob = db.query(UserProfile).filter_by(email="bob@example.com").one()
+        bob.display_name = "Robert"
+        db.commit()
+        query = admin_stats_service.apply_search(db.query(UserProfile), "robert")
+        assert query.count() == 1
+
+    def test_count_is_capped(self, db, users):
+        query = db.query(UserProfile)
+        assert admin_stats_service.count_users(db, query, cap=10) == (4, False)
+
+        total, is_estimate = admin_stats_service.count_users(db, query, cap=2)
+        assert is_estimate
+        assert total >= 3
+
+    def test_planner_estimate_binds_search_text(self, db):
+        from sqlalchemy.dialects import postgresql
+
+        query = admin_stats_service.apply_search(db.query(UserProfile), "o'brien :name")
+        compiled = admin_stats_service.Explain(query.statement).compile(dialect=postgresql.dialect())
+
+        sql = str(compiled)
+        assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert "brien" not in sql
+        assert any("o'brien :name" in str(value) for value in compiled.params.values())
+
+
+def test_search_text_migration_backfills_existing_users(tmp_path, monkeypatch):
+    from alembic import command
+    from alembic.config import Config
+
+    user_core = Path(__file__).parent.parent.parent.parent / "platform" / "user_core"
+    url = f"sqlite:///{tmp_path / 'user_core.db'}"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        # user_profiles as it was before search_text existed
+        conn.execute(text(
+            "CREATE TABLE user_profiles (user_id CHAR(32) PRIMARY KEY, email VARCHAR(255) NOT NULL, "
+            "hashed_password VARCHAR(255) NOT NULL, display_name VARCHAR(100))"
+        ))
+        conn.execute(text(
+            "INSERT INTO user_profiles VALUES ('a', ' Alice@Example.com', 'x', 'Alice Chen'), "
+            "('b', 'bob@example.com', 'x', NULL)"
+        ))
+
+    monkeypatch.setenv("DB_URL", url)
+    config = Config()  # no ini file, so env.py leaves logging alone
+    config.set_main_option("script_location", str(user_core / "alembic"))
+    command.upgrade(config, "head")
+
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT user_id, search_text FROM user_profiles ORDER BY user_id")).all()
+    assert [tuple(row) for row in rows] == [("a", "alice@example.com alice chen"), ("b", "bob@example.com")]
+    indexes = {index["name"] for index in inspect(engine).get_indexes("user_profiles")}
+    assert "idx_users_search_text_trgm" in indexes
@@ -0,0 +1,80 @@
+"""
+Tests for the authentication fast path.
+
+Tests verify:
+- Verified tokens are cached and expired entries are dropped
+- get_current_user_id skips the database once a user's status is cached
+- Publishing a user_profile change invalidates the cached status
+"""
+import pytest
+import time
+import uuid
+from unittest.mock import MagicMock
+from fastapi import HTTPException
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from services import auth_dependencies, change_feed_service
+from services.auth_cache import TokenCache, token_cache, user_status_cache
+from services.auth_service import create_access_token, verify_token
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    token_cache.clear()
+    user_status_cache.clear()
+    yield
+    token_cache.clear()
+    user_status_cache.clear()
+
+
+class TestTokenCache:
+
+    def test_verified_token_is_cached(self, monkeypatch):
+        user_id = uuid.uuid4()
+        token = create_access_token(user_id)
+        assert verify_token(token) == user_id
+
+        decode = MagicMock(side_effect=AssertionError("decoded again"))
+        monkeypatch.setattr("services.auth_service.jwt.decode", decode)
+        assert verify_token(token) == user_id
+
+    def test_expired_and_evicted_entries(self):
+        cache = TokenCache(maxsize=2)
+        cache.put("expired", uuid.uuid4(), time.time() - 1)
+        assert cache.get("expired") is None
+
+        ids = [uuid.uuid4() for _ in range(3)]
+        for i, uid in enumerate(ids):
+            cache.put(f"t{i}", uid, time.time() + 60)
+        assert cache.get("t0") is None
+        assert cache.get("t2") == ids[2]
+
+
+class TestGetCurrentUserId:
+
+    def test_status_is_cached_until_user_changes(self, monkeypatch):
+        user_id = uuid.uuid4()
+        header = f"Bearer {create_access_token(user_id)}"
+        statuses = ["active", "inactive"]
+        loads = MagicMock(side_effect=lambda uid: statuses[loads.call_count - 1])
+        monkeypatch.setattr(auth_dependencies, "_load_user_status", loads)
+
+        assert auth_dependencies.get_current_user_id(header) == user_id
+        assert auth_dependencies.get_current_user_id(header) == user_id
+        assert loads.call_count == 1
+
+        event = MagicMock(entity_type="user_profile", entity_id=user_id)
+        change_feed_service.publish_change_event(event)
+
+        with pytest.raises(HTTPException) as exc:
+            auth_dependencies.get_current_user_id(header)
+        assert exc.value.status_code == 401
+        assert loads.call_count == 2
+
+    def test_unknown_user_rejected(self, monkeypatch):
+        monkeypatch.setattr(auth_dependencies, "_load_user_status", lambda uid: None)
+        with pytest.raises(HTTPException):
+            auth_dependencies.get_current_user_id(f"Bearer {create_access_token(uuid.uuid4())}")
@@ -0,0 +1,192 @@
+"""
+Tests for the incremental CASI skill updater.
+
+Tests verify:
+- Folding events one by one matches the full (decayed) recomputation
+- Event arrival order does not change the result
+- Chunked backfill rebuilds the same accumulators as live updates
+"""
+import pytest
+from hypothesis import given, strategies as st, settings
+import uuid
+from datetime import datetime, UTC, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from models.user_profile import Base, UserProfile
+from models.behavior_event import BehaviorEvent
+from models.buddy_matching import CASISkillAccumulator, CASISkillProfile
+from services.casi_skill_analyzer import CASISkillAnalyzer
+from services.casi_skill_updater import CASISkillUpdater, SkillAccumulatorState
+
+
+LESSONS = ["basic_stance", "falling_leaf", "j_turn", "換刃練習", "刻滑", "unknown_lesson"]
+BASE_TIME = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def test_db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def test_user(test_db):
+    user = UserProfile(
+        user_id=uuid.uuid4(),
+        email=f"test_{uuid.uuid4()}@example.com",
+        hashed_password="hashed_password",
+    )
+    test_db.add(user)
+    test_db.commit()
+    return user
+
+
+def _make_event(user_id, lesson_id, rating, days_offset, event_type="lesson_completed"):
+    return BehaviorEvent(
+        event_id=uuid.uuid4(),
+        user_id=user_id,
+        source_project="snowboard-teaching",
+        event_type=event_type,
+        payload={"lesson_id": lesson_id, "rating": rating},
+        occurred_at=BASE_TIME + timedelta(days=days_offset),
+        recorded_at=BASE_TIME + timedelta(days=days_offset),
+    )
+
+
+event_spec_strategy = st.tuples(
+    st.sampled_from(LESSONS),
+    st.floats(min_value=0.0, max_value=5.0),
+    st.integers(min_value=0, max_value=365),
+)
+
+
+class TestSkillAccumulatorState:
+
+    @given(specs=st.lists(event_spec_strategy, min_size=1, max_size=30))
+    @settings(max_examples=50)
+    def test_fold_matches_full_recomputation(self, specs):
+        analyzer = CASISkillAnalyzer()
+        user_id = uuid.uuid4()
+        events = [_make_event(user_id, *spec) for spec in specs]
+
+        state = SkillAccumulatorState()
+        for event in events:
+            state.fold(analyzer._extract_skill_contribution(event.payload), event.occurred_at, 30.0)
+
+        expected = analyzer._compute_skill_scores_from_events(events, half_life_days=30.0)
+        actual = state.scores(analyzer.CASI_SKILLS)
+        for skill in analyzer.CASI_SKILLS:
+            assert actual[skill] == pytest.approx(expected[skill], abs=1e-9)
+
+    def test_without_decay_matches_plain_average(self):
+        analyzer = CASISkillAnalyzer()
+        user_id = uuid.uuid4()
+        events = [_make_event(user_id, "basic_stance", 5.0, i) for i in range(3)]
+
+        state = SkillAccumulatorState()
+        for event in events:
+            state.fold(analyzer._extract_skill_contribution(event.payload), event.occurred_at, None)
+
+        assert state.scores(analyzer.CASI_SKILLS) == analyzer._compute_skill_scores_from_events(events)
+
+    def test_recent_events_dominate_with_decay(self):
+        analyzer = CASISkillAnalyzer()
+        user_id = uuid.uuid4()
+        events = [
+            _make_event(user_id, "站姿練習", 0.0, 0),
+            _make_event(user_id, "站姿練習", 5.0, 300),
+        ]
+
+        state = SkillAccumulatorState()
+        for event in reversed(events):
+            state.fold(analyzer._extract_skill_contribution(event.payload), event.occurred_at, 30.0)
+
+        assert state.scores(analyzer.CASI_SKILLS)["stance_balance"] > 0.99
+
+
+class TestCASISkillUpdater:
+
+    def test_apply_event_updates_profile(self, test_db, test_user):
+        updater = CASISkillUpdater()
+        event = _make_event(test_user.user_id, "站姿練習", 5.0, 0,
+                            event_type="snowboard.practice.completed")
+        test_db.add(event)
+        test_db.commit()
+
+        profile = updater.apply_event(test_db, event)
+
+        assert profile.stance_balance == pytest.approx(1.0)
+        accumulator = test_db.get(CASISkillAccumulator, test_user.user_id)
+        assert accumulator.events_applied == 1
+
+    def test_apply_event_ignores_unrelated_events(self, test_db, test_user):
+        updater = CASISkillUpdater()
+        event = _make_event(test_user.user_id, "basic_stance", 5.0, 0, event_type="page_view")
+
+        assert updater.apply_event(test_db, event) is None
+        assert test_db.get(CASISkillProfile, test_user.user_id) is None
+
+    def test_first_live_event_starts_from_history(self, test_db, test_user):
+        updater = CASISkillUpdater(half_life_days=14.0)
+        history = [
+            _make_event(test_user.user_id, LESSONS[i % len(LESSONS)], i % 6, i * 2)
+            for i in range(12)
+        ]
+        test_db.add_all(history)
+        test_db.commit()
+        assert test_db.get(CASISkillAccumulator, test_user.user_id) is None
+
+        event = _make_event(test_user.user_id, "basic_stance", 1.0, 30)
+        test_db.add(event)
+        test_db.commit()
+        updater.apply_event(test_db, event)
+
+        accumulator = test_db.get(CASISkillAccumulator, test_user.user_id)
+        assert accumulator.events_applied == len(history) + 1
+        assert updater.check_consistency(test_db, test_user.user_id).consistent
+
+    def test_incremental_updates_are_consistent(self, test_db, test_user):
+        updater = CASISkillUpdater(half_life_days=14.0)
+        events = [
+            _make_event(test_user.user_id, LESSONS[i % len(LESSONS)], (i * 7) % 6, i * 3)
+            for i in range(20)
+        ]
+        # Deliver out of order to exercise late-event handling
+        for event in events[::2] + events[1::2]:
+            test_db.add(event)
+            test_db.commit()
+            updater.apply_event(test_db, event)
+
+        report = updater.check_consistency(test_db, test_user.user_id)
+
+        assert report.events_checked == len(events)
+        assert report.consistent
+
+    def test_backfill_in_chunks_matches_live_updates(self, test_db, test_user):
+        updater = CASISkillUpdater(half_life_days=14.0)
+        events = [
+            _make_event(test_user.user_id, LESSONS[i % len(LESSONS)], i % 6, i)
+            for i in range(25)
+        ]
+        for event in events:
+            test_db.add(event)
+            test_db.commit()
+            updater.apply_event(test_db, event)
+        live = test_db.get(CASISkillAccumulator, test_user.user_id)
+        live_scores = SkillAccumulatorState.from_row(live).scores(CASISkillAnalyzer.CASI_SKILLS)
+
+        rebuilt = updater.backfill_user(test_db, test_user.user_id, chunk_size=4)
+
+        assert test_db.get(CASISkillAccumulator, test_user.user_id).events_applied == len(events)
+        for skill in CASISkillAnalyzer.CASI_SKILLS:
+            assert getattr(rebuilt, skill) == pytest.approx(live_scores[skill], abs=1e-9)
+        assert updater.check_consistency(test_db, test_user.user_id).consistent
@@ -0,0 +1,222 @@
+"""
+Tests for the change feed outbox dispatcher.
+
+Tests verify:
+- Pending events are delivered and marked delivered
+- A failed delivery backs off and holds later events of the same entity
+- Events are marked failed after max_attempts
+- publish_change_event does no network I/O
+- The outbox migration marks pre-existing change_feed rows as delivered
+"""
+import pytest
+import uuid
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from models.user_profile import Base
+from models.change_feed import ChangeFeed
+from audit import publisher
+from services import change_feed_service
+from services.change_feed_outbox import OutboxDispatcher, DELIVERED, FAILED, PENDING
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Record delivered event ids; fail for entity ids in `sent.failing`."""
+    class Recorder(list):
+        failing = set()
+
+    recorder = Recorder()
+    recorder.failing = set()
+
+    def fake_publish(*, entity_type, entity_id, change_type, payload, event_id, client=None, **kwargs):
+        if entity_id in recorder.failing:
+            raise publisher.PublishError("subscriber down")
+        recorder.append(event_id)
+
+    monkeypatch.setattr(publisher, "publish_change", fake_publish)
+    return recorder
+
+
+def _add_event(session_factory, entity_id, offset_seconds=0):
+    session = session_factory()
+    event = ChangeFeed(
+        entity_type="user_profile",
+        entity_id=entity_id,
+        change_type="update",
+        payload={"actor": "system"},
+        published_at=datetime(2026, 1, 1) + timedelta(seconds=offset_seconds),
+    )
+    session.add(event)
+    session.commit()
+    session.close()
+    return event.id
+
+
+def _utcnow():
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _get(session_factory, event_id):
+    session = session_factory()
+    try:
+        return session.get(ChangeFeed, event_id)
+    finally:
+        session.close()
+
+
+class TestOutboxDispatcher:
+    def test_delivers_pending_events_in_order(self, session_factory, sent):
+        entity = uuid.uuid4()
+        first = _add_event(session_factory, entity, 0)
+        second = _add_event(session_factory, entity, 1)
+
+        result = OutboxDispatcher(session_factory, batch_size=10).dispatch_batch()
+
+        assert result.delivered == 2
+        assert sent == [str(first), str(second)]
+        assert _get(session_factory, first).delivery_status == DELIVERED
+        assert _get(session_factory, second).delivered_at is not None
+
+    def test_failure_backs_off_and_blocks_entity(self, session_factory, sent):
+        failing, healthy = uuid.uuid4(), uuid.uuid4()
+        sent.failing.add(str(failing))
+        first = _add_event(session_factory, failing, 0)
+        second = _add_event(session_factory, failing, 1)
+        other = _add_event(session_factory, healthy, 2)
+
+        dispatcher = OutboxDispatcher(session_factory, batch_size=10, base_backoff_seconds=60)
+        result = dispatcher.dispatch_batch()
+
+        assert result.retried == 1
+        assert result.blocked == 1
+        assert sent == [str(other)]
+        event = _get(session_factory, first)
+        assert event.delivery_status == PENDING
+        assert event.attempts == 1
+        assert event.next_attempt_at is not None
+        assert "subscriber down" in event.last_error
+        assert _get(session_factory, second).attempts == 0
+
+        # Still backing off: neither event of the entity is claimed yet
+        sent.failing.clear()
+        assert dispatcher.dispatch_batch().processed == 0
+        assert sent == [str(other)]
+        assert _get(session_factory, second).next_attempt_at is None
+
+    def test_backing_off_events_do_not_stall_the_batch(self, session_factory, sent):
+        stuck, healthy = uuid.uuid4(), uuid.uuid4()
+        backing_off = [_add_event(session_factory, stuck, i) for i in range(3)]
+        session = session_factory()
+        session.get(ChangeFeed, backing_off[0]).next_attempt_at = _utcnow() + timedelta(hours=1)
+        session.commit()
+        session.close()
+        deliverable = _add_event(session_factory, healthy, 10)
+
+        result = OutboxDispatcher(session_factory, batch_size=2).dispatch_batch()
+
+        assert result.delivered == 1
+        assert sent == [str(deliverable)]
+
+    def test_batch_is_claimed_before_delivery(self, session_factory, monkeypatch):
+        event_id = _add_event(session_factory, uuid.uuid4())
+        leases = []
+
+        def fake_publish(*, event_id, **kwargs):
+            # The claim is committed: another session already sees the lease
+            leases.append(_get(session_factory, uuid.UUID(event_id)).next_attempt_at)
+
+        monkeypatch.setattr(publisher, "publish_change", fake_publish)
+        OutboxDispatcher(session_factory, batch_size=10, lease_seconds=300).dispatch_batch()
+
+        assert leases[0] > _utcnow() + timedelta(seconds=200)
+        event = _get(session_factory, event_id)
+        assert event.delivery_status == DELIVERED
+        assert event.next_attempt_at is None
+
+    def test_gives_up_after_max_attempts(self, session_factory, sent):
+        entity = uuid.uuid4()
+        sent.failing.add(str(entity))
+        first = _add_event(session_factory, entity, 0)
+        second = _add_event(session_factory, entity, 1)
+
+        dispatcher = OutboxDispatcher(session_factory, batch_size=10, max_attempts=1)
+        result = dispatcher.dispatch_batch()
+
+        assert result.failed == 2
+        assert _get(session_factory, first).delivery_status == FAILED
+        assert _get(session_factory, second).delivery_status == FAILED
+
+    def test_backoff_is_capped(self, session_factory):
+        dispatcher = OutboxDispatcher(
+            session_factory, base_backoff_seconds=1, max_backoff_seconds=10
+        )
+        assert dispatcher.backoff(1) == timedelta(seconds=1)
+        assert dispatcher.backoff(3) == timedelta(seconds=4)
+        assert dispatcher.backoff(10) == timedelta(seconds=10)
+
+
+def test_publish_change_event_does_no_network_io(monkeypatch):
+    def fail(**kwargs):
+        raise AssertionError("publish_change called on the request path")
+
+    monkeypatch.setattr(publisher, "publish_change", fail)
+    notified = []
+    monkeypatch.setattr(change_feed_service, "notify_outbox", lambda: notified.append(True))
+
+    event = ChangeFeed(
+        entity_type="user_profile",
+        entity_id=uuid.uuid4(),
+        change_type="update",
+        payload={},
+    )
+    change_feed_service.publish_change_event(event)
+
+    assert notified == [True]
+
+
+def test_outbox_migration_marks_existing_rows_delivered(tmp_path, monkeypatch):
+    from alembic import command
+    from alembic.config import Config
+
+    user_core = Path(__file__).parent.parent.parent.parent / "platform" / "user_core"
+    url = f"sqlite:///{tmp_path / 'user_core.db'}"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        # change_feed as it was before the outbox columns existed
+        conn.execute(text(
+            "CREATE TABLE change_feed (id CHAR(32) PRIMARY KEY, entity_type VARCHAR NOT NULL, "
+            "entity_id CHAR(32) NOT NULL, change_type VARCHAR NOT NULL, payload JSON, "
+            "published_at DATETIME NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO change_feed VALUES ('a', 'trip', 'b', 'create', '{}', '2026-01-01 00:00:00')"
+        ))
+
+    monkeypatch.setenv("DB_URL", url)
+    config = Config()  # no ini file, so env.py leaves logging alone
+    config.set_main_option("script_location", str(user_core / "alembic"))
+    command.upgrade(config, "head")
+
+    with engine.begin() as conn:
+        old = conn.execute(text("SELECT delivery_status, attempts FROM change_feed WHERE id = 'a'")).one()
+        conn.execute(text(
+            "INSERT INTO change_feed (id, entity_type, entity_id, change_type, published_at) "
+            "VALUES ('n', 'trip', 'b', 'update', '2026-01-02 00:00:00')"
+        ))
+        new = conn.execute(text("SELECT delivery_status, attempts FROM change_feed WHERE id = 'n'")).one()
+    assert tuple(old) == (DELIVERED, 0)
+    assert tuple(new) == (PENDING, 0)
@@ -0,0 +1,107 @@
+"""
+Tests for engine configuration and pool metrics.
+
+Tests verify:
+- Sync database URLs map to their async drivers
+- The asyncpg URL carries the statement cache setting
+- Instrumented pools record checkout waits and timeouts
+- AsyncSession.run_sync can run the existing sync service code
+"""
+import asyncio
+import pytest
+import uuid
+from sqlalchemy import create_engine, exc, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import QueuePool
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from models.user_profile import Base, UserProfile
+from services import db
+from telemetry.pool_metrics import PoolMetrics, instrument_pool
+
+
+class TestAsyncDatabaseUrl:
+    def test_postgres_uses_asyncpg_with_statement_cache(self, monkeypatch):
+        monkeypatch.setattr(db.settings, "db_statement_cache_size", 0)
+        url = db.async_database_url("postgresql://user:pw@db:5432/app")
+
+        assert url.drivername == "postgresql+asyncpg"
+        assert url.query["prepared_statement_cache_size"] == "0"
+        assert url.database == "app"
+
+    def test_psycopg2_url_is_converted(self):
+        url = db.async_database_url("postgresql+psycopg2://user:pw@db/app")
+        assert url.drivername == "postgresql+asyncpg"
+
+    def test_sqlite_uses_aiosqlite(self):
+        url = db.async_database_url("sqlite:///./test.db")
+        assert url.drivername == "sqlite+aiosqlite"
+        assert "prepared_statement_cache_size" not in url.query
+
+
+class TestPoolMetrics:
+    def test_checkouts_are_recorded(self, tmp_path):
+        metrics = PoolMetrics("test")
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=instrument_pool(QueuePool, metrics),
+            pool_size=1,
+            max_overflow=0,
+        )
+        for _ in range(3):
+            with engine.connect():
+                pass
+
+        stats = metrics.snapshot(engine.pool)
+        assert stats["checkouts"] == 3
+        assert stats["timeouts"] == 0
+        assert stats["size"] == 1
+        assert stats["checked_out"] == 0
+
+    def test_timeouts_are_recorded(self, tmp_path):
+        metrics = PoolMetrics("test")
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=instrument_pool(QueuePool, metrics),
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        stats = metrics.snapshot()
+        assert stats["timeouts"] == 1
+        assert stats["max_wait_ms"] >= 50
+
+
+def test_async_session_runs_sync_service_code(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'async.db'}"
+
+    async def scenario():
+        engine = create_async_engine(url)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                user = UserProfile(
+                    user_id=uuid.uuid4(), email="a@example.com", hashed_password="x", display_name="Ann"
+                )
+                session.add(user)
+                await session.commit()
+
+                by_query = await session.scalar(select(UserProfile).where(UserProfile.email == "a@example.com"))
+                by_sync = await session.run_sync(
+                    lambda sync_session: sync_session.query(UserProfile).filter_by(email="a@example.com").one()
+                )
+        finally:
+            await engine.dispose()
+        return user.user_id, by_query.user_id, by_sync.user_id
+
+    created, by_query, by_sync = asyncio.run(scenario())
+    assert created == by_query == by_sync
@@ -0,0 +1,111 @@
+"""
+Tests for atomic like/comment counters.
+
+Tests verify:
+- Like/unlike are idempotent and keep likes_count in sync
+- Counter updates are single UPDATE ... RETURNING statements
+- Counters never go negative
+- Missing activities raise ValueError
+"""
+import pytest
+import uuid
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from models.user_profile import Base, UserProfile
+from models.social import ActivityFeedItem, ActivityLike
+from services import interaction_service
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def activity(db):
+    user = UserProfile(user_id=uuid.uuid4(), email="a@example.com", hashed_password="x")
+    item = ActivityFeedItem(user_id=user.user_id, activity_type="course_visit", content_json={})
+    db.add_all([user, item])
+    db.commit()
+    return item.id
+
+
+class TestLikes:
+
+    def test_like_is_idempotent(self, engine, db, activity):
+        users = [uuid.uuid4() for _ in range(3)]
+
+        with count_queries(engine) as statements:
+            assert interaction_service.like_activity(db, activity, users[0]) == (False, 1)
+        assert len(statements) == 2  # INSERT ... ON CONFLICT, UPDATE ... RETURNING
+
+        assert interaction_service.like_activity(db, activity, users[0]) == (True, 1)
+        assert interaction_service.like_activity(db, activity, users[1]) == (False, 2)
+        assert interaction_service.like_activity(db, activity, users[2]) == (False, 3)
+        assert db.query(ActivityLike).count() == 3
+
+    def test_unlike(self, db, activity):
+        user_id = uuid.uuid4()
+        interaction_service.like_activity(db, activity, user_id)
+
+        assert interaction_service.unlike_activity(db, activity, user_id) == (True, 0)
+        assert interaction_service.unlike_activity(db, activity, user_id) == (False, 0)
+        assert db.get(ActivityFeedItem, activity).likes_count == 0
+
+    def test_counter_floor(self, db, activity):
+        db.add(ActivityLike(activity_id=activity, user_id=uuid.uuid4()))
+        db.commit()
+        like = db.query(ActivityLike).one()
+        assert interaction_service.unlike_activity(db, activity, like.user_id) == (True, 0)
+
+    def test_missing_activity(self, db):
+        with pytest.raises(ValueError):
+            interaction_service.like_activity(db, uuid.uuid4(), uuid.uuid4())
+        assert db.query(ActivityLike).count() == 0
+
+
+class TestComments:
+
+    def test_comment_counters(self, db, activity):
+        user_id = uuid.uuid4()
+        comment = interaction_service.create_comment(db, activity, user_id, " nice run ")
+        interaction_service.create_comment(db, activity, user_id, "again")
+        assert comment.content == "nice run"
+
+        assert interaction_service.delete_comment(db, comment.id, user_id)
+        db.expire_all()
+        assert db.get(ActivityFeedItem, activity).comments_count == 1
+
+    def test_comment_on_missing_activity(self, db):
+        with pytest.raises(ValueError):
+            interaction_service.create_comment(db, uuid.uuid4(), uuid.uuid4(), "hi")
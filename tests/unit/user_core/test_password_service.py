@@ -0,0 +1,69 @@
+"""
+Tests for the password hashing service.
+
+Tests verify:
+- Hash cost follows configuration and stale hashes are flagged for rehash
+- Async helpers run on the bounded pool
+- A saturated pool rejects work instead of queueing it
+"""
+import asyncio
+import threading
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from config.settings import settings
+from services import password_service
+from services.password_service import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.fixture
+def low_cost(monkeypatch):
+    monkeypatch.setattr(settings, "password_bcrypt_rounds", 4)
+
+
+class TestHashCost:
+
+    def test_hash_uses_configured_rounds(self, low_cost):
+        hashed = password_service.hash_password("secret")
+        assert password_service.hash_rounds(hashed) == 4
+        assert password_service.verify_password("secret", hashed)
+        assert not password_service.needs_rehash(hashed)
+
+    def test_old_cost_needs_rehash(self, low_cost):
+        hashed = password_service.hash_password("secret", rounds=5)
+        assert password_service.needs_rehash(hashed)
+
+
+class TestPasswordHasher:
+
+    def test_async_helpers_roundtrip(self, low_cost):
+        async def run():
+            hashed = await password_service.hash_password_async("secret")
+            return (
+                await password_service.verify_password_async("secret", hashed),
+                await password_service.verify_password_async("wrong", hashed),
+            )
+
+        assert asyncio.run(run()) == (True, False)
+
+    def test_rejects_when_saturated(self):
+        hasher = PasswordHasher(max_workers=1, max_pending=0)
+        release = threading.Event()
+
+        async def run():
+            blocked = asyncio.ensure_future(hasher.run(release.wait))
+            await asyncio.sleep(0.05)
+            with pytest.raises(PasswordHasherBusy):
+                await hasher.run(lambda: None)
+            release.set()
+            await blocked
+            # Slot is released once the first call finishes
+            return await hasher.run(lambda: "ok")
+
+        try:
+            assert asyncio.run(run()) == "ok"
+        finally:
+            hasher.shutdown()
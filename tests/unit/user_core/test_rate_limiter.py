@@ -0,0 +1,144 @@
+"""
+Tests for the shared GCRA rate limiter.
+
+Tests verify:
+- Bursts up to the limit are allowed, then requests are rejected with Retry-After
+- Budget recovers at one request per emission interval
+- Idle keys are swept and the local key count is capped
+- Redis decisions are used when available, with local fallback on errors
+"""
+import pytest
+from fastapi import HTTPException
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from services import rate_limiter
+from services.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    return clock
+
+
+class FakeRedis:
+    def __init__(self, script):
+        self.script = script
+        self.calls = []
+
+    def register_script(self, source):
+        def run(keys, args):
+            self.calls.append((keys, args))
+            return self.script(keys, args)
+        return run
+
+    def pfcount(self, key):
+        return 7
+
+
+class TestLocalLimiter:
+    def test_burst_then_reject(self, clock):
+        limiter = RateLimiter("test", limit=3, window_seconds=60)
+
+        assert all(limiter.hit("a").allowed for _ in range(3))
+        decision = limiter.hit("a")
+        assert not decision.allowed
+        assert decision.retry_after == pytest.approx(20)
+        # Other keys are independent
+        assert limiter.hit("b").allowed
+
+    def test_budget_recovers_per_interval(self, clock):
+        limiter = RateLimiter("test", limit=3, window_seconds=60)
+        for _ in range(3):
+            limiter.hit("a")
+
+        clock.now += 20
+        assert limiter.hit("a").allowed
+        assert not limiter.hit("a").allowed
+
+    def test_check_raises_429_with_retry_after(self, clock):
+        limiter = RateLimiter("test", limit=1, window_seconds=10)
+        limiter.check("a")
+
+        with pytest.raises(HTTPException) as exc_info:
+            limiter.check("a", detail="slow down")
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.detail == "slow down"
+        assert exc_info.value.headers["Retry-After"] == "10"
+
+    def test_idle_keys_are_swept(self, clock):
+        limiter = RateLimiter("test", limit=5, window_seconds=10, sweep_interval_seconds=30)
+        for i in range(100):
+            limiter.hit(f"user:{i}")
+        assert limiter.stats()["local_keys"] == 100
+
+        clock.now += 31
+        limiter.hit("fresh")
+        assert limiter.stats()["local_keys"] == 1
+
+    def test_key_count_is_capped(self, clock):
+        limiter = RateLimiter("test", limit=5, window_seconds=10, max_local_keys=50)
+        for i in range(500):
+            limiter.hit(f"user:{i}")
+        assert limiter.stats()["local_keys"] <= 50
+
+    def test_stats_report_latency_and_counts(self, clock):
+        limiter = RateLimiter("test", limit=1, window_seconds=10)
+        limiter.hit("a")
+        limiter.hit("a")
+
+        stats = limiter.stats()
+        assert stats["backend"] == "local"
+        assert stats["decisions"] == 2
+        assert stats["rejected"] == 1
+        assert set(stats["latency_ms"]) == {"p50", "p99", "max"}
+        assert stats["redis_active_keys"] is None
+
+
+class TestRedisLimiter:
+    def test_uses_script_decision(self, clock):
+        fake = FakeRedis(lambda keys, args: [0, 1500])
+        limiter = RateLimiter("auth", limit=15, window_seconds=60, redis_client=fake)
+
+        decision = limiter.hit("login:1.2.3.4")
+
+        assert not decision.allowed
+        assert decision.retry_after == pytest.approx(1.5)
+        keys, args = fake.calls[0]
+        assert keys[0] == "auth:gcra:login:1.2.3.4"
+        assert args[:2] == [4000, 60000]
+        assert limiter.stats()["redis_active_keys"] == 7
+
+    def test_falls_back_to_local_and_backs_off_redis(self, clock):
+        def broken(keys, args):
+            raise ConnectionError("redis down")
+
+        fake = FakeRedis(broken)
+        limiter = RateLimiter("auth", limit=1, window_seconds=60, redis_client=fake, redis_retry_seconds=5)
+
+        assert limiter.hit("a").allowed
+        assert not limiter.hit("a").allowed
+        # Redis is skipped while backing off
+        assert len(fake.calls) == 1
+        assert limiter.stats()["redis_errors"] == 1
+
+        clock.now += 6
+        limiter.hit("a")
+        assert len(fake.calls) == 2
+
+
+def test_get_rate_limiter_is_shared_per_name():
+    first = rate_limiter.get_rate_limiter("shared-test", 5, 60)
+    assert rate_limiter.get_rate_limiter("shared-test", 5, 60) is first
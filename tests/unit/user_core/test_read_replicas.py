@@ -0,0 +1,173 @@
+"""
+Tests for read-replica routing.
+
+Tests verify:
+- Healthy replicas are used round-robin; unreachable ones are skipped
+- Reads fall back to the primary when no replica is healthy
+- Callers read from the primary for a short window after a write, in every
+  worker process (the marker lives in Redis)
+"""
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from services import db, read_replicas
+from services.read_replicas import ReplicaSet, RecentWriters, WriteTrackingMiddleware
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    replica_set = ReplicaSet(
+        [f"sqlite:///{tmp_path / 'r1.db'}", f"sqlite:///{tmp_path / 'r2.db'}"],
+        max_lag_seconds=5,
+    )
+    replica_set.check_health()
+    return replica_set
+
+
+class TestReplicaSet:
+    def test_round_robin_over_healthy_replicas(self, replicas):
+        picked = [replicas.pick().url for _ in range(4)]
+        assert picked[0] != picked[1]
+        assert picked[0] == picked[2]
+        assert picked[1] == picked[3]
+
+    def test_unreachable_replica_is_skipped(self, tmp_path):
+        replica_set = ReplicaSet(
+            [f"sqlite:///{tmp_path / 'ok.db'}", f"sqlite:///{tmp_path / 'missing' / 'r.db'}"],
+            max_lag_seconds=5,
+        )
+        replica_set.check_health()
+
+        assert [r.healthy for r in replica_set.replicas] == [True, False]
+        assert {replica_set.pick().url for _ in range(4)} == {replica_set.replicas[0].url}
+        assert replica_set.stats()[1]["last_error"]
+
+    def test_no_healthy_replica_means_primary(self, replicas):
+        for replica in replicas.replicas:
+            replica.healthy = False
+        assert replicas.pick() is None
+
+    def test_replicas_start_unhealthy_until_checked(self, tmp_path):
+        replica_set = ReplicaSet([f"sqlite:///{tmp_path / 'r.db'}"], max_lag_seconds=5)
+        assert replica_set.pick() is None
+
+
+class TestRecentWriters:
+    def test_window_expires(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(read_replicas.time, "monotonic", lambda: now[0])
+        writers = RecentWriters(window_seconds=5)
+
+        writers.mark("user:1")
+        assert writers.is_recent("user:1")
+        assert not writers.is_recent("user:2")
+
+        now[0] += 6
+        assert not writers.is_recent("user:1")
+
+
+class FakeRedis:
+    """Shared key store with the SET PX / EXISTS subset RecentWriters uses."""
+
+    def __init__(self):
+        self.expires = {}
+        self.down = False
+
+    def set(self, key, value, px):
+        if self.down:
+            raise ConnectionError("redis down")
+        self.expires[key] = time.monotonic() + px / 1000
+
+    def exists(self, key):
+        if self.down:
+            raise ConnectionError("redis down")
+        return int(self.expires.get(key, 0) > time.monotonic())
+
+
+class FakeAsyncRedis:
+    def __init__(self, sync):
+        self.sync = sync
+
+    async def set(self, key, value, px):
+        return self.sync.set(key, value, px)
+
+    async def exists(self, key):
+        return self.sync.exists(key)
+
+
+class TestSharedRecentWriters:
+    def _worker(self, store):
+        return RecentWriters(window_seconds=60, redis_client=store, async_redis_client=FakeAsyncRedis(store))
+
+    def test_mark_is_seen_by_other_workers(self):
+        store = FakeRedis()
+        writer, reader = self._worker(store), self._worker(store)
+
+        asyncio.run(writer.amark("user:1"))
+
+        assert reader.is_recent("user:1")
+        assert asyncio.run(reader.ais_recent("user:1"))
+        assert not reader.is_recent("user:2")
+
+    def test_redis_errors_fall_back_to_the_local_window(self):
+        store = FakeRedis()
+        store.down = True
+        writers = self._worker(store)
+
+        writers.mark("user:1")
+
+        assert writers.is_recent("user:1")
+        assert not writers.is_recent("user:2")
+
+    def test_caller_key_does_not_depend_on_the_token_cache(self, monkeypatch):
+        cached = read_replicas.auth_cache.TokenCache(maxsize=10)
+        monkeypatch.setattr(read_replicas.auth_cache, "token_cache", cached)
+        before = read_replicas.caller_key("Bearer abc", None)
+
+        cached.put("abc", uuid.uuid4(), time.time() + 60)
+
+        assert read_replicas.caller_key("Bearer abc", None) == before
+        assert before == f"token:{read_replicas.auth_cache.token_digest('abc')}"
+
+
+class TestReadRouting:
+    @pytest.fixture
+    def client(self, replicas, monkeypatch):
+        monkeypatch.setattr(read_replicas, "replica_set", replicas)
+        monkeypatch.setattr(read_replicas, "recent_writers", RecentWriters(window_seconds=60))
+
+        app = FastAPI()
+        app.add_middleware(WriteTrackingMiddleware)
+
+        @app.get("/read")
+        def read(session: Session = Depends(read_replicas.get_read_db)):
+            return {"url": str(session.get_bind().url)}
+
+        @app.post("/write")
+        def write():
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_reads_go_to_replicas(self, client, replicas):
+        urls = {client.get("/read").json()["url"] for _ in range(4)}
+        assert urls == {r.url for r in replicas.replicas}
+
+    def test_read_your_writes(self, client, replicas):
+        headers = {"X-User-Id": "11111111-1111-1111-1111-111111111111"}
+        client.post("/write", headers=headers)
+
+        primary = str(db.engine.url)
+        assert client.get("/read", headers=headers).json()["url"] == primary
+        # Other callers still use replicas
+        assert client.get("/read").json()["url"] != primary
@@ -0,0 +1,135 @@
+"""
+Tests for the share card cache.
+
+Tests verify:
+- Cache keys are stable and sensitive to prompt/params
+- The disk store evicts least-recently-used cards beyond its size cap
+- Concurrent requests for the same card trigger one generation
+- A cancelled request does not cancel the generation other requests wait on
+- A card evicted between the index check and the read is a miss
+"""
+import asyncio
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from services.share_card_cache import (
+    LocalDiskShareCardStore, ShareCardCache, card_cache_key
+)
+
+
+class TestCardCacheKey:
+
+    def test_key_is_stable_and_param_sensitive(self):
+        params = {"model": "imagen", "config": {"aspect_ratio": "1:1", "n": 1}}
+        reordered = {"config": {"n": 1, "aspect_ratio": "1:1"}, "model": "imagen"}
+
+        assert card_cache_key("prompt", params) == card_cache_key("prompt", reordered)
+        assert card_cache_key("prompt", params) != card_cache_key("prompt 2", params)
+        assert card_cache_key("prompt", params) != card_cache_key("prompt", {"model": "other"})
+
+
+class TestLocalDiskShareCardStore:
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        store = LocalDiskShareCardStore(str(tmp_path), max_bytes=30)
+        store.put("a", b"x" * 10)
+        store.put("b", b"y" * 10)
+        store.put("c", b"z" * 10)
+        assert store.get("a") == b"x" * 10  # "b" is now least recently used
+
+        store.put("d", b"w" * 10)
+
+        assert store.get("b") is None
+        assert store.get("a") is not None
+        assert not (tmp_path / "b.png").exists()
+
+    def test_index_survives_restart(self, tmp_path):
+        LocalDiskShareCardStore(str(tmp_path), max_bytes=100).put("a", b"card")
+
+        assert LocalDiskShareCardStore(str(tmp_path), max_bytes=100).get("a") == b"card"
+
+    def test_concurrently_evicted_card_is_a_miss(self, tmp_path):
+        store = LocalDiskShareCardStore(str(tmp_path), max_bytes=100)
+        store.put("a", b"card")
+        (tmp_path / "a.png").unlink()
+
+        assert store.get("a") is None
+        assert store._total_bytes == 0
+
+
+class TestShareCardCache:
+
+    def test_concurrent_requests_share_one_generation(self, tmp_path):
+        cache = ShareCardCache(LocalDiskShareCardStore(str(tmp_path), max_bytes=1000))
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return b"png-bytes"
+
+        async def run():
+            results = await asyncio.gather(*[
+                cache.get_or_generate("key", generate) for _ in range(5)
+            ])
+            again = await cache.get_or_generate("key", generate)
+            return results, again
+
+        results, again = asyncio.run(run())
+
+        assert results == [b"png-bytes"] * 5
+        assert again == b"png-bytes"
+        assert len(calls) == 1
+
+    def test_failures_propagate_and_are_not_cached(self, tmp_path):
+        cache = ShareCardCache(LocalDiskShareCardStore(str(tmp_path), max_bytes=1000))
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            if len(attempts) == 1:
+                raise RuntimeError("imagen down")
+            return b"ok"
+
+        async def run():
+            first = await asyncio.gather(
+                cache.get_or_generate("key", flaky),
+                cache.get_or_generate("key", flaky),
+                return_exceptions=True,
+            )
+            second = await cache.get_or_generate("key", flaky)
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert all(isinstance(r, RuntimeError) for r in first)
+        assert second == b"ok"
+        assert len(attempts) == 2
+
+    def test_cancelled_request_does_not_cancel_waiters(self, tmp_path):
+        cache = ShareCardCache(LocalDiskShareCardStore(str(tmp_path), max_bytes=1000))
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return b"png-bytes"
+
+        async def run():
+            first = asyncio.create_task(cache.get_or_generate("key", generate))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.create_task(cache.get_or_generate("key", generate))
+            await asyncio.sleep(0.01)
+            first.cancel()  # the client that started the generation disconnects
+            return await waiter, first
+
+        data, first = asyncio.run(run())
+
+        assert data == b"png-bytes"
+        assert first.cancelled()
+        assert len(calls) == 1
+        assert (tmp_path / "key.png").read_bytes() == b"png-bytes"
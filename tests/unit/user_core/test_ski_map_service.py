@@ -0,0 +1,219 @@
+"""
+Tests for the ski map resort catalog and per-user rollups.
+
+Tests verify:
+- The catalog pages through resort_api and is grouped by region
+- Concurrent first loads share one fetch; stale catalogs are served while refreshing
+- A failed fetch keeps the previous catalog
+- Rollups and region detail come from the index; visited sets are invalidated on writes
+- Replica reads never fill the visited cache; the async path keeps Redis off the event loop
+"""
+import asyncio
+import threading
+import pytest
+import uuid
+from datetime import date
+from unittest.mock import patch
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from models.user_profile import Base, UserProfile
+from schemas.course_tracking import CourseVisitCreate
+from services import course_visit_service, read_replicas, resort_catalog, ski_map_service
+from services.resort_catalog import ResortCatalog, build_index
+
+
+RESORTS = [
+    {"resort_id": f"hokkaido-{i}", "names": {"zh": f"北海道{i}", "en": f"Hokkaido {i}"}, "region": "北海道"}
+    for i in range(150)
+] + [
+    {"resort_id": "hakuba", "names": {"zh": "白馬", "en": "Hakuba"}, "region": "長野県"},
+]
+
+
+def _resort_api(calls, resorts=RESORTS, fail=False):
+    def handler(request):
+        calls.append(dict(request.url.params))
+        if fail:
+            return httpx.Response(503)
+        limit = int(request.url.params["limit"])
+        offset = int(request.url.params["offset"])
+        return httpx.Response(200, json={
+            "total": len(resorts), "limit": limit, "offset": offset,
+            "items": resorts[offset:offset + limit],
+        })
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def cache():
+    store = {}
+    with patch.object(ski_map_service.redis_cache, "cache_get", side_effect=store.get), \
+         patch.object(ski_map_service.redis_cache, "cache_set",
+                      side_effect=lambda key, value, ttl=300: store.__setitem__(key, value)), \
+         patch.object(ski_map_service.redis_cache, "cache_delete",
+                      side_effect=lambda key: store.pop(key, None) is not None):
+        yield store
+
+
+@pytest.fixture
+def test_db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(engine)
+
+
+class TestResortCatalog:
+    def test_pages_through_resort_api(self):
+        calls = []
+        catalog = ResortCatalog("http://resort-api", 600, 30, transport=_resort_api(calls))
+
+        index = asyncio.run(catalog.get())
+
+        assert [c["offset"] for c in calls] == ["0", "100"]
+        assert all(c["limit"] == "100" for c in calls)
+        assert index.total == 151
+        assert len(index.regions["北海道"]) == 150
+        assert index.regions["長野県"] == ({"id": "hakuba", "name_zh": "白馬", "name_en": "Hakuba"},)
+
+    def test_concurrent_first_load_fetches_once(self):
+        calls = []
+        catalog = ResortCatalog("http://resort-api", 600, 30, transport=_resort_api(calls))
+
+        async def scenario():
+            return await asyncio.gather(*(catalog.get() for _ in range(5)))
+
+        indexes = asyncio.run(scenario())
+        assert len(calls) == 2
+        assert all(index is indexes[0] for index in indexes)
+
+    def test_stale_catalog_is_served_while_refreshing(self):
+        calls = []
+        catalog = ResortCatalog("http://resort-api", 0, 30, transport=_resort_api(calls))
+
+        async def scenario():
+            first = await catalog.get()
+            second = await catalog.get()  # stale: returned at once, refresh scheduled
+            await catalog._refresh
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert second is first
+        assert len(calls) == 4
+
+    def test_failed_fetch_keeps_previous_catalog(self):
+        calls = []
+        catalog = ResortCatalog("http://resort-api", 600, 30, transport=_resort_api(calls))
+        loaded = asyncio.run(catalog.get())
+
+        catalog._transport = _resort_api(calls, fail=True)
+        assert asyncio.run(catalog.refresh()) is loaded
+        assert catalog.current() is loaded
+        assert catalog.stats()["last_error"]
+
+    def test_version_tracks_content(self):
+        assert build_index(RESORTS).version == build_index(list(reversed(RESORTS))).version
+        assert build_index(RESORTS).version != build_index(RESORTS[:-1]).version
+
+
+class TestSkiMap:
+    @pytest.fixture
+    def catalog(self):
+        return build_index(RESORTS)
+
+    @pytest.fixture
+    def user_id(self, test_db):
+        user = UserProfile(user_id=uuid.uuid4(), email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+        test_db.add(user)
+        test_db.commit()
+        return user.user_id
+
+    def _visit(self, db, user_id, resort_id):
+        return course_visit_service.record_visit(
+            db, user_id, CourseVisitCreate(resort_id=resort_id, course_name="A", visited_date=date(2025, 1, 1))
+        )
+
+    def test_rollups_from_catalog_index(self, test_db, cache, catalog, user_id):
+        self._visit(test_db, user_id, "hakuba")
+        self._visit(test_db, user_id, "hokkaido-1")
+
+        data = ski_map_service.get_ski_map_data(test_db, user_id, catalog)
+
+        assert data["visited_resort_ids"] == ["hakuba", "hokkaido-1"]
+        assert data["total_resorts"] == 151
+        assert data["region_stats"]["長野県"]["completion_percentage"] == 100.0
+        assert data["region_stats"]["北海道"]["visited"] == 1
+        assert data["region_stats"]["北海道"]["completion_percentage"] == 0.7
+
+    def test_region_detail(self, test_db, cache, catalog, user_id):
+        self._visit(test_db, user_id, "hakuba")
+
+        detail = ski_map_service.get_region_detail(test_db, user_id, "長野県", catalog)
+        assert detail == {
+            "region": "長野県", "total": 1, "visited": 1, "completion_percentage": 100.0,
+            "resorts": [{"id": "hakuba", "name_zh": "白馬", "name_en": "Hakuba", "visited": True}],
+        }
+        with pytest.raises(ValueError):
+            ski_map_service.get_region_detail(test_db, user_id, "Nowhere", catalog)
+
+    def test_visited_set_is_invalidated_on_writes(self, test_db, cache, catalog, user_id):
+        visit = self._visit(test_db, user_id, "hakuba")
+        assert ski_map_service.get_ski_map_data(test_db, user_id, catalog)["total_visited"] == 1
+
+        self._visit(test_db, user_id, "hokkaido-2")
+        assert ski_map_service.get_ski_map_data(test_db, user_id, catalog)["total_visited"] == 2
+
+        course_visit_service.delete_visit(test_db, visit.id, user_id)
+        assert ski_map_service.get_ski_map_data(test_db, user_id, catalog)["visited_resort_ids"] == ["hokkaido-2"]
+
+    def test_defaults_to_loaded_catalog(self, test_db, cache, catalog, monkeypatch):
+        monkeypatch.setattr(resort_catalog.catalog, "_index", catalog)
+        assert ski_map_service.get_ski_map_data(test_db, uuid.uuid4())["total_resorts"] == 151
+
+    def test_replica_reads_do_not_fill_cache(self, test_db, cache, catalog, user_id):
+        self._visit(test_db, user_id, "hakuba")
+        test_db.info[read_replicas.REPLICA_INFO_KEY] = "postgresql://replica"
+
+        data = ski_map_service.get_ski_map_data(test_db, user_id, catalog)
+
+        assert data["visited_resort_ids"] == ["hakuba"]
+        assert cache == {}
+
+    def test_async_lookup_runs_redis_off_the_event_loop(self, test_db, cache, catalog, user_id):
+        self._visit(test_db, user_id, "hakuba")
+        threads = []
+        lookup = ski_map_service.redis_cache.cache_get
+
+        def cache_get(key):
+            threads.append(threading.current_thread())
+            return lookup(key)
+
+        class AsyncSessionStub:
+            info = test_db.info
+
+            async def run_sync(self, fn, *args):
+                return fn(test_db, *args)
+
+        async def scenario():
+            with patch.object(ski_map_service.redis_cache, "cache_get", side_effect=cache_get):
+                first = await ski_map_service.aget_ski_map_data(AsyncSessionStub(), user_id, catalog)
+                detail = await ski_map_service.aget_region_detail(AsyncSessionStub(), user_id, "長野県", catalog)
+            return first, detail
+
+        first, detail = asyncio.run(scenario())
+
+        assert first["visited_resort_ids"] == ["hakuba"]
+        assert detail["visited"] == 1
+        assert cache == {ski_map_service._visited_key(user_id): ["hakuba"]}
+        assert threads and all(thread is not threading.main_thread() for thread in threads)
+        with pytest.raises(ValueError):
+            asyncio.run(ski_map_service.aget_region_detail(AsyncSessionStub(), user_id, "Nowhere", catalog))
@@ -0,0 +1,152 @@
+"""
+Tests for snowbuddy request-state projections.
+
+Tests verify:
+- Ingesting snowbuddy events maintains match request / trip application rows
+- Responses older than the last applied event do not change the status
+- Accepted applicants are listed as trip participants until they leave
+- Rebuilding from stored events reproduces the projections
+- The event types the snowbuddy-matching routers emit are the ones projected
+"""
+import asyncio
+import pytest
+import uuid
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import AsyncMock, patch
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from models.user_profile import Base
+from models.snowbuddy import SnowbuddyMatchRequest, SnowbuddyTripApplication
+from schemas.behavior_event import BehaviorEventCreate
+from services import behavior_event_service, snowbuddy_projection_service as projections
+from snowbuddy_matching.app.routers.requests_router import respond_to_match_request
+from snowbuddy_matching.app.routers.trip_requests_router import BehaviorEventService, respond_to_trip_application
+
+
+T0 = datetime(2025, 1, 1, 9, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def test_db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(engine)
+
+
+def _ingest(db, event_type, user_id, payload, minutes=0):
+    return behavior_event_service.create_event(db, BehaviorEventCreate(
+        user_id=user_id,
+        source_project="snowbuddy-matching",
+        event_type=event_type,
+        payload=payload,
+        occurred_at=T0 + timedelta(minutes=minutes),
+    ))
+
+
+class TestMatchRequests:
+    def test_sent_then_accepted(self, test_db):
+        requester, target = uuid.uuid4(), uuid.uuid4()
+        _ingest(test_db, "snowbuddy.match.request.sent", requester,
+                {"request_id": "req-1", "target_user_id": str(target)})
+        _ingest(test_db, "snowbuddy.match.request.accepted", target, {"request_id": "req-1"}, minutes=5)
+
+        request = projections.get_match_request(test_db, "req-1")
+        assert (request.requester_id, request.target_user_id) == (requester, target)
+        assert request.status == projections.ACCEPTED
+        assert request.responded_by == target
+
+    def test_older_response_is_ignored(self, test_db):
+        requester, target = uuid.uuid4(), uuid.uuid4()
+        _ingest(test_db, "snowbuddy.match.request.sent", requester,
+                {"request_id": "req-1", "target_user_id": str(target)})
+        _ingest(test_db, "snowbuddy.match.request.accepted", target, {"request_id": "req-1"}, minutes=10)
+        _ingest(test_db, "snowbuddy.match.request.declined", target, {"request_id": "req-1"}, minutes=5)
+
+        assert projections.get_match_request(test_db, "req-1").status == projections.ACCEPTED
+
+
+class TestTripApplications:
+    def test_application_lifecycle(self, test_db):
+        applicant, owner = uuid.uuid4(), uuid.uuid4()
+        _ingest(test_db, "snowbuddy.trip.apply.sent", applicant, {"request_id": "app-1", "trip_id": "trip-1"})
+        assert projections.get_trip_application(test_db, "app-1").status == projections.PENDING
+        assert projections.get_trip_participants(test_db, "trip-1") == []
+
+        _ingest(test_db, "snowbuddy.trip.apply.accepted", owner,
+                {"request_id": "app-1", "trip_id": "trip-1"}, minutes=1)
+        application = projections.get_trip_application(test_db, "app-1")
+        assert (application.applicant_id, application.status) == (applicant, projections.ACCEPTED)
+        assert [p.applicant_id for p in projections.get_trip_participants(test_db, "trip-1")] == [applicant]
+
+        _ingest(test_db, "snowbuddy.trip.leave", applicant,
+                {"trip_id": "trip-1", "user_id": str(applicant)}, minutes=2)
+        assert projections.get_trip_application(test_db, "app-1").status == projections.LEFT
+        assert projections.get_trip_participants(test_db, "trip-1") == []
+
+    def test_response_before_sent(self, test_db):
+        applicant, owner = uuid.uuid4(), uuid.uuid4()
+        _ingest(test_db, "snowbuddy.trip.apply.accepted", owner,
+                {"request_id": "app-1", "trip_id": "trip-1"}, minutes=1)
+        _ingest(test_db, "snowbuddy.trip.apply.sent", applicant, {"request_id": "app-1", "trip_id": "trip-1"})
+
+        application = projections.get_trip_application(test_db, "app-1")
+        assert (application.applicant_id, application.status) == (applicant, projections.ACCEPTED)
+
+    def test_payload_without_keys_is_stored_but_not_projected(self, test_db):
+        _ingest(test_db, "snowbuddy.trip.apply.sent", uuid.uuid4(), {"trip_id": "trip-1"})
+        assert test_db.query(SnowbuddyTripApplication).count() == 0
+
+
+def test_rebuild_replays_stored_events(test_db):
+    applicant, owner, requester = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    _ingest(test_db, "snowbuddy.trip.apply.sent", applicant, {"request_id": "app-1", "trip_id": "trip-1"})
+    _ingest(test_db, "snowbuddy.trip.apply.declined", owner, {"request_id": "app-1", "trip_id": "trip-1"}, 1)
+    _ingest(test_db, "snowbuddy.match.request.sent", requester,
+            {"request_id": "req-1", "target_user_id": str(owner)})
+
+    test_db.query(SnowbuddyTripApplication).delete()
+    test_db.query(SnowbuddyMatchRequest).delete()
+    test_db.commit()
+
+    assert projections.rebuild(test_db) == 3
+    assert projections.get_trip_application(test_db, "app-1").status == projections.DECLINED
+    assert projections.get_match_request(test_db, "req-1").requester_id == requester
+
+    # Replaying again changes nothing
+    assert projections.rebuild(test_db) == 3
+    assert projections.get_trip_application(test_db, "app-1").status == projections.DECLINED
+
+
+def _emitted(respond, *args):
+    """The event a snowbuddy-matching response route posts to user-core."""
+    post_event = AsyncMock(return_value=True)
+    with patch("snowbuddy_matching.app.clients.user_core_client.post_event", post_event):
+        asyncio.run(respond(*args))
+    return post_event.await_args.args[0]
+
+
+@pytest.mark.parametrize("action,status", [("accept", projections.ACCEPTED), ("decline", projections.DECLINED)])
+def test_router_response_events_are_projected(test_db, action, status):
+    requester, target = uuid.uuid4(), uuid.uuid4()
+    _ingest(test_db, "snowbuddy.match.request.sent", requester,
+            {"request_id": "req-1", "target_user_id": str(target)})
+    event = _emitted(respond_to_match_request, "req-1", action, str(target))
+    _ingest(test_db, event["event_type"], target, event["payload"], minutes=1)
+    assert projections.get_match_request(test_db, "req-1").status == status
+
+    applicant, owner = uuid.uuid4(), uuid.uuid4()
+    _ingest(test_db, "snowbuddy.trip.apply.sent", applicant, {"request_id": "app-1", "trip_id": "trip-1"})
+    with patch.object(BehaviorEventService, "get_applicant_id_from_request",
+                      AsyncMock(return_value=None)):
+        event = _emitted(respond_to_trip_application, "trip-1", "app-1", action, str(owner))
+    _ingest(test_db, event["event_type"], owner, event["payload"], minutes=1)
+    assert projections.get_trip_application(test_db, "app-1").status == status
@@ -0,0 +1,110 @@
+"""
+Tests for SQL-backed trip calendar queries.
+
+Tests verify:
+- Calendar trips use date-range overlap (including month-spanning trips)
+- Year overview buckets per month and is not capped by trip pagination
+- Shared calendar merges own and joined trips in one query
+"""
+import pytest
+import uuid
+from datetime import date
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from models.user_profile import Base, UserProfile
+from models.trip_planning import Season, Trip, TripBuddy
+from models.enums import BuddyStatus, TripStatus
+from services import trip_calendar_service
+
+
+@pytest.fixture(autouse=True)
+def no_redis():
+    with patch.object(trip_calendar_service.redis_cache, "cache_hget", return_value=None), \
+         patch.object(trip_calendar_service.redis_cache, "cache_hset", return_value=False):
+        yield
+
+
+@pytest.fixture
+def test_db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(engine)
+
+
+def _add_user(db):
+    user = UserProfile(user_id=uuid.uuid4(), email=f"{uuid.uuid4()}@example.com",
+                       hashed_password="x")
+    season = Season(user_id=user.user_id, title="Season",
+                    start_date=date(2024, 11, 1), end_date=date(2026, 4, 30))
+    db.add_all([user, season])
+    db.commit()
+    return user, season
+
+
+def _add_trip(db, user, season, start, end, status=TripStatus.PLANNING):
+    trip = Trip(season_id=season.season_id, user_id=user.user_id, resort_id="niseko",
+                start_date=start, end_date=end, trip_status=status)
+    db.add(trip)
+    db.commit()
+    return trip
+
+
+class TestCalendarQueries:
+
+    def test_month_filter_uses_overlap(self, test_db):
+        user, season = _add_user(test_db)
+        spanning = _add_trip(test_db, user, season, date(2025, 1, 28), date(2025, 3, 2))
+        _add_trip(test_db, user, season, date(2025, 4, 1), date(2025, 4, 3))
+
+        trips = trip_calendar_service.get_calendar_trips(test_db, user.user_id, 2025, month=2)
+
+        assert [t.trip_id for t in trips] == [spanning.trip_id]
+
+    def test_year_overview_counts_beyond_page_size(self, test_db):
+        user, season = _add_user(test_db)
+        for day in range(1, 29):
+            for _ in range(4):
+                _add_trip(test_db, user, season, date(2025, 2, day), date(2025, 2, day))
+        _add_trip(test_db, user, season, date(2024, 12, 30), date(2025, 1, 2),
+                  status=TripStatus.COMPLETED)
+
+        overview = trip_calendar_service.get_year_overview(test_db, user.user_id, 2025)
+
+        assert overview["months"] == {1: 1, 2: 112}
+        assert overview["total_trips"] == 113
+        assert overview["completed_trips"] == 1
+
+    def test_shared_calendar_includes_joined_trips(self, test_db):
+        owner, owner_season = _add_user(test_db)
+        buddy, buddy_season = _add_user(test_db)
+        own = _add_trip(test_db, buddy, buddy_season, date(2025, 2, 1), date(2025, 2, 2))
+        joined = _add_trip(test_db, owner, owner_season, date(2025, 1, 1), date(2025, 1, 2))
+        pending = _add_trip(test_db, owner, owner_season, date(2025, 3, 1), date(2025, 3, 2))
+        test_db.add_all([
+            TripBuddy(trip_id=joined.trip_id, user_id=buddy.user_id, status=BuddyStatus.ACCEPTED),
+            TripBuddy(trip_id=pending.trip_id, user_id=buddy.user_id, status=BuddyStatus.PENDING),
+        ])
+        test_db.commit()
+
+        trips = trip_calendar_service.get_shared_calendar_trips(test_db, buddy.user_id)
+
+        assert [t.trip_id for t in trips] == [joined.trip_id, own.trip_id]
+
+
+def test_invalidate_deletes_the_users_calendar_key():
+    user_id = uuid.uuid4()
+    with patch.object(trip_calendar_service.redis_cache, "cache_delete") as delete, \
+         patch.object(trip_calendar_service.redis_cache, "cache_invalidate_pattern") as scan:
+        trip_calendar_service.invalidate_user_calendar(user_id)
+
+    delete.assert_called_once_with(f"user:{user_id}:trip_calendar:years")
+    scan.assert_not_called()
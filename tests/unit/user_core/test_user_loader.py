@@ -0,0 +1,157 @@
+"""
+Tests for the request-scoped batched user loader.
+
+Tests verify:
+- Queued IDs are fetched with a single IN query and cached (hits and misses)
+- The loader is shared per session
+- Trip buddy hydration issues a constant number of queries (no N+1)
+"""
+import pytest
+import uuid
+from contextlib import contextmanager
+from datetime import date
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "platform" / "user_core"))
+
+from models.user_profile import Base, UserProfile
+from models.trip_planning import Season, Trip, TripBuddy
+from models.enums import BuddyStatus
+from utils.user_loader import UserLoader, get_user_loader
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@contextmanager
+def count_queries(engine):
+    """Count SQL statements executed against `engine`."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _add_users(db, count):
+    users = [
+        UserProfile(user_id=uuid.uuid4(), email=f"{uuid.uuid4()}@example.com",
+                    hashed_password="x", display_name=f"User {i}")
+        for i in range(count)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+class TestUserLoader:
+
+    def test_load_many_uses_one_query_and_caches(self, engine, session_factory):
+        db = session_factory()
+        ids = [u.user_id for u in _add_users(db, 5)]
+        db.expunge_all()
+        missing = uuid.uuid4()
+        loader = UserLoader(db)
+
+        with count_queries(engine) as statements:
+            loaded = loader.load_many(ids + [missing])
+            assert loader.load(ids[0]).display_name == "User 0"
+            assert loader.load(missing) is None
+
+        assert set(loaded) == set(ids)
+        assert len(statements) == 1
+
+    def test_primed_ids_are_batched_with_next_load(self, engine, session_factory):
+        db = session_factory()
+        ids = [u.user_id for u in _add_users(db, 3)]
+        db.expunge_all()
+        loader = UserLoader(db)
+
+        loader.prime_ids(ids[1:])
+        with count_queries(engine) as statements:
+            loader.load(ids[0])
+            loader.load(ids[2])
+
+        assert len(statements) == 1
+
+    def test_loader_is_shared_per_session(self, session_factory):
+        db = session_factory()
+        assert get_user_loader(db) is get_user_loader(db)
+        assert get_user_loader(db) is not get_user_loader(session_factory())
+
+
+class TestTripBuddiesQueryCount:
+
+    @pytest.fixture
+    def client(self, session_factory):
+        from api.main import app
+        from services.db import get_db
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_db, None)
+
+    def _make_trip(self, session_factory, buddy_count):
+        db = session_factory()
+        owner, *buddies = _add_users(db, buddy_count + 1)
+        season = Season(user_id=owner.user_id, title="Season",
+                        start_date=date(2025, 1, 1), end_date=date(2025, 3, 31))
+        db.add(season)
+        db.flush()
+        trip = Trip(season_id=season.season_id, user_id=owner.user_id, resort_id="niseko",
+                    start_date=date(2025, 2, 1), end_date=date(2025, 2, 3))
+        db.add(trip)
+        db.flush()
+        db.add_all([
+            TripBuddy(trip_id=trip.trip_id, user_id=b.user_id, status=BuddyStatus.ACCEPTED)
+            for b in buddies
+        ])
+        db.commit()
+        trip_id = trip.trip_id
+        db.close()
+        return trip_id
+
+    def test_query_count_independent_of_buddy_count(self, client, engine, session_factory):
+        small_trip = self._make_trip(session_factory, 1)
+        large_trip = self._make_trip(session_factory, 12)
+
+        with count_queries(engine) as small:
+            response = client.get(f"/trip-planning/trips/{small_trip}/buddies")
+            assert response.status_code == 200
+            assert len(response.json()) == 1
+        with count_queries(engine) as large:
+            response = client.get(f"/trip-planning/trips/{large_trip}/buddies")
+            assert response.status_code == 200
+            assert len(response.json()) == 12
+            assert all(b["user_display_name"] for b in response.json())
+
+        assert len(large) == len(small) <= 2